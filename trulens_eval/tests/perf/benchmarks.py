@@ -0,0 +1,634 @@
+"""
+Benchmarks of the overhead of trulens_eval itself.
+
+Everything runs offline: apps are plain python classes and feedback functions
+use the `Dummy` Huggingface provider whose `DummyEndpoint` makes no requests.
+Results are written as JSON so they can be compared across commits.
+
+Usage (from the `trulens_eval` folder):
+
+```bash
+python -m tests.perf.benchmarks --output before.json
+# ... change things ...
+python -m tests.perf.benchmarks --output after.json --compare before.json
+```
+
+Use `--only` to run some of the benchmarks and `--scale` to run more or fewer
+iterations of each.
+"""
+
+import argparse
+import asyncio
+from dataclasses import asdict
+from dataclasses import dataclass
+from dataclasses import field
+from datetime import datetime
+import json
+import os
+from pathlib import Path
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from trulens_eval import __version__
+from trulens_eval import Feedback
+from trulens_eval import Tru
+from trulens_eval import TruCustomApp
+from trulens_eval.database.sqlalchemy import SQLAlchemyDB
+from trulens_eval.feedback.provider.hugs import Dummy
+from trulens_eval.instruments import Instrument
+from trulens_eval.schema.feedback import FeedbackMode
+from trulens_eval.schema.feedback import FeedbackResultStatus
+from trulens_eval.schema.record import Record
+from trulens_eval.tru_custom_app import instrument
+from trulens_eval.utils.json import jsonify
+from trulens_eval.utils.sampling import Sampling
+from trulens_eval.utils.serial import Lens
+
+
+@dataclass
+class Result:
+    """Timings of one benchmark."""
+
+    name: str
+    """Name of the benchmark."""
+
+    n: int
+    """Number of timed iterations."""
+
+    mean: float
+    """Mean seconds per iteration."""
+
+    median: float
+    """Median seconds per iteration."""
+
+    p95: float
+    """95th percentile of seconds per iteration."""
+
+    ops_per_sec: float
+    """Iterations per second, by mean."""
+
+    extra: Dict[str, float] = field(default_factory=dict)
+    """Benchmark-specific measurements such as bytes or rows per second."""
+
+
+def measure(
+    name: str,
+    func: Callable[[], object],
+    n: int,
+    warmup: int = 3,
+    **extra: float
+) -> Result:
+    """Time `n` calls of `func` after `warmup` untimed ones."""
+
+    for _ in range(warmup):
+        func()
+
+    times = []
+    for _ in range(n):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    return result_of_times(name, times, **extra)
+
+
+def result_of_times(name: str, times: Sequence[float], **extra) -> Result:
+    times = sorted(times)
+    mean = statistics.fmean(times)
+
+    return Result(
+        name=name,
+        n=len(times),
+        mean=mean,
+        median=statistics.median(times),
+        p95=times[min(len(times) - 1, int(0.95 * len(times)))],
+        ops_per_sec=1.0 / mean if mean > 0 else float("inf"),
+        extra=extra
+    )
+
+
+BENCHMARKS: Dict[str, Callable[["Context"], List[Result]]] = {}
+"""Benchmarks by name. Each produces one or more results."""
+
+
+def benchmark(name: str):
+    """Register a benchmark."""
+
+    def register(func: Callable[["Context"], List[Result]]):
+        BENCHMARKS[name] = func
+        return func
+
+    return register
+
+
+@dataclass
+class Context:
+    """Shared setup of all benchmarks."""
+
+    scale: float
+    """Multiplier of the number of iterations of each benchmark."""
+
+    workdir: Path
+    """Scratch folder for databases."""
+
+    tru: Tru
+    """Tru using a database in `workdir`."""
+
+    def n(self, base: int) -> int:
+        return max(1, int(base * self.scale))
+
+
+class BenchApp:
+    """App with instrumented methods of each kind that do no work of their
+    own."""
+
+    def __init__(self, depth: int = 10):
+        self.depth = depth
+
+    @instrument
+    def sync(self, query: str) -> str:
+        return query
+
+    @instrument
+    async def asynch(self, query: str) -> str:
+        return query
+
+    @instrument
+    def generator(self, query: str):
+        for word in query.split(" "):
+            yield word
+
+    @instrument
+    def retrieve(self, query: str, i: int) -> List[dict]:
+        return [
+            dict(text=f"{query} chunk {i}-{j}", score=1.0 / (j + 1))
+            for j in range(4)
+        ]
+
+    @instrument
+    def nested(self, query: str) -> str:
+        chunks = [self.retrieve(query, i) for i in range(self.depth)]
+        return self.sync(" ".join(c[0]['text'] for c in chunks))
+
+
+def _original(method: Callable) -> Callable:
+    """The uninstrumented function behind an instrumented method."""
+
+    return getattr(method, Instrument.INSTRUMENT, method)
+
+
+def _record_of(recorder: TruCustomApp, func: Callable, *args) -> Record:
+    with recorder as recording:
+        func(*args)
+
+    return recording.get()
+
+
+@benchmark("instrument")
+def bench_instrument(ctx: Context) -> List[Result]:
+    """Per-call overhead of `Instrument.tracked_method_wrapper` for sync,
+    async and generator methods, with and without a recording in progress."""
+
+    app = BenchApp()
+    recorder = TruCustomApp(app, app_id="bench_instrument", tru=ctx.tru)
+
+    n = ctx.n(300)
+    query = "what is the capital of indonesia"
+    loop = asyncio.new_event_loop()
+
+    raw_sync = _original(BenchApp.sync)
+    raw_asynch = _original(BenchApp.asynch)
+    raw_generator = _original(BenchApp.generator)
+
+    def recorded(thunk):
+
+        def run():
+            with recorder:
+                thunk()
+
+        return run
+
+    def sync():
+        app.sync(query)
+
+    def asynch():
+        loop.run_until_complete(app.asynch(query))
+
+    def generator():
+        list(app.generator(query))
+
+    results = [
+        measure("instrument.raw.sync", lambda: raw_sync(app, query), n),
+        measure(
+            "instrument.raw.async",
+            lambda: loop.run_until_complete(raw_asynch(app, query)), n
+        ),
+        measure(
+            "instrument.raw.generator", lambda: list(raw_generator(app, query)),
+            n
+        ),
+        measure("instrument.unrecorded.sync", sync, n),
+        measure("instrument.recorded.sync", recorded(sync), n),
+        measure("instrument.recorded.async", recorded(asynch), n),
+        measure("instrument.recorded.generator", recorded(generator), n),
+    ]
+
+    # Nested calls: one root call and `depth + 1` calls under it.
+    nested = measure(
+        "instrument.recorded.nested",
+        recorded(lambda: app.nested(query)),
+        ctx.n(50),
+        calls=app.depth + 2
+    )
+    nested.extra['per_call'] = nested.mean / nested.extra['calls']
+    results.append(nested)
+
+    # Nested calls of invocations that are not sampled for recording.
+    unsampled_recorder = TruCustomApp(
+        app,
+        app_id="bench_instrument_unsampled",
+        tru=ctx.tru,
+        sampling=Sampling(rate=0.0)
+    )
+
+    def unsampled():
+        with unsampled_recorder:
+            app.nested(query)
+
+    results.append(measure("instrument.unsampled.nested", unsampled, ctx.n(50)))
+
+    # Nested calls with serialization deferred to the background worker. Only
+    # the time until the app call returns is measured.
+    deferred_recorder = TruCustomApp(
+        app,
+        app_id="bench_instrument_deferred",
+        tru=ctx.tru,
+        defer_serialization=True
+    )
+    deferred_recordings = []
+
+    def deferred():
+        with deferred_recorder as recording:
+            app.nested(query)
+        deferred_recordings.append(recording)
+
+    results.append(
+        measure(
+            "instrument.deferred.nested",
+            deferred,
+            ctx.n(50),
+            calls=app.depth + 2
+        )
+    )
+
+    for recording in deferred_recordings:
+        recording.wait_for_records()
+
+    loop.close()
+
+    return results
+
+
+def _large_object(n_docs: int = 200) -> dict:
+    """Nested object resembling retrieval results with metadata and
+    embeddings."""
+
+    return dict(
+        query="what is the capital of indonesia",
+        documents=[
+            dict(
+                id=f"doc-{i}",
+                text=f"Document {i} " * 20,
+                metadata=dict(
+                    source=f"https://example.com/{i}",
+                    page=i,
+                    tags=["a", "b", "c"],
+                    created=datetime(2024, 1, 1)
+                ),
+                embedding=[float(j) / 64 for j in range(64)],
+                score=1.0 / (i + 1)
+            ) for i in range(n_docs)
+        ]
+    )
+
+
+@benchmark("jsonify")
+def bench_jsonify(ctx: Context) -> List[Result]:
+    """Throughput of `jsonify` on large nested objects."""
+
+    obj = _large_object()
+    size = len(json.dumps(jsonify(obj)))
+
+    result = measure("jsonify.nested", lambda: jsonify(obj), ctx.n(30))
+    result.extra['bytes'] = size
+    result.extra['bytes_per_sec'] = size / result.mean
+
+    return [result]
+
+
+def _realistic_record(ctx: Context) -> Tuple[TruCustomApp, Record]:
+    """A record of nested calls and the app that produced it."""
+
+    app = BenchApp()
+    recorder = TruCustomApp(app, app_id="bench_record", tru=ctx.tru)
+
+    return recorder, _record_of(
+        recorder, app.nested, "what is the capital of indonesia"
+    )
+
+
+@benchmark("lens")
+def bench_lens(ctx: Context) -> List[Result]:
+    """`Lens.get` on a realistic record."""
+
+    _, record = _realistic_record(ctx)
+    record_json = jsonify(record)
+    n = ctx.n(1000)
+
+    lenses = {
+        "lens.get.main_output": Lens().main_output,
+        "lens.get.call_rets": Lens().calls[0].rets,
+        "lens.get.all_call_args": Lens().calls[:].args.query,
+        "lens.get.deep": Lens().calls[-1].stack[0]["path"],
+    }
+
+    return [
+        measure(name, lambda lens=lens: list(lens.get(record_json)), n)
+        for name, lens in lenses.items()
+    ]
+
+
+@benchmark("layout")
+def bench_layout(ctx: Context) -> List[Result]:
+    """`Record.layout_calls_as_app` on a realistic record."""
+
+    _, record = _realistic_record(ctx)
+
+    return [
+        measure(
+            "record.layout_calls_as_app",
+            record.layout_calls_as_app,
+            ctx.n(200),
+            calls=len(record.calls)
+        )
+    ]
+
+
+@benchmark("db")
+def bench_db(ctx: Context) -> List[Result]:
+    """Insert and read throughput of a SQLite database."""
+
+    db = SQLAlchemyDB.from_db_url(
+        f"sqlite:///{ctx.workdir / 'bench_db.sqlite'}"
+    )
+    db.migrate_database()
+
+    app, record = _realistic_record(ctx)
+    db.insert_app(app=app)
+
+    n = ctx.n(200)
+
+    # Each insert is of a new record.
+    ids = iter(range(10**9))
+
+    def insert_new():
+        db.insert_record(
+            record=record.model_copy(
+                update=dict(record_id=f"record_hash_bench_{next(ids)}")
+            )
+        )
+
+    insert_result = measure("db.sqlite.insert_record", insert_new, n)
+
+    rows = len(db.get_records_and_feedback(app_ids=[])[0])
+    read_result = measure(
+        "db.sqlite.get_records_and_feedback",
+        lambda: db.get_records_and_feedback(app_ids=[]),
+        ctx.n(10),
+        warmup=1,
+        rows=rows
+    )
+    read_result.extra['rows_per_sec'] = rows / read_result.mean
+
+    return [insert_result, read_result]
+
+
+@benchmark("evaluator")
+def bench_evaluator(ctx: Context) -> List[Result]:
+    """End-to-end throughput of the deferred feedback evaluator with offline
+    feedback functions."""
+
+    provider = Dummy(
+        error_prob=0.0,
+        loading_prob=0.0,
+        freeze_prob=0.0,
+        overloaded_prob=0.0,
+        alloc=0,
+        delay=0.0,
+        rpm=6_000_000
+    )
+
+    feedbacks = [
+        Feedback(provider.positive_sentiment,
+                 name="bench_sentiment").on_output(),
+        Feedback(provider.language_match,
+                 name="bench_language").on_input_output(),
+    ]
+
+    app = BenchApp()
+    recorder = TruCustomApp(
+        app,
+        app_id="bench_evaluator",
+        tru=ctx.tru,
+        feedbacks=feedbacks,
+        feedback_mode=FeedbackMode.DEFERRED
+    )
+
+    n_records = ctx.n(50)
+    for i in range(n_records):
+        with recorder:
+            app.sync(f"what is the capital of country {i}")
+
+    expected = n_records * len(feedbacks)
+
+    # Only this benchmark produces feedback results.
+    def done() -> int:
+        return ctx.tru.db.get_feedback_count_by_status().get(
+            FeedbackResultStatus.DONE, 0
+        )
+
+    start = time.perf_counter()
+    ctx.tru.start_evaluator(disable_tqdm=True)
+    try:
+        timeout = 60 + expected
+        while done() < expected:
+            if time.perf_counter() - start > timeout:
+                raise RuntimeError(
+                    f"Evaluator did not finish {expected} feedbacks "
+                    f"in {timeout} seconds."
+                )
+            time.sleep(0.01)
+        elapsed = time.perf_counter() - start
+    finally:
+        ctx.tru.stop_evaluator()
+
+    return [
+        Result(
+            name="evaluator.deferred",
+            n=expected,
+            mean=elapsed / expected,
+            median=elapsed / expected,
+            p95=elapsed / expected,
+            ops_per_sec=expected / elapsed,
+            extra=dict(records=n_records, seconds=elapsed)
+        )
+    ]
+
+
+IMPORTS: Dict[str, str] = {
+    "import.trulens_eval": "import trulens_eval",
+    "import.feedback": "from trulens_eval import Feedback, Huggingface",
+    "import.tru": "from trulens_eval import Tru, TruCustomApp",
+}
+"""Statements timed by the import benchmark, by result name."""
+
+
+@benchmark("import")
+def bench_import(ctx: Context) -> List[Result]:
+    """Seconds to run each of `IMPORTS` in a new python process, less the
+    startup time of the process itself."""
+
+    def run(code: str) -> Callable[[], None]:
+        return lambda: subprocess.run(
+            [sys.executable, "-c", code], check=True, capture_output=True
+        )
+
+    n = ctx.n(5)
+
+    startup = measure("import.python", run("pass"), n, warmup=1)
+
+    results = [startup]
+
+    for name, code in IMPORTS.items():
+        result = measure(name, run(code), n, warmup=1)
+        result.extra['without_startup'] = result.mean - startup.mean
+        results.append(result)
+
+    return results
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def run(
+    names: Optional[Sequence[str]] = None,
+    scale: float = 1.0,
+    workdir: Optional[Path] = None
+) -> dict:
+    """Run the named (or all) benchmarks and return the report as JSON."""
+
+    names = list(names or BENCHMARKS.keys())
+    unknown = set(names) - set(BENCHMARKS.keys())
+    if unknown:
+        raise ValueError(
+            f"Unknown benchmark(s) {unknown}. "
+            f"Expected some of {list(BENCHMARKS.keys())}."
+        )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = workdir or Path(tmp)
+        tru = Tru(database_url=f"sqlite:///{workdir / 'bench.sqlite'}")
+        ctx = Context(scale=scale, workdir=workdir, tru=tru)
+
+        results = []
+        for name in names:
+            print(f"Running {name} ...", file=sys.stderr)
+            results.extend(BENCHMARKS[name](ctx))
+
+    return dict(
+        meta=dict(
+            commit=_git_commit(),
+            version=__version__,
+            python=platform.python_version(),
+            platform=platform.platform(),
+            cpus=os.cpu_count(),
+            scale=scale,
+            timestamp=datetime.now().isoformat()
+        ),
+        results=[asdict(result) for result in results]
+    )
+
+
+def compare(report: dict, baseline: dict) -> str:
+    """Table of mean times of `report` relative to `baseline`."""
+
+    before = {r['name']: r for r in baseline['results']}
+
+    lines = [
+        f"{'benchmark':45} {'mean (us)':>12} {'baseline':>12} {'ratio':>7}"
+    ]
+    for r in report['results']:
+        b = before.get(r['name'])
+        if b is None:
+            lines.append(f"{r['name']:45} {r['mean'] * 1e6:12.1f}")
+            continue
+
+        lines.append(
+            f"{r['name']:45} {r['mean'] * 1e6:12.1f} {b['mean'] * 1e6:12.1f} "
+            f"{r['mean'] / b['mean']:7.2f}"
+        )
+
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument(
+        "--only",
+        nargs="+",
+        choices=list(BENCHMARKS.keys()),
+        help="Benchmarks to run. All by default."
+    )
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="Multiplier of the number of iterations."
+    )
+    parser.add_argument(
+        "--output", type=Path, help="File to write results JSON to."
+    )
+    parser.add_argument(
+        "--compare", type=Path, help="Results JSON to compare against."
+    )
+
+    args = parser.parse_args(argv)
+
+    report = run(names=args.only, scale=args.scale)
+
+    if args.output is not None:
+        args.output.write_text(json.dumps(report, indent=2))
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text())
+        print(compare(report, baseline), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""
+Load driver producing synthetic records at a target rate.
+
+Records of a `TruCustomApp` arrive open-loop (Poisson arrivals, so a slow
+evaluator does not slow down the arrivals) and are evaluated by feedback
+functions of the `Dummy` provider whose `DummyEndpoint` simulates a provider
+under load: heavy-tailed latency, errors, throttling and rpm/tpm limits. Use it
+to size evaluator workers, thread counts and database settings locally.
+
+Usage (from the `trulens_eval` folder):
+
+```bash
+python -m tests.perf.load --rate 20 --duration 60 --mode deferred \\
+    --latency lognormal --delay 0.5 --simulated-rpm 600
+```
+
+The summary is printed as JSON.
+"""
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+import json
+from pathlib import Path
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
+
+from trulens_eval import Feedback
+from trulens_eval import Tru
+from trulens_eval import TruCustomApp
+from trulens_eval.feedback.provider.endpoint.base import DummyEndpoint
+from trulens_eval.feedback.provider.endpoint.base import LATENCY_DISTRIBUTIONS
+from trulens_eval.feedback.provider.hugs import Dummy
+from trulens_eval.schema.feedback import FeedbackMode
+from trulens_eval.schema.feedback import FeedbackResultStatus
+from trulens_eval.tru_custom_app import instrument
+
+
+class LoadApp:
+    """Small instrumented app standing in for a RAG pipeline."""
+
+    def __init__(self, app_time: float = 0.0):
+        self.app_time = app_time
+
+    @instrument
+    def retrieve(self, query: str) -> List[str]:
+        return [f"context {i} for {query}" for i in range(3)]
+
+    @instrument
+    def respond_to_query(self, query: str) -> str:
+        contexts = self.retrieve(query)
+        if self.app_time > 0.0:
+            time.sleep(self.app_time)
+        return f"answer to {query} using {len(contexts)} contexts"
+
+
+def _percentiles(values: Sequence[float]) -> Dict[str, Optional[float]]:
+    if len(values) == 0:
+        return dict(p50=None, p95=None, p99=None, max=None)
+
+    if len(values) == 1:
+        return dict(p50=values[0], p95=values[0], p99=values[0], max=values[0])
+
+    cuts = statistics.quantiles(values, n=100, method="inclusive")
+
+    return dict(p50=cuts[49], p95=cuts[94], p99=cuts[98], max=max(values))
+
+
+def run_load(
+    rate: float,
+    duration: float,
+    mode: FeedbackMode = FeedbackMode.DEFERRED,
+    database_url: Optional[str] = None,
+    app_threads: int = 32,
+    app_time: float = 0.0,
+    drain_timeout: float = 600.0,
+    seed: Optional[int] = None,
+    **simulator
+) -> dict:
+    """Drive records at `rate` per second for `duration` seconds and wait for
+    their feedback results.
+
+    Args:
+        rate: Target records per second.
+
+        duration: Seconds to produce records for.
+
+        mode: How feedback functions are run.
+
+        database_url: Database to record into. A temporary sqlite database
+            by default.
+
+        app_threads: Threads running app calls concurrently.
+
+        app_time: Seconds each app call takes by itself.
+
+        drain_timeout: Seconds to wait for feedback results after the last
+            record.
+
+        seed: Seed of the arrival times.
+
+        **simulator: Parameters of the
+            [Dummy][trulens_eval.feedback.provider.hugs.Dummy] provider.
+
+    Returns:
+        Summary of achieved rates, latencies, failures and simulated usage.
+    """
+
+    rng = random.Random(seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tru = Tru(
+            database_url=database_url or
+            f"sqlite:///{Path(tmp) / 'load.sqlite'}"
+        )
+        tru.reset_database()
+
+        # The simulator is a singleton so remove one made with other params.
+        for endpoint in DummyEndpoint.existing_instances():
+            endpoint.delete_singleton()
+
+        provider = Dummy(**simulator)
+        feedbacks = [
+            Feedback(provider.positive_sentiment,
+                     name="load_sentiment").on_output(),
+            Feedback(provider.language_match,
+                     name="load_language").on_input_output(),
+        ]
+
+        app = LoadApp(app_time=app_time)
+        recorder = TruCustomApp(
+            app,
+            app_id="load",
+            tru=tru,
+            feedbacks=feedbacks,
+            feedback_mode=mode
+        )
+
+        latencies: List[float] = []
+        errors: List[str] = []
+        lock = threading.Lock()
+
+        def call(i: int) -> None:
+            start = time.perf_counter()
+            try:
+                with recorder:
+                    app.respond_to_query(f"what is the capital of country {i}")
+            except Exception as e:
+                with lock:
+                    errors.append(repr(e))
+                return
+
+            with lock:
+                latencies.append(time.perf_counter() - start)
+
+        if mode == FeedbackMode.DEFERRED:
+            tru.start_evaluator(disable_tqdm=True)
+
+        # Open-loop arrivals: schedule is fixed ahead of the responses.
+        arrivals = []
+        t = rng.expovariate(rate)
+        while t < duration:
+            arrivals.append(t)
+            t += rng.expovariate(rate)
+
+        start = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=app_threads) as pool:
+                futures = []
+                for i, arrival in enumerate(arrivals):
+                    ahead = arrival - (time.perf_counter() - start)
+                    if ahead > 0:
+                        time.sleep(ahead)
+                    futures.append(pool.submit(call, i))
+                wait(futures)
+
+            produced = time.perf_counter() - start
+
+            expected = len(latencies) * len(feedbacks)
+            counts: Dict[FeedbackResultStatus, int] = {}
+            finished = 0
+            while time.perf_counter() - start - produced < drain_timeout:
+                counts = tru.db.get_feedback_count_by_status()
+                finished = counts.get(FeedbackResultStatus.DONE, 0) + \
+                    counts.get(FeedbackResultStatus.FAILED, 0)
+                if finished >= expected:
+                    break
+                time.sleep(0.1)
+
+            drained = time.perf_counter() - start
+
+        finally:
+            if mode == FeedbackMode.DEFERRED:
+                tru.stop_evaluator()
+
+        usage = provider.endpoint.usage()
+
+        return dict(
+            target_rate=rate,
+            achieved_rate=len(arrivals) / produced,
+            records=len(latencies),
+            record_errors=len(errors),
+            record_latency=_percentiles(latencies),
+            feedbacks_expected=expected,
+            feedbacks_done=counts.get(FeedbackResultStatus.DONE, 0),
+            feedbacks_failed=counts.get(FeedbackResultStatus.FAILED, 0),
+            feedback_rate=finished / drained,
+            drain_seconds=drained - produced,
+            simulated_usage=usage.model_dump()
+        )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument(
+        "--rate", type=float, default=10.0, help="Records per second."
+    )
+    parser.add_argument(
+        "--duration", type=float, default=30.0, help="Seconds of load."
+    )
+    parser.add_argument(
+        "--mode",
+        choices=[m.value for m in FeedbackMode if m != FeedbackMode.NONE],
+        default=FeedbackMode.DEFERRED.value,
+        help="How feedback functions are run."
+    )
+    parser.add_argument(
+        "--database-url",
+        help="Database to use. A temporary sqlite by default."
+    )
+    parser.add_argument("--app-threads", type=int, default=32)
+    parser.add_argument("--app-time", type=float, default=0.0)
+    parser.add_argument("--drain-timeout", type=float, default=600.0)
+    parser.add_argument("--seed", type=int)
+
+    simulator = parser.add_argument_group("simulated provider")
+    simulator.add_argument("--rpm", type=float, default=6000)
+    simulator.add_argument("--delay", type=float, default=0.2)
+    simulator.add_argument(
+        "--latency", choices=LATENCY_DISTRIBUTIONS, default="normal"
+    )
+    simulator.add_argument("--latency-shape", type=float, default=0.5)
+    simulator.add_argument("--error-prob", type=float, default=0.0)
+    simulator.add_argument("--freeze-prob", type=float, default=0.0)
+    simulator.add_argument("--overloaded-prob", type=float, default=0.0)
+    simulator.add_argument("--loading-prob", type=float, default=0.0)
+    simulator.add_argument("--throttle-prob", type=float, default=0.0)
+    simulator.add_argument("--simulated-rpm", type=float)
+    simulator.add_argument("--simulated-tpm", type=float)
+    simulator.add_argument("--completion-tokens", type=int, default=1)
+    simulator.add_argument("--cost-per-1k-tokens", type=float, default=0.0)
+    simulator.add_argument("--alloc", type=int, default=0)
+
+    args = vars(parser.parse_args(argv))
+
+    summary = run_load(
+        rate=args.pop('rate'),
+        duration=args.pop('duration'),
+        mode=FeedbackMode(args.pop('mode')),
+        database_url=args.pop('database_url'),
+        app_threads=args.pop('app_threads'),
+        app_time=args.pop('app_time'),
+        drain_timeout=args.pop('drain_timeout'),
+        seed=args.pop('seed'),
+        **args
+    )
+
+    print(json.dumps(summary, indent=2), file=sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,8 +3,12 @@ Static tests, i.e. ones that don't run anything substantial. This should find
 issues that occur from merely importing trulens.
 """
 
+import os
 from pathlib import Path
 import pkgutil
+import subprocess
+import sys
+import tempfile
 from unittest import main
 from unittest import TestCase
 
@@ -15,6 +19,8 @@ from tests.unit.test import requiredonly_test
 import trulens_eval
 from trulens_eval.instruments import class_filter_matches
 from trulens_eval.instruments import Instrument
+from trulens_eval.utils.imports import _check_imports_marker
+from trulens_eval.utils.imports import check_imports
 from trulens_eval.utils.imports import Dummy
 
 # Importing any of these should throw ImportError (or its sublcass
@@ -41,7 +47,8 @@ optional_mods = dict(
         "trulens_eval.feedback.provider.openai",
         "trulens_eval.feedback.provider.endpoint.openai"
     ],
-    nemoguardrails=["trulens_eval.tru_rails"]
+    nemoguardrails=["trulens_eval.tru_rails"],
+    transformers=["trulens_eval.feedback.provider.endpoint.hugs_local"]
 )
 
 optional_mods_flat = [mod for mods in optional_mods.values() for mod in mods]
@@ -81,6 +88,13 @@ not_mods = [
     "trulens_eval.database.migrations.env"  # can only be executed by alembic
 ]
 
+# Importing trulens_eval alone should not import any of these. They are imported
+# once the names that need them are first accessed.
+lazy_mods = [
+    "trulens_eval.app", "trulens_eval.tru", "trulens_eval.feedback.feedback",
+    "langchain", "pandas", "sqlalchemy", "streamlit", "IPython", "pip"
+]
+
 # Importing any of these should be ok regardless of optional packages. These are
 # all modules not mentioned in optional modules above.
 base_mods = [
@@ -103,6 +117,52 @@ class TestStatic(TestCase):
             with self.subTest(mod=mod):
                 __import__(mod)
 
+    def test_import_lazy(self):
+        """Check that importing trulens_eval does not import its components
+        and their dependencies until they are accessed."""
+
+        modules = subprocess.run(
+            [
+                sys.executable, "-c",
+                "import sys, trulens_eval; print(' '.join(sys.modules))"
+            ],
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout.split()
+
+        for mod in lazy_mods:
+            with self.subTest(mod=mod):
+                self.assertNotIn(mod, modules)
+
+        for name in trulens_eval.__all__:
+            with self.subTest(name=name):
+                self.assertIsNotNone(getattr(trulens_eval, name))
+
+        with self.assertRaises(AttributeError):
+            trulens_eval.NotAName
+
+    def test_check_imports_cache(self):
+        """Check that passing import checks are recorded."""
+
+        cache_home = os.environ.get("XDG_CACHE_HOME")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            os.environ["XDG_CACHE_HOME"] = tmp
+
+            try:
+                path, expected = _check_imports_marker()
+                self.assertFalse(path.exists())
+
+                check_imports()
+                self.assertEqual(path.read_text(), expected)
+
+            finally:
+                if cache_home is None:
+                    del os.environ["XDG_CACHE_HOME"]
+                else:
+                    os.environ["XDG_CACHE_HOME"] = cache_home
+
     def _test_instrumentation(self, i: Instrument):
         """Check that the instrumentation specification is good in these ways:
         
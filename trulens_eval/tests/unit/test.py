@@ -2,13 +2,14 @@ from dataclasses import fields
 from dataclasses import is_dataclass
 from datetime import datetime
 import os
-from typing import Dict, Sequence
+from typing import Any, Dict, Optional, Sequence, Type
 import unittest
 from unittest import TestCase
 
 import pydantic
 from pydantic import BaseModel
 
+from trulens_eval.tru_custom_app import TruCustomApp
 from trulens_eval.utils.serial import JSON_BASES
 from trulens_eval.utils.serial import Lens
 
@@ -49,6 +50,29 @@ def module_installed(module: str) -> bool:
         return False
 
 
+class RecorderTestCase(TestCase):
+    """Tests recording a toy app, `app`, which subclasses set up."""
+
+    app: Any
+    """The app to record."""
+
+    app_id: str = "test_app"
+    """Id of the recorders of `app`."""
+
+    def make_recorder(
+        self,
+        recorder_class: Optional[Type[TruCustomApp]] = None,
+        **kwargs
+    ) -> TruCustomApp:
+        """Make a recorder of `app` with the given options. Feedback functions
+        are not run unless a feedback mode is given."""
+
+        kwargs.setdefault('app_id', self.app_id)
+        kwargs.setdefault('feedback_mode', "none")
+
+        return (recorder_class or TruCustomApp)(self.app, **kwargs)
+
+
 class JSONTestCase(TestCase):
 
     def assertJSONEqual(
@@ -0,0 +1,166 @@
+"""
+Tests for deferred serialization of recorded calls.
+"""
+
+from typing import Dict, List
+from unittest import main
+
+from tests.unit.test import RecorderTestCase
+
+from trulens_eval import TruCustomApp
+from trulens_eval.instruments import CaptureMode
+from trulens_eval.tru_custom_app import instrument
+
+
+class MutatingApp:
+
+    @instrument
+    def retrieve(self, query: str) -> List[str]:
+        return [query, query + "?"]
+
+    @instrument
+    def respond_to_query(self, query: str) -> Dict[str, List[str]]:
+        contexts = self.retrieve(query)
+
+        # Changed after retrieve has returned them.
+        contexts.append("late")
+
+        return dict(answer=[query + "!"])
+
+    @instrument
+    def fail(self, query: str) -> str:
+        raise ValueError("failed")
+
+
+class FailingRecorder(TruCustomApp):
+    """Recorder failing to add its records."""
+
+    def _handle_record_feedback(self, record):
+        raise RuntimeError("cannot add")
+
+
+class TestDeferredSerialization(RecorderTestCase):
+
+    app_id = "deferred_app"
+
+    def setUp(self):
+        self.app = MutatingApp()
+
+    def record(self, recorder: TruCustomApp, query: str = "a"):
+        with recorder as recording:
+            self.app.respond_to_query(query)
+
+        return recording.get()
+
+    def test_same_as_sync(self):
+        """Deferred records have the same content as records made during the
+        call."""
+
+        sync = self.record(self.make_recorder())
+        deferred = self.record(
+            self.make_recorder(
+                defer_serialization=True, capture_mode=CaptureMode.DEEP
+            )
+        )
+
+        self.assertEqual(deferred.main_input, sync.main_input)
+        self.assertEqual(deferred.main_output, sync.main_output)
+        self.assertEqual(len(deferred.calls), len(sync.calls))
+        for dcall, scall in zip(deferred.calls, sync.calls):
+            self.assertEqual(dcall.args, scall.args)
+            self.assertEqual(dcall.rets, scall.rets)
+            self.assertEqual(dcall.stack, scall.stack)
+
+    def test_capture_modes(self):
+        """Copying captures protect recorded values from later changes."""
+
+        for mode, expected in [
+            (CaptureMode.REFERENCE, ["a", "a?", "late"]),
+            (CaptureMode.SHALLOW, ["a", "a?"]),
+            (CaptureMode.DEEP, ["a", "a?"]),
+        ]:
+            with self.subTest(mode=mode):
+                record = self.record(
+                    self.make_recorder(
+                        defer_serialization=True, capture_mode=mode
+                    )
+                )
+
+                self.assertEqual(record.calls[0].rets, expected)
+
+    def test_error(self):
+        """Errors are raised during the call and recorded in the background."""
+
+        recorder = self.make_recorder(defer_serialization=True)
+
+        with self.assertRaises(ValueError):
+            with recorder as recording:
+                self.app.fail("a")
+
+        self.assertEqual(recording.get().calls[0].error, "failed")
+
+    def test_many_records(self):
+        """Records of one context are kept in the order of their calls."""
+
+        recorder = self.make_recorder(defer_serialization=True)
+
+        queries = [str(i) for i in range(20)]
+        with recorder as recording:
+            for query in queries:
+                self.app.respond_to_query(query)
+
+        self.assertEqual([r.main_input for r in recording.records], queries)
+
+    def test_background_error(self):
+        """Failures to add records in the background are logged."""
+
+        recorder = self.make_recorder(FailingRecorder, defer_serialization=True)
+
+        with self.assertLogs("trulens_eval.app", level="ERROR") as logs:
+            with recorder as recording:
+                self.app.respond_to_query("a")
+
+            # Done callbacks have run once the worker is idle.
+            recorder.wait_for_feedback_results()
+
+        self.assertIn("cannot add", "\n".join(logs.output))
+
+        with self.assertRaises(RuntimeError):
+            recording.wait_for_records()
+
+    def test_close(self):
+        """Closing waits for the worker, records synchronously afterwards."""
+
+        recorder = self.make_recorder(defer_serialization=True)
+        executor = recorder.serialization_executor
+
+        with recorder as recording:
+            self.app.respond_to_query("a")
+            recorder.close()
+            self.app.respond_to_query("b")
+
+        self.assertIsNone(recorder.serialization_executor)
+        self.assertEqual([r.main_input for r in recording.records], ["a", "b"])
+
+        with self.assertRaises(RuntimeError):
+            executor.submit(lambda: None)
+
+    def test_close_concurrent(self):
+        """Records synchronously if the worker is shut down by a concurrent
+        close after it was read."""
+
+        recorder = self.make_recorder(defer_serialization=True)
+
+        # As if closed right after the recorder read its worker.
+        recorder.serialization_executor.shutdown(wait=True)
+
+        with recorder as recording:
+            self.app.respond_to_query("a")
+
+        recorder.wait_for_feedback_results()
+
+        self.assertEqual([r.main_input for r in recording.records], ["a"])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""
+Tests for embedding distance utilities that do not need a real embedding model.
+"""
+
+import os
+import tempfile
+from typing import List
+from unittest import main
+from unittest import TestCase
+
+import numpy as np
+
+from trulens_eval.feedback.embeddings import distances
+from trulens_eval.feedback.embeddings import EmbeddingCache
+from trulens_eval.feedback.embeddings import Embeddings
+
+
+class TestDistances(TestCase):
+
+    def setUp(self):
+        self.query = np.array([1.0, 0.0])
+        self.documents = np.array([[1.0, 0.0], [0.0, 2.0], [-3.0, 0.0]])
+
+    def test_cosine(self):
+        np.testing.assert_allclose(
+            distances(self.query, self.documents, "cosine"), [0.0, 1.0, 2.0]
+        )
+
+    def test_manhattan(self):
+        np.testing.assert_allclose(
+            distances(self.query, self.documents, "manhattan"), [0.0, 3.0, 4.0]
+        )
+
+    def test_euclidean(self):
+        np.testing.assert_allclose(
+            distances(self.query, self.documents, "euclidean"),
+            [0.0, np.sqrt(5.0), 4.0]
+        )
+
+    def test_unknown(self):
+        with self.assertRaises(ValueError):
+            distances(self.query, self.documents, "chebyshev")
+
+
+class TestEmbeddingCache(TestCase):
+
+    def test_lru(self):
+        """Least recently used vectors are evicted first."""
+
+        cache = EmbeddingCache(max_size=2)
+
+        cache.put("a", np.array([1.0]))
+        cache.put("b", np.array([2.0]))
+        cache.get("a")
+        cache.put("c", np.array([3.0]))
+
+        self.assertIsNone(cache.get("b"))
+        np.testing.assert_array_equal(cache.get("a"), [1.0])
+        np.testing.assert_array_equal(cache.get("c"), [3.0])
+
+    def test_persistent(self):
+        """Vectors are shared with other caches on the same file."""
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "embeddings.sqlite")
+
+            key = EmbeddingCache.key("model", "text", "hello")
+            EmbeddingCache(path=path).put(key, np.array([0.5, 0.25]))
+
+            np.testing.assert_array_equal(
+                EmbeddingCache(path=path).get(key), [0.5, 0.25]
+            )
+            self.assertNotEqual(
+                key, EmbeddingCache.key("model", "query", "hello")
+            )
+
+
+class FakeEmbedModel:
+    """Embeds texts by their length, counting calls."""
+
+    model_name = "fake"
+
+    def __init__(self):
+        self.calls = 0
+
+    def get_query_embedding(self, query: str) -> List[float]:
+        self.calls += 1
+        return [float(len(query)), 1.0]
+
+    def get_text_embedding_batch(self, texts: List[str]) -> List[List[float]]:
+        self.calls += 1
+        return [[float(len(text)), 1.0] for text in texts]
+
+
+class TestEmbeddings(TestCase):
+
+    def setUp(self):
+        # Constructed without llama_index which wraps the model otherwise.
+        self.embed_model = FakeEmbedModel()
+        self.embeddings = Embeddings.model_construct()
+        self.embeddings._embed_model = self.embed_model
+        self.embeddings._cache = EmbeddingCache()
+
+    def test_many(self):
+        mean, info = self.embeddings.manhattan_distance_many(
+            "ab", ["a", "abc", "abc"]
+        )
+
+        self.assertEqual(info['distances'], [1.0, 1.0, 1.0])
+        self.assertEqual(mean, 1.0)
+        # One query and one batch of the unique texts.
+        self.assertEqual(self.embed_model.calls, 2)
+
+    def test_no_documents(self):
+        """Distances to no documents are empty without calling the model."""
+
+        self.assertEqual(self.embeddings.text_embeddings([]).shape, (0, 0))
+
+        for method in [self.embeddings.cosine_distance_many,
+                       self.embeddings.manhattan_distance_many,
+                       self.embeddings.euclidean_distance_many]:
+            with self.subTest(method=method.__name__):
+                mean, info = method("query", [])
+
+                self.assertTrue(np.isnan(mean))
+                self.assertEqual(info['distances'], [])
+
+        self.assertEqual(self.embed_model.calls, 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,419 @@
+"""
+Tests for Endpoint request handling that do not make network requests.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import time
+from typing import Any, List
+from unittest import main
+from unittest import TestCase
+
+from pydantic import PrivateAttr
+
+from trulens_eval.feedback.provider.endpoint.base import DummyEndpoint
+from trulens_eval.feedback.provider.endpoint.base import Endpoint
+from trulens_eval.feedback.provider.endpoint.base import EndpointCallback
+from trulens_eval.feedback.provider.endpoint.base import SimulatedResponse
+from trulens_eval.feedback.provider.endpoint.base import ThrottledError
+from trulens_eval.utils.batching import MicroBatcher
+from trulens_eval.utils.pace import TokenBucketPace
+from trulens_eval.utils.serial import JSON
+
+
+class ScriptedEndpoint(Endpoint):
+    """Endpoint whose responses are given ahead of time."""
+
+    _responses: List[SimulatedResponse] = PrivateAttr(default_factory=list)
+
+    def __init__(self, *args, **kwargs):
+        kwargs['callback_class'] = EndpointCallback
+        super().__init__(*args, **kwargs)
+
+    _payloads: List[JSON] = PrivateAttr(default_factory=list)
+
+    def script(self, responses: List[SimulatedResponse]) -> None:
+        self._responses = list(responses)
+
+    def _send(self, url: str, payload: JSON, timeout: float) -> Any:
+        self._payloads.append(payload)
+        return self._responses.pop(0)
+
+    async def _asend(self, url: str, payload: JSON, timeout: float) -> Any:
+        return self._send(url=url, payload=payload, timeout=timeout)
+
+
+class EchoEndpoint(ScriptedEndpoint):
+    """Endpoint responding to each input with a label of the input after a
+    delay."""
+
+    delay: float = 0.0
+
+    def _send(self, url: str, payload: JSON, timeout: float) -> Any:
+        self._payloads.append(payload)
+        time.sleep(self.delay)
+
+        inputs = payload['inputs']
+        if isinstance(inputs, str):
+            return SimulatedResponse(
+                status_code=200, body=[[{
+                    'label': inputs,
+                    'score': 0.5
+                }]]
+            )
+
+        return SimulatedResponse(
+            status_code=200,
+            body=[[{
+                'label': i,
+                'score': 0.5
+            }] for i in inputs]
+        )
+
+
+def scripted_responses() -> List[SimulatedResponse]:
+    return [
+        # Endpoint waits 2 seconds longer than estimated_time.
+        SimulatedResponse(status_code=503, body={'estimated_time': -1.8}),
+        SimulatedResponse(
+            status_code=429,
+            body={'error': "rate limited"},
+            headers={'Retry-After': "0.3"}
+        ),
+        SimulatedResponse(
+            status_code=200, body=[[{
+                'label': 'LABEL_1',
+                'score': 0.5
+            }]]
+        ),
+    ]
+
+
+class TestEndpointPost(TestCase):
+
+    def setUp(self):
+        self.endpoint = ScriptedEndpoint(name="scripted", rpm=60000)
+
+    def tearDown(self):
+        self.endpoint.delete_singleton()
+
+    def test_requeue(self):
+        """Loading and throttled responses are requeued until success."""
+
+        self.endpoint.script(scripted_responses())
+
+        start = time.monotonic()
+        res = self.endpoint.post(url="http://localhost", payload={})
+        elapsed = time.monotonic() - start
+
+        self.assertEqual(res, [{'label': 'LABEL_1', 'score': 0.5}])
+        self.assertGreater(elapsed, 0.2)  # waited for the retry hint
+        self.assertEqual(self.endpoint.metrics()['n_throttles'], 1)
+        self.assertEqual(self.endpoint.metrics()['n_successes'], 1)
+
+    def test_requeue_async(self):
+        """Async posts requeue the same way."""
+
+        self.endpoint.script(scripted_responses())
+
+        res = asyncio.run(
+            self.endpoint.apost(url="http://localhost", payload={})
+        )
+
+        self.assertEqual(res, [{'label': 'LABEL_1', 'score': 0.5}])
+
+    def test_given_pace(self):
+        """A given pace is kept to and determines the limits."""
+
+        self.endpoint.delete_singleton()
+
+        pace = TokenBucketPace(rpm=120, tpm=1000)
+        endpoint = ScriptedEndpoint(name="scripted", pace=pace)
+
+        self.assertIs(endpoint.pace, pace)
+        self.assertIs(endpoint.adaptive.pace, pace)
+        self.assertEqual((endpoint.rpm, endpoint.tpm), (120, 1000))
+
+    def test_error(self):
+        """Non-throttling errors are raised."""
+
+        self.endpoint.script(
+            [SimulatedResponse(status_code=400, body={'error': "bad input"})]
+        )
+
+        with self.assertRaises(RuntimeError) as context:
+            self.endpoint.post(url="http://localhost", payload={})
+
+        self.assertNotIsInstance(context.exception, ThrottledError)
+
+    def test_classify_error(self):
+        """Throttling errors are recognized along with their retry hints."""
+
+        class RateLimitError(Exception):
+            status_code = 429
+            headers = {'retry-after': "7"}
+
+        self.assertEqual(
+            self.endpoint.classify_error(RateLimitError("slow down")),
+            (True, 7.0)
+        )
+        self.assertEqual(
+            self.endpoint.classify_error(ValueError("bad value")),
+            (False, None)
+        )
+
+
+class TestAsyncClients(TestCase):
+
+    def setUp(self):
+        self.endpoint = ScriptedEndpoint(name="scripted_clients")
+
+    def tearDown(self):
+        self.endpoint.delete_singleton()
+
+    async def client(self):
+        return self.endpoint._async_client()
+
+    def test_close(self):
+        """Clients of loops that are not running, running in another thread,
+        or running in this thread are closed by close.
+
+        Clients of loops that are not running are closed once they run again if
+        closing within another running loop."""
+
+        loop = asyncio.new_event_loop()
+        idle_client = loop.run_until_complete(self.client())
+        self.assertIs(loop.run_until_complete(self.client()), idle_client)
+
+        async def close_running():
+            client = self.endpoint._async_client()
+            self.endpoint.close()
+            await asyncio.sleep(0.1)
+            return client
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            running_client = executor.submit(asyncio.run,
+                                             close_running()).result()
+
+        self.assertTrue(running_client.is_closed)
+        self.assertFalse(idle_client.is_closed)
+
+        loop.run_until_complete(asyncio.sleep(0.1))
+        self.assertTrue(idle_client.is_closed)
+
+        loop.close()
+
+    def test_aclose(self):
+
+        async def get_and_close():
+            client = self.endpoint._async_client()
+            await self.endpoint.aclose()
+            self.assertTrue(client.is_closed)
+
+            # Reopened on next use.
+            self.assertIsNot(self.endpoint._async_client(), client)
+
+        asyncio.run(get_and_close())
+
+
+class TestBatching(TestCase):
+
+    def test_micro_batcher(self):
+        """Concurrent submissions are combined into batches."""
+
+        batches = []
+
+        def double(items):
+            batches.append(list(items))
+            time.sleep(0.01)
+            return [i * 2 for i in items]
+
+        batcher = MicroBatcher(double, max_size=4, max_wait=0.2)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(batcher.submit, range(8)))
+
+        self.assertEqual(results, [i * 2 for i in range(8)])
+        self.assertLess(len(batches), 8)
+        self.assertTrue(all(len(b) <= 4 for b in batches))
+
+    def test_micro_batcher_error(self):
+        """Errors in a batch are raised to each of its callers."""
+
+        def fail(items):
+            raise ValueError("bad batch")
+
+        batcher = MicroBatcher(fail, max_size=2, max_wait=0.0)
+
+        with self.assertRaises(ValueError):
+            batcher.submit(1)
+
+    def test_post_batch(self):
+        """Batched posts send a list of inputs and split the results."""
+
+        endpoint = ScriptedEndpoint(
+            name="batched", rpm=60000, batch_max_size=2, batch_max_wait=1.0
+        )
+
+        try:
+            endpoint.script(
+                [
+                    SimulatedResponse(
+                        status_code=200,
+                        body=[
+                            [{
+                                'label': 'a',
+                                'score': 0.1
+                            }], [{
+                                'label': 'b',
+                                'score': 0.2
+                            }]
+                        ]
+                    )
+                ]
+            )
+
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                results = list(
+                    pool.map(
+                        lambda text: endpoint.post(
+                            url="http://localhost",
+                            payload={"inputs": text},
+                            batch=True
+                        ), ["a", "b"]
+                    )
+                )
+
+            self.assertEqual([r[0]['label'] for r in results], ["a", "b"])
+            self.assertEqual(endpoint._payloads, [{"inputs": ["a", "b"]}])
+
+        finally:
+            endpoint.delete_singleton()
+
+    def test_post_batch_many(self):
+        """Many inputs are split into requests of at most batch_max_size which
+        are sent concurrently."""
+
+        endpoint = EchoEndpoint(
+            name="batchedmany", rpm=60000, batch_max_size=2, delay=0.2
+        )
+
+        try:
+            start = time.monotonic()
+            results = endpoint.post_batch(
+                url="http://localhost", inputs=["a", "b", "c", "d", "e"]
+            )
+            elapsed = time.monotonic() - start
+
+            self.assertEqual(
+                [r[0]['label'] for r in results], ["a", "b", "c", "d", "e"]
+            )
+            self.assertCountEqual(
+                [payload['inputs'] for payload in endpoint._payloads],
+                [["a", "b"], ["c", "d"], "e"]
+            )
+            self.assertLess(elapsed, 0.5)
+
+        finally:
+            endpoint.delete_singleton()
+
+
+class TestDummyEndpoint(TestCase):
+
+    def setUp(self):
+        # All dummy endpoints share a singleton name so remove any created by
+        # other tests to get one with the parameters below.
+        for endpoint in DummyEndpoint.existing_instances():
+            endpoint.delete_singleton()
+
+        self.endpoint = DummyEndpoint(
+            error_prob=0.0,
+            freeze_prob=0.0,
+            overloaded_prob=0.0,
+            loading_prob=0.0,
+            alloc=0,
+            rpm=60000,
+            simulated_rpm=2,
+            completion_tokens=3,
+            cost_per_1k_tokens=1.0
+        )
+
+    def tearDown(self):
+        self.endpoint.delete_singleton()
+
+    def test_rate_limit(self):
+        """Requests past the simulated rpm are throttled with a retry-after
+        header."""
+
+        for _ in range(2):
+            response = self.endpoint._send(
+                url="http://localhost", payload={"inputs": "abcd"}, timeout=1.0
+            )
+            self.assertEqual(response.status_code, 200)
+
+        response = self.endpoint._send(
+            url="http://localhost", payload={"inputs": "abcd"}, timeout=1.0
+        )
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(float(response.headers['retry-after']), 59.0)
+
+    def test_usage(self):
+        """Simulated usage is tallied by cost tracking."""
+
+        def send():
+            return self.endpoint._send(
+                url="http://localhost",
+                payload={"inputs": ["abcd", "abcdefgh"]},
+                timeout=1.0
+            )
+
+        response, cost = Endpoint.track_all_costs_tally(
+            send,
+            with_openai=False,
+            with_hugs=False,
+            with_litellm=False,
+            with_bedrock=False
+        )
+
+        self.assertEqual(len(response.body), 2)
+        self.assertEqual(cost.n_successful_requests, 1)
+        self.assertEqual(cost.n_prompt_tokens, 3)
+        self.assertEqual(cost.n_completion_tokens, 3)
+        self.assertAlmostEqual(cost.cost, 6 / 1000.0)
+        self.assertEqual(self.endpoint.usage().n_tokens, 6)
+
+    def test_batch_usage(self):
+        """Usage of a batch is split among its callers."""
+
+        self.endpoint.batch_max_size = 2
+        self.endpoint.batch_max_wait = 1.0
+
+        def call(text):
+            return self.endpoint.track_cost(
+                self.endpoint.post,
+                url="http://localhost",
+                payload={"inputs": text},
+                batch=True
+            )
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            results = list(pool.map(call, ["abcd", "abcdefgh"]))
+
+        costs = [callback.cost for _, callback in results]
+
+        self.assertEqual(sorted(c.n_requests for c in costs), [0, 1])
+        self.assertAlmostEqual(costs[0].cost, costs[1].cost)
+        self.assertAlmostEqual(sum(c.cost for c in costs), 6 / 1000.0)
+        self.assertEqual(sum(c.n_tokens for c in costs), 6)
+
+    def test_batch_timeout(self):
+        """Requests with different timeouts are not batched together."""
+
+        self.assertIsNot(
+            self.endpoint._batcher("http://localhost", 1.0),
+            self.endpoint._batcher("http://localhost", 2.0)
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -3,10 +3,17 @@ Test suites meant for testing the reliability and robustness of the regex
 pattern matching of feedback scores from LLM responses.
 """
 
+from typing import Dict, List, Optional, Sequence
+
+from pydantic import PrivateAttr
 import pytest
 
+from trulens_eval.feedback.provider.base import LLMProvider
+from trulens_eval.feedback.provider.endpoint.base import Endpoint
+from trulens_eval.feedback.provider.endpoint.base import EndpointCallback
 from trulens_eval.utils.generated import ParseError
 from trulens_eval.utils.generated import re_0_10_rating
+from trulens_eval.utils.generated import re_enumerated_0_10_ratings
 
 test_data = [
     ("The relevance score is 7.", 7),
@@ -34,3 +41,83 @@ def test_re_0_10_rating(test_input, expected):
         result = None
 
     assert result == expected, f"Failed on {test_input}: expected {expected}, got {result}"
+
+
+enumerated_test_data = [
+    ("1: 8\n2: 3", 2, [8, 3]),
+    ("CONTEXT 1: 4\nCONTEXT 2: 9\nCONTEXT 3: 0", 3, [4, 9, 0]),
+    ("Item 1 - 7\nItem 2: Score 10/10", 2, [7, 10]),
+    ("Here are the scores:\n1. 5\n2) 6\n", 2, [5, 6]),
+    ("[2] 6\n[1] 5", 2, [5, 6]),
+    ("1: 8", 2, None),  # missing item
+    ("1: 8\n1: 2", 1, None),  # conflicting ratings
+    ("1: high\n2: low", 2, None),
+]
+
+
+@pytest.mark.parametrize("test_input,n,expected", enumerated_test_data)
+def test_re_enumerated_0_10_ratings(test_input, n, expected):
+    """Check that re_enumerated_0_10_ratings extracts the rating of each item
+    or fails."""
+
+    try:
+        result = re_enumerated_0_10_ratings(test_input, n)
+    except ParseError:
+        result = None
+
+    assert result == expected, f"Failed on {test_input}: expected {expected}, got {result}"
+
+
+class ScriptedProvider(LLMProvider):
+    """Provider whose completions are given ahead of time by the first text
+    found in the request messages, so requests can be made in any order."""
+
+    _responses: Dict[str, str] = PrivateAttr(default_factory=dict)
+    _requests: List[Sequence[Dict]] = PrivateAttr(default_factory=list)
+
+    def _create_chat_completion(
+        self,
+        prompt: Optional[str] = None,
+        messages: Optional[Sequence[Dict]] = None,
+        **kwargs
+    ) -> str:
+        self._requests.append(messages)
+
+        content = "\n".join(message['content'] for message in messages)
+        for text, response in self._responses.items():
+            if text in content:
+                return response
+
+        raise ValueError("No scripted response.")
+
+
+def test_context_relevance_batched():
+    """Several contexts are scored in one completion and unparsable responses
+    fall back to one completion per context."""
+
+    endpoint = Endpoint(name="scripted_llm", callback_class=EndpointCallback)
+
+    try:
+        provider = ScriptedProvider(
+            model_engine="scripted", endpoint=endpoint, judge_batch_max_items=2
+        )
+        provider._responses = {
+            # First batch.
+            "CONTEXT 1: alpha": "CONTEXT 1: 10\nCONTEXT 2: 5",
+            # Second batch, unparsable.
+            "CONTEXT 1: charlie": "I cannot do that.",
+            # Fallbacks for the contexts of the second batch.
+            "charlie": "2",
+            "delta": "4",
+        }
+
+        score, meta = provider.context_relevance_batched(
+            question="What?", contexts=["alpha", "bravo", "charlie", "delta"]
+        )
+
+        assert meta['scores'] == [1.0, 0.5, 0.2, 0.4]
+        assert score == sum(meta['scores']) / 4
+        assert len(provider._requests) == 4
+
+    finally:
+        endpoint.delete_singleton()
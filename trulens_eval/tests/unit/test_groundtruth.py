@@ -0,0 +1,226 @@
+"""
+Tests for ground truth lookup that do not make requests.
+"""
+
+from unittest import main
+from unittest import TestCase
+
+import numpy as np
+
+from trulens_eval.feedback import groundtruth
+from trulens_eval.feedback.groundtruth import _NearestNeighbors
+from trulens_eval.feedback.groundtruth import GroundTruthAgreement
+from trulens_eval.feedback.provider.hugs import Dummy
+
+GOLDEN_SET = [
+    {
+        "query": "Who invented the lightbulb?",
+        "response": "Thomas Edison",
+        "expected_score": 0.9
+    },
+    {
+        "query": "who  invented the LIGHTBULB? ",
+        "response": "Someone else",
+        "expected_score": 0.1
+    },
+    {
+        "query": "¿Quién inventó la bombilla?",
+        "response": "Thomas Edison",
+        "expected_score": 0.8
+    },
+]
+
+
+class TestGroundTruthLookup(TestCase):
+
+    def setUp(self):
+        self.provider = Dummy()
+        self.gta = GroundTruthAgreement(GOLDEN_SET, provider=self.provider)
+
+    def tearDown(self):
+        self.provider.endpoint.delete_singleton()
+
+    def test_find_response(self):
+        """Queries match regardless of case and whitespace, first entry wins."""
+
+        self.assertEqual(
+            self.gta._find_response("who invented the lightbulb?"),
+            "Thomas Edison"
+        )
+        self.assertEqual(
+            self.gta._find_response("¿quién inventó la bombilla?"),
+            "Thomas Edison"
+        )
+        self.assertIsNone(self.gta._find_response("who invented the radio?"))
+
+    def test_find_score(self):
+        """Scores are looked up by query and response."""
+
+        self.assertEqual(
+            self.gta._find_score("Who invented the lightbulb?", "Someone else"),
+            0.1
+        )
+        self.assertIsNone(
+            self.gta._find_score("Who invented the lightbulb?", "Tesla")
+        )
+
+    def test_deserialized(self):
+        """Deserialized instances are indexed on first lookup."""
+
+        gta = GroundTruthAgreement.model_validate(self.gta.model_dump())
+
+        self.assertEqual(
+            gta._find_response("WHO INVENTED THE LIGHTBULB?"), "Thomas Edison"
+        )
+
+
+def overlap(response: str, reference: str) -> float:
+    """Fraction of the words of the reference that are in the response."""
+
+    words = set(response.split())
+    reference_words = reference.split()
+
+    return sum(word in words for word in reference_words) / len(reference_words)
+
+
+class FakeBERTScorer:
+    """Stand-in for `bert_score.BERTScorer` scoring by word overlap."""
+
+    instances = []
+
+    def __init__(self, lang: str, rescale_with_baseline: bool):
+        self.lang = lang
+        FakeBERTScorer.instances.append(self)
+
+    def score(self, cands, refs, batch_size):
+        precision = np.array(
+            [overlap(cand, ref) for cand, ref in zip(cands, refs)]
+        )
+        return precision, precision, precision
+
+
+class FakeMetric:
+    """Stand-in for an `evaluate` metric scoring by word overlap."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def compute(self, predictions, references, use_aggregator=True):
+        scores = [
+            overlap(prediction, reference)
+            for prediction, reference in zip(predictions, references)
+        ]
+
+        if self.name == "bleu":
+            # Corpus score.
+            return {"bleu": sum(scores) / len(scores)}
+
+        return {"rouge1": scores}
+
+
+class FakeEvaluate:
+    """Stand-in for the `evaluate` module."""
+
+    def __init__(self):
+        self.loaded = []
+
+    def load(self, name: str) -> FakeMetric:
+        self.loaded.append(name)
+        return FakeMetric(name)
+
+
+class TestGroundTruthBatch(TestCase):
+
+    def setUp(self):
+        self.bert_scorer_class = groundtruth.BERTScorer
+        self.evaluate = groundtruth.evaluate
+
+        FakeBERTScorer.instances.clear()
+        groundtruth.BERTScorer = FakeBERTScorer
+        groundtruth.evaluate = FakeEvaluate()
+
+        groundtruth._shared_bert_scorers.clear()
+        groundtruth._shared_metrics.clear()
+
+        self.provider = Dummy()
+        self.gta = GroundTruthAgreement(GOLDEN_SET, provider=self.provider)
+
+        self.prompts = [gt["query"] for gt in GOLDEN_SET[::2]]
+        self.responses = ["Thomas Edison", "Edison"]
+        self.references = [
+            self.gta._find_response(prompt) for prompt in self.prompts
+        ]
+
+    def tearDown(self):
+        groundtruth.BERTScorer = self.bert_scorer_class
+        groundtruth.evaluate = self.evaluate
+
+        groundtruth._shared_bert_scorers.clear()
+        groundtruth._shared_metrics.clear()
+
+        self.provider.endpoint.delete_singleton()
+
+    def test_batch_matches_single(self):
+        """Batches score each pair as the single pair methods do."""
+
+        for single, batch in [(self.gta.bert_score, self.gta.bert_score_batch),
+                              (self.gta.bleu, self.gta.bleu_batch),
+                              (self.gta.rouge, self.gta.rouge_batch)]:
+            with self.subTest(batch=batch.__name__):
+                scores = batch(self.responses, self.references)
+
+                self.assertEqual(scores, [1.0, 0.5])
+                self.assertEqual(
+                    scores, [
+                        single(prompt, response)[0] for prompt, response in
+                        zip(self.prompts, self.responses)
+                    ]
+                )
+
+    def test_batch_checks_pairs(self):
+        with self.assertRaises(ValueError):
+            self.gta.rouge_batch(self.responses, self.references[:1])
+
+        self.assertEqual(self.gta.bert_score_batch([], []), [])
+
+    def test_shared(self):
+        """Scorers and metrics are built once per key."""
+
+        self.gta.bert_score_batch(self.responses, self.references)
+        self.gta.bert_score_batch(self.responses, self.references)
+        self.assertIs(
+            groundtruth.shared_bert_scorer(), groundtruth.shared_bert_scorer()
+        )
+        self.assertIsNot(
+            groundtruth.shared_bert_scorer("de"),
+            groundtruth.shared_bert_scorer()
+        )
+        self.assertEqual(
+            [scorer.lang for scorer in FakeBERTScorer.instances], ["en", "de"]
+        )
+
+        self.gta.bleu_batch(self.responses, self.references)
+        self.gta.rouge_batch(self.responses, self.references)
+        self.gta.bleu_batch(self.responses, self.references)
+        self.gta.rouge_batch(self.responses, self.references)
+        self.assertEqual(groundtruth.evaluate.loaded, ["bleu", "rouge"])
+
+        metric, lock = groundtruth.shared_metric("bleu")
+        self.assertEqual(metric.name, "bleu")
+        self.assertIs(groundtruth.shared_metric("bleu")[1], lock)
+
+
+class TestNearestNeighbors(TestCase):
+
+    def test_nearest(self):
+        vectors = np.array([[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]])
+        neighbors = _NearestNeighbors(vectors)
+
+        i, distance = neighbors.nearest(np.array([0.1, 2.0]))
+
+        self.assertEqual(i, 1)
+        self.assertLess(distance, 0.01)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,186 @@
+"""
+Tests for the local Huggingface endpoint using stand-in pipelines instead of
+real models.
+"""
+
+from unittest import main
+from unittest import TestCase
+
+import numpy as np
+from tests.unit.test import optional_test
+
+
+class FakePipeline:
+    """Stand-in for a transformers pipeline. Scores are numpy scalars as
+    returned by real pipelines."""
+
+    def __init__(self, model_id: str):
+        self.model_id = model_id
+        self.calls = []
+
+    def __call__(self, inputs, **kwargs):
+        self.calls.append((inputs, kwargs))
+
+        if isinstance(inputs, list):
+            # Text classification.
+            return [
+                [
+                    {
+                        "label": "POSITIVE",
+                        "score": np.float32(0.75)
+                    }, {
+                        "label": "NEGATIVE",
+                        "score": np.float32(0.25)
+                    }
+                ] for _ in inputs
+            ]
+
+        # Token classification.
+        return [
+            {
+                "entity_group": "NAME",
+                "score": np.float32(0.5),
+                "word": inputs,
+                "start": np.int64(0),
+                "end": np.int64(len(inputs))
+            }
+        ]
+
+
+@optional_test
+class TestHuggingfaceLocalEndpoint(TestCase):
+
+    def setUp(self):
+        # Imported here as it requires transformers.
+        from trulens_eval.feedback.provider.endpoint import hugs_local
+
+        self.hugs_local = hugs_local
+
+        loaded = self.loaded = []
+
+        class FakeLocalEndpoint(hugs_local.HuggingfaceLocalEndpoint):
+
+            def _load(self, model_id: str) -> FakePipeline:
+                loaded.append(model_id)
+                return FakePipeline(model_id)
+
+        self.endpoint = FakeLocalEndpoint(warm_pool_size=2)
+
+    def tearDown(self):
+        self.endpoint.delete_singleton()
+
+    def send(self, model_id: str, inputs):
+        return self.endpoint._send(
+            url=self.hugs_local.HUGS_API_MODELS_PREFIX + model_id,
+            payload={"inputs": inputs},
+            timeout=1.0
+        )
+
+    def test_text_classification(self):
+        """Responses have the scores of all labels, nested in a list per input
+        as the inference api responds."""
+
+        expected = [
+            {
+                "label": "POSITIVE",
+                "score": 0.75
+            }, {
+                "label": "NEGATIVE",
+                "score": 0.25
+            }
+        ]
+
+        response = self.send("some/classifier", "hello")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), [expected])
+
+        response = self.send("some/classifier", ["hello", "there"])
+        self.assertEqual(response.json(), [expected, expected])
+
+        inputs, kwargs = self.endpoint._pipelines["some/classifier"].calls[1]
+        self.assertEqual(inputs, ["hello", "there"])
+        self.assertEqual(
+            kwargs, dict(top_k=None, truncation=True, batch_size=2)
+        )
+
+    def test_token_classification(self):
+        response = self.send("bigcode/starpii", "alice")
+
+        self.assertEqual(
+            response.json(), [
+                {
+                    "entity_group": "NAME",
+                    "score": 0.5,
+                    "word": "alice",
+                    "start": 0,
+                    "end": 5
+                }
+            ]
+        )
+        self.assertEqual(
+            self.endpoint._pipelines["bigcode/starpii"].calls, [("alice", {})]
+        )
+
+    def test_to_json(self):
+        """Numpy scalars in nested outputs become python numbers."""
+
+        json = self.hugs_local._to_json(
+            {
+                "a": (np.float64(0.5), [np.int32(1)]),
+                "b": "text"
+            }
+        )
+
+        self.assertEqual(json, {"a": [0.5, [1]], "b": "text"})
+        self.assertIs(type(json["a"][0]), float)
+        self.assertIs(type(json["a"][1][0]), int)
+
+    def test_warm_pool(self):
+        """The least recently used model is unloaded past the pool size."""
+
+        self.endpoint.warmup(["a", "b"])
+        self.send("a", "x")
+        self.send("c", "x")
+
+        self.assertEqual(list(self.endpoint._pipelines), ["a", "c"])
+        self.assertEqual(self.loaded, ["a", "b", "c"])
+
+        self.send("b", "x")
+
+        self.assertEqual(list(self.endpoint._pipelines), ["c", "b"])
+        self.assertEqual(self.loaded, ["a", "b", "c", "b"])
+
+    def test_singleton_per_config(self):
+        """Endpoints with other runtimes or numbers of threads are separate
+        instances."""
+
+        endpoint_class = type(self.endpoint)
+
+        self.assertIs(endpoint_class(warm_pool_size=2), self.endpoint)
+
+        names = [
+            endpoint_class._name_of(),
+            endpoint_class._name_of("onnx"),
+            endpoint_class._name_of(runtime="onnx", num_threads=4)
+        ]
+
+        self.assertEqual(names[0], self.endpoint.name)
+        self.assertEqual(len(set(names)), 3)
+
+    def test_num_threads(self):
+        """Threads are not set process-wide for the transformers runtime."""
+
+        endpoint_class = self.hugs_local.HuggingfaceLocalEndpoint
+
+        try:
+            with self.assertRaises(ValueError):
+                endpoint_class(runtime="transformers", num_threads=2)
+
+        finally:
+            endpoint_class.delete_singleton_by_name(
+                "huggingfacelocal", cls=endpoint_class
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Tests for discovery of the components of apps to instrument.
+"""
+
+from unittest import main
+from unittest import TestCase
+
+from trulens_eval.instruments import Instrument
+from trulens_eval.instruments import WithInstrumentCallbacks
+from trulens_eval.utils.json import jsonify
+from trulens_eval.utils.pyschema import NOSERIO
+from trulens_eval.utils.serial import Lens
+
+
+class Component:
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def respond(self, query: str) -> str:
+        return self.name + query
+
+
+class Store:
+    """A data container holding many components."""
+
+    def __init__(self, n: int):
+        self.items = [Component(str(i)) for i in range(n)]
+
+
+class DataApp:
+
+    def __init__(self):
+        self.component = Component("main")
+        self.store = Store(1000)
+
+
+class Callbacks(WithInstrumentCallbacks):
+
+    def on_method_instrumented(self, obj, func, path):
+        pass
+
+
+class TestInstrumentObject(TestCase):
+
+    def setUp(self):
+        self.instrument = Instrument(
+            include_modules={__name__},
+            include_classes={Component, Store, DataApp},
+            include_methods={"respond": Component},
+            skip_types={f"{__name__}.Store"},
+            app=Callbacks()
+        )
+
+    def test_skip(self):
+        """Data containers are neither walked nor serialized."""
+
+        app = DataApp()
+
+        done = set()
+        self.instrument.instrument_object(app, query=Lens().app, done=done)
+
+        self.assertIn(id(app.component), done)
+        self.assertNotIn(id(app.store.items[0]), done)
+
+        content = jsonify(app, instrument=self.instrument)
+
+        self.assertEqual(content['component']['name'], "main")
+        self.assertIn(NOSERIO, content['store'])
+
+        # Without skipping, the store is walked.
+        walked = jsonify(
+            app,
+            instrument=Instrument(include_classes={Component, Store, DataApp})
+        )
+        self.assertEqual(len(walked['store']['items']), 1000)
+
+    def test_methods_cache(self):
+        """Methods to instrument are determined once per class until the
+        instrument changes."""
+
+        methods = self.instrument.methods_to_instrument(Component)
+
+        self.assertIn((Component, "respond"), methods)
+        self.assertIs(self.instrument.methods_to_instrument(Component), methods)
+
+        self.instrument.include_methods["__init__"] = Component
+
+        self.assertEqual(
+            len(self.instrument.methods_to_instrument(Component)),
+            len(methods) + 1
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""
+Tests for json serialization utilities.
+"""
+
+import dataclasses
+from enum import Enum
+import json
+from unittest import main
+from unittest import TestCase
+
+import pydantic
+
+from trulens_eval.keys import REDACTED_VALUE
+from trulens_eval.utils import json as mod_json
+from trulens_eval.utils.json import json_str_of_obj
+from trulens_eval.utils.json import jsonify
+from trulens_eval.utils.pyschema import CIRCLE
+from trulens_eval.utils.pyschema import NOSERIO
+
+
+class Color(Enum):
+    RED = 1
+
+
+@dataclasses.dataclass
+class Point:
+    x: int
+    y: int = 0
+
+
+class Config(pydantic.BaseModel):
+    name: str = "config"
+    openai_api_key: str = "sk-secret"
+    hidden: int = pydantic.Field(1, exclude=True)
+
+
+class Extra:
+
+    def __init__(self):
+        self.value = 1
+
+    def jsonify_extra(self, content):
+        return dict(extra=True)
+
+
+class TestJsonify(TestCase):
+
+    def test_containers(self):
+        obj = dict(
+            a=[1, 2.5, "x", None, True],
+            b=(Color.RED, {3}),
+            c=Point(1),
+            d=Config()
+        )
+
+        self.assertEqual(
+            jsonify(obj, skip_specials=True),
+            dict(
+                a=[1, 2.5, "x", None, True],
+                b=["RED", [3]],
+                c=dict(x=1, y=0),
+                d=dict(name="config", openai_api_key="sk-secret", hidden=1)
+            )
+        )
+
+        self.assertNotIn("hidden", jsonify(Config(), include_excluded=False))
+
+    def test_references(self):
+        """Circular references are marked, shared ones are repeated."""
+
+        shared = [1]
+        circular = dict(shared=[shared, shared])
+        circular['self'] = circular
+
+        content = jsonify(circular)
+
+        self.assertEqual(content['shared'], [[1], [1]])
+        self.assertEqual(content['self'], {CIRCLE: id(circular)})
+        self.assertIsNone(jsonify(circular, skip_specials=True)['self'])
+
+    def test_redact(self):
+        content = jsonify(
+            dict(config=Config(), COHERE_API_KEY="abc"), redact_keys=True
+        )
+
+        self.assertEqual(content['COHERE_API_KEY'], REDACTED_VALUE)
+        self.assertEqual(content['config']['openai_api_key'], REDACTED_VALUE)
+        self.assertEqual(content['config']['name'], "config")
+
+    def test_max_depth(self):
+        content = jsonify([[["deep"]]], max_depth=2)
+
+        self.assertIn(NOSERIO, content[0][0][0])
+
+    def test_jsonify_extra(self):
+        self.assertEqual(jsonify(Extra()), dict(extra=True))
+
+    def test_orjson(self):
+        obj = dict(a=[1, 2.5, "é"], b={1: Point(1)}, c=2**70)
+
+        expected = json_str_of_obj(obj)
+
+        mod_json.USE_ORJSON = True
+        try:
+            self.assertEqual(
+                json.loads(json_str_of_obj(obj)), json.loads(expected)
+            )
+        finally:
+            mod_json.USE_ORJSON = False
+
+
+if __name__ == '__main__':
+    main()
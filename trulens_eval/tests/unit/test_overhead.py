@@ -0,0 +1,143 @@
+"""
+Tests for profiling of instrumentation overhead.
+"""
+
+import asyncio
+from threading import Thread
+import time
+from unittest import main
+from unittest import TestCase
+
+from tests.unit.test import RecorderTestCase
+
+from trulens_eval.tru_custom_app import instrument
+from trulens_eval.utils.overhead import OVERHEAD_PHASES
+from trulens_eval.utils.overhead import OverheadPhase
+from trulens_eval.utils.overhead import OverheadProfiler
+
+
+class ProfiledApp:
+
+    @instrument
+    def retrieve(self, query: str) -> str:
+        time.sleep(0.02)
+        return query + "?"
+
+    @instrument
+    def respond_to_query(self, query: str) -> str:
+        return self.retrieve(query) + "!"
+
+    @instrument
+    async def arespond_to_query(self, query: str) -> str:
+        await asyncio.sleep(0.02)
+        return query + "!"
+
+
+class TestOverheadProfiler(TestCase):
+
+    def test_report(self):
+        profiler = OverheadProfiler()
+        method = (None, "method")
+
+        for ns in [1000, 2000, 3000]:
+            profiler.add(
+                method, {
+                    OverheadPhase.FUNCTION: 1_000_000,
+                    OverheadPhase.BIND: ns,
+                    OverheadPhase.JSONIFY: ns
+                }
+            )
+
+        report = profiler.report()
+        row = report.loc["None.method"]
+
+        self.assertEqual(row['calls'], 3)
+        self.assertAlmostEqual(row['function_ms'], 1.0)
+        self.assertAlmostEqual(row['bind_ms'], 0.002)
+        self.assertAlmostEqual(row['overhead_ms'], 0.004)
+        self.assertAlmostEqual(row['overhead_pct'], 0.4)
+        # Upper bound of the log2 bucket, no more than the max.
+        self.assertEqual(row['overhead_p99_ms'], 0.006)
+
+    def test_threads(self):
+        """Accumulators of all threads are merged."""
+
+        profiler = OverheadProfiler()
+        method = (None, "method")
+
+        def add():
+            profiler.add(method, {OverheadPhase.FUNCTION: 1})
+
+        threads = [Thread(target=add) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(
+            profiler.stats()[method][OverheadPhase.FUNCTION].count, 8
+        )
+
+
+class TestAppOverhead(RecorderTestCase):
+
+    app_id = "profiled_app"
+
+    def setUp(self):
+        self.app = ProfiledApp()
+        self.measurements = []
+        self.recorder = self.make_recorder(
+            overhead_profiler=OverheadProfiler(
+                hooks=[
+                    lambda method, measurement: self.measurements.
+                    append((method, dict(measurement)))
+                ]
+            )
+        )
+
+    def test_phases(self):
+        with self.recorder:
+            self.app.respond_to_query("a")
+
+        self.assertEqual(
+            [method[1] for method, _ in self.measurements],
+            ["retrieve", "respond_to_query"]
+        )
+
+        for _, measurement in self.measurements:
+            self.assertGreaterEqual(
+                measurement[OverheadPhase.FUNCTION], 20_000_000
+            )
+            for phase in OVERHEAD_PHASES:
+                self.assertGreaterEqual(measurement[phase], 0)
+
+        # Only the root call makes a record.
+        self.assertEqual(
+            self.measurements[0][1][OverheadPhase.ON_ADD_RECORD], 0
+        )
+        self.assertGreater(
+            self.measurements[1][1][OverheadPhase.ON_ADD_RECORD], 0
+        )
+
+        report = self.recorder.instrumentation_overhead_report()
+        self.assertEqual(len(report), 2)
+        self.assertEqual(report['calls'].tolist(), [1, 1])
+
+    def test_async(self):
+        """Time spent awaiting is the function's."""
+
+        with self.recorder:
+            asyncio.run(self.app.arespond_to_query("a"))
+
+        _, measurement = self.measurements[0]
+        self.assertGreaterEqual(measurement[OverheadPhase.FUNCTION], 20_000_000)
+
+    def test_not_profiled(self):
+        recorder = self.make_recorder(app_id="unprofiled_app")
+
+        with self.assertRaises(ValueError):
+            recorder.instrumentation_overhead_report()
+
+
+if __name__ == '__main__':
+    main()
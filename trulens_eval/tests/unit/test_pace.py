@@ -0,0 +1,156 @@
+"""
+Tests for pacing/rate limiting utilities.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import time
+from unittest import main
+from unittest import TestCase
+
+from trulens_eval.feedback.provider.endpoint.base import retry_after_of
+from trulens_eval.utils.pace import AdaptiveLimits
+from trulens_eval.utils.pace import TokenBucketPace
+
+
+class TestTokenBucketPace(TestCase):
+
+    def test_rpm(self):
+        """Marks beyond the initial burst are spaced by the rpm."""
+
+        pace = TokenBucketPace(rpm=6000)  # 100 per second, burst of 100
+
+        start = time.monotonic()
+        for _ in range(150):
+            pace.mark()
+        elapsed = time.monotonic() - start
+
+        # 100 go through immediately, the other 50 take 0.5 seconds.
+        self.assertGreater(elapsed, 0.4)
+        self.assertLess(elapsed, 1.5)
+
+    def test_tpm(self):
+        """Token budget limits marks even if rpm permits them."""
+
+        pace = TokenBucketPace(rpm=60000, tpm=60000)  # 1000 tokens per second
+
+        start = time.monotonic()
+        for _ in range(3):
+            pace.mark(tokens=1000)
+        elapsed = time.monotonic() - start
+
+        self.assertGreater(elapsed, 1.8)
+
+    def test_reconcile(self):
+        """Overestimated tokens are returned to the budget."""
+
+        pace = TokenBucketPace(rpm=60000, tpm=60000)
+
+        pace.mark(tokens=1000)
+        pace.reconcile(estimated=1000, actual=10)
+
+        start = time.monotonic()
+        pace.mark(tokens=900)
+        elapsed = time.monotonic() - start
+
+        self.assertLess(elapsed, 0.5)
+
+    def test_no_lock_while_waiting(self):
+        """Concurrent waiters do not serialize on each other's sleeps."""
+
+        pace = TokenBucketPace(rpm=600, burst_seconds=0.1)  # 10 per second
+
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=10) as pool:
+            list(pool.map(lambda _: pace.mark(), range(10)))
+        elapsed = time.monotonic() - start
+
+        self.assertGreater(elapsed, 0.7)
+        self.assertLess(elapsed, 1.5)
+
+    def test_async(self):
+        """Async marks wait without blocking the loop."""
+
+        pace = TokenBucketPace(rpm=600, burst_seconds=0.1)
+
+        async def run():
+            await asyncio.gather(*(pace.amark() for _ in range(10)))
+
+        start = time.monotonic()
+        asyncio.run(run())
+        elapsed = time.monotonic() - start
+
+        self.assertGreater(elapsed, 0.7)
+        self.assertLess(elapsed, 1.5)
+
+
+class TestAdaptiveLimits(TestCase):
+
+    def test_decrease_and_recover(self):
+        """Throttling cuts limits multiplicatively, success restores them
+        additively."""
+
+        pace = TokenBucketPace(rpm=600)
+        limits = AdaptiveLimits(pace=pace, max_concurrency=8)
+
+        limits.on_throttle()
+        self.assertEqual(limits.metrics()['concurrency'], 4)
+        self.assertAlmostEqual(pace.effective_rpm, 300.0)
+
+        # Throttles in quick succession count as one signal.
+        limits.on_throttle()
+        self.assertEqual(limits.metrics()['concurrency'], 4)
+        self.assertEqual(limits.metrics()['n_throttles'], 2)
+
+        for _ in range(100):
+            limits.on_success()
+
+        self.assertEqual(limits.metrics()['concurrency'], 8)
+        self.assertAlmostEqual(pace.effective_rpm, 600.0)
+
+    def test_retry_after_pauses(self):
+        """A retry hint holds off marks for that long."""
+
+        pace = TokenBucketPace(rpm=60000)
+        limits = AdaptiveLimits(pace=pace)
+
+        limits.on_throttle(retry_after=0.5)
+
+        start = time.monotonic()
+        pace.mark()
+        elapsed = time.monotonic() - start
+
+        self.assertGreater(elapsed, 0.4)
+
+    def test_slot(self):
+        """No more than the concurrency limit of slots are in flight."""
+
+        limits = AdaptiveLimits(
+            pace=TokenBucketPace(rpm=600), max_concurrency=2
+        )
+
+        peak = 0
+
+        def work(_):
+            nonlocal peak
+            with limits.slot():
+                peak = max(peak, limits.in_flight)
+                time.sleep(0.05)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(work, range(8)))
+
+        self.assertEqual(peak, 2)
+        self.assertEqual(limits.in_flight, 0)
+
+    def test_retry_after_of(self):
+        """Retry hints are parsed from headers."""
+
+        self.assertEqual(retry_after_of({"Retry-After": "3"}), 3.0)
+        self.assertEqual(retry_after_of({"retry-after-ms": "1500"}), 1.5)
+        self.assertIsNone(retry_after_of({}))
+        self.assertIsNone(retry_after_of(None))
+
+
+if __name__ == '__main__':
+    main()
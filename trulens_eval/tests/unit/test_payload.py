@@ -0,0 +1,166 @@
+"""
+Tests for payload policies limiting recorded arguments and returns.
+"""
+
+from typing import List
+from unittest import main
+from unittest import TestCase
+
+import numpy as np
+from tests.unit.test import RecorderTestCase
+
+from trulens_eval import Feedback
+from trulens_eval import Select
+from trulens_eval import Tru
+from trulens_eval.feedback.provider.hugs import Dummy
+from trulens_eval.tru_custom_app import instrument
+from trulens_eval.utils.json import jsonify
+from trulens_eval.utils.payload import ELIDED
+from trulens_eval.utils.payload import json_size
+from trulens_eval.utils.payload import PayloadPolicy
+from trulens_eval.utils.pyschema import NOSERIO
+
+
+class PayloadApp:
+
+    @instrument
+    def embed(self, query: str) -> List[float]:
+        return [0.5] * 1000
+
+    @instrument
+    def retrieve(self, query: str) -> List[str]:
+        return ["document " * 1000, "short"]
+
+    @instrument(payload=PayloadPolicy(max_string_length=10))
+    def summarize(self, docs: List[str]) -> str:
+        return "summary " * 100
+
+    @instrument
+    def respond_to_query(self, query: str) -> str:
+        self.embed(query)
+        docs = self.retrieve(query)
+        return self.summarize(docs)
+
+
+class TestPayloadPolicy(TestCase):
+
+    def test_truncate(self):
+        policy = PayloadPolicy(max_string_length=10)
+
+        truncated = policy.limit("a" * 100)
+        self.assertTrue(truncated.startswith("a" * 10 + "... [truncated 100"))
+
+        self.assertEqual(policy.limit("short"), "short")
+
+        # Same content, same note.
+        self.assertEqual(truncated, policy.limit("a" * 100))
+
+    def test_vectors(self):
+        policy = PayloadPolicy(max_vector_length=8)
+
+        elided = policy.limit(dict(embedding=[0.1] * 100, small=[1, 2]))
+        summary = elided['embedding'][ELIDED]
+
+        self.assertEqual(summary['shape'], [100])
+        self.assertEqual(summary['dtype'], "float")
+        self.assertEqual(elided['small'], [1, 2])
+
+        matrix = policy.limit([[1, 2, 3]] * 4)
+        self.assertEqual(matrix[ELIDED]['shape'], [4, 3])
+        self.assertEqual(matrix[ELIDED]['dtype'], "int")
+
+    def test_field_and_call_bytes(self):
+        policy = PayloadPolicy(max_field_bytes=100)
+
+        self.assertIn(ELIDED, policy.limit(["x" * 200]))
+
+        policy = PayloadPolicy(max_call_bytes=300)
+
+        args, rets = policy.limit_call(
+            dict(big="x" * 250, small="y"), rets="z" * 100
+        )
+        self.assertIn(ELIDED, args['big'])
+        self.assertEqual(args['small'], "y")
+        self.assertEqual(rets, "z" * 100)
+
+    def test_array_summary(self):
+        """Arrays are summarized by jsonify with their shape and dtype."""
+
+        summary = jsonify(np.zeros((3, 4), dtype=np.float32))[NOSERIO]
+
+        self.assertEqual(summary['shape'], [3, 4])
+        self.assertEqual(summary['dtype'], "float32")
+
+
+class TestAppPayload(RecorderTestCase):
+
+    app_id = "payload_app"
+
+    def setUp(self):
+        self.app = PayloadApp()
+
+    def record(self, **kwargs):
+        recorder = self.make_recorder(**kwargs)
+
+        with recorder as recording:
+            self.app.respond_to_query("a")
+
+        return recording.get()
+
+    def calls_by_method(self, record):
+        return {call.method().name: call for call in record.calls}
+
+    def test_app_policy(self):
+        record = self.record(
+            payload=PayloadPolicy(max_string_length=20, max_vector_length=16)
+        )
+        calls = self.calls_by_method(record)
+
+        self.assertIn(ELIDED, calls['embed'].rets)
+        self.assertLess(len(calls['retrieve'].rets[0]), 100)
+        self.assertEqual(calls['retrieve'].rets[1], "short")
+
+        # Main output is not limited.
+        self.assertEqual(record.main_output, "summary " * 100)
+
+    def test_method_override(self):
+        """Methods can limit their calls with no policy on the app."""
+
+        calls = self.calls_by_method(self.record())
+
+        self.assertEqual(
+            len(calls['retrieve'].rets[0]),
+            len("document ") * 1000
+        )
+        self.assertLess(len(calls['summarize'].rets), 100)
+
+    def test_record_bytes(self):
+        record = self.record(payload=PayloadPolicy(max_record_bytes=2000))
+
+        total = sum(
+            json_size(call.args) + json_size(call.rets) for call in record.calls
+        )
+        self.assertLess(total, 2000)
+
+    def test_feedback_selected(self):
+        """Calls selected by feedback functions are not limited."""
+
+        f = Feedback(Dummy().positive_sentiment
+                    ).on(Select.RecordCalls.retrieve.rets[0])
+
+        record = self.record(
+            payload=PayloadPolicy(max_string_length=20, max_vector_length=16),
+            feedbacks=[f],
+            tru=Tru()
+        )
+        calls = self.calls_by_method(record)
+
+        self.assertEqual(
+            len(calls['retrieve'].rets[0]),
+            len("document ") * 1000
+        )
+        self.assertIn(ELIDED, calls['embed'].rets)
+
+
+if __name__ == '__main__':
+    main()
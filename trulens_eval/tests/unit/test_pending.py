@@ -0,0 +1,179 @@
+"""
+Tests for bounded tracking of records with pending feedback.
+"""
+
+from concurrent.futures import Future
+from threading import Event
+from threading import Thread
+import time
+from unittest import main
+from unittest import TestCase
+
+from tests.unit.test import RecorderTestCase
+
+from trulens_eval import Feedback
+from trulens_eval import Tru
+from trulens_eval import TruCustomApp
+from trulens_eval.schema.feedback import FeedbackMode
+from trulens_eval.schema.feedback import FeedbackResultStatus
+from trulens_eval.tru_custom_app import instrument
+from trulens_eval.utils.pending import Overflow
+from trulens_eval.utils.pending import PendingFeedback
+
+release_feedback = Event()
+
+
+def gated_feedback(text: str) -> float:
+    release_feedback.wait(timeout=10.0)
+    return 1.0
+
+
+class EchoApp:
+
+    @instrument
+    def respond_to_query(self, query: str) -> str:
+        return query + "!"
+
+
+class TestPendingFeedback(TestCase):
+
+    def track(self, pending: PendingFeedback, record_id: str, n: int = 2):
+        futures = [Future() for _ in range(n)]
+        self.assertTrue(pending.reserve())
+        pending.track(record_id, futures)
+        return futures
+
+    def test_callbacks(self):
+        """Records are forgotten once all of their feedback is done, in any
+        order."""
+
+        pending = PendingFeedback(max_pending=4)
+
+        first = self.track(pending, "first")
+        second = self.track(pending, "second")
+        self.assertEqual(pending.pending_record_ids(), ["first", "second"])
+
+        for future in second:
+            future.set_result(None)
+        self.assertEqual(pending.pending_record_ids(), ["first"])
+
+        first[0].set_result(None)
+        self.assertEqual(pending.depth, 1)
+        first[1].set_exception(ValueError())
+        self.assertEqual(pending.depth, 0)
+
+        # No futures, nothing to wait for.
+        self.track(pending, "third", n=0)
+        self.assertTrue(pending.wait(timeout=0))
+
+        stats = pending.stats()
+        self.assertEqual(stats['tracked'], 3)
+        self.assertEqual(stats['completed'], 3)
+        self.assertEqual(stats['max_depth'], 2)
+
+    def test_overflow(self):
+        for overflow in [Overflow.DEFER, Overflow.SHED]:
+            with self.subTest(overflow=overflow):
+                pending = PendingFeedback(max_pending=1, overflow=overflow)
+
+                self.track(pending, "first")
+                self.assertFalse(pending.reserve())
+                self.assertEqual(pending.stats()['overflowed'], 1)
+
+    def test_block(self):
+        pending = PendingFeedback(max_pending=1)
+        futures = self.track(pending, "first", n=1)
+
+        reserved = Event()
+
+        def reserve():
+            pending.reserve()
+            reserved.set()
+            pending.release()
+
+        thread = Thread(target=reserve)
+        thread.start()
+
+        self.assertFalse(reserved.wait(timeout=0.1))
+        self.assertFalse(pending.wait(timeout=0))
+
+        futures[0].set_result(None)
+        thread.join()
+
+        self.assertTrue(reserved.is_set())
+        self.assertTrue(pending.wait(timeout=0))
+        self.assertEqual(pending.stats()['blocked'], 1)
+        self.assertGreater(pending.stats()['blocked_seconds'], 0.0)
+
+
+class TestAppPendingFeedback(RecorderTestCase):
+
+    def setUp(self):
+        self.tru = Tru()
+        self.tru.reset_database()
+        self.app = EchoApp()
+        self.feedback = Feedback(gated_feedback).on_output()
+        release_feedback.clear()
+
+    def tearDown(self):
+        release_feedback.set()
+
+    def recorder(self, overflow: Overflow) -> TruCustomApp:
+        return self.make_recorder(
+            app_id=f"pending_app_{overflow.value}",
+            feedbacks=[self.feedback],
+            feedback_mode=FeedbackMode.WITH_APP_THREAD,
+            tru=self.tru,
+            pending_feedback=PendingFeedback(max_pending=1, overflow=overflow)
+        )
+
+    def test_overflow(self):
+        for overflow in [Overflow.DEFER, Overflow.SHED]:
+            with self.subTest(overflow=overflow):
+                release_feedback.clear()
+                recorder = self.recorder(overflow)
+
+                with recorder as recording:
+                    self.app.respond_to_query("a")
+                    self.app.respond_to_query("b")
+
+                first, second = recording.records
+
+                self.assertEqual(
+                    recorder.pending_feedback.pending_record_ids(),
+                    [first.record_id]
+                )
+                self.assertIsNone(second.feedback_results)
+
+                release_feedback.set()
+                recorder.wait_for_feedback_results()
+
+                self.assertEqual(recorder.pending_feedback.depth, 0)
+                self.assertEqual(
+                    recorder.pending_feedback.stats()['overflowed'], 1
+                )
+
+                # Deferred feedback is left in the database for the evaluator.
+                df = self.tru.db.get_feedback(record_id=second.record_id)
+                if overflow == Overflow.DEFER:
+                    self.assertEqual(
+                        df['status'].tolist(), [FeedbackResultStatus.NONE]
+                    )
+                else:
+                    self.assertEqual(len(df), 0)
+
+    def test_wait(self):
+        recorder = self.recorder(Overflow.BLOCK)
+
+        with recorder as recording:
+            self.app.respond_to_query("a")
+
+        Thread(target=lambda: (time.sleep(0.1), release_feedback.set())).start()
+        recorder.wait_for_feedback_results()
+
+        self.assertEqual(recorder.pending_feedback.depth, 0)
+        self.assertTrue(recording.get().feedback_results[0].done())
+
+
+if __name__ == '__main__':
+    main()
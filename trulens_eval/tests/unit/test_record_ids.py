@@ -0,0 +1,108 @@
+"""
+Tests for record id generation.
+"""
+
+import datetime
+from unittest import main
+from unittest import TestCase
+import uuid
+
+from trulens_eval import TruCustomApp
+from trulens_eval.schema.record import Record
+from trulens_eval.schema.record import RecordAppCall
+from trulens_eval.schema.record import RecordIDStrategy
+from trulens_eval.schema.types import uuid7
+from trulens_eval.tru_custom_app import instrument
+
+
+class IdApp:
+
+    @instrument
+    def respond_to_query(self, query: str) -> str:
+        return query + "!"
+
+
+class TestRecordIDs(TestCase):
+
+    def record(self, strategy: RecordIDStrategy, **kwargs) -> Record:
+        return Record(
+            app_id="app",
+            main_input="a",
+            main_output="a!",
+            calls=[RecordAppCall(stack=[], args=dict(q="a"), pid=0, tid=0)],
+            ts=datetime.datetime(2024, 1, 1),
+            record_id_strategy=strategy,
+            **kwargs
+        )
+
+    def test_uuid7(self):
+        """UUIDs are version 7 and in the order they were generated."""
+
+        uuids = [uuid7() for _ in range(10000)]
+
+        self.assertEqual(uuids[0].version, 7)
+        self.assertEqual(uuids[0].variant, uuid.RFC_4122)
+        self.assertEqual(uuids, sorted(uuids))
+        self.assertEqual(len(set(uuids)), len(uuids))
+
+        ms = uuids[0].int >> 80
+        now = datetime.datetime.now().timestamp() * 1000
+        self.assertLess(abs(now - ms), 10000)
+
+    def test_default(self):
+        record = self.record(RecordIDStrategy.UUID7)
+
+        self.assertTrue(record.record_id.startswith("record_"))
+        self.assertEqual(
+            uuid.UUID(record.record_id[len("record_"):]).version, 7
+        )
+        self.assertNotEqual(
+            record.record_id,
+            self.record(RecordIDStrategy.UUID7).record_id
+        )
+
+        # Given ids are kept.
+        self.assertEqual(
+            self.record(RecordIDStrategy.UUID7, record_id="given").record_id,
+            "given"
+        )
+
+    def test_hashes(self):
+        """Hashing strategies give the same id to the same content."""
+
+        for strategy in [RecordIDStrategy.CONTENT_HASH,
+                         RecordIDStrategy.INCREMENTAL_HASH]:
+            with self.subTest(strategy=strategy):
+                record = self.record(strategy)
+
+                self.assertTrue(record.record_id.startswith("record_hash_"))
+
+                # Calls have unique ids so share them to get the same content.
+                fields = record.model_dump()
+                del fields['record_id']
+
+                same = Record(**fields, record_id_strategy=strategy)
+                self.assertEqual(same.record_id, record.record_id)
+
+                fields['main_input'] = "b"
+
+                different = Record(**fields, record_id_strategy=strategy)
+                self.assertNotEqual(different.record_id, record.record_id)
+
+    def test_app(self):
+        app = IdApp()
+        recorder = TruCustomApp(
+            app,
+            app_id="id_app",
+            feedback_mode="none",
+            record_id_strategy=RecordIDStrategy.INCREMENTAL_HASH
+        )
+
+        with recorder as recording:
+            app.respond_to_query("a")
+
+        self.assertTrue(recording.get().record_id.startswith("record_hash_"))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""
+Tests for recording sampling.
+"""
+
+from unittest import main
+from unittest import TestCase
+
+from tests.unit.test import RecorderTestCase
+
+from trulens_eval.tru_custom_app import instrument
+from trulens_eval.utils.sampling import Sampling
+
+
+class SampledApp:
+
+    @instrument
+    def inner(self, query: str) -> str:
+        return query + "!"
+
+    @instrument
+    def respond_to_query(self, query: str) -> str:
+        if query == "fail":
+            raise ValueError("failed")
+
+        return self.inner(query)
+
+
+class TestSampling(TestCase):
+
+    def test_rate(self):
+        """Rates of 0 and 1 record nothing and everything."""
+
+        self.assertFalse(any(Sampling(rate=0.0).sample() for _ in range(100)))
+        self.assertTrue(all(Sampling(rate=1.0).sample() for _ in range(100)))
+
+        sampled = sum(Sampling(rate=0.5).sample() for _ in range(1000))
+        self.assertGreater(sampled, 350)
+        self.assertLess(sampled, 650)
+
+    def test_by_input(self):
+        """Sampling by input is deterministic per input."""
+
+        sampling = Sampling(rate=0.5, by_input=True)
+
+        inputs = [f"question {i}" for i in range(100)]
+        first = [sampling.sample(i) for i in inputs]
+        second = [sampling.sample(i) for i in inputs]
+
+        self.assertEqual(first, second)
+        self.assertTrue(any(first))
+        self.assertFalse(all(first))
+
+    def test_max_per_minute(self):
+        """Bursts are limited to a second's worth."""
+
+        sampling = Sampling(max_per_minute=120)
+
+        self.assertEqual(sum(sampling.sample() for _ in range(10)), 2)
+
+    def test_keep_unsampled(self):
+        sampling = Sampling(record_errors=True, record_slower_than=1.0)
+
+        self.assertTrue(sampling.keep_unsampled(ValueError(), duration=0.0))
+        self.assertTrue(sampling.keep_unsampled(None, duration=2.0))
+        self.assertFalse(sampling.keep_unsampled(None, duration=0.5))
+
+
+class TestAppSampling(RecorderTestCase):
+
+    app_id = "sampled_app"
+
+    def setUp(self):
+        self.app = SampledApp()
+
+    def test_unsampled(self):
+        """Unsampled invocations produce no records."""
+
+        recorder = self.make_recorder(sampling=Sampling(rate=0.0))
+
+        with recorder as recording:
+            self.assertEqual(self.app.respond_to_query("a"), "a!")
+
+        self.assertEqual(len(recording.records), 0)
+
+    def test_sampled(self):
+        """Sampled invocations are recorded with their subcalls."""
+
+        recorder = self.make_recorder(sampling=Sampling(rate=1.0))
+
+        with recorder as recording:
+            self.app.respond_to_query("a")
+
+        self.assertEqual(len(recording.get().calls), 2)
+
+    def test_unsampled_error(self):
+        """Unsampled invocations that fail are recorded by their root call."""
+
+        recorder = self.make_recorder(
+            sampling=Sampling(rate=0.0, record_errors=True)
+        )
+
+        with self.assertRaises(ValueError):
+            with recorder as recording:
+                self.app.respond_to_query("fail")
+
+        record = recording.get()
+        self.assertEqual(len(record.calls), 1)
+        self.assertEqual(record.calls[0].error, "failed")
+
+    def test_with_record(self):
+        """Explicitly requested records are always made."""
+
+        recorder = self.make_recorder(sampling=Sampling(rate=0.0))
+
+        _, record = recorder.with_record(self.app.respond_to_query, "a")
+
+        self.assertEqual(len(record.calls), 2)
+
+
+if __name__ == '__main__':
+    main()
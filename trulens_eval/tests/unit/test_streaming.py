@@ -0,0 +1,303 @@
+"""
+Tests for recording instrumented methods that stream their returns.
+"""
+
+import asyncio
+import itertools
+import time
+from typing import Any, AsyncGenerator, Callable, Dict, Generator
+from unittest import main
+from unittest import TestCase
+
+from tests.unit.test import RecorderTestCase
+
+from trulens_eval import Tru
+from trulens_eval.feedback.provider.endpoint.base import DummyEndpoint
+from trulens_eval.schema.base import ChunkLatency
+from trulens_eval.tru_custom_app import instrument
+
+
+class Resp:
+    """Response holding a stream for its receiver to consume."""
+
+    def __init__(self, chunks: Generator[str, None, None]):
+        self.chunks = chunks
+
+
+class StreamingApp:
+
+    @instrument
+    def retrieve(self, query: str) -> str:
+        return "context for " + query
+
+    @instrument
+    def stream(self, query: str) -> Generator[str, None, None]:
+        context = self.retrieve(query)
+
+        time.sleep(0.05)
+        for word in [query, " with ", context]:
+            yield word
+            time.sleep(0.01)
+
+    @instrument
+    def stream_dicts(self, query: str) -> Generator[Dict, None, None]:
+        for i in range(3):
+            yield dict(i=i)
+
+    @instrument
+    def stream_fail(self, query: str) -> Generator[str, None, None]:
+        yield query
+        raise ValueError("failed")
+
+    @instrument
+    def stream_requests(
+        self, query: str, send: Callable[[str], Any]
+    ) -> Generator[str, None, None]:
+        # A request per chunk, as made while streaming from LLM apis.
+        for word in [query, "!"]:
+            send(word)
+            yield word
+
+    @instrument
+    async def astream_requests(
+        self, query: str, send: Callable[[str], Any]
+    ) -> AsyncGenerator[str, None]:
+        for word in [query, "!"]:
+            send(word)
+            yield word
+
+    @instrument
+    def respond_to_query(self, query: str) -> Resp:
+        return Resp(self.stream(query))
+
+    @instrument
+    def respond_with_first(self, query: str) -> Resp:
+        chunks = self.stream(query)
+        first = next(chunks)
+        return Resp(itertools.chain([first], chunks))
+
+    @instrument
+    async def astream(self, query: str) -> AsyncGenerator[str, None]:
+        for word in [query, "!"]:
+            await asyncio.sleep(0.01)
+            yield word
+
+
+class TestChunkLatency(TestCase):
+
+    def test_of_gaps(self):
+        self.assertIsNone(ChunkLatency.of_gaps([]))
+
+        latency = ChunkLatency.of_gaps([float(i) for i in range(1, 101)])
+
+        self.assertEqual(latency.mean, 50.5)
+        self.assertEqual(latency.p50, 50.0)
+        self.assertEqual(latency.p90, 90.0)
+        self.assertEqual(latency.p99, 99.0)
+        self.assertEqual(latency.max, 100.0)
+
+
+class TestStreaming(RecorderTestCase):
+
+    app_id = "streaming_app"
+
+    def setUp(self):
+        self.app = StreamingApp()
+        self.recorder = self.make_recorder()
+
+    def test_stream(self):
+        with self.recorder as recording:
+            chunks = list(self.app.stream("a"))
+
+        self.assertEqual(chunks, ["a", " with ", "context for a"])
+
+        record = recording.get()
+
+        self.assertEqual(record.main_output, "a with context for a")
+        self.assertEqual(len(record.calls), 2)
+
+        perf = record.perf
+        self.assertEqual(perf.n_chunks, 3)
+        self.assertGreaterEqual(perf.time_to_first_chunk.total_seconds(), 0.05)
+        self.assertLess(perf.time_to_first_chunk, perf.latency)
+        self.assertGreaterEqual(perf.chunk_latency.p50, 0.01)
+
+        # Subcalls made while streaming are part of the record.
+        self.assertEqual(record.calls[0].method().name, "retrieve")
+        self.assertEqual(record.calls[0].stack[:1], record.calls[1].stack)
+
+    def test_not_strings(self):
+        with self.recorder as recording:
+            list(self.app.stream_dicts("a"))
+
+        self.assertEqual(
+            recording.get().calls[0].rets,
+            [dict(i=0), dict(i=1), dict(i=2)]
+        )
+
+    def test_closed(self):
+        """Streams closed before they end are recorded up to then."""
+
+        with self.recorder as recording:
+            stream = self.app.stream("a")
+            next(stream)
+            stream.close()
+
+        record = recording.get()
+        self.assertEqual(record.main_output, "a")
+        self.assertEqual(record.perf.n_chunks, 1)
+        self.assertIsNone(record.perf.chunk_latency)
+
+    def test_error(self):
+        with self.assertRaises(ValueError):
+            with self.recorder as recording:
+                list(self.app.stream_fail("a"))
+
+        record = recording.get()
+        self.assertEqual(record.calls[0].error, "failed")
+        self.assertEqual(record.calls[0].rets, "a")
+
+    def test_async(self):
+
+        async def consume():
+            return [chunk async for chunk in self.app.astream("a")]
+
+        with self.recorder as recording:
+            chunks = asyncio.run(consume())
+
+        self.assertEqual(chunks, ["a", "!"])
+
+        record = recording.get()
+        self.assertEqual(record.main_output, "a!")
+        self.assertEqual(record.perf.n_chunks, 2)
+
+    def test_consumed_after_root(self):
+        """Streams of subcalls consumed after their root call returned are
+        recorded with the root call as they were then, not with the next root
+        call."""
+
+        with self.recorder as recording:
+            resp = self.app.respond_to_query("a")
+            chunks = list(resp.chunks)
+            self.app.retrieve("b")
+
+        self.assertEqual(chunks, ["a", " with ", "context for a"])
+
+        first, second = recording.records
+
+        self.assertEqual(
+            [call.method().name for call in first.calls],
+            ["stream", "respond_to_query"]
+        )
+        self.assertEqual(first.calls[0].rets, "")
+        self.assertEqual(first.calls[0].perf.n_chunks, 0)
+
+        self.assertEqual(
+            [call.method().name for call in second.calls], ["retrieve"]
+        )
+        self.assertEqual(second.main_input, "b")
+
+    def test_partly_consumed_before_root(self):
+        """Chunks produced before the root call returned are recorded."""
+
+        with self.recorder as recording:
+            resp = self.app.respond_with_first("a")
+            chunks = list(resp.chunks)
+            self.app.retrieve("b")
+
+        self.assertEqual(chunks, ["a", " with ", "context for a"])
+
+        first, second = recording.records
+
+        self.assertEqual(
+            [call.method().name for call in first.calls],
+            ["retrieve", "stream", "respond_with_first"]
+        )
+        self.assertEqual(first.calls[1].rets, "a")
+        self.assertEqual(first.calls[1].perf.n_chunks, 1)
+
+        self.assertEqual(len(second.calls), 1)
+
+    def test_with_record(self):
+        """Streamed returns are recorded right away, without their chunks."""
+
+        with self.assertWarns(DeprecationWarning):
+            chunks, record = self.recorder.with_record(self.app.stream, "a")
+
+        self.assertEqual(
+            [call.method().name for call in record.calls], ["stream"]
+        )
+        self.assertIsNone(record.perf.n_chunks)
+
+        # Still recorded, but not into the record already returned.
+        self.assertEqual("".join(chunks), "a with context for a")
+        self.assertEqual(len(record.calls), 1)
+
+        # Non-streamed returns holding a stream are recorded right away.
+        resp, record = self.recorder.with_record(self.app.respond_to_query, "a")
+        self.assertEqual(
+            [call.method().name for call in record.calls],
+            ["stream", "respond_to_query"]
+        )
+        self.assertEqual("".join(resp.chunks), "a with context for a")
+
+    def test_cost(self):
+        """Costs incurred while producing chunks are part of the record."""
+
+        # All dummy endpoints share a singleton name so remove any created by
+        # other tests to get one with the parameters below.
+        for endpoint in DummyEndpoint.existing_instances():
+            endpoint.delete_singleton()
+
+        endpoint = DummyEndpoint(
+            error_prob=0.0,
+            freeze_prob=0.0,
+            overloaded_prob=0.0,
+            loading_prob=0.0,
+            alloc=0,
+            rpm=60000,
+            completion_tokens=3,
+            cost_per_1k_tokens=1.0
+        )
+
+        def send(text: str):
+            endpoint._send(
+                url="http://localhost", payload={"inputs": text}, timeout=1.0
+            )
+
+        async def consume():
+            return [
+                chunk async for chunk in self.app.astream_requests("a", send)
+            ]
+
+        try:
+            with self.recorder as recording:
+                list(self.app.stream_requests("a", send))
+                asyncio.run(consume())
+
+            for record in recording.records:
+                with self.subTest(method=record.calls[0].method().name):
+                    self.assertEqual(record.cost.n_successful_requests, 2)
+                    self.assertGreater(record.cost.cost, 0.0)
+
+        finally:
+            endpoint.delete_singleton()
+
+    def test_leaderboard(self):
+        tru = Tru()
+        tru.reset_database()
+
+        recorder = self.make_recorder(tru=tru)
+
+        with recorder:
+            list(self.app.stream("a"))
+
+        df, _ = tru.get_records_and_feedback(app_ids=[])
+        self.assertEqual(df['n_chunks'][0], 3)
+        self.assertGreater(df['time_to_first_chunk'][0], 0.0)
+
+        self.assertIn('time_to_first_chunk', tru.get_leaderboard().columns)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Tests for threading utilities.
+"""
+
+import threading
+import time
+from unittest import main
+from unittest import TestCase
+
+from trulens_eval.utils.threading import FanOut
+
+
+class TestFanOut(TestCase):
+
+    def test_map(self):
+        """Results are returned in item order."""
+
+        def slow_square(i):
+            time.sleep(0.01 * (5 - i))
+            return i * i
+
+        self.assertEqual(FanOut().map(slow_square, range(5)), [0, 1, 4, 9, 16])
+
+    def test_limit(self):
+        """No more than the limit of a key's items run in workers at once, plus
+        the caller itself."""
+
+        lock = threading.Lock()
+        running = 0
+        peak = 0
+
+        def work(_):
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.02)
+            with lock:
+                running -= 1
+
+        FanOut().map(work, range(16), key="test_limit", limit=2)
+
+        self.assertLessEqual(peak, 3)
+        self.assertGreater(peak, 1)
+
+    def test_nested(self):
+        """Nested fan-outs beyond the pool size complete."""
+
+        def inner(i):
+            time.sleep(0.001)
+            return i
+
+        def outer(_):
+            return sum(FanOut().map(inner, range(4)))
+
+        results = FanOut().map(outer, range(FanOut.MAX_THREADS * 2))
+
+        self.assertEqual(results, [6] * FanOut.MAX_THREADS * 2)
+
+    def test_error(self):
+        """Errors are raised to the caller."""
+
+        def fail_on_odd(i):
+            if i % 2 == 1:
+                raise ValueError(f"odd {i}")
+            return i
+
+        with self.assertRaises(ValueError) as context:
+            FanOut().map(fail_on_odd, range(4))
+
+        self.assertEqual(str(context.exception), "odd 1")
+
+
+if __name__ == '__main__':
+    main()
@@ -2,6 +2,8 @@
 Tests for TruCustomApp.
 """
 
+import asyncio
+from tempfile import TemporaryDirectory
 from unittest import main
 
 from examples.expositional.end2end_apps.custom_app.custom_app import CustomApp
@@ -9,7 +11,9 @@ from tests.unit.test import JSONTestCase
 
 from trulens_eval import Tru
 from trulens_eval import TruCustomApp
+from trulens_eval.tru_custom_app import instrument
 from trulens_eval.tru_custom_app import TruCustomApp
+from trulens_eval.utils.threading import ThreadPoolExecutor
 
 
 class TestTruCustomApp(JSONTestCase):
@@ -90,5 +94,89 @@ class TestTruCustomApp(JSONTestCase):
         self.assertEqual(recording2[0].meta, "meta2")
 
 
+class NestingApp:
+    """App with instrumented methods calling others in various ways."""
+
+    @instrument
+    def inner(self, query: str) -> str:
+        return query + "!"
+
+    @instrument
+    def threaded(self, query: str) -> str:
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            return "".join(pool.map(self.inner, [query, query]))
+
+    @instrument
+    async def ainner(self, query: str) -> str:
+        await asyncio.sleep(0)
+        return query + "?"
+
+    @instrument
+    async def aouter(self, query: str) -> str:
+        first = await self.ainner(query)
+        rest = await asyncio.gather(self.ainner(query), self.ainner(query))
+        return first + "".join(rest)
+
+
+class TestCallStacks(JSONTestCase):
+
+    def setUp(self):
+        # A database of its own instead of the default one in the working
+        # directory.
+        self.database = TemporaryDirectory()
+        Tru.delete_singleton_by_name(None, cls=Tru)
+        self.tru = Tru(
+            database_url=f"sqlite:///{self.database.name}/nesting.sqlite"
+        )
+
+        self.app = NestingApp()
+        self.recorder = TruCustomApp(
+            self.app, app_id="nesting_app", tru=self.tru
+        )
+
+    def tearDown(self):
+        self.tru.db.engine.dispose()
+        self.tru.delete_singleton()
+        self.database.cleanup()
+
+    def assertStacks(self, recording, expected):
+        self.assertEqual(len(recording.records), 1)
+        self.assertEqual(
+            [
+                [frame.method.name
+                 for frame in call.stack]
+                for call in recording.get().calls
+            ], expected
+        )
+
+    def test_threads(self):
+        """Calls in worker threads are nested under their submitter."""
+
+        with self.recorder as recording:
+            self.app.threaded("a")
+
+        self.assertStacks(
+            recording, [["threaded", "inner"]] * 2 + [["threaded"]]
+        )
+
+    def test_async(self):
+        """Calls made while awaiting, including in gathered tasks, are nested
+        under the awaited method."""
+
+        with self.recorder as recording:
+            self.assertEqual(asyncio.run(self.app.aouter("a")), "a?a?a?")
+
+        self.assertStacks(recording, [["aouter", "ainner"]] * 3 + [["aouter"]])
+
+    def test_not_recording(self):
+        """Calls outside of a recording are not recorded."""
+
+        with self.recorder as recording:
+            pass
+
+        self.assertEqual(self.app.threaded("b"), "b!b!")
+        self.assertEqual(len(recording.records), 0)
+
+
 if __name__ == '__main__':
     main()
@@ -2,8 +2,14 @@
 # Trulens-eval LLM Evaluation Library
 
 This top-level import includes everything to get started.
+
+The names below are imported on first access so that importing
+`trulens_eval` alone does not import app frameworks, databases or providers
+that are not used.
 """
 
+from typing import TYPE_CHECKING
+
 __version_info__ = (0, 31, 0)
 """Version number components for major, minor, patch."""
 
@@ -17,57 +23,79 @@ from trulens_eval.utils.imports import check_imports
 
 check_imports()
 
-from trulens_eval import tru as mod_tru
-from trulens_eval import tru_basic_app as mod_tru_basic_app
-from trulens_eval import tru_chain as mod_tru_chain
-from trulens_eval import tru_custom_app as mod_tru_custom_app
-from trulens_eval import tru_virtual as mod_tru_virtual
-from trulens_eval.feedback import feedback as mod_feedback
-from trulens_eval.feedback.provider import base as mod_provider
-from trulens_eval.feedback.provider import hugs as mod_hugs_provider
-from trulens_eval.feedback.provider import langchain as mod_langchain_provider
-from trulens_eval.schema import app as mod_app_schema
-from trulens_eval.schema import feedback as mod_feedback_schema
 from trulens_eval.utils import imports as mod_imports_utils
-from trulens_eval.utils import threading as mod_threading_utils
-
-# Optional provider types.
 
-with mod_imports_utils.OptionalImports(
-        messages=mod_imports_utils.REQUIREMENT_LITELLM):
-    from trulens_eval.feedback.provider.litellm import LiteLLM
-
-with mod_imports_utils.OptionalImports(
-        messages=mod_imports_utils.REQUIREMENT_BEDROCK):
+if TYPE_CHECKING:
+    from trulens_eval.feedback.feedback import Feedback
+    from trulens_eval.feedback.provider.base import Provider
     from trulens_eval.feedback.provider.bedrock import Bedrock
-
-with mod_imports_utils.OptionalImports(
-        messages=mod_imports_utils.REQUIREMENT_OPENAI):
+    from trulens_eval.feedback.provider.hugs import Huggingface
+    from trulens_eval.feedback.provider.langchain import Langchain
+    from trulens_eval.feedback.provider.litellm import LiteLLM
     from trulens_eval.feedback.provider.openai import AzureOpenAI
     from trulens_eval.feedback.provider.openai import OpenAI
-
-# Optional app types.
-
-with mod_imports_utils.OptionalImports(
-        messages=mod_imports_utils.REQUIREMENT_LLAMA):
+    from trulens_eval.schema.feedback import FeedbackMode
+    from trulens_eval.schema.feedback import Select
+    from trulens_eval.tru import Tru
+    from trulens_eval.tru_basic_app import TruBasicApp
+    from trulens_eval.tru_chain import TruChain
+    from trulens_eval.tru_custom_app import TruCustomApp
     from trulens_eval.tru_llama import TruLlama
-
-with mod_imports_utils.OptionalImports(
-        messages=mod_imports_utils.REQUIREMENT_RAILS):
     from trulens_eval.tru_rails import TruRails
-
-Tru = mod_tru.Tru
-TruBasicApp = mod_tru_basic_app.TruBasicApp
-TruChain = mod_tru_chain.TruChain
-TruCustomApp = mod_tru_custom_app.TruCustomApp
-TruVirtual = mod_tru_virtual.TruVirtual
-TP = mod_threading_utils.TP
-Feedback = mod_feedback.Feedback
-Provider = mod_provider.Provider
-Huggingface = mod_hugs_provider.Huggingface
-Langchain = mod_langchain_provider.Langchain
-FeedbackMode = mod_feedback_schema.FeedbackMode
-Select = mod_feedback_schema.Select
+    from trulens_eval.tru_virtual import TruVirtual
+    from trulens_eval.utils.threading import TP
+
+__getattr__, __dir__ = mod_imports_utils.lazy_module_attributes(
+    __name__,
+    {
+        "Tru": ("trulens_eval.tru", None),
+
+        # app types
+        "TruBasicApp": ("trulens_eval.tru_basic_app", None),
+        "TruCustomApp": ("trulens_eval.tru_custom_app", None),
+        "TruChain": ("trulens_eval.tru_chain", None),
+        "TruLlama":
+            ("trulens_eval.tru_llama", mod_imports_utils.REQUIREMENT_LLAMA),
+        "TruVirtual": ("trulens_eval.tru_virtual", None),
+        "TruRails":
+            ("trulens_eval.tru_rails", mod_imports_utils.REQUIREMENT_RAILS),
+
+        # app setup
+        "FeedbackMode": ("trulens_eval.schema.feedback", None),
+
+        # feedback setup
+        "Feedback": ("trulens_eval.feedback.feedback", None),
+        "Select": ("trulens_eval.schema.feedback", None),
+
+        # feedback providers
+        "Provider": ("trulens_eval.feedback.provider.base", None),
+        "AzureOpenAI":
+            (
+                "trulens_eval.feedback.provider.openai",
+                mod_imports_utils.REQUIREMENT_OPENAI
+            ),
+        "OpenAI":
+            (
+                "trulens_eval.feedback.provider.openai",
+                mod_imports_utils.REQUIREMENT_OPENAI
+            ),
+        "Langchain": ("trulens_eval.feedback.provider.langchain", None),
+        "LiteLLM":
+            (
+                "trulens_eval.feedback.provider.litellm",
+                mod_imports_utils.REQUIREMENT_LITELLM
+            ),
+        "Bedrock":
+            (
+                "trulens_eval.feedback.provider.bedrock",
+                mod_imports_utils.REQUIREMENT_BEDROCK
+            ),
+        "Huggingface": ("trulens_eval.feedback.provider.hugs", None),
+
+        # misc utility
+        "TP": ("trulens_eval.utils.threading", None),
+    }
+)
 
 __all__ = [
     "Tru",  # main interface
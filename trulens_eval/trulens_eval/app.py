@@ -9,15 +9,16 @@ from inspect import BoundArguments
 from inspect import Signature
 import logging
 from pprint import PrettyPrinter
-import threading
 from threading import Lock
 from typing import (
     Any, Awaitable, Callable, ClassVar, Dict, Hashable, Iterable, List,
     Optional, Sequence, Set, Tuple, Type, TypeVar, Union
 )
-from ux.page_config import set_page_config
+import warnings
+
+import pandas
 import pydantic
-import json 
+
 from trulens_eval import app as mod_app
 from trulens_eval import feedback as mod_feedback
 from trulens_eval import instruments as mod_instruments
@@ -32,6 +33,11 @@ from trulens_eval.utils.asynchro import desync
 from trulens_eval.utils.asynchro import sync
 from trulens_eval.utils.json import json_str_of_obj
 from trulens_eval.utils.json import jsonify
+from trulens_eval.utils.overhead import OverheadProfiler
+from trulens_eval.utils.payload import may_select
+from trulens_eval.utils.payload import PayloadPolicy
+from trulens_eval.utils.pending import Overflow
+from trulens_eval.utils.pending import PendingFeedback
 from trulens_eval.utils.pyschema import Class
 from trulens_eval.utils.pyschema import CLASS_INFO
 from trulens_eval.utils.python import callable_name
@@ -39,16 +45,16 @@ from trulens_eval.utils.python import class_name
 from trulens_eval.utils.python import \
     Future  # can take type args with python < 3.9
 from trulens_eval.utils.python import id_str
-from trulens_eval.utils.python import \
-    Queue  # can take type args with python < 3.9
 from trulens_eval.utils.python import safe_hasattr
 from trulens_eval.utils.python import T
+from trulens_eval.utils.sampling import Sampling
 from trulens_eval.utils.serial import all_objects
 from trulens_eval.utils.serial import GetItemOrAttribute
 from trulens_eval.utils.serial import JSON
 from trulens_eval.utils.serial import JSON_BASES
 from trulens_eval.utils.serial import JSON_BASES_T
 from trulens_eval.utils.serial import Lens
+from trulens_eval.utils.threading import ThreadPoolExecutor
 
 logger = logging.getLogger(__name__)
 
@@ -359,9 +365,13 @@ class RecordingContext():
         the result is ready.
         """
 
-        self.records: List[mod_record_schema.Record] = []
+        self._records: List[mod_record_schema.Record] = []
         """Completed records."""
 
+        self.pending: List[Future[mod_record_schema.Record]] = []
+        """Records being assembled in the background when the app defers
+        serialization."""
+
         self.lock: Lock = Lock()
         """Lock blocking access to `calls` and `records` when adding calls or finishing a record."""
 
@@ -374,6 +384,44 @@ class RecordingContext():
         self.record_metadata = record_metadata
         """Metadata to attach to all records produced in this context."""
 
+        self.record_all: bool = False
+        """Record every root call in this context regardless of the sampling
+        policy of the app."""
+
+        self.stream_placeholders: bool = False
+        """Record root calls returning a stream right away, with the stream
+        itself as their return, instead of once the stream is consumed."""
+
+        self.roots: Dict[mod_types_schema.CallID, Dict[mod_types_schema.CallID,
+                                                       Callable[[], None]]] = {}
+        """Root calls that have not finished yet, by call id, each with its
+        subcalls with streamed returns that have not ended yet and how to record
+        each of them with the chunks produced so far."""
+
+    @property
+    def records(self) -> List[mod_record_schema.Record]:
+        """Completed records.
+        
+        Waits for records being assembled in the background, if any.
+        """
+
+        self.wait_for_records()
+
+        return self._records
+
+    def wait_for_records(self) -> None:
+        """Wait for records being assembled in the background.
+
+        Raises the first error that happened while assembling them, if any.
+        """
+
+        with self.lock:
+            pending = self.pending
+            self.pending = []
+
+        for future in pending:
+            future.result()
+
     def __iter__(self):
         return iter(self.records)
 
@@ -401,21 +449,125 @@ class RecordingContext():
 
     def __hash__(self) -> int:
         # The same app can have multiple recording contexts.
-        return hash(id(self.app)) + hash(id(self.records))
+        return hash(id(self.app)) + hash(id(self._records))
 
     def __eq__(self, other):
         return hash(self) == hash(other)
-        # return id(self.app) == id(other.app) and id(self.records) == id(other.records)
+        # return id(self.app) == id(other.app) and id(self._records) == id(other._records)
 
-    def add_call(self, call: mod_record_schema.RecordAppCall):
+    def add_call(
+        self,
+        call: mod_record_schema.RecordAppCall,
+        root_call_id: Optional[mod_types_schema.CallID] = None
+    ):
         """
         Add the given call to the currently tracked call list.
+
+        If the call id of its root call is given and that root call has already
+        finished, the call is not added as the record it belongs to is already
+        made.
         """
         with self.lock:
+            if root_call_id is not None and root_call_id != call.call_id and \
+                    root_call_id not in self.roots:
+                logger.debug(
+                    "Not recording call %s as its root call %s has finished.",
+                    call.call_id, root_call_id
+                )
+                return
+
             # NOTE: This might override existing call record which happens when
             # processing calls with awaitable or generator results.
             self.calls[call.call_id] = call
 
+    def start_root(self, root_call_id: mod_types_schema.CallID) -> None:
+        """Track the given root call until it finishes."""
+
+        with self.lock:
+            self.roots[root_call_id] = {}
+
+    def finish_root(self, root_call_id: mod_types_schema.CallID) -> None:
+        """Stop tracking the given root call as it finished.
+
+        Its subcalls with streamed returns that have not ended yet are recorded
+        now with the chunks produced so far, as the record of the root call
+        does not wait for them.
+        """
+
+        with self.lock:
+            streams = self.roots.get(root_call_id, {})
+            flushes = list(streams.values())
+            streams.clear()
+
+        # Recorded while the root call is still tracked so that they are added.
+        for flush in flushes:
+            flush()
+
+        with self.lock:
+            self.roots.pop(root_call_id, None)
+
+    def add_stream(
+        self, root_call_id: mod_types_schema.CallID,
+        call_id: mod_types_schema.CallID, flush: Callable[[], None]
+    ) -> None:
+        """Track the given subcall with a streamed return until it ends or its
+        root call finishes, whichever is first."""
+
+        with self.lock:
+            streams = self.roots.get(root_call_id)
+            if streams is not None:
+                streams[call_id] = flush
+
+    def end_stream(
+        self, root_call_id: mod_types_schema.CallID,
+        call_id: mod_types_schema.CallID
+    ) -> bool:
+        """Stop tracking the given subcall with a streamed return as it ended.
+
+        Returns whether it was still tracked. If not, it was already recorded
+        along with its root call, or its root call finished before it started,
+        and must not be recorded again.
+        """
+
+        with self.lock:
+            streams = self.roots.get(root_call_id)
+
+            return streams is not None and \
+                streams.pop(call_id, None) is not None
+
+    def submit_record(
+        self, executor: ThreadPoolExecutor, calls_to_record: Callable[[
+            List[Union[mod_record_schema.RecordAppCall,
+                       mod_instruments.DeferredCall]], mod_types_schema.Metadata
+        ], mod_record_schema.Record]
+    ) -> Optional[Future[mod_record_schema.Record]]:
+        """
+        Take the currently tracked calls for a record, leaving none tracked, and
+        build the record from them in the given executor.
+
+        Returns None and leaves the calls tracked if the executor was shut down.
+        """
+
+        with self.lock:
+            try:
+                future = executor.submit(
+                    calls_to_record, list(self.calls.values()),
+                    self.record_metadata
+                )
+            except RuntimeError:
+                return None
+
+            self.calls = {}
+            self.pending.append(future)
+
+        return future
+
+    def add_record(self, record: mod_record_schema.Record) -> None:
+        """Add the given completed record."""
+
+        with self.lock:
+            self._records.append(record)
+
     def finish_record(
         self,
         calls_to_record: Callable[[
@@ -438,7 +590,7 @@ class RecordingContext():
             if existing_record is None:
                 # If existing record was given, we assume it was already
                 # inserted into this list.
-                self.records.append(record)
+                self._records.append(record)
 
         return record
 
@@ -517,16 +669,67 @@ class App(mod_app_schema.AppDefinition, mod_instruments.WithInstrumentCallbacks,
     """Mapping of instrumented methods (by id(.) of owner object and the
     function) to their path in this app."""
 
-    records_with_pending_feedback_results: Queue[mod_record_schema.Record] = \
-        pydantic.Field(exclude=True, default_factory=lambda: Queue(maxsize=1024))
-    """Records produced by this app which might have yet to finish
-    feedback runs."""
+    pending_feedback: PendingFeedback = \
+        pydantic.Field(exclude=True, default_factory=PendingFeedback)
+    """Ids of the records produced by this app whose feedback functions are
+    still running with
+    [FeedbackMode.WITH_APP_THREAD][trulens_eval.schema.feedback.FeedbackMode.WITH_APP_THREAD],
+    and what to do with records beyond its limit. See
+    [PendingFeedback][trulens_eval.utils.pending.PendingFeedback]."""
+
+    sampling: Optional[Sampling] = pydantic.Field(None, exclude=True)
+    """Policy deciding which invocations of the app are recorded.
+    
+    All invocations are recorded if not given. See
+    [Sampling][trulens_eval.utils.sampling.Sampling].
+    """
 
-    manage_pending_feedback_results_thread: Optional[threading.Thread] = \
-        pydantic.Field(exclude=True, default=None)
-    """Thread for manager of pending feedback results queue.
+    payload: Optional[PayloadPolicy] = pydantic.Field(None, exclude=True)
+    """Limits on the size of the recorded arguments and returns of calls.
     
-    See _manage_pending_feedback_results."""
+    Everything is recorded in full if not given. Calls that feedback functions
+    of this app select from are never limited. See
+    [PayloadPolicy][trulens_eval.utils.payload.PayloadPolicy].
+    """
+
+    record_id_strategy: mod_record_schema.RecordIDStrategy = pydantic.Field(
+        mod_record_schema.RecordIDStrategy.UUID7, exclude=True
+    )
+    """How ids of records of this app are generated. See
+    [RecordIDStrategy][trulens_eval.schema.record.RecordIDStrategy]."""
+
+    feedback_selected_calls: Dict[Tuple[Lens, str], bool] = \
+        pydantic.Field(exclude=True, default_factory=dict)
+    """Whether the calls of methods (by path and name) may be selected by
+    feedback functions of this app."""
+
+    defer_serialization: bool = pydantic.Field(False, exclude=True)
+    """Serialize arguments and returns of instrumented calls and assemble
+    records in a background thread instead of before the root call returns.
+    
+    Records of a recording context are available once they are assembled:
+    `recording.get()` and `recording.records` wait for them.
+    """
+
+    capture_mode: mod_instruments.CaptureMode = pydantic.Field(
+        mod_instruments.CaptureMode.SHALLOW, exclude=True
+    )
+    """How arguments and returns are captured for serialization when it is
+    deferred. See [CaptureMode][trulens_eval.instruments.CaptureMode]."""
+
+    serialization_executor: Optional[ThreadPoolExecutor] = \
+        pydantic.Field(None, exclude=True)
+    """Worker assembling records when serialization is deferred.
+    
+    A single thread so that records are assembled in the order their root
+    calls finished. It is shut down when the app is closed or garbage
+    collected."""
+
+    overhead_profiler: Optional[OverheadProfiler] = \
+        pydantic.Field(None, exclude=True)
+    """Profiler measuring the time recorded calls spend in instrumentation as
+    opposed to in the instrumented methods. Nothing is measured if not given.
+    See [OverheadProfiler][trulens_eval.utils.overhead.OverheadProfiler]."""
 
     selector_check_warning: bool = False
     """Issue warnings when selectors are not found in the app with a placeholder
@@ -572,46 +775,30 @@ class App(mod_app_schema.AppDefinition, mod_instruments.WithInstrumentCallbacks,
         else:
             pass
 
-        if self.feedback_mode == mod_feedback_schema.FeedbackMode.WITH_APP_THREAD:
-            self._start_manage_pending_feedback_results()
+        if self.defer_serialization and self.serialization_executor is None:
+            self.serialization_executor = ThreadPoolExecutor(max_workers=1)
 
         self._tru_post_init()
 
     def __del__(self):
         # Can use to do things when this object is being garbage collected.
-        pass
 
-    def _start_manage_pending_feedback_results(self) -> None:
-        """Start the thread that manages the queue of records with
-        pending feedback results.
-        
-        This is meant to be run permentantly in a separate thread. It will
-        remove records from the queue `records_with_pending_feedback_results` as
-        their feedback results are computed and makes sure the queue does not
-        keep growing.
-        """
+        # May not be set if construction failed.
+        executor = getattr(self, "serialization_executor", None)
+        if executor is not None:
+            executor.shutdown(wait=False)
 
-        if self.manage_pending_feedback_results_thread is not None:
-            raise RuntimeError("Manager Thread already started.")
-
-        self.manage_pending_feedback_results_thread = threading.Thread(
-            target=self._manage_pending_feedback_results,
-            daemon=True  # otherwise this thread will keep parent alive
-        )
-        self.manage_pending_feedback_results_thread.start()
+    def close(self) -> None:
+        """Stop the serialization worker, if any, once it has assembled the
+        records of the calls made so far.
 
-    def _manage_pending_feedback_results(self) -> None:
-        """Manage the queue of records with pending feedback results.
-
-        This is meant to be run permentantly in a separate thread. It will
-        remove records from the queue records_with_pending_feedback_results as
-        their feedback results are computed and makes sure the queue does not
-        keep growing.
+        Serialization is synchronous for calls recorded afterwards.
         """
 
-        while True:
-            record = self.records_with_pending_feedback_results.get()
-            record.wait_for_feedback_results()
+        if self.serialization_executor is not None:
+            executor = self.serialization_executor
+            self.serialization_executor = None
+            executor.shutdown(wait=True)
 
     def wait_for_feedback_results(self) -> None:
         """Wait for all feedbacks functions to complete.
@@ -621,10 +808,17 @@ class App(mod_app_schema.AppDefinition, mod_instruments.WithInstrumentCallbacks,
         this is running, it will include them.
         """
 
-        while not self.records_with_pending_feedback_results.empty():
-            record = self.records_with_pending_feedback_results.get()
+        executor = self.serialization_executor
+        if executor is not None:
+            # Records assembled in the background are queued once assembled.
+            try:
+                executor.submit(lambda: None).result()
+            except RuntimeError:
+                # Shut down by a concurrent `close`. Wait for the worker as it
+                # does.
+                executor.shutdown(wait=True)
 
-            record.wait_for_feedback_results()
+        self.pending_feedback.wait()
 
     @classmethod
     def select_context(cls, app: Optional[Any] = None) -> Lens:
@@ -705,11 +899,15 @@ class App(mod_app_schema.AppDefinition, mod_instruments.WithInstrumentCallbacks,
                     "Feedback logging requires `tru` to be specified."
                 )
 
-        if self.feedback_mode == mod_feedback_schema.FeedbackMode.DEFERRED:
+        if self.feedback_mode == mod_feedback_schema.FeedbackMode.DEFERRED or (
+                self.feedback_mode
+                == mod_feedback_schema.FeedbackMode.WITH_APP_THREAD and
+                self.pending_feedback.overflow == Overflow.DEFER):
             for f in self.feedbacks:
                 # Try to load each of the feedback implementations. Deferred
                 # mode will do this but we want to fail earlier at app
-                # constructor here.
+                # constructor here. Records overflowing the pending feedback
+                # limit may also be deferred.
                 try:
                     f.implementation.load()
                 except Exception as e:
@@ -1060,6 +1258,132 @@ class App(mod_app_schema.AppDefinition, mod_instruments.WithInstrumentCallbacks,
             yield ctx
             ctx = ctx.token.old_value
 
+    # WithInstrumentCallbacks requirement
+    def get_capture_mode(self) -> Optional[mod_instruments.CaptureMode]:
+        """How instrumented methods capture their arguments and returns.
+
+        See
+        [WithInstrumentCallbacks.get_capture_mode][trulens_eval.instruments.WithInstrumentCallbacks.get_capture_mode].
+        """
+
+        if not self.defer_serialization:
+            return None
+
+        return self.capture_mode
+
+    # WithInstrumentCallbacks requirement
+    def get_payload_policy(
+        self, frame: mod_record_schema.RecordAppCallMethod, func: Callable
+    ) -> Optional[PayloadPolicy]:
+        """Limits on the recorded arguments and returns of the call of `func`
+        at `frame`.
+
+        See
+        [WithInstrumentCallbacks.get_payload_policy][trulens_eval.instruments.WithInstrumentCallbacks.get_payload_policy].
+        """
+
+        policy = getattr(func, mod_instruments.Instrument.PAYLOAD, None)
+        if policy is None:
+            policy = self.payload
+
+        if policy is None or self._selected_by_feedback(frame):
+            return None
+
+        return policy
+
+    # WithInstrumentCallbacks requirement
+    def get_overhead_profiler(self) -> Optional[OverheadProfiler]:
+        """Profiler to measure the overhead of recorded calls with.
+
+        See
+        [WithInstrumentCallbacks.get_overhead_profiler][trulens_eval.instruments.WithInstrumentCallbacks.get_overhead_profiler].
+        """
+
+        return self.overhead_profiler
+
+    def instrumentation_overhead_report(self) -> pandas.DataFrame:
+        """Time spent in instrumentation per instrumented method of this app,
+        most overhead first.
+
+        Requires an `overhead_profiler`. See
+        [OverheadProfiler.report][trulens_eval.utils.overhead.OverheadProfiler.report]
+        for the columns.
+        """
+
+        if self.overhead_profiler is None:
+            raise ValueError(
+                "Instrumentation overhead is not measured. "
+                "Give this app an `overhead_profiler` to measure it."
+            )
+
+        return self.overhead_profiler.report()
+
+    def _selected_by_feedback(
+        self, frame: mod_record_schema.RecordAppCallMethod
+    ) -> bool:
+        """Whether feedback functions of this app may select from the calls of
+        the method at `frame`."""
+
+        key = (frame.path, frame.method.name)
+
+        if key not in self.feedback_selected_calls:
+            # Where the calls are in records as per
+            # Record.layout_calls_as_app .
+            lens = mod_feedback_schema.Select.Record + frame.path._append(
+                GetItemOrAttribute(item_or_attribute=frame.method.name)
+            )
+
+            self.feedback_selected_calls[key] = any(
+                may_select(selector, lens)
+                for feedback in self.feedbacks
+                for selector in feedback.selectors.values()
+            )
+
+        return self.feedback_selected_calls[key]
+
+    # WithInstrumentCallbacks requirement
+    def on_root_call(
+        self, ctx: RecordingContext, func: Callable, sig: Signature,
+        args: Tuple, kwargs: Dict[str, Any]
+    ) -> bool:
+        """Called at the start of root calls to decide whether they are
+        recorded.
+
+        See
+        [WithInstrumentCallbacks.on_root_call][trulens_eval.instruments.WithInstrumentCallbacks.on_root_call].
+        """
+
+        if self.sampling is None or ctx.record_all:
+            return True
+
+        main_input = None
+        if self.sampling.needs_input():
+            try:
+                bindings = sig.bind(*args, **kwargs)
+                main_input = str(self.main_input(func, sig, bindings))
+            except Exception as e:
+                logger.debug(
+                    "Could not determine main input for sampling: %s", e
+                )
+
+        return self.sampling.sample(main_input)
+
+    # WithInstrumentCallbacks requirement
+    def on_unsampled_call(
+        self, ctx: RecordingContext, error: Optional[BaseException],
+        duration: float
+    ) -> bool:
+        """Called at the end of root calls that were not sampled to decide
+        whether to record them after all.
+
+        See
+        [WithInstrumentCallbacks.on_unsampled_call][trulens_eval.instruments.WithInstrumentCallbacks.on_unsampled_call].
+        """
+
+        return self.sampling is not None and self.sampling.keep_unsampled(
+            error=error, duration=duration
+        )
+
     # WithInstrumentCallbacks requirement
     def on_add_record(
         self,
@@ -1072,23 +1396,46 @@ class App(mod_app_schema.AppDefinition, mod_instruments.WithInstrumentCallbacks,
         perf: Perf,
         cost: Cost,
         existing_record: Optional[mod_record_schema.Record] = None
-    ) -> mod_record_schema.Record:
+    ) -> Optional[mod_record_schema.Record]:
         """Called by instrumented methods if they use _new_record to construct a record call list.
 
+        Returns None if serialization is deferred, in which case the record is
+        added to `ctx` once it is assembled in the background.
+
         See [WithInstrumentCallbacks.on_add_record][trulens_eval.instruments.WithInstrumentCallbacks.on_add_record].
         """
 
+        main_in = self.main_input(func, sig, bindings)
+        main_out = self.main_output(func, sig, bindings, ret)
+
+        # Read once as a concurrent `close` may unset it.
+        executor = self.serialization_executor
+        deferred = executor is not None and self.get_capture_mode() is not None
+
+        if deferred:
+            main_in = mod_instruments.capture(main_in, self.capture_mode)
+            main_out = mod_instruments.capture(main_out, self.capture_mode)
+
         def build_record(
-            calls: Iterable[mod_record_schema.RecordAppCall],
+            calls: Iterable[Union[mod_record_schema.RecordAppCall,
+                                  mod_instruments.DeferredCall]],
             record_metadata: JSON,
             existing_record: Optional[mod_record_schema.Record] = None
         ) -> mod_record_schema.Record:
-            calls = list(calls)
+            calls = [
+                call.serialize()
+                if isinstance(call, mod_instruments.DeferredCall) else call
+                for call in calls
+            ]
 
             assert len(calls) > 0, "No information recorded in call."
 
-            main_in = self.main_input(func, sig, bindings)
-            main_out = self.main_output(func, sig, bindings, ret)
+            if self.payload is not None:
+                self.payload.limit_calls(
+                    calls,
+                    limited=lambda call: not self.
+                    _selected_by_feedback(call.top())
+                )
 
             updates = dict(
                 main_input=jsonify(main_in),
@@ -1105,10 +1452,20 @@ class App(mod_app_schema.AppDefinition, mod_instruments.WithInstrumentCallbacks,
             if existing_record is not None:
                 existing_record.update(**updates)
             else:
-                existing_record = mod_record_schema.Record(**updates)
+                existing_record = mod_record_schema.Record(
+                    record_id_strategy=self.record_id_strategy, **updates
+                )
 
             return existing_record
 
+        if deferred and self._add_record_deferred(
+                ctx=ctx, executor=executor, build_record=build_record,
+                error=error, existing_record=existing_record):
+            return None
+
+        # Otherwise the worker was shut down by a concurrent `close` so the
+        # record is finished here as it is once closed.
+
         # Finishing record needs to be done in a thread lock, done there:
         record = ctx.finish_record(
             build_record, existing_record=existing_record
@@ -1119,23 +1476,10 @@ class App(mod_app_schema.AppDefinition, mod_instruments.WithInstrumentCallbacks,
             self._handle_error(record=record, error=error)
             raise error
 
-        # Will block on DB, but not on feedback evaluation, depending on
-        # FeedbackMode:
-        record.feedback_and_future_results = self._handle_record(record=record)
-        if record.feedback_and_future_results is not None:
-            record.feedback_results = [
-                tup[1] for tup in record.feedback_and_future_results
-            ]
-
-        if record.feedback_and_future_results is None:
-            return record
-
-        if self.feedback_mode == mod_feedback_schema.FeedbackMode.WITH_APP_THREAD:
-            # Add the record to ones with pending feedback.
+        self._handle_record_feedback(record)
 
-            self.records_with_pending_feedback_results.put(record)
-
-        elif self.feedback_mode == mod_feedback_schema.FeedbackMode.WITH_APP:
+        if self.feedback_mode == mod_feedback_schema.FeedbackMode.WITH_APP and \
+                record.feedback_and_future_results is not None:
             # If in blocking mode ("WITH_APP"), wait for feedbacks to finished
             # evaluating before returning the record.
 
@@ -1143,6 +1487,112 @@ class App(mod_app_schema.AppDefinition, mod_instruments.WithInstrumentCallbacks,
 
         return record
 
+    def _add_record_deferred(
+        self,
+        ctx: RecordingContext,
+        executor: ThreadPoolExecutor,
+        build_record: Callable[..., mod_record_schema.Record],
+        error: Any,
+        existing_record: Optional[mod_record_schema.Record] = None
+    ) -> bool:
+        """Assemble the record of a root call from the calls tracked in `ctx` in
+        the serialization worker `executor` and add it to `ctx` once done.
+
+        Returns False, leaving the calls tracked in `ctx`, if `executor` was
+        shut down.
+        """
+
+        def finish(
+            calls: List[Union[mod_record_schema.RecordAppCall,
+                              mod_instruments.DeferredCall]],
+            record_metadata: JSON
+        ) -> mod_record_schema.Record:
+            record = build_record(calls, record_metadata, existing_record)
+
+            if existing_record is None:
+                ctx.add_record(record)
+
+            if error is not None:
+                self._handle_error(record=record, error=error)
+            else:
+                self._handle_record_feedback(record)
+
+            return record
+
+        def log_error(future: Future[mod_record_schema.Record]) -> None:
+            # Nobody may ever wait for the record, so report failures here.
+            if not future.cancelled() and future.exception() is not None:
+                logger.error(
+                    "Could not assemble or add a record: %s",
+                    future.exception(),
+                    exc_info=future.exception()
+                )
+
+        # Take the calls now as the context may be used for more root calls
+        # while this record is being assembled.
+        future = ctx.submit_record(executor, finish)
+        if future is None:
+            return False
+
+        future.add_done_callback(log_error)
+
+        if error is not None:
+            raise error
+
+        if self.feedback_mode == mod_feedback_schema.FeedbackMode.WITH_APP:
+            # Blocking mode ("WITH_APP") waits for feedbacks anyway so also
+            # wait for the record.
+            record = future.result()
+            if record.feedback_and_future_results is not None:
+                record.wait_for_feedback_results()
+
+        return True
+
+    def _handle_record_feedback(self, record: mod_record_schema.Record) -> None:
+        """Insert the given record and start its feedback functions as per the
+        feedback mode."""
+
+        feedback_mode = self.feedback_mode
+
+        # Only the ids of records with feedback running in this process are
+        # tracked, up to a limit.
+        tracked = feedback_mode == mod_feedback_schema.FeedbackMode.WITH_APP_THREAD \
+            and self.tru is not None and len(self.feedbacks) > 0
+
+        if tracked and not self.pending_feedback.reserve():
+            tracked = False
+
+            if self.pending_feedback.overflow == Overflow.DEFER:
+                feedback_mode = mod_feedback_schema.FeedbackMode.DEFERRED
+            else:
+                feedback_mode = mod_feedback_schema.FeedbackMode.NONE
+
+        try:
+            # Will block on DB, but not on feedback evaluation, depending on
+            # FeedbackMode:
+            record.feedback_and_future_results = self._handle_record(
+                record=record, feedback_mode=feedback_mode
+            )
+
+        except Exception:
+            if tracked:
+                self.pending_feedback.release()
+            raise
+
+        if record.feedback_and_future_results is None:
+            if tracked:
+                self.pending_feedback.release()
+            return
+
+        record.feedback_results = [
+            tup[1] for tup in record.feedback_and_future_results
+        ]
+
+        if tracked:
+            self.pending_feedback.track(
+                record.record_id, record.feedback_results
+            )
+
     def _check_instrumented(self, func):
         """
         Issue a warning and some instructions if a function that has not been
@@ -1220,14 +1670,43 @@ you use the `%s` wrapper to make sure `%s` does get instrumented. `%s` method
         """
         Call the given `func` with the given `*args` and `**kwargs`, producing
         its results as well as a record of the execution.
+
+        Methods that stream their results, i.e. return a generator, are
+        recorded right away with the unconsumed stream as their return. This is
+        deprecated. Consume the stream while using the app as a context manager
+        instead to get a record including its chunks:
+
+        Example:
+            ```python
+            with truapp as recording:
+                for chunk in app.stream(...):
+                    ...
+
+            record = recording.get()
+            ```
         """
 
         self._check_instrumented(func)
 
         with self as ctx:
             ctx.record_metadata = record_metadata
+            # A record is expected back so sampling does not apply.
+            ctx.record_all = True
+            # A record is expected back before the stream is consumed.
+            ctx.stream_placeholders = True
             ret = func(*args, **kwargs)
 
+        if inspect.isgenerator(ret) or inspect.isasyncgen(ret):
+            warnings.warn(
+                (
+                    f"Using `with_record` with {callable_name(func)}, which returns a stream, is deprecated "
+                    f"as its record does not include the streamed chunks. "
+                    f"Consume the stream while using the app as a context manager to get a complete record instead."
+                ),
+                DeprecationWarning,
+                stacklevel=2
+            )
+
         assert len(ctx.records) > 0, (
             f"Did not create any records. "
             f"This means that no instrumented methods were invoked in the process of calling {func}."
@@ -23,7 +23,8 @@ if config.config_file_name is not None:
             f"Alembic config file not found: {config.config_file_name}."
         )
 
-    fileConfig(config.config_file_name)
+    # Loggers of the app created before migrations run are kept enabled.
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
 
 # Get `sqlalchemy.url` from the environment.
 if config.get_main_option("sqlalchemy.url", None) is None:
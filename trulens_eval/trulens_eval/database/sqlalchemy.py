@@ -634,18 +634,31 @@ def _extract_feedback_results(
             "type",
         ],
     )
-    df["latency"] = _extract_latency(df["perf_json"])
-    df = pd.concat([df, _extract_tokens_and_cost(df["cost_json"])], axis=1)
+    df = pd.concat(
+        [
+            df,
+            _extract_perf(df["perf_json"]),
+            _extract_tokens_and_cost(df["cost_json"])
+        ],
+        axis=1
+    )
     return df
 
 
-def _extract_latency(
+def _extract_perf(
     series: Iterable[Union[str, dict, mod_base_schema.Perf]]
-) -> pd.Series:
+) -> pd.DataFrame:
+    """Latency and streaming metrics of each of the given perfs.
+
+    Streaming metrics are in seconds and NaN for records whose main output was
+    not streamed.
+    """
 
-    def _extract(perf_json: Union[str, dict, mod_base_schema.Perf]) -> int:
+    def _extract(
+        perf_json: Union[str, dict, mod_base_schema.Perf]
+    ) -> Tuple[float, float, float, float]:
         if perf_json == MIGRATION_UNKNOWN_STR:
-            return np.nan
+            return np.nan, np.nan, np.nan, np.nan
 
         if isinstance(perf_json, str):
             perf_json = json.loads(perf_json)
@@ -654,14 +667,26 @@ def _extract_latency(
             perf_json = mod_base_schema.Perf.model_validate(perf_json)
 
         if isinstance(perf_json, mod_base_schema.Perf):
-            return perf_json.latency.seconds
+            ttfc = perf_json.time_to_first_chunk
+            chunk_latency = perf_json.chunk_latency
+
+            return (
+                perf_json.latency.seconds,
+                ttfc.total_seconds() if ttfc is not None else np.nan,
+                perf_json.n_chunks
+                if perf_json.n_chunks is not None else np.nan,
+                chunk_latency.mean if chunk_latency is not None else np.nan
+            )
 
         if perf_json is None:
-            return 0
+            return 0, np.nan, np.nan, np.nan
 
         raise ValueError(f"Failed to parse perf_json: {perf_json}")
 
-    return pd.Series(data=(_extract(p) for p in series))
+    return pd.DataFrame(
+        data=(_extract(p) for p in series),
+        columns=["latency", "time_to_first_chunk", "n_chunks", "chunk_latency"],
+    )
 
 
 def _extract_tokens_and_cost(cost_json: pd.Series) -> pd.DataFrame:
@@ -687,7 +712,10 @@ class AppsExtractor:
         "record_id", "input", "output", "tags", "record_json", "cost_json",
         "perf_json", "ts"
     ]
-    extra_cols = ["latency", "total_tokens", "total_cost"]
+    extra_cols = [
+        "latency", "time_to_first_chunk", "n_chunks", "chunk_latency",
+        "total_tokens", "total_cost"
+    ]
     all_cols = app_cols + rec_cols + extra_cols
 
     def __init__(self):
@@ -697,11 +725,17 @@ class AppsExtractor:
         self, apps: Iterable[orm.AppDefinition]
     ) -> Tuple[pd.DataFrame, Sequence[str]]:
         df = pd.concat(self.extract_apps(apps))
-        df["latency"] = _extract_latency(df["perf_json"])
         df.reset_index(
             drop=True, inplace=True
         )  # prevent index mismatch on the horizontal concat that follows
-        df = pd.concat([df, _extract_tokens_and_cost(df["cost_json"])], axis=1)
+        df = pd.concat(
+            [
+                df,
+                _extract_perf(df["perf_json"]),
+                _extract_tokens_and_cost(df["cost_json"])
+            ],
+            axis=1
+        )
         return df, list(self.feedback_columns)
 
     def extract_apps(
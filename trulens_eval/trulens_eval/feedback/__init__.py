@@ -1,27 +1,41 @@
 # Specific feedback functions:
 # Main class holding and running feedback functions:
-from trulens_eval.feedback import feedback as mod_feedback
-from trulens_eval.feedback.embeddings import Embeddings
-from trulens_eval.feedback.groundtruth import GroundTruthAgreement
 # Providers of feedback functions evaluation:
-from trulens_eval.feedback.provider.hugs import Huggingface
-from trulens_eval.feedback.provider.langchain import Langchain
-from trulens_eval.utils.imports import OptionalImports
+# These are imported on first access, see trulens_eval/__init__.py .
+from typing import TYPE_CHECKING
+
+from trulens_eval.utils.imports import lazy_module_attributes
 from trulens_eval.utils.imports import REQUIREMENT_BEDROCK
 from trulens_eval.utils.imports import REQUIREMENT_LITELLM
 from trulens_eval.utils.imports import REQUIREMENT_OPENAI
 
-with OptionalImports(messages=REQUIREMENT_BEDROCK):
+if TYPE_CHECKING:
+    from trulens_eval.feedback.embeddings import Embeddings
+    from trulens_eval.feedback.feedback import Feedback
+    from trulens_eval.feedback.groundtruth import GroundTruthAgreement
     from trulens_eval.feedback.provider.bedrock import Bedrock
-
-with OptionalImports(messages=REQUIREMENT_LITELLM):
+    from trulens_eval.feedback.provider.hugs import Huggingface
+    from trulens_eval.feedback.provider.langchain import Langchain
     from trulens_eval.feedback.provider.litellm import LiteLLM
-
-with OptionalImports(messages=REQUIREMENT_OPENAI):
     from trulens_eval.feedback.provider.openai import AzureOpenAI
     from trulens_eval.feedback.provider.openai import OpenAI
 
-Feedback = mod_feedback.Feedback
+__getattr__, __dir__ = lazy_module_attributes(
+    __name__, {
+        "Feedback": ("trulens_eval.feedback.feedback", None),
+        "Embeddings": ("trulens_eval.feedback.embeddings", None),
+        "GroundTruthAgreement": ("trulens_eval.feedback.groundtruth", None),
+        "OpenAI": ("trulens_eval.feedback.provider.openai", REQUIREMENT_OPENAI),
+        "AzureOpenAI":
+            ("trulens_eval.feedback.provider.openai", REQUIREMENT_OPENAI),
+        "Huggingface": ("trulens_eval.feedback.provider.hugs", None),
+        "LiteLLM":
+            ("trulens_eval.feedback.provider.litellm", REQUIREMENT_LITELLM),
+        "Bedrock":
+            ("trulens_eval.feedback.provider.bedrock", REQUIREMENT_BEDROCK),
+        "Langchain": ("trulens_eval.feedback.provider.langchain", None),
+    }
+)
 
 __all__ = [
     "Feedback",
@@ -1,39 +1,257 @@
-from typing import Dict, Tuple, Union
+from collections import OrderedDict
+import hashlib
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 from pydantic import PrivateAttr
 
 from trulens_eval.utils.imports import OptionalImports
 from trulens_eval.utils.imports import REQUIREMENT_LLAMA
-from trulens_eval.utils.imports import REQUIREMENT_SKLEARN
 from trulens_eval.utils.pyschema import WithClassInfo
 from trulens_eval.utils.serial import SerialModel
 
-with OptionalImports(messages=REQUIREMENT_SKLEARN):
-    import sklearn
-
 with OptionalImports(messages=REQUIREMENT_LLAMA):
     from llama_index.legacy import ServiceContext
 
+METRICS = ("cosine", "manhattan", "euclidean")
+"""Supported embedding distance metrics."""
+
+
+def distances(
+    query: np.ndarray, documents: np.ndarray, metric: str
+) -> np.ndarray:
+    """Distances between one query embedding and each row of a matrix of
+    document embeddings, computed in one vectorized operation.
+
+    Matches the corresponding `sklearn.metrics.pairwise` distances.
+
+    Args:
+        query: Query embedding of shape (d,).
+
+        documents: Document embeddings of shape (n, d).
+
+        metric: One of "cosine", "manhattan" or "euclidean".
+
+    Returns:
+        np.ndarray: Distances of shape (n,).
+    """
+
+    if metric == "cosine":
+        norms = np.linalg.norm(documents, axis=1) * np.linalg.norm(query)
+        # Zero vectors have no direction; sklearn treats them as orthogonal.
+        norms[norms == 0.0] = 1.0
+        return np.clip(1.0 - (documents @ query) / norms, 0.0, 2.0)
+
+    if metric == "manhattan":
+        return np.abs(documents - query).sum(axis=1)
+
+    if metric == "euclidean":
+        return np.sqrt(((documents - query)**2).sum(axis=1))
+
+    raise ValueError(f"Unknown metric {metric}. Expected one of {METRICS}.")
+
+
+class EmbeddingCache:
+    """LRU cache of embedding vectors keyed by model and text hash, optionally
+    persisted to a sqlite file so embeddings survive across processes.
+
+    Args:
+        max_size: Maximum number of vectors kept in memory.
+
+        path: Sqlite file to persist vectors to. Not persisted if None.
+    """
+
+    def __init__(self, max_size: int = 4096, path: Optional[str] = None):
+        self.max_size = max_size
+        self.path = path
+
+        self._lock = threading.Lock()
+        self._vectors: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
+        self._db: Optional[sqlite3.Connection] = None
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings "
+                "(key TEXT PRIMARY KEY, vector BLOB)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def key(model: str, kind: str, text: str) -> str:
+        """Cache key of the embedding of the given kind ("query" or "text") of
+        the text by the given model."""
+
+        return hashlib.sha256("\0".join((model, kind, text)).encode("utf-8")
+                             ).hexdigest()
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Get the cached vector for the given key, if any."""
+
+        with self._lock:
+            vector = self._vectors.get(key)
+            if vector is not None:
+                self._vectors.move_to_end(key)
+                return vector
+
+            if self._db is None:
+                return None
+
+            row = self._db.execute(
+                "SELECT vector FROM embeddings WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            vector = np.frombuffer(row[0], dtype=np.float64)
+            self._remember(key, vector)
+
+            return vector
+
+    def put(self, key: str, vector: np.ndarray) -> None:
+        """Cache the given vector."""
+
+        vector = np.asarray(vector, dtype=np.float64)
+
+        with self._lock:
+            self._remember(key, vector)
+
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO embeddings VALUES (?, ?)",
+                    (key, vector.tobytes())
+                )
+                self._db.commit()
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        self._vectors[key] = vector
+        self._vectors.move_to_end(key)
+
+        while len(self._vectors) > self.max_size:
+            self._vectors.popitem(last=False)
+
 
 class Embeddings(WithClassInfo, SerialModel):
     """Embedding related feedback function implementations.
     """
     _embed_model: 'Embedder' = PrivateAttr()
 
-    def __init__(self, embed_model: 'Embedder' = None):
+    cache_size: int = 4096
+    """Number of embeddings kept in memory."""
+
+    cache_path: Optional[str] = None
+    """Sqlite file to persist embeddings to. Not persisted if None."""
+
+    _cache: EmbeddingCache = PrivateAttr()
+
+    def __init__(
+        self,
+        embed_model: 'Embedder' = None,
+        cache_size: int = 4096,
+        cache_path: Optional[str] = None
+    ):
         """Instantiates embeddings for feedback functions. 
         ```
         f_embed = feedback.Embeddings(embed_model=embed_model)
         ```
 
+        Embeddings are cached by model and text so each unique text is
+        embedded once.
+
         Args:
             embed_model ('Embedder'): Supported embedders taken from llama-index: https://gpt-index.readthedocs.io/en/latest/core_modules/model_modules/embeddings/root.html
+
+            cache_size (int): Number of embeddings kept in memory.
+
+            cache_path (Optional[str]): Sqlite file to persist embeddings to.
         """
 
         service_context = ServiceContext.from_defaults(embed_model=embed_model)
+        super().__init__(cache_size=cache_size, cache_path=cache_path)
         self._embed_model = service_context.embed_model
-        super().__init__()
+        self._cache = EmbeddingCache(max_size=cache_size, path=cache_path)
+
+    @property
+    def _model_name(self) -> str:
+        return getattr(self._embed_model, "model_name",
+                       None) or type(self._embed_model).__name__
+
+    def _query_embedding(self, query: str) -> np.ndarray:
+        """Embedding of the given query, cached."""
+
+        key = EmbeddingCache.key(self._model_name, "query", query)
+
+        vector = self._cache.get(key)
+        if vector is None:
+            vector = np.asarray(
+                self._embed_model.get_query_embedding(query), dtype=np.float64
+            )
+            self._cache.put(key, vector)
+
+        return vector
+
+    def text_embeddings(self, texts: Sequence[str]) -> np.ndarray:
+        """Embeddings of the given texts as rows of a matrix. Texts not in the
+        cache are embedded in one batched call, each unique text once.
+        
+        Without texts, the matrix has shape (0, 0) as the model is not called
+        to find out the size of its embeddings.
+        """
+
+        if len(texts) == 0:
+            return np.empty((0, 0), dtype=np.float64)
+
+        keys = [
+            EmbeddingCache.key(self._model_name, "text", text) for text in texts
+        ]
+        vectors: Dict[str, np.ndarray] = {}
+        missing: Dict[str, str] = {}
+
+        for key, text in zip(keys, texts):
+            if key in vectors or key in missing:
+                continue
+
+            vector = self._cache.get(key)
+            if vector is None:
+                missing[key] = text
+            else:
+                vectors[key] = vector
+
+        if missing:
+            embedded = self._embed_model.get_text_embedding_batch(
+                list(missing.values())
+            )
+            for key, vector in zip(missing.keys(), embedded):
+                vector = np.asarray(vector, dtype=np.float64)
+                self._cache.put(key, vector)
+                vectors[key] = vector
+
+        return np.stack([vectors[key] for key in keys])
+
+    def _distances(
+        self, query: str, documents: Sequence[str], metric: str
+    ) -> np.ndarray:
+        if len(documents) == 0:
+            return np.empty(0, dtype=np.float64)
+
+        return distances(
+            self._query_embedding(query), self.text_embeddings(documents),
+            metric
+        )
+
+    def _distances_many(
+        self, query: str, documents: Sequence[str], metric: str
+    ) -> Tuple[float, Dict[str, List[float]]]:
+        dists = self._distances(query, documents, metric)
+
+        if len(dists) == 0:
+            # No documents, no mean distance.
+            return np.nan, {"distances": []}
+
+        return float(np.mean(dists)), {"distances": dists.tolist()}
 
     def cosine_distance(
         self, query: str, document: str
@@ -73,23 +291,7 @@ class Embeddings(WithClassInfo, SerialModel):
         Returns:
             - float: the embedding vector distance
         """
-        import sklearn
-        query_embed = np.asarray(
-            self._embed_model.get_query_embedding(query)
-        ).reshape(
-            1, -1
-        )  # sklearn expects 2d array (first dimension number of samples)
-        document_embed = np.asarray(
-            self._embed_model.get_text_embedding(document)
-        ).reshape(
-            1, -1
-        )  # sklearn expects 2d array (first dimension number of samples)
-
-        return sklearn.metrics.pairwise.cosine_distances(
-            query_embed, document_embed
-        )[0][
-            0
-        ]  # final results will be dimensions (sample query x sample doc) === (1,1)
+        return self._distances(query, [document], "cosine")[0]
 
     def manhattan_distance(
         self, query: str, document: str
@@ -129,23 +331,7 @@ class Embeddings(WithClassInfo, SerialModel):
         Returns:
             - float: the embedding vector distance
         """
-        import sklearn
-        query_embed = np.asarray(
-            self._embed_model.get_query_embedding(query)
-        ).reshape(
-            1, -1
-        )  # sklearn expects 2d array (first dimension number of samples)
-        document_embed = np.asarray(
-            self._embed_model.get_text_embedding(document)
-        ).reshape(
-            1, -1
-        )  # sklearn expects 2d array (first dimension number of samples)
-
-        return sklearn.metrics.pairwise.manhattan_distances(
-            query_embed, document_embed
-        )[0][
-            0
-        ]  # final results will be dimensions (sample query x sample doc) === (1,1)
+        return self._distances(query, [document], "manhattan")[0]
 
     def euclidean_distance(
         self, query: str, document: str
@@ -185,20 +371,69 @@ class Embeddings(WithClassInfo, SerialModel):
         Returns:
             - float: the embedding vector distance
         """
-        import sklearn
-        query_embed = np.asarray(
-            self._embed_model.get_query_embedding(query)
-        ).reshape(
-            1, -1
-        )  # sklearn expects 2d array (first dimension number of samples)
-        document_embed = np.asarray(
-            self._embed_model.get_text_embedding(document)
-        ).reshape(
-            1, -1
-        )  # sklearn expects 2d array (first dimension number of samples)
-
-        return sklearn.metrics.pairwise.euclidean_distances(
-            query_embed, document_embed
-        )[0][
-            0
-        ]  # final results will be dimensions (sample query x sample doc) === (1,1)
+        return self._distances(query, [document], "euclidean")[0]
+
+    def cosine_distance_many(
+        self, query: str, documents: Sequence[str]
+    ) -> Tuple[float, Dict[str, List[float]]]:
+        """
+        Runs cosine distance between the query embedding and each of the
+        document embeddings in one vectorized operation. See `cosine_distance`.
+
+        !!! example
+
+            ```python
+            f_embed_dist = feedback.Feedback(f_embed.cosine_distance_many)\
+                .on_input()\
+                .on(Select.Record.app.combine_documents_chain._call.args.inputs.input_documents[:].page_content.collect())
+            ```
+
+        Args:
+            query (str): A text prompt to a vector DB.
+            documents (Sequence[str]): The documents returned from the vector DB.
+
+        Returns:
+            - float: the mean embedding vector distance, NaN without
+              documents
+            - dict: the distance of each document
+        """
+
+        return self._distances_many(query, documents, "cosine")
+
+    def manhattan_distance_many(
+        self, query: str, documents: Sequence[str]
+    ) -> Tuple[float, Dict[str, List[float]]]:
+        """
+        Runs L1 distance between the query embedding and each of the document
+        embeddings in one vectorized operation. See `manhattan_distance`.
+
+        Args:
+            query (str): A text prompt to a vector DB.
+            documents (Sequence[str]): The documents returned from the vector DB.
+
+        Returns:
+            - float: the mean embedding vector distance, NaN without
+              documents
+            - dict: the distance of each document
+        """
+
+        return self._distances_many(query, documents, "manhattan")
+
+    def euclidean_distance_many(
+        self, query: str, documents: Sequence[str]
+    ) -> Tuple[float, Dict[str, List[float]]]:
+        """
+        Runs L2 distance between the query embedding and each of the document
+        embeddings in one vectorized operation. See `euclidean_distance`.
+
+        Args:
+            query (str): A text prompt to a vector DB.
+            documents (Sequence[str]): The documents returned from the vector DB.
+
+        Returns:
+            - float: the mean embedding vector distance, NaN without
+              documents
+            - dict: the distance of each document
+        """
+
+        return self._distances_many(query, documents, "euclidean")
@@ -0,0 +1,82 @@
+"""
+# Groundedness Utilities
+
+Sentence segmentation shared by the groundedness feedback functions of
+[Huggingface][trulens_eval.feedback.provider.hugs.Huggingface] and
+[LLMProvider][trulens_eval.feedback.provider.base.LLMProvider].
+
+The punkt tokenizer is loaded once per process and sentence splits are
+memoized, as the same response is typically checked against several sources
+(or by several feedback functions).
+"""
+
+import functools
+import logging
+import threading
+from typing import Tuple
+
+import nltk
+from nltk.tokenize import sent_tokenize
+
+logger = logging.getLogger(__name__)
+
+PUNKT_RESOURCES = ("punkt_tab", "punkt")
+"""Tokenizer resources used by `sent_tokenize`. Newer versions of nltk use
+"punkt_tab" while older use "punkt"."""
+
+_punkt_lock = threading.Lock()
+_punkt_ready = False
+
+
+def ensure_punkt() -> None:
+    """Make sure the punkt tokenizer is available, downloading it only if it
+    cannot be found."""
+
+    global _punkt_ready
+
+    if _punkt_ready:
+        return
+
+    with _punkt_lock:
+        if _punkt_ready:
+            return
+
+        for resource in PUNKT_RESOURCES:
+            try:
+                nltk.data.find(f"tokenizers/{resource}")
+            except LookupError:
+                logger.info("Downloading nltk resource %s.", resource)
+                nltk.download(resource, quiet=True)
+
+        _punkt_ready = True
+
+
+@functools.lru_cache(maxsize=1024)
+def sentences(text: str) -> Tuple[str, ...]:
+    """Split the given text into sentences. Memoized."""
+
+    ensure_punkt()
+
+    return tuple(sent_tokenize(text))
+
+
+@functools.lru_cache(maxsize=256)
+def chunks(text: str, max_chars: int) -> Tuple[str, ...]:
+    """Split the given text into chunks of whole sentences of at most
+    `max_chars` characters each, unless a single sentence is longer. Memoized.
+    """
+
+    ret = []
+    current = ""
+
+    for sentence in sentences(text):
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            ret.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+
+    if current:
+        ret.append(current)
+
+    return tuple(ret)
@@ -1,9 +1,15 @@
 import logging
-from typing import Callable, ClassVar, Dict, List, Optional, Tuple, Union
+import re
+import threading
+from typing import (
+    Any, Callable, ClassVar, Dict, List, Optional, Sequence, Tuple, Union
+)
+import unicodedata
 
 import numpy as np
 import pydantic
 
+from trulens_eval.feedback.embeddings import Embeddings
 from trulens_eval.feedback.provider import Provider
 from trulens_eval.utils.generated import re_0_10_rating
 from trulens_eval.utils.imports import OptionalImports
@@ -25,6 +31,104 @@ with OptionalImports(messages=REQUIREMENT_EVALUATE):
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_BERT_SCORE_BATCH_SIZE: int = 64
+"""Default number of pairs per BERTScore model invocation."""
+
+_shared_lock = threading.Lock()
+_shared_bert_scorers: Dict[str, "BERTScorer"] = {}
+_shared_metrics: Dict[str, Tuple[Any, threading.Lock]] = {}
+
+
+def shared_bert_scorer(lang: str = "en") -> "BERTScorer":
+    """Get the BERTScore scorer for the given language, loading its model only
+    once per process."""
+
+    with _shared_lock:
+        scorer = _shared_bert_scorers.get(lang)
+        if scorer is None:
+            logger.info("Loading BERTScore model for language %s.", lang)
+            scorer = BERTScorer(lang=lang, rescale_with_baseline=True)
+            _shared_bert_scorers[lang] = scorer
+
+        return scorer
+
+
+def shared_metric(name: str) -> Tuple[Any, threading.Lock]:
+    """Get the `evaluate` metric of the given name, loading it only once per
+    process, along with a lock to hold while computing it as metrics are not
+    thread-safe."""
+
+    with _shared_lock:
+        metric = _shared_metrics.get(name)
+        if metric is None:
+            metric = (evaluate.load(name), threading.Lock())
+            _shared_metrics[name] = metric
+
+        return metric
+
+
+def _check_pairs(responses: Sequence[str], references: Sequence[str]) -> None:
+    if len(responses) != len(references):
+        raise ValueError(
+            f"Got {len(responses)} response(s) "
+            f"but {len(references)} reference(s)."
+        )
+
+
+_PATTERN_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(text: str) -> str:
+    """Normalize text for ground truth lookup: unicode normalization, case
+    folding and whitespace collapsing."""
+
+    text = unicodedata.normalize("NFKC", text).casefold()
+
+    return _PATTERN_WHITESPACE.sub(" ", text).strip()
+
+
+class _NearestNeighbors:
+    """Index of vectors for finding the nearest one to a given vector by cosine
+    distance.
+
+    Uses an approximate hnswlib index if hnswlib is installed and otherwise an
+    exact search as one vectorized operation.
+    """
+
+    def __init__(self, vectors: np.ndarray):
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0.0] = 1.0
+        self.vectors = vectors / norms
+
+        self.hnsw = None
+
+        try:
+            import hnswlib
+        except ImportError:
+            return
+
+        n, dim = self.vectors.shape
+        self.hnsw = hnswlib.Index(space="cosine", dim=dim)
+        self.hnsw.init_index(max_elements=max(1, n), ef_construction=200, M=16)
+        self.hnsw.add_items(self.vectors, np.arange(n))
+        self.hnsw.set_ef(64)
+
+    def nearest(self, vector: np.ndarray) -> Tuple[int, float]:
+        """Index of and cosine distance to the nearest vector."""
+
+        norm = np.linalg.norm(vector)
+        if norm > 0.0:
+            vector = vector / norm
+
+        if self.hnsw is not None:
+            labels, dists = self.hnsw.knn_query(vector, k=1)
+            return int(labels[0][0]), float(dists[0][0])
+
+        similarities = self.vectors @ vector
+        i = int(np.argmax(similarities))
+
+        return i, float(1.0 - similarities[i])
+
 
 # TODEP
 class GroundTruthAgreement(WithClassInfo, SerialModel):
@@ -40,13 +144,47 @@ class GroundTruthAgreement(WithClassInfo, SerialModel):
 
     ground_truth_imp: Optional[Callable] = pydantic.Field(None, exclude=True)
 
+    embeddings: Optional[Embeddings] = pydantic.Field(None, exclude=True)
+    """Embeddings for fuzzy matching of queries not found in the ground truth
+    after normalization. Fuzzy matching is disabled if None."""
+
+    fuzzy_max_distance: float = 0.05
+    """Maximum cosine distance between the embeddings of a query and a ground
+    truth query for them to match."""
+
+    batch_size: int = DEFAULT_BERT_SCORE_BATCH_SIZE
+    """Number of pairs per BERTScore model invocation."""
+
     model_config: ClassVar[dict] = dict(arbitrary_types_allowed=True)
 
+    _query_index: Dict[str, int] = pydantic.PrivateAttr(default_factory=dict)
+    """Position in `ground_truth` of the first entry of each normalized
+    query."""
+
+    _pair_index: Dict[Tuple[str, str],
+                      int] = pydantic.PrivateAttr(default_factory=dict)
+    """Position in `ground_truth` of the first entry of each normalized
+    query/response pair."""
+
+    _queries: List[str] = pydantic.PrivateAttr(default_factory=list)
+    """Distinct normalized queries in the order of their nearest neighbor
+    index."""
+
+    _neighbors: Optional[_NearestNeighbors] = pydantic.PrivateAttr(None)
+
+    _indexed: bool = pydantic.PrivateAttr(False)
+
+    _index_lock: threading.Lock = pydantic.PrivateAttr(
+        default_factory=threading.Lock
+    )
+
     def __init__(
         self,
         ground_truth: Union[List, Callable, FunctionOrMethod],
         provider: Optional[Provider] = None,
         bert_scorer: Optional["BERTScorer"] = None,
+        embeddings: Optional[Embeddings] = None,
+        fuzzy_max_distance: float = 0.05,
         **kwargs
     ):
         """Measures Agreement against a Ground Truth. 
@@ -69,10 +207,28 @@ class GroundTruthAgreement(WithClassInfo, SerialModel):
         ground_truth_collection = GroundTruthAgreement(ground_truth_imp)
         ```
 
+        Queries in a list ground truth are indexed when constructed. Lookups
+        ignore case, unicode and whitespace differences. Optionally, queries
+        without such a match are matched to the most similar ground truth query
+        by embedding if close enough.
+
+        Usage 3:
+        ```
+        from trulens_eval.feedback import Embeddings
+        from trulens_eval.feedback import GroundTruthAgreement
+        ground_truth_collection = GroundTruthAgreement(
+            golden_set,
+            embeddings=Embeddings(embed_model=embed_model),
+            fuzzy_max_distance=0.05
+        )
+        ```
+
         Args:
             ground_truth (Union[Callable, FunctionOrMethod]): A list of query/response pairs or a function or callable that returns a ground truth string given a prompt string.
             bert_scorer (Optional[&quot;BERTScorer&quot;], optional): Internal Usage for DB serialization.
             provider (Provider, optional): Internal Usage for DB serialization.
+            embeddings (Optional[Embeddings]): Embeddings for fuzzy query matching.
+            fuzzy_max_distance (float): Maximum cosine distance for fuzzy matches.
 
         """
         if not provider:
@@ -98,35 +254,96 @@ class GroundTruthAgreement(WithClassInfo, SerialModel):
             ground_truth_imp=ground_truth_imp,
             provider=provider,
             bert_scorer=bert_scorer,
+            embeddings=embeddings,
+            fuzzy_max_distance=fuzzy_max_distance,
             **kwargs
         )
 
+        if ground_truth_imp is None:
+            self._ensure_index()
+
+    def _ensure_index(self) -> None:
+        """Index the list ground truth by normalized query and query/response
+        pair, and by query embedding if fuzzy matching is enabled, unless
+        already indexed."""
+
+        if self._indexed:
+            return
+
+        with self._index_lock:
+            if self._indexed:
+                return
+
+            self._build_index()
+            self._indexed = True
+
+    def _build_index(self) -> None:
+        for i, qr in enumerate(self.ground_truth):
+            query = normalize_query(qr["query"])
+
+            if query not in self._query_index:
+                self._query_index[query] = i
+                self._queries.append(query)
+
+            if "response" in qr:
+                self._pair_index.setdefault(
+                    (query, normalize_query(qr["response"])), i
+                )
+
+        if self.embeddings is not None and len(self._queries) > 0:
+            self._neighbors = _NearestNeighbors(
+                self.embeddings.text_embeddings(self._queries)
+            )
+
+    def _match_query(self, prompt: str) -> Optional[str]:
+        """Find the normalized ground truth query matching the prompt."""
+
+        self._ensure_index()
+
+        query = normalize_query(prompt)
+        if query in self._query_index:
+            return query
+
+        if self._neighbors is None:
+            return None
+
+        i, distance = self._neighbors.nearest(
+            self.embeddings.text_embeddings([query])[0]
+        )
+        if distance > self.fuzzy_max_distance:
+            return None
+
+        logger.debug(
+            "Matched query %s to ground truth query %s at distance %s.", prompt,
+            self._queries[i], distance
+        )
+
+        return self._queries[i]
+
     def _find_response(self, prompt: str) -> Optional[str]:
         if self.ground_truth_imp is not None:
             return self.ground_truth_imp(prompt)
 
-        responses = [
-            qr["response"] for qr in self.ground_truth if qr["query"] == prompt
-        ]
-        if responses:
-            return responses[0]
-        else:
+        query = self._match_query(prompt)
+        if query is None:
             return None
 
+        return self.ground_truth[self._query_index[query]]["response"]
+
     def _find_score(self, prompt: str, response: str) -> Optional[float]:
         if self.ground_truth_imp is not None:
             return self.ground_truth_imp(prompt)
 
-        responses = [
-            qr["expected_score"]
-            for qr in self.ground_truth
-            if qr["query"] == prompt and qr["response"] == response
-        ]
-        if responses:
-            return responses[0]
-        else:
+        query = self._match_query(prompt)
+        if query is None:
+            return None
+
+        i = self._pair_index.get((query, normalize_query(response)))
+        if i is None:
             return None
 
+        return self.ground_truth[i]["expected_score"]
+
     # TODEP
     def agreement_measure(
         self, prompt: str, response: str
@@ -237,21 +454,61 @@ class GroundTruthAgreement(WithClassInfo, SerialModel):
                 being "in agreement".
             - dict: with key 'ground_truth_response'
         """
-        if self.bert_scorer is None:
-            self.bert_scorer = BERTScorer(lang="en", rescale_with_baseline=True)
         ground_truth_response = self._find_response(prompt)
         if ground_truth_response:
-            bert_score = self.bert_scorer.score(
-                [response], [ground_truth_response]
-            )
-            ret = bert_score[0].item(), dict(
-                ground_truth_response=ground_truth_response
-            )
+            score = self.bert_score_batch([response],
+                                          [ground_truth_response])[0]
+            ret = score, dict(ground_truth_response=ground_truth_response)
         else:
             ret = np.nan
 
         return ret
 
+    def bert_score_batch(
+        self, responses: Sequence[str], references: Sequence[str]
+    ) -> List[float]:
+        """
+        BERT Score of each response against the reference at the same
+        position, computed in batches of `batch_size` pairs. The scorer model
+        is loaded once per process. The number of CPU threads it uses is
+        process-wide and left to the application, see `torch.set_num_threads`.
+
+        !!! example
+
+            ```python
+            from trulens_eval.feedback import GroundTruthAgreement
+
+            ground_truth_collection = GroundTruthAgreement(golden_set)
+
+            scores = ground_truth_collection.bert_score_batch(
+                responses=[app(gt["query"]) for gt in golden_set],
+                references=[gt["response"] for gt in golden_set]
+            )
+            ```
+
+        Args:
+            responses (Sequence[str]): Responses to score.
+            references (Sequence[str]): Ground truth responses.
+
+        Returns:
+            List[float]: A value between 0 and 1 for each pair. 0 being "not in
+                agreement" and 1 being "in agreement".
+        """
+        _check_pairs(responses, references)
+
+        if len(responses) == 0:
+            return []
+
+        scorer = self.bert_scorer
+        if scorer is None:
+            scorer = shared_bert_scorer()
+
+        precision, _, _ = scorer.score(
+            list(responses), list(references), batch_size=self.batch_size
+        )
+
+        return precision.tolist()
+
     # TODEP
     def bleu(self, prompt: str,
              response: str) -> Union[float, Tuple[float, Dict[str, str]]]:
@@ -283,20 +540,42 @@ class GroundTruthAgreement(WithClassInfo, SerialModel):
                 being "in agreement".
             - dict: with key 'ground_truth_response'
         """
-        bleu = evaluate.load('bleu')
         ground_truth_response = self._find_response(prompt)
         if ground_truth_response:
-            bleu_score = bleu.compute(
-                predictions=[response], references=[ground_truth_response]
-            )
-            ret = bleu_score['bleu'], dict(
-                ground_truth_response=ground_truth_response
-            )
+            score = self.bleu_batch([response], [ground_truth_response])[0]
+            ret = score, dict(ground_truth_response=ground_truth_response)
         else:
             ret = np.nan
 
         return ret
 
+    def bleu_batch(self, responses: Sequence[str],
+                   references: Sequence[str]) -> List[float]:
+        """
+        BLEU Score of each response against the reference at the same
+        position. The metric is loaded once per process.
+
+        Args:
+            responses (Sequence[str]): Responses to score.
+            references (Sequence[str]): Ground truth responses.
+
+        Returns:
+            List[float]: A value between 0 and 1 for each pair. 0 being "not in
+                agreement" and 1 being "in agreement".
+        """
+        _check_pairs(responses, references)
+
+        bleu, lock = shared_metric('bleu')
+
+        # BLEU over several predictions is a corpus score, not one per pair, so
+        # each pair is computed on its own.
+        with lock:
+            return [
+                bleu.compute(predictions=[response],
+                             references=[reference])['bleu']
+                for response, reference in zip(responses, references)
+            ]
+
     # TODEP
     def rouge(self, prompt: str,
               response: str) -> Union[float, Tuple[float, Dict[str, str]]]:
@@ -313,16 +592,42 @@ class GroundTruthAgreement(WithClassInfo, SerialModel):
                 being "in agreement".
             - dict: with key 'ground_truth_response'
         """
-        rouge = evaluate.load('rouge')
         ground_truth_response = self._find_response(prompt)
         if ground_truth_response:
-            rouge_score = rouge.compute(
-                predictions=[response], references=[ground_truth_response]
-            )
-            ret = rouge_score['rouge1'], dict(
-                ground_truth_response=ground_truth_response
-            )
+            score = self.rouge_batch([response], [ground_truth_response])[0]
+            ret = score, dict(ground_truth_response=ground_truth_response)
         else:
             ret = np.nan
 
         return ret
+
+    def rouge_batch(self, responses: Sequence[str],
+                    references: Sequence[str]) -> List[float]:
+        """
+        ROUGE-1 Score of each response against the reference at the same
+        position, computed for the whole batch in one call. The metric is
+        loaded once per process.
+
+        Args:
+            responses (Sequence[str]): Responses to score.
+            references (Sequence[str]): Ground truth responses.
+
+        Returns:
+            List[float]: A value between 0 and 1 for each pair. 0 being "not in
+                agreement" and 1 being "in agreement".
+        """
+        _check_pairs(responses, references)
+
+        if len(responses) == 0:
+            return []
+
+        rouge, lock = shared_metric('rouge')
+
+        with lock:
+            rouge_score = rouge.compute(
+                predictions=list(responses),
+                references=list(references),
+                use_aggregator=False
+            )
+
+        return [float(score) for score in rouge_score['rouge1']]
@@ -15,6 +15,15 @@ Criteria: <Provide the criteria for this evaluation>
 Supporting Evidence: <Provide your reasons for scoring based on the listed criteria step by step. Tie it back to the evaluation being completed.>
 """
 
+BATCH_SCORES_TEMPLATE = \
+"""
+You will be given {n} numbered items. Score each item independently of the others, exactly as you would score it alone.
+Respond with exactly one line per item and nothing else, using the template below.
+
+TEMPLATE:
+<item number>: <The score 0-10 of that item>
+"""
+
 # Keep this in line with the LLM output template as above
 GROUNDEDNESS_REASON_TEMPLATE = """
 Criteria: {statement_sentence} 
@@ -29,10 +38,12 @@ STATEMENT: {hypothesis}
 
 LLM_GROUNDEDNESS_SYSTEM = v2.Groundedness.system_prompt.template
 LLM_GROUNDEDNESS_USER = v2.Groundedness.user_prompt.template
+LLM_GROUNDEDNESS_BATCH_USER = v2.Groundedness.batch_user_prompt.template
 
 CONTEXT_RELEVANCE_SYSTEM = v2.ContextRelevance.system_prompt.template
 QS_RELEVANCE_VERB_2S_TOP1 = v2.QuestionStatementRelevanceVerb2STop1Confidence.prompt.template
 CONTEXT_RELEVANCE_USER = v2.ContextRelevance.user_prompt.template
+CONTEXT_RELEVANCE_BATCH_USER = v2.ContextRelevance.batch_user_prompt.template
 
 ANSWER_RELEVANCE_SYSTEM = v2.PromptResponseRelevance.system_prompt.template
 ANSWER_RELEVANCE_USER = v2.PromptResponseRelevance.user_prompt.template
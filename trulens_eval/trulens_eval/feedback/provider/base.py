@@ -1,22 +1,25 @@
-from concurrent.futures import as_completed
-from concurrent.futures import ThreadPoolExecutor
 import logging
-from typing import ClassVar, Dict, List, Optional, Sequence, Tuple
+from typing import (
+    Callable, ClassVar, Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar
+)
 import warnings
 
-import nltk
-from nltk.tokenize import sent_tokenize
 import numpy as np
 
+from trulens_eval.feedback import groundedness as mod_groundedness
 from trulens_eval.feedback import prompts
 from trulens_eval.feedback.provider.endpoint import base as mod_endpoint
 from trulens_eval.utils import generated as mod_generated_utils
+from trulens_eval.utils import threading as mod_threading_utils
 from trulens_eval.utils.generated import re_0_10_rating
 from trulens_eval.utils.pyschema import WithClassInfo
 from trulens_eval.utils.serial import SerialModel
 
 logger = logging.getLogger(__name__)
 
+A = TypeVar("A")
+T = TypeVar("T")
+
 
 class Provider(WithClassInfo, SerialModel):
     """Base Provider class.
@@ -80,6 +83,24 @@ class Provider(WithClassInfo, SerialModel):
     def __init__(self, name: Optional[str] = None, **kwargs):
         super().__init__(name=name, **kwargs)
 
+    def _fan_out(self, func: Callable[[A], T], items: Iterable[A]) -> List[T]:
+        """Apply `func` to each of the items concurrently in the shared
+        [FanOut][trulens_eval.utils.threading.FanOut] pool, running at most the
+        endpoint's `max_concurrency` items at once.
+        
+        Returns the results in order.
+        """
+
+        if self.endpoint is None:
+            return mod_threading_utils.FanOut().map(func, items)
+
+        return mod_threading_utils.FanOut().map(
+            func,
+            items,
+            key=self.endpoint.name,
+            limit=self.endpoint.max_concurrency
+        )
+
 
 class LLMProvider(Provider):
     """An LLM-based provider.
@@ -106,6 +127,15 @@ class LLMProvider(Provider):
 
     model_config: ClassVar[dict] = dict(protected_namespaces=())
 
+    judge_batch_max_items: int = 8
+    """Maximum number of items scored in one completion by the batched feedback
+    functions like `context_relevance_batched`."""
+
+    judge_batch_max_tokens: int = 2048
+    """Maximum estimated number of tokens of items scored in one completion by
+    the batched feedback functions. A single item longer than this is scored in
+    a completion of its own."""
+
     def __init__(self, *args, **kwargs):
         # TODO: why was self_kwargs required here independently of kwargs?
         self_kwargs = dict(kwargs)
@@ -256,6 +286,117 @@ class LLMProvider(Provider):
             )
             return score, {}
 
+    def _judge_batches(self, items: Sequence[str]) -> List[List[int]]:
+        """Group the indices of the given items into batches respecting
+        `judge_batch_max_items` and `judge_batch_max_tokens`."""
+
+        batches: List[List[int]] = []
+        batch: List[int] = []
+        batch_tokens = 0
+
+        for i, item in enumerate(items):
+            tokens = len(item) // mod_endpoint.CHARS_PER_TOKEN + 1
+
+            if batch and (len(batch) >= self.judge_batch_max_items or
+                          batch_tokens + tokens > self.judge_batch_max_tokens):
+                batches.append(batch)
+                batch = []
+                batch_tokens = 0
+
+            batch.append(i)
+            batch_tokens += tokens
+
+        if batch:
+            batches.append(batch)
+
+        return batches
+
+    def generate_scores(
+        self,
+        system_prompt: str,
+        user_prompt: Callable[[str], str],
+        items: Sequence[str],
+        item_label: str,
+        score_one: Callable[[str], float],
+        normalize: float = 10.0,
+        temperature: float = 0.0
+    ) -> List[float]:
+        """
+        Base method to generate scores for many items with as few completions
+        as possible, used for batched evaluation.
+
+        Items are numbered and packed into prompts of up to
+        `judge_batch_max_items` items and `judge_batch_max_tokens` estimated
+        tokens. If the scores in a response cannot be parsed, the items of that
+        batch are scored one at a time with `score_one` instead.
+
+        Args:
+            system_prompt: A pre-formatted system prompt for scoring one item.
+
+            user_prompt: Produces the user prompt given the text of the
+                numbered items.
+
+            items: The items to score.
+
+            item_label: Label of each item in the prompt, e.g. "CONTEXT".
+
+            score_one: Scores a single item on a 0-1 scale. Used for batches of
+                one item and as fallback.
+
+            normalize: The normalization factor for the scores.
+
+            temperature: The temperature for the LLM response.
+
+        Returns:
+            The score of each item on a 0-1 scale.
+        """
+        assert self.endpoint is not None, "Endpoint is not set."
+
+        def score_batch(batch: List[int]) -> List[float]:
+            if len(batch) == 1:
+                return [score_one(items[batch[0]])]
+
+            enumerated = "\n\n".join(
+                f"{item_label} {n}: {items[i]}"
+                for n, i in enumerate(batch, start=1)
+            )
+
+            llm_messages = [
+                {
+                    "role":
+                        "system",
+                    "content":
+                        system_prompt +
+                        prompts.BATCH_SCORES_TEMPLATE.format(n=len(batch))
+                }, {
+                    "role": "user",
+                    "content": user_prompt(enumerated)
+                }
+            ]
+
+            response = self.endpoint.run_in_pace(
+                func=self._create_chat_completion,
+                messages=llm_messages,
+                temperature=temperature
+            )
+
+            try:
+                ratings = mod_generated_utils.re_enumerated_0_10_ratings(
+                    response, len(batch)
+                )
+                return [rating / normalize for rating in ratings]
+
+            except mod_generated_utils.ParseError as e:
+                logger.warning(
+                    "Could not parse scores of %s items, scoring them one at a time instead: %s",
+                    len(batch), e
+                )
+                return self._fan_out(score_one, [items[i] for i in batch])
+
+        results = self._fan_out(score_batch, self._judge_batches(items))
+
+        return [score for batch_scores in results for score in batch_scores]
+
     def context_relevance(
         self, question: str, context: str, temperature: float = 0.0
     ) -> float:
@@ -353,6 +494,57 @@ class LLMProvider(Provider):
             temperature=temperature
         )
 
+    def context_relevance_batched(
+        self,
+        question: str,
+        contexts: Sequence[str],
+        temperature: float = 0.0
+    ) -> Tuple[float, Dict]:
+        """
+        Uses chat completion model. Checks the relevance of each of the
+        contexts to the question as `context_relevance` would, scoring several
+        contexts per completion (see `judge_batch_max_items` and
+        `judge_batch_max_tokens`).
+
+        !!! example
+
+            ```python
+            from trulens_eval.app import App
+            context = App.select_context(rag_app)
+            feedback = (
+                Feedback(provider.context_relevance_batched)
+                .on_input()
+                .on(context.collect())
+                )
+            ```
+
+        Args:
+            question (str): A question being asked.
+
+            contexts (Sequence[str]): Contexts related to the question.
+
+        Returns:
+            Tuple[float, Dict]: The mean relevance between 0.0 (not relevant)
+                and 1.0 (relevant) and a dictionary with the score of each
+                context.
+        """
+
+        scores = self.generate_scores(
+            system_prompt=prompts.CONTEXT_RELEVANCE_SYSTEM,
+            user_prompt=lambda enumerated: str.format(
+                prompts.CONTEXT_RELEVANCE_BATCH_USER,
+                question=question,
+                contexts=enumerated
+            ),
+            items=contexts,
+            item_label="CONTEXT",
+            score_one=lambda context: self.
+            context_relevance(question, context, temperature=temperature),
+            temperature=temperature
+        )
+
+        return float(np.mean(scores)), {"scores": scores}
+
     def qs_relevance_with_cot_reasons(self, question: str,
                                       context: str) -> Tuple[float, Dict]:
         """
@@ -1199,36 +1391,21 @@ class LLMProvider(Provider):
         Returns:
             Tuple[float, dict]: A tuple containing a value between 0.0 (not grounded) and 1.0 (grounded) and a dictionary containing the reasons for the evaluation.
         """
-        nltk.download('punkt', quiet=True)
         groundedness_scores = {}
         reasons_str = ""
 
-        hypotheses = sent_tokenize(statement)
+        hypotheses = mod_groundedness.sentences(statement)
         system_prompt = prompts.LLM_GROUNDEDNESS_SYSTEM
 
-        def evaluate_hypothesis(index, hypothesis):
+        def evaluate_hypothesis(hypothesis):
             user_prompt = prompts.LLM_GROUNDEDNESS_USER.format(
                 premise=f"{source}", hypothesis=f"{hypothesis}"
             )
-            score, reason = self.generate_score_and_reasons(
-                system_prompt, user_prompt
-            )
-            return index, score, reason
+            return self.generate_score_and_reasons(system_prompt, user_prompt)
 
-        results = []
-
-        with ThreadPoolExecutor() as executor:
-            futures = [
-                executor.submit(evaluate_hypothesis, i, hypothesis)
-                for i, hypothesis in enumerate(hypotheses)
-            ]
+        results = self._fan_out(evaluate_hypothesis, hypotheses)
 
-            for future in as_completed(futures):
-                results.append(future.result())
-
-        results.sort(key=lambda x: x[0])  # Sort results by index
-
-        for i, score, reason in results:
+        for i, (score, reason) in enumerate(results):
             groundedness_scores[f"statement_{i}"] = score
             reason_str = reason[
                 'reason'] if 'reason' in reason else "reason not generated"
@@ -1240,3 +1417,60 @@ class LLMProvider(Provider):
         )
 
         return average_groundedness_score, {"reasons": reasons_str}
+
+    def groundedness_measure_batched(self, source: str,
+                                     statement: str) -> Tuple[float, dict]:
+        """A measure to track if the source material supports each sentence in
+        the statement using an LLM provider, scoring several sentences per
+        completion (see `judge_batch_max_items` and `judge_batch_max_tokens`).
+
+        Unlike `groundedness_measure_with_cot_reasons`, no reasons are
+        generated.
+
+        !!! example
+
+            ```python
+            from trulens_eval import Feedback
+            from trulens_eval.feedback.provider.openai import OpenAI
+
+            provider = OpenAI()
+
+            f_groundedness = (
+                Feedback(provider.groundedness_measure_batched)
+                .on(context.collect())
+                .on_output()
+                )
+            ```
+        Args:
+            source: The source that should support the statement.
+            statement: The statement to check groundedness.
+
+        Returns:
+            Tuple[float, dict]: A tuple containing a value between 0.0 (not grounded) and 1.0 (grounded) and a dictionary containing the score of each statement sentence.
+        """
+
+        hypotheses = mod_groundedness.sentences(statement)
+
+        def score_one(hypothesis: str) -> float:
+            score, _ = self.generate_score_and_reasons(
+                prompts.LLM_GROUNDEDNESS_SYSTEM,
+                prompts.LLM_GROUNDEDNESS_USER.format(
+                    premise=f"{source}", hypothesis=f"{hypothesis}"
+                )
+            )
+            return score
+
+        scores = self.generate_scores(
+            system_prompt=prompts.LLM_GROUNDEDNESS_SYSTEM,
+            user_prompt=lambda enumerated: prompts.LLM_GROUNDEDNESS_BATCH_USER.
+            format(premise=f"{source}", hypotheses=enumerated),
+            items=hypotheses,
+            item_label="STATEMENT",
+            score_one=score_one
+        )
+
+        groundedness_scores = {
+            f"statement_{i}": score for i, score in enumerate(scores)
+        }
+
+        return float(np.mean(scores)), {"scores": groundedness_scores}
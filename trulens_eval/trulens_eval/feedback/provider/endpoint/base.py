@@ -1,31 +1,42 @@
 from __future__ import annotations
 
+from _thread import LockType
+import asyncio
 from collections import defaultdict
+from collections import deque
+import contextvars
+import dataclasses
 from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
 import functools
 import inspect
 import logging
 from pprint import PrettyPrinter
 import random
 import sys
+from threading import Lock
+import time
 from time import sleep
 from types import ModuleType
 from typing import (
-    Any, Awaitable, Callable, ClassVar, Dict, List, Optional, Sequence, Tuple,
-    Type, TypeVar
+    Any, Awaitable, Callable, ClassVar, Deque, Dict, List, Mapping, Optional,
+    Sequence, Tuple, Type, TypeVar, Union
 )
+import weakref
 
 from pydantic import Field
+from pydantic import PrivateAttr
 import requests
 
 from trulens_eval.schema import base as mod_base_schema
 from trulens_eval.utils import asynchro as mod_asynchro_utils
+from trulens_eval.utils import batching as mod_batching_utils
 from trulens_eval.utils import pace as mod_pace
 from trulens_eval.utils.pyschema import safe_getattr
 from trulens_eval.utils.pyschema import WithClassInfo
 from trulens_eval.utils.python import callable_name
 from trulens_eval.utils.python import class_name
-from trulens_eval.utils.python import get_first_local_in_call_stack
+from trulens_eval.utils.python import context_vars_set
 from trulens_eval.utils.python import is_really_coroutinefunction
 from trulens_eval.utils.python import locals_except
 from trulens_eval.utils.python import module_name
@@ -36,6 +47,7 @@ from trulens_eval.utils.python import wrap_awaitable
 from trulens_eval.utils.serial import JSON
 from trulens_eval.utils.serial import SerialModel
 from trulens_eval.utils.threading import DEFAULT_NETWORK_TIMEOUT
+from trulens_eval.utils.threading import FanOut
 
 logger = logging.getLogger(__name__)
 
@@ -47,9 +59,105 @@ T = TypeVar("T")
 
 INSTRUMENT = "__tru_instrument"
 
+_tracked_endpoints: contextvars.ContextVar[Optional[Dict[
+    Type[EndpointCallback], List[Tuple[Endpoint, EndpointCallback]]]]] = \
+    contextvars.ContextVar("tru_tracked_endpoints", default=None)
+"""Endpoints, and the callbacks tallying their usage, of the innermost
+`Endpoint._track_costs` currently executing, indexed by callback class."""
+
 DEFAULT_RPM = 60
 """Default requests per minute for endpoints."""
 
+CHARS_PER_TOKEN = 4
+"""Rough number of characters per token used for estimating request sizes."""
+
+DEFAULT_COMPLETION_TOKENS = 256
+"""Completion tokens to expect when a request does not specify `max_tokens`."""
+
+DEFAULT_MAX_CONCURRENCY = 32
+"""Default maximum number of requests in flight to an endpoint."""
+
+DEFAULT_OVERLOADED_WAIT = 10.0
+"""Seconds to hold off requests after an overloaded response without a retry
+hint."""
+
+DEFAULT_POOL_CONNECTIONS = 10
+"""Default number of hosts to keep pooled connections for."""
+
+DEFAULT_BATCH_MAX_SIZE = 16
+"""Default maximum number of inputs per batch for endpoints that accept batches
+of inputs."""
+
+DEFAULT_BATCH_MAX_WAIT = 0.005
+"""Default seconds to wait for concurrent requests to join a batch."""
+
+MAX_POST_REQUEUES = 16
+"""How many times a post request is requeued due to model loading or
+throttling before giving up."""
+
+THROTTLE_STATUS_CODES = {429, 503, 529}
+"""HTTP status codes providers use to indicate throttling or overload."""
+
+THROTTLE_MESSAGES = [
+    "rate limit", "ratelimit", "too many requests", "overloaded", "throttl",
+    "slow down"
+]
+"""Lowercase fragments of error messages and error class names that indicate
+throttling or overload."""
+
+
+class ThrottledError(RuntimeError):
+    """A request was rejected due to rate limits or provider overload.
+
+    Args:
+        message: Error message.
+
+        retry_after: Seconds after which the provider suggested to retry, if
+            it did.
+    """
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def retry_after_of(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    """Get the number of seconds to wait before retrying from the given
+    response headers, if they say.
+    
+    Handles `retry-after-ms` and `retry-after` as either seconds or an HTTP
+    date.
+    """
+
+    if headers is None:
+        return None
+
+    try:
+        headers = {str(k).lower(): v for k, v in headers.items()}
+    except Exception:
+        return None
+
+    if "retry-after-ms" in headers:
+        try:
+            return float(headers['retry-after-ms']) / 1000.0
+        except ValueError:
+            pass
+
+    if "retry-after" in headers:
+        value = headers['retry-after']
+        try:
+            return float(value)
+        except ValueError:
+            pass
+
+        try:
+            date = parsedate_to_datetime(value)
+            return max(0.0, date.timestamp() - time.time())
+        except Exception:
+            pass
+
+    return None
+
 
 class EndpointCallback(SerialModel):
     """
@@ -100,6 +208,10 @@ class Endpoint(WithClassInfo, SerialModel, SingletonPerName):
         module_name: str
         class_name: str
 
+        existing_only: bool = False
+        """Only track with already created instances of the endpoint rather
+        than creating one."""
+
     ENDPOINT_SETUPS: ClassVar[List[EndpointSetup]] = [
         EndpointSetup(
             arg_flag="with_openai",
@@ -120,6 +232,12 @@ class Endpoint(WithClassInfo, SerialModel, SingletonPerName):
             arg_flag="with_bedrock",
             module_name="trulens_eval.feedback.provider.endpoint.bedrock",
             class_name="BedrockEndpoint"
+        ),
+        EndpointSetup(
+            arg_flag="with_dummy",
+            module_name="trulens_eval.feedback.provider.endpoint.base",
+            class_name="DummyEndpoint",
+            existing_only=True
         )
     ]
 
@@ -146,18 +264,62 @@ class Endpoint(WithClassInfo, SerialModel, SingletonPerName):
     rpm: float = DEFAULT_RPM
     """Requests per minute."""
 
+    tpm: Optional[float] = None
+    """Tokens per minute. If None, tokens are not limited."""
+
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+    """Maximum number of requests in flight.
+    
+    The concurrency and rate in effect are lowered from `max_concurrency`,
+    `rpm` and `tpm` when the provider signals throttling. See `adaptive`.
+    """
+
     retries: int = 3
     """Retries (if performing requests using this class)."""
 
     post_headers: Dict[str, str] = Field(default_factory=dict, exclude=True)
     """Optional post headers for post requests if done by this class."""
 
-    pace: mod_pace.Pace = Field(
-        default_factory=lambda: mod_pace.
-        Pace(marks_per_second=DEFAULT_RPM / 60.0, seconds_per_period=60.0),
+    pace: mod_pace.TokenBucketPace = Field(
+        default_factory=lambda: mod_pace.TokenBucketPace(rpm=DEFAULT_RPM),
         exclude=True
     )
-    """Pacing instance to maintain a desired rpm."""
+    """Pacing instance to maintain a desired rpm and tpm."""
+
+    adaptive: mod_pace.AdaptiveLimits = Field(exclude=True)
+    """Controller of concurrency and rate driven by throttling signals."""
+
+    pool_maxsize: int = DEFAULT_MAX_CONCURRENCY
+    """Maximum number of pooled connections kept open per host by `post`."""
+
+    timeout: float = DEFAULT_NETWORK_TIMEOUT
+    """Default timeout in seconds for requests made by `post` and `apost`."""
+
+    _session: Optional[requests.Session] = PrivateAttr(default=None)
+    _async_clients: weakref.WeakKeyDictionary = PrivateAttr(
+        default_factory=weakref.WeakKeyDictionary
+    )
+    """Async clients by event loop."""
+
+    _clients_lock: LockType = PrivateAttr(default_factory=Lock)
+
+    _model_ready_at: Dict[str, float] = PrivateAttr(default_factory=dict)
+    """Monotonic times at which loading models are expected to be ready, keyed
+    by url."""
+
+    batch_max_size: int = 1
+    """Maximum number of inputs combined into one request by `post(...,
+    batch=True)`. 1 disables batching."""
+
+    batch_max_wait: float = DEFAULT_BATCH_MAX_WAIT
+    """Maximum number of seconds to wait for concurrent requests to join a
+    batch."""
+
+    _batchers: Dict[Tuple[str, float],
+                    mod_batching_utils.MicroBatcher] = PrivateAttr(
+                        default_factory=dict
+                    )
+    """Micro-batchers of `post(..., batch=True)` requests by url and timeout."""
 
     global_callback: EndpointCallback = Field(
         exclude=True
@@ -192,6 +354,9 @@ class Endpoint(WithClassInfo, SerialModel, SingletonPerName):
         *args,
         name: str,
         rpm: Optional[float] = None,
+        tpm: Optional[float] = None,
+        pace: Optional[mod_pace.TokenBucketPace] = None,
+        max_concurrency: Optional[int] = None,
         callback_class: Optional[Any] = None,
         **kwargs
     ):
@@ -207,16 +372,32 @@ class Endpoint(WithClassInfo, SerialModel, SingletonPerName):
             #    "Endpoint has to be extended by class that can set `callback_class`."
             #)
 
+        if pace is not None:
+            # A given pace determines the limits unless they are also given.
+            if rpm is None:
+                rpm = pace.rpm
+            if tpm is None:
+                tpm = pace.tpm
+
         if rpm is None:
             rpm = DEFAULT_RPM
 
+        if pace is None:
+            pace = mod_pace.TokenBucketPace(rpm=rpm, tpm=tpm)
+
+        if max_concurrency is None:
+            max_concurrency = DEFAULT_MAX_CONCURRENCY
+
         kwargs['name'] = name
+        kwargs['rpm'] = rpm
+        kwargs['tpm'] = tpm
+        kwargs['max_concurrency'] = max_concurrency
         kwargs['callback_class'] = callback_class
         kwargs['global_callback'] = callback_class(endpoint=self)
         kwargs['callback_name'] = f"callback_{name}"
-        kwargs['pace'] = mod_pace.Pace(
-            seconds_per_period=60.0,  # 1 minute
-            marks_per_second=rpm / 60.0
+        kwargs['pace'] = pace
+        kwargs['adaptive'] = mod_pace.AdaptiveLimits(
+            pace=pace, max_concurrency=max_concurrency
         )
 
         super().__init__(*args, **kwargs)
@@ -226,61 +407,558 @@ class Endpoint(WithClassInfo, SerialModel, SingletonPerName):
         # Extending class should call _instrument_module on the appropriate
         # modules and methods names.
 
-    def pace_me(self) -> float:
+    def pace_me(self, tokens: int = 0) -> float:
         """
         Block until we can make a request to this endpoint to keep pace with
-        maximum rpm. Returns time in seconds since last call to this method
-        returned.
+        maximum rpm and tpm. Returns time in seconds since last call to this
+        method returned.
+
+        Args:
+            tokens: Estimated number of tokens the request will use. Only
+                matters if `tpm` is set.
         """
 
-        return self.pace.mark()
+        return self.pace.mark(tokens=tokens)
 
-    def post(
-        self,
-        url: str,
-        payload: JSON,
-        timeout: float = DEFAULT_NETWORK_TIMEOUT
-    ) -> Any:
-        self.pace_me()
-        ret = requests.post(
+    async def apace_me(self, tokens: int = 0) -> float:
+        """Async version of
+        [pace_me][trulens_eval.feedback.provider.endpoint.base.Endpoint.pace_me]."""
+
+        return await self.pace.amark(tokens=tokens)
+
+    def estimate_prompt_tokens(self, *args, **kwargs) -> int:
+        """Estimate the number of prompt tokens of a request with the given
+        arguments.
+
+        Subclasses with access to a tokenizer may override this.
+        """
+
+        chars = 0
+
+        def count(obj):
+            nonlocal chars
+
+            if isinstance(obj, str):
+                chars += len(obj)
+            elif isinstance(obj, Dict):
+                for v in obj.values():
+                    count(v)
+            elif isinstance(obj, (list, tuple)):
+                for v in obj:
+                    count(v)
+
+        count(args)
+        for key in ["messages", "prompt", "input"]:
+            count(kwargs.get(key))
+
+        return chars // CHARS_PER_TOKEN
+
+    def response_tokens(self,
+                        response: Any,
+                        prompt_tokens: int = 0) -> Optional[int]:
+        """Number of tokens, prompt and completion together, used by a request
+        that produced the given response, if it can be determined.
+
+        Uses the `usage` information of the response if present. Text responses
+        are estimated from their length added to `prompt_tokens`. Otherwise
+        returns None.
+        """
+
+        if isinstance(response, str):
+            return prompt_tokens + len(response) // CHARS_PER_TOKEN
+
+        usage = None
+        if safe_hasattr(response, "usage"):
+            usage = safe_getattr(response, "usage")
+
+        if isinstance(usage, Dict):
+            total = usage.get("total_tokens")
+        elif usage is not None and safe_hasattr(usage, "total_tokens"):
+            total = safe_getattr(usage, "total_tokens")
+        else:
+            total = None
+
+        if isinstance(total, int):
+            return total
+
+        return None
+
+    def classify_error(self, error: Exception) -> Tuple[bool, Optional[float]]:
+        """Determine whether the given error indicates throttling or provider
+        overload and how many seconds the provider asked to wait before
+        retrying, if it did.
+
+        Recognizes [ThrottledError][trulens_eval.feedback.provider.endpoint.base.ThrottledError],
+        errors carrying an HTTP status from `THROTTLE_STATUS_CODES` (directly
+        or in their `response`) and errors whose class name or message contain
+        one of `THROTTLE_MESSAGES`. Subclasses may extend this for
+        provider-specific errors.
+        """
+
+        if isinstance(error, ThrottledError):
+            return True, error.retry_after
+
+        response = getattr(error, "response", None)
+
+        status = None
+        headers = None
+        for obj in [error, response]:
+            if obj is None:
+                continue
+
+            for attr in ["status_code", "status"]:
+                code = getattr(obj, attr, None)
+                if isinstance(code, int):
+                    status = code
+                    break
+
+            if headers is None:
+                headers = getattr(obj, "headers", None)
+
+            if status is not None:
+                break
+
+        if status is None and isinstance(response, Dict):
+            # botocore errors keep their response as a dict.
+            metadata = response.get("ResponseMetadata", {})
+            status = metadata.get("HTTPStatusCode")
+            headers = metadata.get("HTTPHeaders")
+
+        retry_after = retry_after_of(headers)
+
+        if status in THROTTLE_STATUS_CODES:
+            return True, retry_after
+
+        text = f"{type(error).__name__} {error}".lower()
+        if any(fragment in text for fragment in THROTTLE_MESSAGES):
+            return True, retry_after
+
+        return False, None
+
+    def metrics(self) -> Dict[str, Union[int, float, None]]:
+        """Current concurrency and rate limits in effect along with counts of
+        successes and throttling signals."""
+
+        return self.adaptive.metrics()
+
+    @property
+    def session(self) -> requests.Session:
+        """Pooled HTTP session used by
+        [post][trulens_eval.feedback.provider.endpoint.base.Endpoint.post].
+        
+        Created on first use. Keeps up to `pool_maxsize` connections open per
+        host so requests reuse connections instead of doing a new (TLS)
+        handshake every time.
+        """
+
+        if self._session is None:
+            with self._clients_lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = requests.adapters.HTTPAdapter(
+                        pool_connections=DEFAULT_POOL_CONNECTIONS,
+                        pool_maxsize=self.pool_maxsize
+                    )
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._session = session
+
+        return self._session
+
+    def _async_client(self) -> Optional[Any]:
+        """Get the pooled `httpx.AsyncClient` for the running event loop or None
+        if httpx is not installed.
+
+        Clients cannot be shared between event loops so one is kept per loop.
+        """
+
+        try:
+            import httpx
+        except ImportError:
+            return None
+
+        loop = asyncio.get_running_loop()
+
+        with self._clients_lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                client = httpx.AsyncClient(
+                    limits=httpx.Limits(
+                        max_connections=self.pool_maxsize,
+                        max_keepalive_connections=self.pool_maxsize
+                    ),
+                    timeout=self.timeout
+                )
+                self._async_clients[loop] = client
+
+        return client
+
+    def close(self) -> None:
+        """Close pooled connections.
+        
+        They will be reopened if the endpoint is used again. Async clients are
+        closed on their own event loops: right away if the loop is not running
+        and as soon as possible if it is. Within a running event loop, clients
+        of other loops that are not running are closed once those loops run
+        again as they cannot be run from there. Clients of loops that were
+        closed already cannot be closed and are dropped.
+        """
+
+        with self._clients_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+            entries = list(self._async_clients.items())
+            self._async_clients.clear()
+
+        try:
+            current_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            current_loop = None
+
+        for loop, client in entries:
+            if loop.is_closed():
+                continue
+
+            if loop is current_loop:
+                loop.create_task(client.aclose())
+            elif loop.is_running() or current_loop is not None:
+                asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+            else:
+                loop.run_until_complete(client.aclose())
+
+    async def aclose(self) -> None:
+        """Close pooled connections, waiting for the async client of the
+        running event loop to close.
+        
+        See [close][trulens_eval.feedback.provider.endpoint.base.Endpoint.close].
+        """
+
+        loop = asyncio.get_running_loop()
+
+        with self._clients_lock:
+            client = self._async_clients.pop(loop, None)
+
+        if client is not None:
+            await client.aclose()
+
+        self.close()
+
+    def _send(self, url: str, payload: JSON, timeout: float) -> Any:
+        """Send a post request returning a response with `status_code`,
+        `headers` and `json()`."""
+
+        return self.session.post(
+            url, json=payload, timeout=timeout, headers=self.post_headers
+        )
+
+    async def _asend(self, url: str, payload: JSON, timeout: float) -> Any:
+        """Async version of `_send`."""
+
+        client = self._async_client()
+
+        if client is None:
+            return await asyncio.to_thread(
+                self._send, url=url, payload=payload, timeout=timeout
+            )
+
+        return await client.post(
             url, json=payload, timeout=timeout, headers=self.post_headers
         )
 
-        j = ret.json()
+    def _model_wait(self, url: str) -> float:
+        """Seconds until the model at the given url is expected to be loaded."""
+
+        ready_at = self._model_ready_at.get(url)
+        if ready_at is None:
+            return 0.0
+
+        delay = ready_at - time.monotonic()
+        if delay <= 0.0:
+            self._model_ready_at.pop(url, None)
+            return 0.0
+
+        return delay
+
+    def _post_outcome(self, url: str, response: Any) -> Tuple[bool, Any]:
+        """Interpret a post response.
+        
+        Returns whether the request needs to be requeued and, if not, the
+        result. Raises errors that should not be retried.
+        """
+
+        try:
+            j = response.json()
+        except ValueError:
+            j = None
 
         # Huggingface public api sometimes tells us that a model is loading and
-        # how long to wait:
-        if "estimated_time" in j:
+        # how long to wait. Requests to the same model made in the meantime will
+        # wait for the same time.
+        if isinstance(j, Dict) and "estimated_time" in j:
             wait_time = j['estimated_time']
-            logger.error("Waiting for %s (%s) second(s).", j, wait_time)
-            sleep(wait_time + 2)
-            return self.post(url, payload)
+            logger.warning(
+                "Model at %s is loading. Requeuing for %s second(s).", url,
+                wait_time
+            )
+            self._model_ready_at[url] = time.monotonic() + wait_time + 2
+            return True, None
 
-        elif isinstance(j, Dict) and "error" in j:
-            error = j['error']
-            logger.error("API error: %s.", j)
+        if response.status_code in THROTTLE_STATUS_CODES or (isinstance(
+                j, Dict) and j.get("error") == "overloaded"):
+            retry_after = retry_after_of(response.headers)
+            logger.warning(
+                "API throttled with status %s (%s). Requeuing after %s second(s).",
+                response.status_code, j, retry_after
+            )
+            # Pauses pace for all requests so the requeued one waits there.
+            self.adaptive.on_throttle(
+                retry_after=retry_after or DEFAULT_OVERLOADED_WAIT
+            )
+            return True, None
 
-            if error == "overloaded":
-                logger.error("Waiting for overloaded API before trying again.")
-                sleep(10.0)
-                return self.post(url, payload)
-            else:
-                raise RuntimeError(error)
+        if isinstance(j, Dict) and "error" in j:
+            logger.error("API error: %s.", j)
+            raise RuntimeError(j['error'])
 
         assert isinstance(
             j, Sequence
         ) and len(j) > 0, f"Post did not return a sequence: {j}"
 
+        self.adaptive.on_success()
+
+        return False, j
+
+    @staticmethod
+    def _unwrap(j: JSON) -> JSON:
+        """Unwrap singleton response lists as returned by `post`."""
+
         if len(j) == 1:
             return j[0]
 
         else:
             return j
 
+    def _batcher(
+        self, url: str, timeout: float
+    ) -> mod_batching_utils.MicroBatcher:
+        """Get the micro-batcher for requests to the given url with the given
+        timeout.
+        
+        Items of its batches are the inputs of the requests along with the
+        endpoints tracked by their callers.
+        """
+
+        key = (url, timeout)
+
+        with self._clients_lock:
+            batcher = self._batchers.get(key)
+            if batcher is None:
+
+                def post_batch(items: List[Tuple[str, Any]]) -> List[JSON]:
+                    return self._post_batch_tracked(url, items, timeout=timeout)
+
+                batcher = mod_batching_utils.MicroBatcher(
+                    post_batch,
+                    max_size=self.batch_max_size,
+                    max_wait=self.batch_max_wait
+                )
+                self._batchers[key] = batcher
+
+        return batcher
+
+    def _post_batch_tracked(
+        self, url: str, items: List[Tuple[str, Any]], timeout: float
+    ) -> List[JSON]:
+        """Post a batch of inputs from different callers, splitting the usage
+        of the batch evenly among the callers' callbacks.
+
+        Whichever caller sends the batch tracks its usage with a callback of
+        its own here instead of the callbacks of its caller.
+        """
+
+        inputs = [i for i, _ in items]
+
+        callback = self.callback_class(endpoint=self)
+
+        with context_vars_set({_tracked_endpoints: {self.callback_class: [
+            (self, callback)
+        ]}}):
+            results = self._post_batch(url, inputs, timeout=timeout)
+
+        for (_, endpoints), share in zip(items, _split_cost(callback.cost,
+                                                            len(items))):
+            if endpoints is None:
+                continue
+
+            for _, caller_callback in endpoints.get(self.callback_class, []):
+                caller_callback.cost = caller_callback.cost + share
+
+        return results
+
+    def _post_batch(self, url: str, inputs: List[str],
+                    timeout: float) -> List[JSON]:
+        """Post a list of inputs in one request, returning the result for each
+        input as `post` would have for that input alone.
+        
+        Falls back to one request per input if the response does not have one
+        result per input.
+        """
+
+        if len(inputs) > 1:
+            j = self._post_raw(url, {"inputs": inputs}, timeout=timeout)
+
+            if len(j) == len(inputs):
+                return j
+
+            logger.warning(
+                "Batched request to %s returned %s result(s) for %s input(s). "
+                "Retrying without batching.", url, len(j), len(inputs)
+            )
+
+        return [
+            self._unwrap(self._post_raw(url, {"inputs": i}, timeout=timeout))
+            for i in inputs
+        ]
+
+    def post_batch(
+        self,
+        url: str,
+        inputs: Sequence[str],
+        timeout: Optional[float] = None
+    ) -> List[JSON]:
+        """Post each of the given inputs to the given url as
+        [post][trulens_eval.feedback.provider.endpoint.base.Endpoint.post]
+        would with payload `{"inputs": input}`, combining them into requests of
+        up to `batch_max_size` inputs.
+
+        The requests are sent concurrently in the shared
+        [FanOut][trulens_eval.utils.threading.FanOut] pool, at most
+        `max_concurrency` of them at once.
+
+        Returns the result for each input in order.
+        """
+
+        if timeout is None:
+            timeout = self.timeout
+
+        size = max(1, self.batch_max_size)
+
+        chunks = [
+            list(inputs[start:start + size])
+            for start in range(0, len(inputs), size)
+        ]
+
+        results = FanOut().map(
+            lambda chunk: self._post_batch(url, chunk, timeout=timeout),
+            chunks,
+            key=self.name,
+            limit=self.max_concurrency
+        )
+
+        return [result for chunk_results in results for result in chunk_results]
+
+    def post(
+        self,
+        url: str,
+        payload: JSON,
+        timeout: Optional[float] = None,
+        batch: bool = False
+    ) -> Any:
+        """Post the given payload to the given url at pace, using pooled
+        connections.
+
+        Requests for models that are loading or that were throttled are
+        requeued behind the pace up to `MAX_POST_REQUEUES` times.
+
+        Args:
+            url: The url to post to.
+
+            payload: JSON payload.
+
+            timeout: Request timeout in seconds. Defaults to `self.timeout`.
+
+            batch: Whether the request may be combined with concurrent requests
+                to the same url into one request with a list of inputs. Only
+                payloads of the form `{"inputs": str}` are batched and only if
+                `batch_max_size` is more than 1. The url must accept lists of
+                inputs and respond with one result per input. Usage of a batch
+                is split evenly among the callers in it.
+        """
+
+        if timeout is None:
+            timeout = self.timeout
+
+        if batch and self.batch_max_size > 1 and _is_single_input(payload):
+            return self._batcher(url, timeout).submit(
+                (payload['inputs'], _tracked_endpoints.get())
+            )
+
+        return self._unwrap(self._post_raw(url, payload, timeout=timeout))
+
+    def _post_raw(self, url: str, payload: JSON, timeout: float) -> JSON:
+        """Post without unwrapping the response. See `post`."""
+
+        for _ in range(MAX_POST_REQUEUES):
+            delay = self._model_wait(url)
+            if delay > 0.0:
+                sleep(delay)
+
+            with self.adaptive.slot():
+                self.pace_me()
+                response = self._send(url=url, payload=payload, timeout=timeout)
+
+            requeue, result = self._post_outcome(url, response)
+            if not requeue:
+                return result
+
+        raise ThrottledError(
+            f"Request to {url} was requeued {MAX_POST_REQUEUES} time(s)."
+        )
+
+    async def apost(
+        self, url: str, payload: JSON, timeout: Optional[float] = None
+    ) -> Any:
+        """Async version of
+        [post][trulens_eval.feedback.provider.endpoint.base.Endpoint.post].
+
+        Uses a pooled `httpx.AsyncClient` if httpx is installed. Otherwise runs
+        the synchronous request in a thread. Requests are not batched.
+        """
+
+        if timeout is None:
+            timeout = self.timeout
+
+        for _ in range(MAX_POST_REQUEUES):
+            delay = self._model_wait(url)
+            if delay > 0.0:
+                await asyncio.sleep(delay)
+
+            async with self.adaptive.aslot():
+                await self.apace_me()
+                response = await self._asend(
+                    url=url, payload=payload, timeout=timeout
+                )
+
+            requeue, result = self._post_outcome(url, response)
+            if not requeue:
+                return self._unwrap(result)
+
+        raise ThrottledError(
+            f"Request to {url} was requeued {MAX_POST_REQUEUES} time(s)."
+        )
+
     def run_in_pace(self, func: Callable[[A], B], *args, **kwargs) -> B:
         """
         Run the given `func` on the given `args` and `kwargs` at pace with the
         endpoint-specified rpm. Failures will be retried `self.retries` times.
+
+        Throttling errors (see
+        [classify_error][trulens_eval.feedback.provider.endpoint.base.Endpoint.classify_error])
+        lower the concurrency and rate in effect for all requests to this
+        endpoint and the retry waits for as long as the provider asked.
+        Successes gradually restore them.
         """
 
         retries = self.retries + 1
@@ -288,21 +966,51 @@ class Endpoint(WithClassInfo, SerialModel, SingletonPerName):
 
         errors = []
 
+        # Tokens are charged against the tpm budget up front using an estimate
+        # and corrected once the response is known.
+        prompt_tokens = 0
+        tokens = 0
+        if self.tpm is not None:
+            prompt_tokens = self.estimate_prompt_tokens(*args, **kwargs)
+            tokens = prompt_tokens + (
+                kwargs.get("max_tokens") or DEFAULT_COMPLETION_TOKENS
+            )
+
         while retries > 0:
             try:
-                self.pace_me()
-                ret = func(*args, **kwargs)
+                with self.adaptive.slot():
+                    self.pace_me(tokens=tokens)
+                    ret = func(*args, **kwargs)
+
+                self.adaptive.on_success()
+
+                if tokens > 0:
+                    actual = self.response_tokens(
+                        ret, prompt_tokens=prompt_tokens
+                    )
+                    if actual is not None:
+                        self.pace.reconcile(estimated=tokens, actual=actual)
+
                 return ret
 
             except Exception as e:
                 retries -= 1
+                throttled, retry_after = self.classify_error(e)
                 logger.error(
-                    "%s request failed %s=%s. Retries remaining=%s.", self.name,
-                    type(e), e, retries
+                    "%s request failed %s=%s. Throttled=%s. Retries remaining=%s.",
+                    self.name, type(e), e, throttled, retries
                 )
                 errors.append(e)
-                if retries > 0:
-                    sleep(retry_delay)
+
+                if throttled:
+                    # Pauses the pace of all requests if retry_after is given so
+                    # the retry below waits in pace_me instead.
+                    self.adaptive.on_throttle(retry_after=retry_after)
+
+                if retries > 0 and not (throttled and retry_after is not None):
+                    # Jitter so that requests failing together do not all
+                    # retry together.
+                    sleep(retry_delay * random.uniform(0.5, 1.5))
                     retry_delay *= 2
 
         raise RuntimeError(
@@ -439,6 +1147,7 @@ class Endpoint(WithClassInfo, SerialModel, SingletonPerName):
         with_hugs: bool = True,
         with_litellm: bool = True,
         with_bedrock: bool = True,
+        with_dummy: bool = True,
         **kwargs
     ) -> Tuple[T, Sequence[EndpointCallback]]:
         """
@@ -461,6 +1170,10 @@ class Endpoint(WithClassInfo, SerialModel, SingletonPerName):
                     # at getattr. Skip either way.
                     continue
 
+                if endpoint.existing_only:
+                    endpoints.extend(cls.existing_instances())
+                    continue
+
                 try:
                     e = cls()
                     endpoints.append(e)
@@ -486,6 +1199,7 @@ class Endpoint(WithClassInfo, SerialModel, SingletonPerName):
         with_hugs: bool = True,
         with_litellm: bool = True,
         with_bedrock: bool = True,
+        with_dummy: bool = True,
         **kwargs
     ) -> Tuple[T, mod_base_schema.Cost]:
         """
@@ -500,6 +1214,7 @@ class Endpoint(WithClassInfo, SerialModel, SingletonPerName):
             with_hugs=with_hugs,
             with_litellm=with_litellm,
             with_bedrock=with_bedrock,
+            with_dummy=with_dummy,
             **kwargs
         )
 
@@ -524,12 +1239,7 @@ class Endpoint(WithClassInfo, SerialModel, SingletonPerName):
         """
 
         # Check to see if this call is within another _track_costs call:
-        endpoints: Dict[Type[EndpointCallback], List[Tuple[Endpoint, EndpointCallback]]] = \
-            get_first_local_in_call_stack(
-                key="endpoints",
-                func=Endpoint.__find_tracker,
-                offset=1
-            )
+        endpoints = _tracked_endpoints.get()
 
         if endpoints is None:
             # If not, lets start a new collection of endpoints here along with
@@ -540,13 +1250,10 @@ class Endpoint(WithClassInfo, SerialModel, SingletonPerName):
         else:
             # We copy the dict here so that the outer call to _track_costs will
             # have their own version unaffacted by our additions below. Once
-            # this frame returns, the outer frame will have its own endpoints
+            # this call returns, the outer call will have its own endpoints
             # again and any wrapped method will get that smaller set of
             # endpoints.
-
-            # TODO: check if deep copy is needed given we are storing lists in
-            # the values and don't want to affect the existing ones here.
-            endpoints = dict(endpoints)
+            endpoints = {k: list(v) for k, v in endpoints.items()}
 
         # Collect any new endpoints requested of us.
         with_endpoints = with_endpoints or []
@@ -564,14 +1271,15 @@ class Endpoint(WithClassInfo, SerialModel, SingletonPerName):
             if callback_class not in endpoints:
                 endpoints[callback_class] = []
 
-            # And add them to the endpoints dict. This will be retrieved from
-            # locals of this frame later in the wrapped methods.
+            # And add them to the endpoints dict. This will be retrieved by the
+            # wrapped methods called by __func.
             endpoints[callback_class].append((endpoint, callback))
 
             callbacks.append(callback)
 
         # Call the function.
-        result: T = __func(*args, **kwargs)
+        with context_vars_set({_tracked_endpoints: endpoints}):
+            result: T = __func(*args, **kwargs)
 
         # Return result and only the callbacks created here. Outer thunks might
         # return others.
@@ -593,10 +1301,6 @@ class Endpoint(WithClassInfo, SerialModel, SingletonPerName):
 
         return result, callbacks[0]
 
-    @staticmethod
-    def __find_tracker(f):
-        return id(f) == id(Endpoint._track_costs.__code__)
-
     def handle_wrapped_call(
         self, func: Callable, bindings: inspect.BoundArguments, response: Any,
         callback: Optional[EndpointCallback]
@@ -669,22 +1373,10 @@ class Endpoint(WithClassInfo, SerialModel, SingletonPerName):
 
             response = func(*args, **kwargs)
 
-            bindings = inspect.signature(func).bind(*args, **kwargs)
-
-            # Get all of the callback classes suitable for handling this
-            # call. Note that we stored this in the INSTRUMENT attribute of
-            # the wrapper method.
-            registered_callback_classes = getattr(tru_wrapper, INSTRUMENT)
-
             # Look up the endpoints that are expecting to be notified and the
             # callback tracking the tally. See Endpoint._track_costs for
             # definition.
-            endpoints: Dict[Type[EndpointCallback], Sequence[Tuple[Endpoint, EndpointCallback]]] = \
-                get_first_local_in_call_stack(
-                    key="endpoints",
-                    func=self.__find_tracker,
-                    offset=0
-                )
+            endpoints = _tracked_endpoints.get()
 
             # If wrapped method was not called from within _track_costs, we
             # will get None here and do nothing but return wrapped
@@ -693,6 +1385,13 @@ class Endpoint(WithClassInfo, SerialModel, SingletonPerName):
                 logger.debug("No endpoints found.")
                 return response
 
+            bindings = inspect.signature(func).bind(*args, **kwargs)
+
+            # Get all of the callback classes suitable for handling this
+            # call. Note that we stored this in the INSTRUMENT attribute of
+            # the wrapper method.
+            registered_callback_classes = getattr(tru_wrapper, INSTRUMENT)
+
             def response_callback(response):
                 for callback_class in registered_callback_classes:
                     logger.debug("Handling callback_class: %s.", callback_class)
@@ -729,10 +1428,115 @@ class Endpoint(WithClassInfo, SerialModel, SingletonPerName):
         return tru_wrapper
 
 
+def _split_cost(cost: mod_base_schema.Cost,
+                n: int) -> List[mod_base_schema.Cost]:
+    """Split the given cost into `n` parts that add up to it.
+
+    Counts are split as evenly as whole numbers allow, with the remainders
+    going to the first parts.
+    """
+
+    parts = [{} for _ in range(n)]
+
+    for k in mod_base_schema.Cost.model_fields.keys():
+        v = getattr(cost, k)
+
+        if isinstance(v, int):
+            each, rem = divmod(v, n)
+            for i, part in enumerate(parts):
+                part[k] = each + (1 if i < rem else 0)
+
+        else:
+            for part in parts:
+                part[k] = v / n
+
+    return [mod_base_schema.Cost(**part) for part in parts]
+
+
+def _is_single_input(payload: JSON) -> bool:
+    """Whether the payload is of the form `{"inputs": str}`."""
+
+    return isinstance(payload, Dict) and list(payload.keys()) == [
+        "inputs"
+    ] and isinstance(payload["inputs"], str)
+
+
+@dataclass
+class SimulatedResponse:
+    """Stand-in for an HTTP response produced by
+    [DummyEndpoint][trulens_eval.feedback.provider.endpoint.base.DummyEndpoint]."""
+
+    status_code: int
+    """HTTP status code."""
+
+    body: JSON
+    """Response content."""
+
+    headers: Dict[str, str] = dataclasses.field(default_factory=dict)
+    """Response headers."""
+
+    usage: Optional[mod_base_schema.Cost] = None
+    """Simulated token usage and cost of the request."""
+
+    def json(self) -> JSON:
+        """Get the response content."""
+        return self.body
+
+
+class DummyCallback(EndpointCallback):
+    """Callback tallying the simulated usage of
+    [DummyEndpoint][trulens_eval.feedback.provider.endpoint.base.DummyEndpoint]
+    requests."""
+
+    def handle_classification(self, response: SimulatedResponse) -> None:
+        super().handle_classification(response)
+
+        if response.status_code != 200 or not isinstance(response.body, List):
+            # Throttled, loading, or overloaded responses.
+            return
+
+        self.cost.n_successful_requests += 1
+
+        for item in response.body:
+            self.cost.n_classes += len(item)
+
+        if response.usage is not None:
+            self.cost.n_tokens += response.usage.n_tokens
+            self.cost.n_prompt_tokens += response.usage.n_prompt_tokens
+            self.cost.n_completion_tokens += response.usage.n_completion_tokens
+            self.cost.cost += response.usage.cost
+
+
+LATENCY_DISTRIBUTIONS = ("normal", "lognormal", "pareto", "constant")
+"""Request latency distributions supported by
+[DummyEndpoint][trulens_eval.feedback.provider.endpoint.base.DummyEndpoint]."""
+
+
 class DummyEndpoint(Endpoint):
     """Endpoint for testing purposes.
     
-    Does not make any network calls and just pretends to.
+    Does not make any network calls and just pretends to. Besides the failure
+    modes of the huggingface api, it can simulate a provider under load:
+    latency with heavy tails, throttling, rate limits enforced the way
+    providers do (HTTP 429 with a retry-after header), and token usage and
+    cost. Simulated usage is tracked like that of real endpoints.
+
+    !!! example
+
+        ```python
+        from trulens_eval.feedback.provider.hugs import Dummy
+
+        # Median latency of 0.5s with a heavy tail, throttling past 600
+        # requests or 100k tokens per minute.
+        provider = Dummy(
+            delay=0.5,
+            latency="lognormal",
+            latency_shape=1.0,
+            simulated_rpm=600,
+            simulated_tpm=100_000,
+            cost_per_1k_tokens=0.002
+        )
+        ```
     """
 
     loading_prob: float
@@ -758,6 +1562,51 @@ class DummyEndpoint(Endpoint):
     delay: float = 0.0
     """How long to delay each request."""
 
+    latency: str = "normal"
+    """Distribution of the delay of each request. One of:
+
+    - "normal": mean `delay` and standard deviation `latency_shape * delay`,
+    - "lognormal": median `delay` and standard deviation of the log of
+      `latency_shape`,
+    - "pareto": minimum `delay` and tail index `latency_shape`, smaller values
+      giving heavier tails,
+    - "constant": always `delay`.
+    """
+
+    latency_shape: float = 0.5
+    """Shape parameter of the `latency` distribution."""
+
+    throttle_prob: float = 0.0
+    """How often to respond as throttled (HTTP 429) regardless of load."""
+
+    throttle_retry_after: Optional[float] = 1.0
+    """Seconds throttled responses ask to wait in their retry-after header. No
+    header is sent if None."""
+
+    simulated_rpm: Optional[float] = None
+    """Requests per sliding minute accepted before responding as throttled.
+    Unlimited if None."""
+
+    simulated_tpm: Optional[float] = None
+    """Tokens per sliding minute accepted before responding as throttled.
+    Unlimited if None."""
+
+    completion_tokens: int = 0
+    """Completion tokens to report for each request. Prompt tokens are
+    estimated from the inputs."""
+
+    cost_per_1k_tokens: float = 0.0
+    """Cost in USD per thousand prompt and completion tokens."""
+
+    _window_lock: LockType = PrivateAttr(default_factory=Lock)
+
+    _window: Deque[Tuple[float, int]] = PrivateAttr(default_factory=deque)
+    """Times and tokens of requests accepted within the last minute."""
+
+    _usage: mod_base_schema.Cost = PrivateAttr(
+        default_factory=mod_base_schema.Cost
+    )
+
     def __new__(cls, *args, **kwargs):
         return super(Endpoint, cls).__new__(cls, name="dummyendpoint")
 
@@ -771,19 +1620,30 @@ class DummyEndpoint(Endpoint):
         alloc: int = 1024 * 1024,
         delay: float = 0.0,
         rpm: float = DEFAULT_RPM * 10,
+        latency: str = "normal",
+        latency_shape: float = 0.5,
+        throttle_prob: float = 0.0,
+        throttle_retry_after: Optional[float] = 1.0,
+        simulated_rpm: Optional[float] = None,
+        simulated_tpm: Optional[float] = None,
+        completion_tokens: int = 0,
+        cost_per_1k_tokens: float = 0.0,
         **kwargs
     ):
         if safe_hasattr(self, "callback_class"):
             # Already created with SingletonPerName mechanism
             return
 
-        assert error_prob + freeze_prob + overloaded_prob + loading_prob <= 1.0, "Probabilites should not exceed 1.0 ."
+        assert error_prob + freeze_prob + overloaded_prob + loading_prob + throttle_prob <= 1.0, "Probabilites should not exceed 1.0 ."
         assert rpm > 0
         assert alloc >= 0
         assert delay >= 0.0
+        assert latency in LATENCY_DISTRIBUTIONS, f"Latency distribution should be one of {LATENCY_DISTRIBUTIONS}."
+        assert latency_shape > 0.0
 
         kwargs['name'] = name
-        kwargs['callback_class'] = EndpointCallback
+        kwargs['callback_class'] = DummyCallback
+        kwargs.setdefault('batch_max_size', DEFAULT_BATCH_MAX_SIZE)
 
         super().__init__(
             **kwargs, **locals_except("self", "name", "kwargs", "__class__")
@@ -794,18 +1654,111 @@ class DummyEndpoint(Endpoint):
             locals_except('self', 'name', 'kwargs', '__class__')
         )
 
+        # Track simulated requests the same way real endpoints track the http
+        # requests they make.
+        self._instrument_class(DummyEndpoint, "_send")
+
     def handle_wrapped_call(
         self, func: Callable, bindings: inspect.BoundArguments, response: Any,
         callback: Optional[EndpointCallback]
     ) -> None:
-        """Dummy handler does nothing."""
+        """Tally the simulated usage of a request."""
 
-    def post(
-        self, url: str, payload: JSON, timeout: Optional[float] = None
-    ) -> Any:
+        if callback is not None:
+            callback.handle_classification(response)
+
+    def usage(self) -> mod_base_schema.Cost:
+        """Total simulated usage of all successful requests since creation."""
+
+        with self._window_lock:
+            return self._usage.model_copy()
+
+    def _sample_delay(self) -> float:
+        """Sample the delay of a request from the `latency` distribution."""
+
+        from numpy import random as np_random
+
+        if self.latency == "normal":
+            return max(
+                0.0,
+                np_random.normal(self.delay, self.delay * self.latency_shape)
+            )
+
+        if self.latency == "lognormal":
+            return self.delay * np_random.lognormal(0.0, self.latency_shape)
+
+        if self.latency == "pareto":
+            return self.delay * (1.0 + np_random.pareto(self.latency_shape))
+
+        return self.delay
+
+    def _simulated_usage(self, payload: JSON) -> mod_base_schema.Cost:
+        """Usage of a request, with prompt tokens estimated from its inputs."""
+
+        inputs = payload.get('inputs') if isinstance(payload, Dict) else payload
+        if not isinstance(inputs, List):
+            inputs = [inputs]
+
+        chars = sum(len(str(i)) for i in inputs)
+        prompt_tokens = -(-chars // CHARS_PER_TOKEN)
+        tokens = prompt_tokens + self.completion_tokens
+
+        return mod_base_schema.Cost(
+            n_requests=1,
+            n_successful_requests=1,
+            n_tokens=tokens,
+            n_prompt_tokens=prompt_tokens,
+            n_completion_tokens=self.completion_tokens,
+            cost=tokens * self.cost_per_1k_tokens / 1000.0
+        )
+
+    def _admit(self, tokens: int) -> Optional[float]:
+        """Admit a request of the given tokens under the simulated rate limits.
+        
+        Returns None if admitted or otherwise the seconds until it would be.
+        """
+
+        now = time.monotonic()
+
+        with self._window_lock:
+            while len(self._window) > 0 and self._window[0][0] <= now - 60.0:
+                self._window.popleft()
+
+            over_rpm = self.simulated_rpm is not None and len(
+                self._window
+            ) + 1 > self.simulated_rpm
+
+            over_tpm = self.simulated_tpm is not None and sum(
+                t for _, t in self._window
+            ) + tokens > self.simulated_tpm
+
+            if over_rpm or over_tpm:
+                if len(self._window) == 0:
+                    # Request too large to ever be admitted.
+                    return 60.0
+
+                return self._window[0][0] + 60.0 - now
+
+            self._window.append((now, tokens))
+
+            return None
+
+    def _throttled(
+        self, message: str, retry_after: Optional[float]
+    ) -> SimulatedResponse:
+        headers = {}
+        if retry_after is not None:
+            headers['retry-after'] = f"{retry_after:.3f}"
+
+        return SimulatedResponse(
+            status_code=429, body={'error': message}, headers=headers
+        )
+
+    def _send(self, url: str, payload: JSON, timeout: float) -> Any:
         """Pretend to make a classification request similar to huggingface API.
         
-        Simulates overloaded, model loading, frozen, error as configured:
+        Simulates overloaded, model loading, frozen, error, throttled and rate
+        limited outcomes as configured:
 
         ```python
         requests.post(
@@ -814,18 +1767,20 @@ class DummyEndpoint(Endpoint):
         ```
 
         """
-        if timeout is None:
-            timeout = DEFAULT_NETWORK_TIMEOUT
 
-        self.pace_me()
+        usage = self._simulated_usage(payload)
+
+        # Rate limited requests are rejected before doing any work, as
+        # providers do.
+        retry_after = self._admit(usage.n_tokens)
+        if retry_after is not None:
+            return self._throttled("Rate limit reached.", retry_after)
 
         # allocate some data to pretend we are doing hard work
         temporary = [0x42] * self.alloc
 
-        from numpy import random as np_random
-
         if self.delay > 0.0:
-            sleep(max(0.0, np_random.normal(self.delay, self.delay / 2)))
+            sleep(self._sample_delay())
 
         r = random.random()
         j: Optional[JSON] = None
@@ -845,6 +1800,14 @@ class DummyEndpoint(Endpoint):
             raise RuntimeError("Simulated error happened.")
         r -= self.error_prob
 
+        if r < self.throttle_prob:
+            # Simulated throttled outcome.
+
+            return self._throttled(
+                "Too many requests.", self.throttle_retry_after
+            )
+        r -= self.throttle_prob
+
         if r < self.loading_prob:
             # Simulated loading model outcome.
 
@@ -858,7 +1821,13 @@ class DummyEndpoint(Endpoint):
         r -= self.overloaded_prob
 
         if j is None:
-            # Otherwise a simulated success outcome with some constant results plus some randomness.
+            # Otherwise a simulated success outcome with some constant results
+            # plus some randomness, one per input if given a batch of inputs.
+
+            n = 1
+            if isinstance(payload, Dict) and isinstance(payload.get('inputs'),
+                                                        List):
+                n = len(payload['inputs'])
 
             j = [
                 [
@@ -872,42 +1841,23 @@ class DummyEndpoint(Endpoint):
                         'label': 'LABEL_0',
                         'score': 0.13167837262153625 + random.random()
                     }
-                ]
+                ] for _ in range(n)
             ]
 
-        # The rest is the same as in Endpoint:
-
-        # Huggingface public api sometimes tells us that a model is loading and
-        # how long to wait:
-        if "estimated_time" in j:
-            wait_time = j['estimated_time']
-            logger.warning(
-                "Waiting for %s (%s) second(s).",
-                j,
-                wait_time,
-            )
-            sleep(wait_time + 2)
-            return self.post(url, payload)
-
-        if isinstance(j, Dict) and "error" in j:
-            error = j['error']
-            if error == "overloaded":
-                logger.warning(
-                    "Waiting for overloaded API before trying again."
-                )
-                sleep(10)
-                return self.post(url, payload)
+        # Use `temporary`` to make sure it doesn't get compiled away.
+        logger.debug("I have allocated %s bytes.", sys.getsizeof(temporary))
 
-            raise RuntimeError(error)
+        with self._window_lock:
+            self._usage = self._usage + usage
 
-        assert isinstance(
-            j, Sequence
-        ) and len(j) > 0, f"Post did not return a sequence: {j}"
+        return SimulatedResponse(status_code=200, body=j, usage=usage)
 
-        # Use `temporary`` to make sure it doesn't get compiled away.
-        logger.debug("I have allocated %s bytes.", sys.getsizeof(temporary))
+    async def _asend(self, url: str, payload: JSON, timeout: float) -> Any:
+        """Async version of `_send`. Runs the simulation in a thread."""
 
-        return j[0]
+        return await asyncio.to_thread(
+            self._send, url=url, payload=payload, timeout=timeout
+        )
 
 
 EndpointCallback.model_rebuild()
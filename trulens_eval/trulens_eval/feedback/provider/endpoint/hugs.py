@@ -4,6 +4,7 @@ from typing import Callable, Dict, Hashable, Optional
 
 import requests
 
+from trulens_eval.feedback.provider.endpoint.base import DEFAULT_BATCH_MAX_SIZE
 from trulens_eval.feedback.provider.endpoint.base import Endpoint
 from trulens_eval.feedback.provider.endpoint.base import EndpointCallback
 from trulens_eval.keys import _check_key
@@ -22,7 +23,12 @@ class HuggingfaceCallback(EndpointCallback):
 
         super().handle_classification(response)
 
-        if response.ok:
+        # requests responses have `ok`, httpx responses have `is_success`.
+        ok = getattr(response, "ok", None)
+        if ok is None:
+            ok = getattr(response, "is_success", False)
+
+        if ok:
             self.cost.n_successful_requests += 1
             content = json.loads(response.text)
 
@@ -33,7 +39,8 @@ class HuggingfaceCallback(EndpointCallback):
 
 class HuggingfaceEndpoint(Endpoint):
     """
-    Huggingface. Instruments the requests.post method for requests to
+    Huggingface. Instruments the requests.post method, the `post` method of
+    requests sessions and of httpx async clients for requests to
     "https://api-inference.huggingface.co".
     """
 
@@ -44,12 +51,13 @@ class HuggingfaceEndpoint(Endpoint):
         self, func: Callable, bindings: inspect.BoundArguments,
         response: requests.Response, callback: Optional[EndpointCallback]
     ) -> None:
-        # Call here can only be requests.post .
+        # Call here can only be requests.post, requests.Session.post or
+        # httpx.AsyncClient.post .
 
         if "url" not in bindings.arguments:
             return
 
-        url = bindings.arguments['url']
+        url = str(bindings.arguments['url'])
         if not url.startswith("https://api-inference.huggingface.co"):
             return
 
@@ -69,6 +77,8 @@ class HuggingfaceEndpoint(Endpoint):
 
         kwargs['name'] = "huggingface"
         kwargs['callback_class'] = HuggingfaceCallback
+        # The inference api accepts lists of inputs for classification models.
+        kwargs.setdefault('batch_max_size', DEFAULT_BATCH_MAX_SIZE)
 
         # Returns true in "warn" mode to indicate that key is set. Does not
         # print anything even if key not set.
@@ -78,3 +88,10 @@ class HuggingfaceEndpoint(Endpoint):
         super().__init__(*args, **kwargs)
 
         self._instrument_class(requests, "post")
+        self._instrument_class(requests.Session, "post")
+
+        try:
+            import httpx
+            self._instrument_class(httpx.AsyncClient, "post")
+        except ImportError:
+            pass
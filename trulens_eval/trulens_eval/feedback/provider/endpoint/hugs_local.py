@@ -0,0 +1,321 @@
+"""
+# Local Huggingface Endpoint
+
+Runs the models behind the
+[Huggingface][trulens_eval.feedback.provider.hugs.Huggingface] feedback
+functions on the local CPU instead of the Huggingface inference API.
+"""
+
+import asyncio
+from collections import OrderedDict
+import inspect
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from pydantic import PrivateAttr
+
+from trulens_eval.feedback.provider.endpoint.base import DEFAULT_BATCH_MAX_SIZE
+from trulens_eval.feedback.provider.endpoint.base import Endpoint
+from trulens_eval.feedback.provider.endpoint.base import EndpointCallback
+from trulens_eval.feedback.provider.endpoint.base import SimulatedResponse
+from trulens_eval.utils.imports import OptionalImports
+from trulens_eval.utils.imports import REQUIREMENT_ONNX
+from trulens_eval.utils.imports import REQUIREMENT_TRANSFORMERS
+from trulens_eval.utils.python import safe_hasattr
+from trulens_eval.utils.serial import JSON
+
+with OptionalImports(messages=REQUIREMENT_TRANSFORMERS):
+    import transformers
+
+OptionalImports(messages=REQUIREMENT_TRANSFORMERS
+               ).assert_installed(transformers)
+
+logger = logging.getLogger(__name__)
+
+HUGS_API_MODELS_PREFIX = "https://api-inference.huggingface.co/models/"
+"""Prefix of inference api urls before the model id."""
+
+MODEL_TASKS: Dict[str, str] = {
+    "bigcode/starpii": "token-classification",
+}
+"""Pipeline tasks of models that are not text classifiers."""
+
+RUNTIMES = ("transformers", "onnx")
+"""Supported local runtimes."""
+
+
+def model_id_of_url(url: str) -> str:
+    """Get the model id from an inference api url.
+
+    Urls that do not start with the inference api prefix are taken to be model
+    ids or local paths already.
+    """
+
+    if url.startswith(HUGS_API_MODELS_PREFIX):
+        return url[len(HUGS_API_MODELS_PREFIX):]
+
+    return url
+
+
+class HuggingfaceLocalEndpoint(Endpoint):
+    """Endpoint running Huggingface models on the local CPU.
+
+    Accepts the same urls and payloads as
+    [HuggingfaceEndpoint][trulens_eval.feedback.provider.endpoint.hugs.HuggingfaceEndpoint]
+    and produces responses in the same format as the inference api, so the
+    [Huggingface][trulens_eval.feedback.provider.hugs.Huggingface] feedback
+    functions work unchanged. Concurrent requests to the same model are
+    batched (see `batch_max_size`) and loaded models are kept in a warm pool.
+    No api requests are made; with `local_files_only` set, no network access is
+    needed at all provided the models are already in the local Huggingface
+    cache.
+
+    !!! example
+
+        ```python
+        from trulens_eval.feedback.provider.hugs import Huggingface
+
+        huggingface_provider = Huggingface(
+            local=True, runtime="onnx", num_threads=4
+        )
+        ```
+    """
+
+    runtime: str = "transformers"
+    """Runtime to run models with. One of "transformers" (PyTorch) or "onnx"
+    (ONNX Runtime via optimum, models are exported when loaded)."""
+
+    num_threads: Optional[int] = None
+    """Number of CPU threads used by each model invocation with the "onnx"
+    runtime. Defaults to the runtime's default.
+    
+    Not supported by the "transformers" runtime as PyTorch only has a
+    process-wide setting which an endpoint should not change for the rest of
+    the process. Use `torch.set_num_threads` instead.
+    """
+
+    local_files_only: bool = False
+    """Only load models from the local Huggingface cache, never downloading
+    them."""
+
+    warm_pool_size: int = 4
+    """Number of loaded models to keep. The least recently used model is
+    unloaded when another one needs to be loaded."""
+
+    trust_remote_code: bool = False
+    """Whether to allow models that come with their own code. Needed by some
+    models such as the one used by `hallucination_evaluator`."""
+
+    _pipelines: "OrderedDict[str, Any]" = PrivateAttr(
+        default_factory=OrderedDict
+    )
+    """Loaded pipelines by model id, least recently used first."""
+
+    _load_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    @staticmethod
+    def _name_of(
+        runtime: str = "transformers",
+        num_threads: Optional[int] = None,
+        *args,
+        **kwargs
+    ) -> str:
+        """Name of the singleton instance for the given configuration.
+
+        Endpoints with different runtimes or numbers of threads are separate
+        instances so that one does not silently stand in for the other.
+        """
+
+        name = "huggingfacelocal"
+
+        if runtime != "transformers":
+            name += f"_{runtime}"
+
+        if num_threads is not None:
+            name += f"_{num_threads}"
+
+        return name
+
+    def __new__(cls, *args, **kwargs):
+        return super(Endpoint, cls).__new__(
+            cls, name=cls._name_of(*args, **kwargs)
+        )
+
+    def __init__(
+        self,
+        runtime: str = "transformers",
+        num_threads: Optional[int] = None,
+        local_files_only: bool = False,
+        warm_pool_size: int = 4,
+        trust_remote_code: bool = False,
+        **kwargs
+    ):
+        if safe_hasattr(self, "callback_class"):
+            # Already created with SingletonPerName mechanism
+            return
+
+        if runtime not in RUNTIMES:
+            raise ValueError(
+                f"Unknown runtime {runtime}. Expected one of {RUNTIMES}."
+            )
+
+        if runtime == "transformers" and num_threads is not None:
+            raise ValueError(
+                "`num_threads` is only supported by the onnx runtime. "
+                "Use `torch.set_num_threads` for the transformers runtime."
+            )
+
+        if runtime == "onnx":
+            # Fail early rather than on first request.
+            with OptionalImports(messages=REQUIREMENT_ONNX):
+                import onnxruntime
+                import optimum
+            OptionalImports(messages=REQUIREMENT_ONNX
+                           ).assert_installed([onnxruntime, optimum])
+
+        kwargs['name'] = self._name_of(runtime, num_threads)
+        kwargs['callback_class'] = EndpointCallback
+        kwargs.setdefault('batch_max_size', DEFAULT_BATCH_MAX_SIZE)
+        # Requests are limited by local compute, not an api quota. Running more
+        # than one model invocation at a time only splits the same cores.
+        kwargs.setdefault('rpm', 60000)
+        kwargs.setdefault('max_concurrency', 1)
+
+        super().__init__(
+            runtime=runtime,
+            num_threads=num_threads,
+            local_files_only=local_files_only,
+            warm_pool_size=warm_pool_size,
+            trust_remote_code=trust_remote_code,
+            **kwargs
+        )
+
+    def warmup(self, urls: Iterable[str]) -> None:
+        """Load the models for the given urls or model ids ahead of the first
+        request to them."""
+
+        for url in urls:
+            self._pipeline(model_id_of_url(url))
+
+    def _pipeline(self, model_id: str) -> Any:
+        """Get the loaded pipeline for the given model, loading it if needed."""
+
+        with self._load_lock:
+            pipe = self._pipelines.get(model_id)
+            if pipe is not None:
+                self._pipelines.move_to_end(model_id)
+                return pipe
+
+            pipe = self._load(model_id)
+            self._pipelines[model_id] = pipe
+
+            while len(self._pipelines) > max(1, self.warm_pool_size):
+                evicted, _ = self._pipelines.popitem(last=False)
+                logger.info("Unloaded model %s.", evicted)
+
+            return pipe
+
+    def _load(self, model_id: str) -> Any:
+        """Load a pipeline for the given model using the configured runtime."""
+
+        task = MODEL_TASKS.get(model_id, "text-classification")
+
+        logger.info(
+            "Loading model %s for %s with %s runtime.", model_id, task,
+            self.runtime
+        )
+
+        load_kwargs = dict(
+            local_files_only=self.local_files_only,
+            trust_remote_code=self.trust_remote_code
+        )
+
+        if self.runtime == "onnx":
+            import onnxruntime
+            from optimum import onnxruntime as ort_models
+
+            options = onnxruntime.SessionOptions()
+            if self.num_threads is not None:
+                options.intra_op_num_threads = self.num_threads
+
+            model_class = ort_models.ORTModelForTokenClassification \
+                if task == "token-classification" \
+                else ort_models.ORTModelForSequenceClassification
+
+            load_kwargs.update(
+                export=True,
+                provider="CPUExecutionProvider",
+                session_options=options
+            )
+
+        else:
+            model_class = transformers.AutoModelForTokenClassification \
+                if task == "token-classification" \
+                else transformers.AutoModelForSequenceClassification
+
+        model = model_class.from_pretrained(model_id, **load_kwargs)
+        tokenizer = transformers.AutoTokenizer.from_pretrained(
+            model_id,
+            local_files_only=self.local_files_only,
+            trust_remote_code=self.trust_remote_code
+        )
+
+        pipeline_kwargs = {}
+        if task == "token-classification":
+            # Same aggregation as the inference api.
+            pipeline_kwargs['aggregation_strategy'] = "simple"
+
+        return transformers.pipeline(
+            task, model=model, tokenizer=tokenizer, **pipeline_kwargs
+        )
+
+    def _send(self, url: str, payload: JSON, timeout: float) -> Any:
+        """Run the model for the given url on the payload inputs, producing a
+        response as the inference api would."""
+
+        model_id = model_id_of_url(url)
+        task = MODEL_TASKS.get(model_id, "text-classification")
+        pipe = self._pipeline(model_id)
+
+        inputs = payload['inputs']
+
+        if task == "text-classification":
+            # The api responds with scores for all labels of each input, always
+            # nested in a list per input.
+            texts = inputs if isinstance(inputs, List) else [inputs]
+            outputs = pipe(
+                texts, top_k=None, truncation=True, batch_size=len(texts)
+            )
+        else:
+            outputs = pipe(inputs)
+
+        return SimulatedResponse(status_code=200, body=_to_json(outputs))
+
+    async def _asend(self, url: str, payload: JSON, timeout: float) -> Any:
+        """Async version of `_send`. Runs the model in a thread."""
+
+        return await asyncio.to_thread(
+            self._send, url=url, payload=payload, timeout=timeout
+        )
+
+    def handle_wrapped_call(
+        self, func: Callable, bindings: inspect.BoundArguments, response: Any,
+        callback: Optional[EndpointCallback]
+    ) -> None:
+        """Nothing to track as no api is called."""
+
+
+def _to_json(obj: Any) -> JSON:
+    """Convert pipeline outputs, which may contain numpy scalars, to JSON."""
+
+    if isinstance(obj, Dict):
+        return {k: _to_json(v) for k, v in obj.items()}
+
+    if isinstance(obj, (List, tuple)):
+        return [_to_json(v) for v in obj]
+
+    if hasattr(obj, "item"):
+        return obj.item()
+
+    return obj
@@ -33,7 +33,7 @@ from trulens_eval.feedback.provider.endpoint.base import Endpoint
 from trulens_eval.feedback.provider.endpoint.base import EndpointCallback
 from trulens_eval.utils.imports import OptionalImports
 from trulens_eval.utils.imports import REQUIREMENT_OPENAI
-from trulens_eval.utils.pace import Pace
+from trulens_eval.utils.pace import TokenBucketPace
 from trulens_eval.utils.pyschema import Class
 from trulens_eval.utils.pyschema import CLASS_INFO
 from trulens_eval.utils.pyschema import safe_getattr
@@ -210,6 +210,14 @@ class OpenAIEndpoint(Endpoint):
         client: openai client to use. If not provided, a new client will be
             created using the provided kwargs.
 
+        rpm: Requests per minute to keep to.
+
+        tpm: Tokens per minute to keep to. If not given, tokens are not
+            limited.
+
+        pace: [TokenBucketPace][trulens_eval.utils.pace.TokenBucketPace] to
+            keep to instead of one made from `rpm` and `tpm`.
+
         **kwargs: arguments to constructor of a new OpenAI client if `client`
             not provided.
 
@@ -223,7 +231,8 @@ class OpenAIEndpoint(Endpoint):
         client: Optional[Union[oai.OpenAI, oai.AzureOpenAI,
                                OpenAIClient]] = None,
         rpm: Optional[int] = None,
-        pace: Optional[Pace] = None,
+        tpm: Optional[int] = None,
+        pace: Optional[TokenBucketPace] = None,
         **kwargs: dict
     ):
         if safe_hasattr(self, "name") and client is not None:
@@ -240,6 +249,7 @@ class OpenAIEndpoint(Endpoint):
         self_kwargs = {
             'name': name,  # for SingletonPerName
             'rpm': rpm,
+            'tpm': tpm,
             'pace': pace,
             **kwargs
         }
@@ -1,21 +1,16 @@
-from concurrent.futures import wait
 import logging
-from typing import Dict, get_args, get_origin, Optional, Tuple, Union
+from typing import Dict, get_args, get_origin, List, Optional, Tuple, Union
 
-import nltk
-from nltk.tokenize import sent_tokenize
 import numpy as np
 import requests
-from tqdm.auto import tqdm
 
+from trulens_eval.feedback import groundedness as mod_groundedness
 from trulens_eval.feedback import prompts
 from trulens_eval.feedback.provider.base import Provider
 from trulens_eval.feedback.provider.endpoint import HuggingfaceEndpoint
 from trulens_eval.feedback.provider.endpoint.base import DummyEndpoint
 from trulens_eval.feedback.provider.endpoint.base import Endpoint
-from trulens_eval.utils.python import Future
 from trulens_eval.utils.python import locals_except
-from trulens_eval.utils.threading import ThreadPoolExecutor
 
 logger = logging.getLogger(__name__)
 
@@ -83,6 +78,16 @@ def _tci(func):  # "typecheck inputs"
     return wrapper
 
 
+def _entailment(labels: List[Dict]) -> Optional[float]:
+    """Get the entailment score from an NLI classification response."""
+
+    for label in labels:
+        if label['label'] == 'entailment':
+            return label['score']
+
+    return None
+
+
 class Huggingface(Provider):
     """
     Out of the box feedback functions calling Huggingface APIs.
@@ -90,10 +95,18 @@ class Huggingface(Provider):
 
     endpoint: Endpoint
 
+    nli_chunk_chars: Optional[int] = None
+    """Sources longer than this many characters are split into chunks of whole
+    sentences by `groundedness_measure_with_nli`, each statement scored by its
+    best supporting chunk. If None, statements are checked against the full
+    source."""
+
     def __init__(
         self,
         name: Optional[str] = None,
         endpoint: Optional[Endpoint] = None,
+        local: bool = False,
+        nli_chunk_chars: Optional[int] = None,
         **kwargs
     ):
         # NOTE(piotrm): HACK006: pydantic adds endpoint to the signature of this
@@ -108,6 +121,21 @@ class Huggingface(Provider):
             from trulens_eval.feedback.provider.hugs import Huggingface
             huggingface_provider = Huggingface()
             ```
+
+        Args:
+            name: Name of the provider.
+
+            endpoint: Endpoint to use. Defaults to the Huggingface inference api
+                or to a local endpoint if `local` is set.
+
+            local: Run the models on the local CPU instead of calling the
+                inference api. Other arguments are passed to
+                [HuggingfaceLocalEndpoint][trulens_eval.feedback.provider.endpoint.hugs_local.HuggingfaceLocalEndpoint],
+                e.g. `runtime="onnx"`, `num_threads` (onnx only) or
+                `local_files_only`.
+
+            nli_chunk_chars: Chunk size for `groundedness_measure_with_nli`.
+                See `Huggingface.nli_chunk_chars`.
         """
 
         kwargs['name'] = name
@@ -115,7 +143,14 @@ class Huggingface(Provider):
         self_kwargs = dict()
 
         # TODO: figure out why all of this logic is necessary:
-        if endpoint is None:
+        if endpoint is None and local:
+            # Imported here as it requires optional packages.
+            from trulens_eval.feedback.provider.endpoint.hugs_local import \
+                HuggingfaceLocalEndpoint
+
+            self_kwargs['endpoint'] = HuggingfaceLocalEndpoint(**kwargs)
+
+        elif endpoint is None:
             self_kwargs['endpoint'] = HuggingfaceEndpoint(**kwargs)
         else:
             if isinstance(endpoint, Endpoint):
@@ -124,6 +159,7 @@ class Huggingface(Provider):
                 self_kwargs['endpoint'] = HuggingfaceEndpoint(**endpoint)
 
         self_kwargs['name'] = name or "huggingface"
+        self_kwargs['nli_chunk_chars'] = nli_chunk_chars
 
         super().__init__(
             **self_kwargs
@@ -163,23 +199,17 @@ class Huggingface(Provider):
         def get_scores(text):
             payload = {"inputs": text}
             hf_response = self.endpoint.post(
-                url=HUGS_LANGUAGE_API_URL, payload=payload, timeout=30
+                url=HUGS_LANGUAGE_API_URL,
+                payload=payload,
+                timeout=30,
+                batch=True
             )
             return {r['label']: r['score'] for r in hf_response}
 
-        with ThreadPoolExecutor(max_workers=2) as tpool:
-            max_length = 500
-            f_scores1: Future[Dict] = tpool.submit(
-                get_scores, text=text1[:max_length]
-            )
-            f_scores2: Future[Dict] = tpool.submit(
-                get_scores, text=text2[:max_length]
-            )
-
-        wait([f_scores1, f_scores2])
-
-        scores1: Dict = f_scores1.result()
-        scores2: Dict = f_scores2.result()
+        max_length = 500
+        scores1, scores2 = self._fan_out(
+            get_scores, [text1[:max_length], text2[:max_length]]
+        )
 
         langs = list(scores1.keys())
         prob1 = np.array([scores1[k] for k in langs])
@@ -195,7 +225,7 @@ class Huggingface(Provider):
         """
         A measure to track if the source material supports each sentence in the statement using an NLI model.
 
-        First the response will be split into statements using a sentence tokenizer.The NLI model will process each statement using a natural language inference model, and will use the entire source.
+        First the response will be split into statements using a sentence tokenizer.The NLI model will process each statement using a natural language inference model, and will use the entire source (or its chunks, see `nli_chunk_chars`). All statements are scored together in batched requests.
 
         !!! example
         
@@ -218,25 +248,49 @@ class Huggingface(Provider):
         Returns:
             Tuple[float, str]: A tuple containing a value between 0.0 (not grounded) and 1.0 (grounded) and a string containing the reasons for the evaluation.
         """
-        nltk.download('punkt', quiet=True)
-        groundedness_scores = {}
-
-        reasons_str = ""
         if isinstance(source, list):
             source = ' '.join(map(str, source))
-        hypotheses = sent_tokenize(statement)
-        for i, hypothesis in enumerate(tqdm(
-                hypotheses, desc="Groundendess per statement in source")):
-            score = self._doc_groundedness(
-                premise=source, hypothesis=hypothesis
-            )
+
+        hypotheses = mod_groundedness.sentences(statement)
+
+        if self.nli_chunk_chars is not None and len(source
+                                                   ) > self.nli_chunk_chars:
+            premises = mod_groundedness.chunks(source, self.nli_chunk_chars)
+        else:
+            premises = (source,)
+
+        # Score all (premise, hypothesis) pairs in as few requests as the
+        # endpoint allows.
+        responses = self.endpoint.post_batch(
+            url=HUGS_DOCNLI_API_URL,
+            inputs=[
+                premise + ' [SEP] ' + hypothesis
+                for hypothesis in hypotheses
+                for premise in premises
+            ]
+        )
+
+        groundedness_scores = {}
+        reasons_str = ""
+
+        for i, hypothesis in enumerate(hypotheses):
+            # Each hypothesis is scored by its best supporting premise.
+            scores = [
+                _entailment(responses[i * len(premises) + j])
+                for j in range(len(premises))
+            ]
+            best = int(np.argmax(scores))
+            score = scores[best]
+
             reasons_str = reasons_str + str.format(
                 prompts.GROUNDEDNESS_REASON_TEMPLATE,
                 statement_sentence=hypothesis,
-                supporting_evidence="[Doc NLI Used full source]",
+                supporting_evidence="[Doc NLI Used full source]"
+                if len(premises) == 1 else premises[best],
                 score=score * 10,
             )
             groundedness_scores[f"statement_{i}"] = score
+
         average_groundedness_score = float(
             np.mean(list(groundedness_scores.values()))
         )
@@ -277,7 +331,7 @@ class Huggingface(Provider):
         ctx_relevnace_string = prompt + '<eos>' + context
         payload = {"inputs": ctx_relevnace_string}
         hf_response = self.endpoint.post(
-            url=HUGS_CONTEXT_RELEVANCE_API_URL, payload=payload
+            url=HUGS_CONTEXT_RELEVANCE_API_URL, payload=payload, batch=True
         )
 
         for label in hf_response:
@@ -317,7 +371,7 @@ class Huggingface(Provider):
         payload = {"inputs": truncated_text}
 
         hf_response = self.endpoint.post(
-            url=HUGS_SENTIMENT_API_URL, payload=payload
+            url=HUGS_SENTIMENT_API_URL, payload=payload, batch=True
         )
 
         for label in hf_response:
@@ -356,7 +410,7 @@ class Huggingface(Provider):
         truncated_text = text[:max_length]
         payload = {"inputs": truncated_text}
         hf_response = self.endpoint.post(
-            url=HUGS_TOXIC_API_URL, payload=payload
+            url=HUGS_TOXIC_API_URL, payload=payload, batch=True
         )
 
         for label in hf_response:
@@ -409,12 +463,10 @@ class Huggingface(Provider):
         nli_string = premise + ' [SEP] ' + hypothesis
         payload = {"inputs": nli_string}
         hf_response = self.endpoint.post(
-            url=HUGS_DOCNLI_API_URL, payload=payload
+            url=HUGS_DOCNLI_API_URL, payload=payload, batch=True
         )
 
-        for label in hf_response:
-            if label['label'] == 'entailment':
-                return label['score']
+        return _entailment(hf_response)
 
     def pii_detection(self, text: str) -> float:
         """
@@ -628,8 +680,20 @@ class Dummy(Huggingface):
         alloc: int = 1024 * 1024,
         rpm: float = 600,
         delay: float = 1.0,
+        latency: str = "normal",
+        latency_shape: float = 0.5,
+        throttle_prob: float = 0.0,
+        throttle_retry_after: Optional[float] = 1.0,
+        simulated_rpm: Optional[float] = None,
+        simulated_tpm: Optional[float] = None,
+        completion_tokens: int = 0,
+        cost_per_1k_tokens: float = 0.0,
         **kwargs
     ):
+        """Huggingface provider backed by a simulated endpoint. See
+        [DummyEndpoint][trulens_eval.feedback.provider.endpoint.base.DummyEndpoint]
+        for the meaning of the arguments."""
+
         kwargs['name'] = name or "dummyhugs"
         kwargs['endpoint'] = DummyEndpoint(
             name="dummyendhugspoint", **locals_except("self", "name", "kwargs")
@@ -9,7 +9,7 @@ from trulens_eval.feedback.provider.endpoint import OpenAIEndpoint
 from trulens_eval.feedback.provider.endpoint.base import Endpoint
 from trulens_eval.utils.imports import OptionalImports
 from trulens_eval.utils.imports import REQUIREMENT_OPENAI
-from trulens_eval.utils.pace import Pace
+from trulens_eval.utils.pace import TokenBucketPace
 from trulens_eval.utils.pyschema import CLASS_INFO
 
 with OptionalImports(messages=REQUIREMENT_OPENAI):
@@ -38,6 +38,15 @@ class OpenAI(LLMProvider):
         model_engine: The OpenAI completion model. Defaults to
             `gpt-3.5-turbo`
 
+        rpm: Requests per minute to keep to.
+
+        tpm: Tokens per minute to keep to. If not given, tokens are not
+            limited.
+
+        pace: [TokenBucketPace][trulens_eval.utils.pace.TokenBucketPace] to
+            keep to instead of one made from `rpm` and `tpm`, for example to
+            share one budget between providers.
+
         **kwargs: Additional arguments to pass to the
             [OpenAIEndpoint][trulens_eval.feedback.provider.endpoint.openai.OpenAIEndpoint]
             which are then passed to
@@ -55,8 +64,9 @@ class OpenAI(LLMProvider):
         self,
         *args,
         endpoint=None,
-        pace: Optional[Pace] = None,
+        pace: Optional[TokenBucketPace] = None,
         rpm: Optional[int] = None,
+        tpm: Optional[int] = None,
         model_engine: Optional[str] = None,
         **kwargs: dict
     ):
@@ -74,7 +84,7 @@ class OpenAI(LLMProvider):
         self_kwargs['model_engine'] = model_engine
 
         self_kwargs['endpoint'] = OpenAIEndpoint(
-            *args, pace=pace, rpm=rpm, **kwargs
+            *args, pace=pace, rpm=rpm, tpm=tpm, **kwargs
         )
 
         super().__init__(
@@ -168,6 +168,13 @@ class Groundedness(Semantics, WithPrompt):
         Score: <Output a number between 0-10 where 0 is no information overlap and 10 is all information is overlapping>
         """
     )
+    batch_user_prompt: ClassVar[PromptTemplate] = PromptTemplate.from_template(
+        """SOURCE: {premise}
+
+        {hypotheses}
+
+        INFORMATION OVERLAP of each STATEMENT: """
+    )
 
 
 class ContextRelevance(Relevance, WithPrompt):
@@ -203,6 +210,13 @@ class ContextRelevance(Relevance, WithPrompt):
         
         RELEVANCE: """
     )
+    batch_user_prompt: ClassVar[PromptTemplate] = PromptTemplate.from_template(
+        """QUESTION: {question}
+
+        {contexts}
+
+        RELEVANCE of each CONTEXT: """
+    )
 
 
 class QuestionStatementRelevanceVerb2STop1Confidence(Relevance, WithPrompt):
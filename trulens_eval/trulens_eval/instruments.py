@@ -8,8 +8,11 @@ typical use cases.
 
 from __future__ import annotations
 
+import contextvars
+import copy
 import dataclasses
 from datetime import datetime
+from enum import Enum
 import functools
 import inspect
 from inspect import BoundArguments
@@ -18,10 +21,11 @@ import logging
 import os
 from pprint import pformat
 import threading as th
+import time
 import traceback
 from typing import (
-    Any, Awaitable, Callable, Dict, Iterable, Optional, Sequence, Set, Tuple,
-    Type, Union
+    Any, Awaitable, Callable, Dict, FrozenSet, Iterable, List, Optional,
+    Sequence, Set, Tuple, Type, Union
 )
 import weakref
 
@@ -29,6 +33,7 @@ import pydantic
 
 from trulens_eval.feedback import feedback as mod_feedback
 from trulens_eval.feedback.provider import endpoint as mod_endpoint
+from trulens_eval.feedback.provider.endpoint import base as mod_endpoint_base
 from trulens_eval.schema import base as mod_base_schema
 from trulens_eval.schema import record as mod_record_schema
 from trulens_eval.schema import types as mod_types_schema
@@ -36,24 +41,171 @@ from trulens_eval.utils import python
 from trulens_eval.utils.containers import dict_merge_with
 from trulens_eval.utils.imports import Dummy
 from trulens_eval.utils.json import jsonify
+from trulens_eval.utils.overhead import OverheadPhase
+from trulens_eval.utils.overhead import OverheadProfiler
+from trulens_eval.utils.payload import PayloadPolicy
 from trulens_eval.utils.pyschema import clean_attributes
 from trulens_eval.utils.pyschema import Method
 from trulens_eval.utils.pyschema import safe_getattr
 from trulens_eval.utils.python import callable_name
-from trulens_eval.utils.python import caller_frame
 from trulens_eval.utils.python import class_name
-from trulens_eval.utils.python import get_first_local_in_call_stack
+from trulens_eval.utils.python import context_vars_set
 from trulens_eval.utils.python import id_str
 from trulens_eval.utils.python import is_really_coroutinefunction
 from trulens_eval.utils.python import safe_hasattr
 from trulens_eval.utils.python import safe_signature
+from trulens_eval.utils.python import wrap_async_generator
 from trulens_eval.utils.python import wrap_awaitable
+from trulens_eval.utils.python import wrap_generator
+from trulens_eval.utils.serial import JSON
 from trulens_eval.utils.serial import Lens
 from trulens_eval.utils.text import retab
 
 logger = logging.getLogger(__name__)
 
 
+class CaptureMode(str, Enum):
+    """How arguments and returns of instrumented calls are captured when their
+    serialization is deferred until after the root call returns."""
+
+    REFERENCE = "reference"
+    """Keep references. Fastest, but changes made to the objects after the call
+    show up in its record."""
+
+    SHALLOW = "shallow"
+    """Keep shallow copies of each argument and return value. Protects against
+    reassignment and container changes at the top level but not against
+    changes to nested objects."""
+
+    DEEP = "deep"
+    """Keep deep copies. Protects against all changes but copies everything."""
+
+
+def capture(obj: Any, mode: CaptureMode) -> Any:
+    """Capture the given object for serialization later according to `mode`.
+
+    Objects that cannot be copied are captured by reference.
+    """
+
+    if mode == CaptureMode.REFERENCE:
+        return obj
+
+    try:
+        if mode == CaptureMode.DEEP:
+            return copy.deepcopy(obj)
+
+        return copy.copy(obj)
+
+    except Exception as e:
+        logger.debug(
+            "Could not copy %s, capturing it by reference: %s",
+            class_name(type(obj)), e
+        )
+        return obj
+
+
+@dataclasses.dataclass
+class DeferredCall:
+    """An instrumented call whose arguments and returns were captured to be
+    serialized into a
+    [RecordAppCall][trulens_eval.schema.record.RecordAppCall] later."""
+
+    call_id: mod_types_schema.CallID
+    stack: Tuple[mod_record_schema.RecordAppCallMethod, ...]
+    args: Dict[str, Any]
+    rets: Any
+    error: Optional[str]
+    perf: mod_base_schema.Perf
+    pid: int
+    tid: int
+    payload: Optional[PayloadPolicy] = None
+
+    def serialize(self) -> mod_record_schema.RecordAppCall:
+        """Serialize the captured call, limiting its payload as per
+        `payload`."""
+
+        args = {k: jsonify(v) for k, v in self.args.items()}
+        rets = jsonify(self.rets)
+
+        if self.payload is not None:
+            args, rets = self.payload.limit_call(args, rets)
+
+        return mod_record_schema.RecordAppCall(
+            call_id=self.call_id,
+            stack=self.stack,
+            args=args,
+            rets=rets,
+            error=self.error,
+            perf=self.perf,
+            pid=self.pid,
+            tid=self.tid
+        )
+
+
+class StreamCollector:
+    """Chunks of a streamed return of an instrumented call and their timing,
+    collected as the chunks are produced.
+
+    String chunks are joined into one string. Other chunks are jsonified as
+    they arrive so that the chunk objects themselves are not kept.
+    """
+
+    def __init__(self):
+        self.texts: Optional[List[str]] = []
+        self.chunks: List[JSON] = []
+
+        self.n_chunks: int = 0
+        self.first_chunk_time: Optional[datetime] = None
+        self.last_chunk_time: Optional[datetime] = None
+        self.gaps: List[float] = []
+
+    def add(self, chunk: Any) -> None:
+        """Collect the given chunk, produced just now."""
+
+        now = datetime.now()
+
+        if self.last_chunk_time is None:
+            self.first_chunk_time = now
+        else:
+            self.gaps.append((now - self.last_chunk_time).total_seconds())
+
+        self.last_chunk_time = now
+        self.n_chunks += 1
+
+        if self.texts is not None:
+            if isinstance(chunk, str):
+                self.texts.append(chunk)
+                return
+
+            # Not all chunks are strings. Keep them all as a list instead.
+            self.chunks = list(self.texts)
+            self.texts = None
+
+        self.chunks.append(jsonify(chunk))
+
+    def rets(self) -> JSON:
+        """The return value to record: the joined string if all chunks are
+        strings, the list of jsonified chunks otherwise."""
+
+        if self.texts is not None:
+            return "".join(self.texts)
+
+        return self.chunks
+
+    def perf(
+        self, start_time: datetime, end_time: datetime
+    ) -> mod_base_schema.Perf:
+        """Performance of the call including the timing of its chunks."""
+
+        return mod_base_schema.Perf(
+            start_time=start_time,
+            end_time=end_time,
+            first_chunk_time=self.first_chunk_time,
+            n_chunks=self.n_chunks,
+            chunk_latency=mod_base_schema.ChunkLatency.of_gaps(self.gaps)
+        )
+
+
 class WithInstrumentCallbacks:
     """Abstract definition of callbacks invoked by Instrument during
     instrumentation or when instrumented methods are called.
@@ -122,6 +274,82 @@ class WithInstrumentCallbacks:
 
         raise NotImplementedError
 
+    # Called during invocation.
+    def get_capture_mode(self) -> Optional[CaptureMode]:
+        """
+        How instrumented methods capture their arguments and returns to be
+        serialized after the root call returns, or None to serialize them
+        during the call.
+        """
+
+        raise NotImplementedError
+
+    # Called during invocation.
+    def get_payload_policy(
+        self, frame: mod_record_schema.RecordAppCallMethod, func: Callable
+    ) -> Optional[PayloadPolicy]:
+        """
+        Limits on the recorded arguments and returns of the call of `func`
+        at `frame`, or None to record them in full.
+        """
+
+        raise NotImplementedError
+
+    # Called during invocation.
+    def get_overhead_profiler(self) -> Optional[OverheadProfiler]:
+        """
+        Profiler to measure the overhead of instrumented calls recorded by
+        this app with, or None to not measure them.
+        """
+
+        raise NotImplementedError
+
+    # Called during invocation.
+    def on_root_call(
+        self, ctx: 'RecordingContext', func: Callable, sig: Signature,
+        args: Tuple, kwargs: Dict[str, Any]
+    ) -> bool:
+        """
+        Called by instrumented methods at the start of root calls (first
+        instrumented methods in a call stack) to decide whether the call is
+        recorded into `ctx`.
+
+        Args:
+            ctx: The context of the recording.
+
+            func: The function being called.
+
+            sig: The signature of the function.
+
+            args: The positional arguments of the call.
+
+            kwargs: The keyword arguments of the call.
+        """
+
+        raise NotImplementedError
+
+    # Called during invocation.
+    def on_unsampled_call(
+        self, ctx: 'RecordingContext', error: Optional[BaseException],
+        duration: float
+    ) -> bool:
+        """
+        Called by instrumented methods at the end of root calls that were not
+        recorded into `ctx` to decide whether to record them after all.
+        
+        Only the root call is recorded in that case as its subcalls were not
+        tracked.
+
+        Args:
+            ctx: The context of the recording.
+
+            error: The error raised by the call if any.
+
+            duration: The duration of the call in seconds.
+        """
+
+        raise NotImplementedError
+
     # Called during invocation.
     def on_add_record(
         self,
@@ -159,6 +387,10 @@ class WithInstrumentCallbacks:
             existing_record: If the record has already been produced (i.e.
                 because it was an awaitable), it can be passed here to avoid
                 re-creating it.
+
+        Returns:
+            The record or None if it is being assembled in the background as
+                per [get_capture_mode][trulens_eval.instruments.WithInstrumentCallbacks.get_capture_mode].
         """
 
         raise NotImplementedError
@@ -212,6 +444,32 @@ def class_filter_matches(f: ClassFilter, obj: Union[Type, object]) -> bool:
     raise ValueError(f"Invalid filter {f}. Type, or a Tuple of Types expected.")
 
 
+_call_contexts: contextvars.ContextVar[FrozenSet['RecordingContext']] = \
+    contextvars.ContextVar("tru_call_contexts", default=frozenset())
+"""Recording contexts of the instrumented methods currently executing.
+
+Context variables are copied into new tasks and into threads started by
+[TP][trulens_eval.utils.threading.TP] so instrumented methods called there
+find the contexts of their callers."""
+
+_call_stacks: contextvars.ContextVar[Dict['RecordingContext', Tuple[
+    mod_record_schema.RecordAppCallMethod, ...]]] = \
+    contextvars.ContextVar("tru_call_stacks", default={})
+"""Call stacks of the instrumented methods currently executing, one per
+recording context."""
+
+_unsampled_contexts: contextvars.ContextVar[FrozenSet['RecordingContext']] = \
+    contextvars.ContextVar("tru_unsampled_contexts", default=frozenset())
+"""Recording contexts whose root calls currently executing were not sampled
+for recording. Subcalls are not recorded into them."""
+
+_call_roots: contextvars.ContextVar[Dict['RecordingContext',
+                                         mod_types_schema.CallID]] = \
+    contextvars.ContextVar("tru_call_roots", default={})
+"""Call ids of the root calls of the instrumented methods currently executing,
+one per recording context."""
+
+
 class Instrument(object):
     """Instrumentation tools."""
 
@@ -221,6 +479,10 @@ class Instrument(object):
     APPS = "__tru_apps"
     """Attribute name for storing apps that expect to be notified of calls."""
 
+    PAYLOAD = "__tru_payload"
+    """Attribute name for storing the payload policy of a method overriding
+    that of apps."""
+
     class Default:
         """Default instrumentation configuration.
         
@@ -239,6 +501,20 @@ class Instrument(object):
         Methods matching name have to pass the filter to be instrumented.
         """
 
+        SKIP_TYPES = {
+            "numpy.ndarray",
+            "torch.Tensor",
+            "pandas.core.frame.DataFrame",
+            "pandas.core.series.Series",
+        }
+        """Data containers, by full class name, that are not walked for
+        components to instrument nor serialized into app json.
+
+        Objects of these types and their subclasses are summarized instead.
+        Names are used so that the libraries defining them need not be
+        imported.
+        """
+
     def print_instrumentation(self) -> None:
         """Print out description of the modules, classes, methods this class
         will instrument."""
@@ -271,40 +547,148 @@ class Instrument(object):
 
             print()
 
+    def _cache(self, name: str) -> Dict[Any, Any]:
+        """Cache of per-type or per-module decisions named `name`.
+        
+        All caches are reset if modules, classes, methods or types to skip
+        were added since they were filled.
+        """
+
+        version = (
+            len(self.include_modules), len(self.include_classes),
+            len(self.include_methods), len(self.skip_types)
+        )
+
+        if self._cache_version != version:
+            self._cache_version = version
+            self._caches = {}
+
+        cache = self._caches.get(name)
+        if cache is None:
+            cache = self._caches[name] = {}
+
+        return cache
+
     def to_instrument_object(self, obj: object) -> bool:
         """Determine whether the given object should be instrumented."""
 
-        # NOTE: some classes do not support issubclass but do support
-        # isinstance. It is thus preferable to do isinstance checks when we can
-        # avoid issublcass checks.
-        return any(isinstance(obj, cls) for cls in self.include_classes)
+        cls = type(obj)
+        if obj.__class__ is not cls:
+            # Proxies may pretend to be of other classes.
+            return any(isinstance(obj, cls) for cls in self.include_classes)
+
+        cache = self._cache("object")
+
+        ret = cache.get(cls)
+        if ret is None:
+            # NOTE: some classes do not support issubclass but do support
+            # isinstance. It is thus preferable to do isinstance checks when
+            # we can avoid issublcass checks.
+            ret = cache[cls] = any(
+                isinstance(obj, parent) for parent in self.include_classes
+            )
+
+        return ret
 
     def to_instrument_class(self, cls: type) -> bool:  # class
         """Determine whether the given class should be instrumented."""
 
-        # Sometimes issubclass is not supported so we return True just to be
-        # sure we instrument that thing.
+        cache = self._cache("class")
 
-        try:
-            return any(
-                issubclass(cls, parent) for parent in self.include_classes
-            )
-        except Exception:
-            return True
+        ret = cache.get(cls)
+        if ret is None:
+            # Sometimes issubclass is not supported so we return True just to
+            # be sure we instrument that thing.
+            try:
+                ret = any(
+                    issubclass(cls, parent) for parent in self.include_classes
+                )
+            except Exception:
+                ret = True
+
+            cache[cls] = ret
+
+        return ret
 
     def to_instrument_module(self, module_name: str) -> bool:
         """Determine whether a module with the given (full) name should be instrumented."""
 
-        return any(
-            module_name.startswith(mod2) for mod2 in self.include_modules
-        )
+        cache = self._cache("module")
+
+        ret = cache.get(module_name)
+        if ret is None:
+            ret = cache[module_name] = any(
+                module_name.startswith(mod2) for mod2 in self.include_modules
+            )
+
+        return ret
+
+    def to_skip_object(self, obj: object) -> bool:
+        """Determine whether the given object is a data container that should
+        not be walked for components nor serialized into app json. See
+        [Default.SKIP_TYPES][trulens_eval.instruments.Instrument.Default.SKIP_TYPES]."""
+
+        cls = type(obj)
+        cache = self._cache("skip")
+
+        ret = cache.get(cls)
+        if ret is None:
+            try:
+                mro = cls.__mro__
+            except Exception:
+                mro = (cls,)
+
+            ret = cache[cls] = any(
+                f"{base.__module__}.{base.__qualname__}" in self.skip_types
+                for base in mro
+            )
+
+        return ret
+
+    def methods_to_instrument(self, cls: type) -> List[Tuple[type, str]]:
+        """Methods of `cls` or its bases that may be instrumented, as the base
+        owning them and their name.
+
+        Instances of `cls` still need to pass the filters of the methods in
+        `include_methods`.
+        """
+
+        cache = self._cache("methods")
+
+        ret = cache.get(cls)
+        if ret is not None:
+            return ret
+
+        ret = []
+
+        # Warning: cls.__mro__ sometimes returns an object that can be iterated
+        # through only once.
+        for base in list(cls.__mro__):
+            # Some top part of mro() may need instrumentation here if some
+            # subchains call superchains, and we want to capture the
+            # intermediate steps. On the other hand we don't want to instrument
+            # the very base classes such as object. Classes whose subclass
+            # checks fail are included as we don't want to miss anything.
+            # Unsure why some llama_index subclass checks fail.
+            if not self.to_instrument_module(base.__module__) or \
+                    not self.to_instrument_class(base):
+                continue
+
+            for method_name in self.include_methods:
+                if safe_hasattr(base, method_name):
+                    ret.append((base, method_name))
+
+        cache[cls] = ret
+
+        return ret
 
     def __init__(
         self,
         include_modules: Optional[Iterable[str]] = None,
         include_classes: Optional[Iterable[type]] = None,
         include_methods: Optional[Dict[str, ClassFilter]] = None,
-        app: Optional[WithInstrumentCallbacks] = None
+        app: Optional[WithInstrumentCallbacks] = None,
+        skip_types: Optional[Iterable[str]] = None
     ):
         if include_modules is None:
             include_modules = []
@@ -327,8 +711,15 @@ class Instrument(object):
             merge=class_filter_disjunction
         )
 
+        self.skip_types = Instrument.Default.SKIP_TYPES.union(
+            set(skip_types or [])
+        )
+
         self.app = app
 
+        self._cache_version = None
+        self._caches: Dict[str, Dict[Any, Any]] = {}
+
     def tracked_method_wrapper(
         self, query: Lens, func: Callable, method_name: str, cls: type,
         obj: object
@@ -366,21 +757,18 @@ class Instrument(object):
 
         sig = safe_signature(func)
 
-        def find_instrumented(f):
-            # Used for finding the wrappers methods in the call stack. Note that
-            # the sync version uses the async one internally and all of the
-            # relevant locals are in the async version. We thus don't look for
-            # sync tru_wrapper calls in the stack.
-            return id(f) == id(tru_wrapper.__code__)
+        is_coroutine = is_really_coroutinefunction(func)
+        is_asyncgen = inspect.isasyncgenfunction(func)
 
         @functools.wraps(func)
         def tru_wrapper(*args, **kwargs):
+            entry_ns = time.perf_counter_ns()
+
             logger.debug(
                 "%s: calling instrumented sync method %s of type %s, "
                 "iscoroutinefunction=%s, "
                 "isasyncgeneratorfunction=%s", query, func, type(func),
-                is_really_coroutinefunction(func),
-                inspect.isasyncgenfunction(func)
+                is_coroutine, is_asyncgen
             )
 
             apps = getattr(tru_wrapper, Instrument.APPS)
@@ -388,16 +776,11 @@ class Instrument(object):
             # If not within a root method, call the wrapped function without
             # any recording.
 
-            # Get any contexts already known from higher in the call stack.
-            contexts = get_first_local_in_call_stack(
-                key="contexts",
-                func=find_instrumented,
-                offset=1,
-                skip=python.caller_frame()
-            )
-            # Note: are empty sets false?
-            if contexts is None:
-                contexts = set([])
+            # Get any contexts already known from callers.
+            contexts = set(_call_contexts.get())
+
+            # Contexts that a caller decided not to record into.
+            skipped = _unsampled_contexts.get()
 
             # And add any new contexts from all apps wishing to record this
             # function. This may produce some of the same contexts that were
@@ -407,7 +790,8 @@ class Instrument(object):
             # instrumented method being called.
             for app in apps:
                 for ctx in app.on_new_record(func):
-                    contexts.add(ctx)
+                    if ctx not in skipped:
+                        contexts.add(ctx)
 
             if len(contexts) == 0:
                 # If no app wants this call recorded, run and return without
@@ -418,34 +802,35 @@ class Instrument(object):
 
                 return func(*args, **kwargs)
 
-            # If a wrapped method was called in this call stack, get the prior
-            # calls from this variable. Otherwise create a new chain stack. As
+            # If a wrapped method is being executed by our callers, get the
+            # prior calls from here. Otherwise create a new chain stack. As
             # another wrinke, the addresses of methods in the stack may vary
             # from app to app that are watching this method. Hence we index the
-            # stacks by id of the call record list which is unique to each app.
-            ctx_stacks = get_first_local_in_call_stack(
-                key="stacks",
-                func=find_instrumented,
-                offset=1,
-                skip=caller_frame()
+            # stacks by the recording context which is unique to each app.
+            ctx_stacks = _call_stacks.get()
+
+            # Apps decide whether to record calls that are roots for them.
+            # Calls not recorded into any context run without any tracking
+            # and neither do their subcalls.
+            unsampled = set(
+                ctx for ctx in contexts
+                if ctx not in ctx_stacks and not ctx.app.on_root_call(
+                    ctx=ctx, func=func, sig=sig, args=args, kwargs=kwargs
+                )
             )
-            # Note: Empty dicts are false.
-            if ctx_stacks is None:
-                ctx_stacks = {}
+            contexts -= unsampled
 
             error = None
             rets = None
 
             # My own stacks to be looked up by further subcalls by the logic
-            # right above. We make a copy here since we need subcalls to access
-            # it but we don't want them to modify it.
-            stacks = {k: v for k, v in ctx_stacks.items()}
+            # right above, for the contexts that record this call.
+            stacks = {}
 
             start_time = None
             end_time = None
 
             bindings = None
-            cost = mod_base_schema.Cost()
 
             # Prepare stacks with call information of this wrapped method so
             # subsequent (inner) calls will see it. For every root_method in the
@@ -456,8 +841,9 @@ class Instrument(object):
             # to use a different stack for the same reason. We index the stack
             # in `stacks` via id of the (unique) list `record`.
 
-            # First prepare the stacks for each context.
-            for ctx in contexts:
+            def frame_of(
+                ctx
+            ) -> Optional[mod_record_schema.RecordAppCallMethod]:
                 # Get app that has instrumented this method.
                 app = ctx.app
 
@@ -473,6 +859,16 @@ class Instrument(object):
                         class_name(type(app)), id_str(args[0]),
                         callable_name(func)
                     )
+                    return None
+
+                return mod_record_schema.RecordAppCallMethod(
+                    path=path, method=Method.of_method(func, obj=obj, cls=cls)
+                )
+
+            # First prepare the stacks for each context.
+            for ctx in contexts:
+                frame_ident = frame_of(ctx)
+                if frame_ident is None:
                     continue
 
                 if ctx not in ctx_stacks:
@@ -483,10 +879,6 @@ class Instrument(object):
                 else:
                     stack = ctx_stacks[ctx]
 
-                frame_ident = mod_record_schema.RecordAppCallMethod(
-                    path=path, method=Method.of_method(func, obj=obj, cls=cls)
-                )
-
                 stack = stack + (frame_ident,)
 
                 stacks[ctx] = stack  # for deeper calls to get
@@ -503,14 +895,95 @@ class Instrument(object):
 
             error_str = None
 
+            # Root call of each context, this one for those it is a root of.
+            ctx_roots = _call_roots.get()
+            roots = {
+                ctx: call_id if len(stack) == 1 else ctx_roots[ctx]
+                for ctx, stack in stacks.items()
+            }
+            for ctx, stack in stacks.items():
+                if len(stack) == 1:
+                    ctx.start_root(call_id)
+
+            # Contexts, stacks and roots for subcalls to find.
+            call_vars = {
+                _call_contexts: frozenset(contexts),
+                _call_stacks: stacks,
+                _call_roots: roots
+            }
+            if len(unsampled) > 0:
+                call_vars[_unsampled_contexts] = skipped.union(unsampled)
+
+            # Profilers of apps measuring the overhead of this call, with the
+            # method as known to each.
+            profiled = []
+            for ctx, stack in stacks.items():
+                profiler = ctx.app.get_overhead_profiler()
+                if profiler is not None:
+                    profiled.append((profiler, (stack[-1].path, func.__name__)))
+
+            # Nanoseconds spent in each phase of this call if profiled.
+            timings: Optional[Dict[OverheadPhase, int]] = None
+            func_start_ns = None
+            if len(profiled) > 0:
+                timings = dict.fromkeys(OverheadPhase, 0)
+                timings[OverheadPhase.CONTEXT] = \
+                    time.perf_counter_ns() - entry_ns
+
+            def timed_func(*args, **kwargs):
+                nonlocal func_start_ns
+
+                func_start_ns = time.perf_counter_ns()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    timings[OverheadPhase.FUNCTION] = \
+                        time.perf_counter_ns() - func_start_ns
+
+            # Endpoints tracking costs while the wrapped function runs and their
+            # callbacks for this call. Streams and awaitables it returns incur
+            # more costs once consumed so they run with the same endpoints.
+            tracked_endpoints = None
+            callbacks = []
+
+            def tracked_func(*args, **kwargs):
+                nonlocal tracked_endpoints
+
+                tracked_endpoints = mod_endpoint_base._tracked_endpoints.get()
+
+                if timings is not None:
+                    return timed_func(*args, **kwargs)
+
+                return func(*args, **kwargs)
+
+            def tally() -> mod_base_schema.Cost:
+                # Cost so far, including that of consuming returned streams and
+                # awaitables.
+                return sum(
+                    (callback.cost for callback in callbacks),
+                    mod_base_schema.Cost()
+                )
+
             try:
                 # Using sig bind here so we can produce a list of key-value
                 # pairs even if positional arguments were provided.
-                bindings: BoundArguments = sig.bind(*args, **kwargs)
+                if timings is not None:
+                    bind_ns = time.perf_counter_ns()
+                    bindings: BoundArguments = sig.bind(*args, **kwargs)
+                    timings[OverheadPhase.BIND
+                           ] = time.perf_counter_ns() - bind_ns
+                else:
+                    bindings: BoundArguments = sig.bind(*args, **kwargs)
 
-                rets, cost = mod_endpoint.Endpoint.track_all_costs_tally(
-                    func, *args, **kwargs
-                )
+                with context_vars_set(call_vars):
+                    cost_ns = time.perf_counter_ns()
+                    rets, callbacks = mod_endpoint.Endpoint.track_all_costs(
+                        tracked_func, *args, **kwargs
+                    )
+                    if timings is not None:
+                        timings[OverheadPhase.COST
+                               ] = time.perf_counter_ns() - cost_ns - timings[
+                                   OverheadPhase.FUNCTION]
 
             except BaseException as e:
                 error = e
@@ -525,8 +998,8 @@ class Instrument(object):
             # Create common information across all records.
 
             # Don't include self in the recorded arguments.
-            nonself = {
-                k: jsonify(v)
+            call_args = {
+                k: v
                 for k, v in
                 (bindings.arguments.items() if bindings is not None else {})
                 if k != "self"
@@ -534,37 +1007,141 @@ class Instrument(object):
 
             records = {}
 
-            def handle_done(rets):
+            def handle_done(
+                rets,
+                stream: Optional[StreamCollector] = None,
+                raise_error: bool = True,
+                awaited: bool = False,
+                contexts: Optional[Set['RecordingContext']] = None
+            ):
+                # Records into all contexts unless `contexts` are given. Only
+                # those are recorded into otherwise, without considering
+                # unsampled root calls or profiling.
+
+                done_ns = time.perf_counter_ns()
+
+                if timings is not None and func_start_ns is not None and \
+                        (stream is not None or awaited):
+                    # The function ran until now.
+                    timings[OverheadPhase.FUNCTION] = done_ns - func_start_ns
+
                 # (re) renerate end_time here because cases where the initial end_time was
                 # just to produce an awaitable before being awaited.
                 end_time = datetime.now()
 
+                if stream is not None:
+                    perf = stream.perf(start_time=start_time, end_time=end_time)
+                else:
+                    perf = mod_base_schema.Perf(
+                        start_time=start_time, end_time=end_time
+                    )
+
+                if contexts is None:
+                    recorded = dict(stacks)
+                    recorded_unsampled = unsampled
+                else:
+                    recorded = {ctx: stacks[ctx] for ctx in contexts}
+                    recorded_unsampled = ()
+
+                # Unsampled root calls may be recorded after all given how they
+                # went, by themselves.
+                duration = (end_time - start_time).total_seconds()
+                for ctx in recorded_unsampled:
+                    if ctx.app.on_unsampled_call(ctx=ctx, error=error,
+                                                 duration=duration):
+                        frame_ident = frame_of(ctx)
+                        if frame_ident is not None:
+                            recorded[ctx] = (frame_ident,)
+
+                if len(recorded) == 0:
+                    if error is not None and raise_error:
+                        raise error
+
+                    return records
+
+                # Arguments and returns, serialized or captured to be
+                # serialized later, by capture mode. Apps using the same mode
+                # share them.
+                values = {}
+
+                def values_of(mode: Optional[CaptureMode]) -> Tuple[Dict, Any]:
+                    if mode not in values:
+                        values_ns = time.perf_counter_ns()
+
+                        if mode is None:
+                            values[mode] = (
+                                {
+                                    k: jsonify(v) for k, v in call_args.items()
+                                }, jsonify(rets)
+                            )
+                        else:
+                            values[mode] = (
+                                {
+                                    k: capture(v, mode)
+                                    for k, v in call_args.items()
+                                }, capture(rets, mode)
+                            )
+
+                        if timings is not None:
+                            timings[OverheadPhase.JSONIFY] += \
+                                time.perf_counter_ns() - values_ns
+
+                    return values[mode]
+
                 record_app_args = dict(
                     call_id=call_id,
-                    args=nonself,
-                    perf=mod_base_schema.Perf(
-                        start_time=start_time, end_time=end_time
-                    ),
+                    perf=perf,
                     pid=os.getpid(),
                     tid=th.get_native_id(),
-                    rets=jsonify(rets),
                     error=error_str if error is not None else None
                 )
                 # End of run wrapped block.
 
                 # Now record calls to each context.
-                for ctx in contexts:
-                    stack = stacks[ctx]
+                for ctx, stack in recorded.items():
 
                     # Note that only the stack differs between each of the records in this loop.
                     record_app_args['stack'] = stack
-                    call = mod_record_schema.RecordAppCall(**record_app_args)
-                    ctx.add_call(call)
+
+                    mode = ctx.app.get_capture_mode()
+                    payload = ctx.app.get_payload_policy(stack[-1], func)
+
+                    recorded_args, recorded_rets = values_of(mode)
+
+                    if mode is None:
+                        if payload is not None:
+                            recorded_args, recorded_rets = payload.limit_call(
+                                recorded_args, recorded_rets
+                            )
+
+                        call = mod_record_schema.RecordAppCall(
+                            args=recorded_args,
+                            rets=recorded_rets,
+                            **record_app_args
+                        )
+                    else:
+                        call = DeferredCall(
+                            args=recorded_args,
+                            rets=recorded_rets,
+                            payload=payload,
+                            **record_app_args
+                        )
+
+                    if len(stack) == 1:
+                        # Subcalls still streaming are recorded now, as they
+                        # are so far, before their root call.
+                        ctx.finish_root(call_id)
+
+                    # Unsampled root calls recorded after all are their own
+                    # roots.
+                    ctx.add_call(call, root_call_id=roots.get(ctx, call_id))
 
                     # If stack has only 1 thing on it, we are looking at a "root
                     # call". Create a record of the result and notify the app:
 
                     if len(stack) == 1:
+                        add_record_ns = time.perf_counter_ns()
+
                         # If this is a root call, notify app to add the completed record
                         # into its containers:
                         records[ctx] = ctx.app.on_add_record(
@@ -574,18 +1151,121 @@ class Instrument(object):
                             bindings=bindings,
                             ret=rets,
                             error=error,
-                            perf=mod_base_schema.Perf(
-                                start_time=start_time, end_time=end_time
-                            ),
-                            cost=cost,
+                            perf=perf,
+                            cost=tally(),
                             existing_record=records.get(ctx)
                         )
 
-                if error is not None:
+                        if timings is not None:
+                            timings[OverheadPhase.ON_ADD_RECORD] += \
+                                time.perf_counter_ns() - add_record_ns
+
+                if timings is not None and contexts is None:
+                    timings[OverheadPhase.RECORD_CALL] = \
+                        time.perf_counter_ns() - done_ns \
+                        - timings[OverheadPhase.JSONIFY] \
+                        - timings[OverheadPhase.ON_ADD_RECORD]
+
+                    for profiler, method in profiled:
+                        profiler.add(method, timings)
+
+                if error is not None and raise_error:
                     raise error
 
                 return records
 
+            def consume_vars() -> Dict[contextvars.ContextVar, Any]:
+                # Context variables to set while returned streams and
+                # awaitables are consumed.
+                return {
+                    **call_vars, mod_endpoint_base._tracked_endpoints:
+                        tracked_endpoints
+                }
+
+            if error is None and (inspect.isgenerator(rets) or
+                                  inspect.isasyncgen(rets)):
+                # Streamed returns are recorded once the stream ends, or fails
+                # or is closed, with their chunks collected as they are
+                # produced.
+
+                stream = StreamCollector()
+
+                # Contexts recording this root call right away instead, with
+                # the stream itself as its return.
+                placeholder_contexts = set(
+                    ctx for ctx, stack in stacks.items()
+                    if len(stack) == 1 and ctx.stream_placeholders
+                )
+                if len(placeholder_contexts) > 0:
+                    handle_done(rets=rets, contexts=placeholder_contexts)
+
+                # In contexts where this is a subcall, it is recorded along
+                # with its root call instead if the root call finishes first,
+                # with the chunks produced until then. This happens when the
+                # stream is consumed after the root call has returned it.
+                subcall_contexts = [
+                    ctx for ctx, stack in stacks.items() if len(stack) > 1
+                ]
+
+                def flush(ctx: 'RecordingContext'):
+                    handle_done(
+                        rets=stream.rets(),
+                        stream=stream,
+                        raise_error=False,
+                        contexts={ctx}
+                    )
+
+                for ctx in subcall_contexts:
+                    ctx.add_stream(
+                        roots[ctx], call_id, functools.partial(flush, ctx)
+                    )
+
+                def unflushed() -> Optional[Set['RecordingContext']]:
+                    # Contexts to record into when the stream ends, or None for
+                    # all of them.
+                    recorded = placeholder_contexts.union(
+                        ctx for ctx in subcall_contexts
+                        if not ctx.end_stream(roots[ctx], call_id)
+                    )
+
+                    if len(recorded) == 0:
+                        return None
+
+                    return set(stacks) - recorded
+
+                def on_stream_done():
+                    handle_done(
+                        rets=stream.rets(), stream=stream, contexts=unflushed()
+                    )
+
+                def on_stream_error(e: BaseException):
+                    nonlocal error, error_str
+
+                    error = e
+                    error_str = str(e)
+
+                    # The wrapper raises the error again.
+                    handle_done(
+                        rets=stream.rets(),
+                        stream=stream,
+                        raise_error=False,
+                        contexts=unflushed()
+                    )
+
+                wrap = wrap_generator if inspect.isgenerator(rets) \
+                    else wrap_async_generator
+
+                # Generators run in the context of whoever iterates them so
+                # set ours again for subcalls and costs made while producing
+                # chunks.
+                return wrap(
+                    rets,
+                    on_next=stream.add,
+                    on_done=on_stream_done,
+                    on_error=on_stream_error,
+                    context_vars=consume_vars()
+                )
+
             if isinstance(rets, Awaitable):
                 # If method produced an awaitable
                 logger.info(
@@ -593,10 +1273,13 @@ class Instrument(object):
                             This record will be updated once the response is available"""
                 )
 
-                # TODO(piotrm): need to track costs of awaiting the ret in the
-                # below.
-
-                return wrap_awaitable(rets, on_done=handle_done)
+                # Coroutines run in the context of whoever awaits them so set
+                # ours again for subcalls and costs made while awaiting.
+                return wrap_awaitable(
+                    rets,
+                    on_done=lambda rets: handle_done(rets=rets, awaited=True),
+                    context_vars=consume_vars()
+                )
 
             handle_done(rets=rets)
             return rets
@@ -679,15 +1362,17 @@ class Instrument(object):
     def instrument_object(
         self, obj, query: Lens, done: Optional[Set[int]] = None
     ):
-        """Instrument the given object `obj` and its components."""
+        """Instrument the given object `obj` and its components.
+
+        Data containers of the types in `skip_types` are not walked. Which
+        methods of a class may be instrumented is determined once per class.
+        """
 
-        done = done or set([])
+        if done is None:
+            done = set([])
 
         cls = type(obj)
 
-        mro = list(cls.__mro__)
-        # Warning: cls.__mro__ sometimes returns an object that can be iterated through only once.
-
         logger.debug(
             "%s: instrumenting object at %s of class %s", query, id_str(obj),
             class_name(cls)
@@ -699,6 +1384,10 @@ class Instrument(object):
 
         done.add(id(obj))
 
+        if self.to_skip_object(obj):
+            logger.debug("\t%s: skipping data container", query)
+            return
+
         # NOTE: We cannot instrument chain directly and have to instead
         # instrument its class. The pydantic.BaseModel does not allow instance
         # attributes that are not fields:
@@ -708,73 +1397,48 @@ class Instrument(object):
         # Recursively instrument inner components
         if hasattr(obj, '__dict__'):
             for attr_name, attr_value in obj.__dict__.items():
-                if any(isinstance(attr_value, cls)
-                       for cls in self.include_classes):
+                if self.to_instrument_object(attr_value):
                     inner_query = query[attr_name]
                     self.instrument_object(attr_value, inner_query, done)
 
-        for base in mro:
-            # Some top part of mro() may need instrumentation here if some
-            # subchains call superchains, and we want to capture the
-            # intermediate steps. On the other hand we don't want to instrument
-            # the very base classes such as object:
-            if not self.to_instrument_module(base.__module__):
+        for base, method_name in self.methods_to_instrument(cls):
+            if not class_filter_matches(f=self.include_methods[method_name],
+                                        obj=obj):
                 continue
 
-            try:
-                if not self.to_instrument_class(base):
+            original_fun = getattr(base, method_name)
+
+            # If an instrument class uses a decorator to wrap one of
+            # their methods, the wrapper will capture an uninstrumented
+            # version of the inner method which we may fail to
+            # instrument.
+            if hasattr(original_fun, "__wrapped__"):
+                original_fun = original_fun.__wrapped__
+
+            # Sometimes the base class may be in some module but when a
+            # method is looked up from it, it actually comes from some
+            # other, even baser class which might come from builtins
+            # which we want to skip instrumenting.
+            if safe_hasattr(original_fun, "__self__"):
+                if not self.to_instrument_module(
+                        original_fun.__self__.__class__.__module__):
                     continue
+            else:
+                # Determine module here somehow.
+                pass
 
-            except Exception as e:
-                # subclass check may raise exception
-                logger.debug(
-                    "\t\tWarning: checking whether %s should be instrumented resulted in an error: %s",
-                    python.module_name(base), e
-                )
-                # NOTE: Proceeding to instrument here as we don't want to miss
-                # anything. Unsure why some llama_index subclass checks fail.
-
-                # continue
-
-            for method_name, class_filter in self.include_methods.items():
+            logger.debug("\t\t%s: instrumenting %s", query, method_name)
 
-                if safe_hasattr(base, method_name):
-                    if not class_filter_matches(f=class_filter, obj=obj):
-                        continue
-
-                    original_fun = getattr(base, method_name)
-
-                    # If an instrument class uses a decorator to wrap one of
-                    # their methods, the wrapper will capture an uninstrumented
-                    # version of the inner method which we may fail to
-                    # instrument.
-                    if hasattr(original_fun, "__wrapped__"):
-                        original_fun = original_fun.__wrapped__
-
-                    # Sometimes the base class may be in some module but when a
-                    # method is looked up from it, it actually comes from some
-                    # other, even baser class which might come from builtins
-                    # which we want to skip instrumenting.
-                    if safe_hasattr(original_fun, "__self__"):
-                        if not self.to_instrument_module(
-                                original_fun.__self__.__class__.__module__):
-                            continue
-                    else:
-                        # Determine module here somehow.
-                        pass
-
-                    logger.debug("\t\t%s: instrumenting %s", query, method_name)
-
-                    setattr(
-                        base, method_name,
-                        self.tracked_method_wrapper(
-                            query=query,
-                            func=original_fun,
-                            method_name=method_name,
-                            cls=base,
-                            obj=obj
-                        )
-                    )
+            setattr(
+                base, method_name,
+                self.tracked_method_wrapper(
+                    query=query,
+                    func=original_fun,
+                    method_name=method_name,
+                    cls=base,
+                    obj=obj
+                )
+            )
 
         if self.to_instrument_object(obj) or isinstance(obj,
                                                         (dict, list, tuple)):
@@ -987,8 +1651,24 @@ class instrument(AddInstruments):
     # NOTE(piotrm): Approach taken from:
     # https://stackoverflow.com/questions/2366713/can-a-decorator-of-an-instance-method-access-the-class
 
-    def __init__(self, func: Callable):
+    def __init__(
+        self,
+        func: Optional[Callable] = None,
+        *,
+        payload: Optional[PayloadPolicy] = None
+    ):
         self.func = func
+        self.payload = payload
+
+    def __call__(self, func: Callable) -> 'instrument':
+        """
+        For use as method decorator with arguments, i.e.
+        `@instrument(payload=...)`.
+        """
+
+        self.func = func
+
+        return self
 
     def __set_name__(self, cls: type, name: str):
         """
@@ -998,6 +1678,10 @@ class instrument(AddInstruments):
         # Important: do this first:
         setattr(cls, name, self.func)
 
+        if self.payload is not None:
+            # Override the payload policy of apps for calls to this method.
+            setattr(self.func, Instrument.PAYLOAD, self.payload)
+
         # Note that this does not actually change the method, just adds it to
         # list of filters.
         self.method(cls, name)
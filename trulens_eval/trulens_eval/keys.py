@@ -92,6 +92,7 @@ of the configured openai object as needed to compute feedback.
 """
 
 from collections import defaultdict
+import functools
 import logging
 import os
 from pathlib import Path
@@ -154,8 +155,14 @@ global cohere_agent
 cohere_agent = None
 
 
+@functools.lru_cache(maxsize=4096)
+def _key_matches_redact(k: str) -> bool:
+    # Keys repeat a lot during serialization so remember the matches.
+    return RE_KEY_TO_REDACT.fullmatch(k) is not None
+
+
 def should_redact_key(k: Optional[str]) -> bool:
-    return isinstance(k, str) and RE_KEY_TO_REDACT.fullmatch(k)
+    return isinstance(k, str) and _key_matches_redact(k)
 
 
 def should_redact_value(v: Union[Any, str]) -> bool:
@@ -230,6 +230,13 @@ else:
         gb.configure_column("total_tokens", header_name="Total Tokens (#)")
         gb.configure_column("total_cost", header_name="Total Cost (USD)")
         gb.configure_column("latency", header_name="Latency (Seconds)")
+        gb.configure_column(
+            "time_to_first_chunk", header_name="Time to First Chunk (Seconds)"
+        )
+        gb.configure_column("n_chunks", header_name="Chunks (#)")
+        gb.configure_column(
+            "chunk_latency", header_name="Mean Inter-Chunk Latency (Seconds)"
+        )
         gb.configure_column("tags", header_name="Application Tag")
         gb.configure_column("ts", header_name="Time Stamp", sort="desc")
 
@@ -241,6 +248,9 @@ else:
             "total_cost",
             "record_json",
             "latency",
+            "time_to_first_chunk",
+            "n_chunks",
+            "chunk_latency",
             "tags",
             "record_metadata",
             "record_id",
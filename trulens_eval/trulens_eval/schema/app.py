@@ -9,7 +9,6 @@ from typing import Any, Callable, ClassVar, Optional, Sequence, Type
 import dill
 import humanize
 
-from trulens_eval import app as mod_app
 from trulens_eval.schema import base as mod_base_schema
 from trulens_eval.schema import feedback as mod_feedback_schema
 from trulens_eval.schema import types as mod_types_schema
@@ -208,6 +207,9 @@ class AppDefinition(pyschema.WithClassInfo, serial.SerialModel):
         app_definition_json['app'] = app
         app_definition_json['initial_app_loader_dump'] = serial_bytes_json
 
+        # Avoids circular imports.
+        from trulens_eval import app as mod_app
+
         cls: Type[mod_app.App
                  ] = pyschema.WithClassInfo.get_class(app_definition_json)
 
@@ -250,6 +252,9 @@ class AppDefinition(pyschema.WithClassInfo, serial.SerialModel):
         # it is considered an `AppDefinition` and is thus using this definition
         # of `dict` instead of the one in `app.App`.
 
+        # Avoids circular imports.
+        from trulens_eval import app as mod_app
+
         if isinstance(self, mod_app.App):
             return jsonify(self, instrument=self.instrument)
         else:
@@ -3,7 +3,8 @@
 from __future__ import annotations
 
 import datetime
-from typing import Optional
+import math
+from typing import Optional, Sequence
 
 import pydantic
 
@@ -55,17 +56,74 @@ class Cost(serial.SerialModel, pydantic.BaseModel):
         return self.__add__(other)
 
 
+class ChunkLatency(serial.SerialModel, pydantic.BaseModel):
+    """Distribution of the time between consecutive chunks of a streamed
+    return, in seconds."""
+
+    mean: float
+    """Mean time between chunks."""
+
+    p50: float
+    """Median time between chunks."""
+
+    p90: float
+    """90th percentile of the time between chunks."""
+
+    p99: float
+    """99th percentile of the time between chunks."""
+
+    max: float
+    """Longest time between chunks."""
+
+    @staticmethod
+    def of_gaps(gaps: Sequence[float]) -> Optional[ChunkLatency]:
+        """Summarize the given times between chunks. None if there are none."""
+
+        if len(gaps) == 0:
+            return None
+
+        gaps = sorted(gaps)
+
+        def percentile(p: float) -> float:
+            # Nearest rank.
+            return gaps[max(0, math.ceil(p * len(gaps)) - 1)]
+
+        return ChunkLatency(
+            mean=sum(gaps) / len(gaps),
+            p50=percentile(0.5),
+            p90=percentile(0.9),
+            p99=percentile(0.99),
+            max=gaps[-1]
+        )
+
+
 class Perf(serial.SerialModel, pydantic.BaseModel):
     """Performance information.
     
-    Presently only the start and end times, and thus latency.
+    The start and end times, and thus latency, of calls. Calls that stream
+    their returns also have the time their first chunk was produced, the number
+    of chunks and the distribution of the time between chunks.
     """
 
     start_time: datetime.datetime
     """Datetime before the recorded call."""
 
     end_time: datetime.datetime
-    """Datetime after the recorded call."""
+    """Datetime after the recorded call.
+    
+    For streamed returns, after the last chunk was produced."""
+
+    first_chunk_time: Optional[datetime.datetime] = None
+    """Datetime the first chunk of a streamed return was produced.
+    
+    None if the return was not streamed or had no chunks."""
+
+    n_chunks: Optional[int] = None
+    """Number of chunks of a streamed return. None if not streamed."""
+
+    chunk_latency: Optional[ChunkLatency] = None
+    """Distribution of the time between chunks of a streamed return. None if
+    not streamed or fewer than two chunks were produced."""
 
     @staticmethod
     def min():
@@ -97,7 +155,17 @@ class Perf(serial.SerialModel, pydantic.BaseModel):
         """Latency in seconds."""
         return self.end_time - self.start_time
 
+    @property
+    def time_to_first_chunk(self) -> Optional[datetime.timedelta]:
+        """Time from the start of the call to its first streamed chunk."""
+
+        if self.first_chunk_time is None:
+            return None
+
+        return self.first_chunk_time - self.start_time
+
 
 # HACK013: Need these if using __future__.annotations .
 Cost.model_rebuild()
+ChunkLatency.model_rebuild()
 Perf.model_rebuild()
@@ -12,7 +12,6 @@ from typing import (
 
 import pydantic
 
-from trulens_eval import app as mod_app
 from trulens_eval.schema import base as mod_base_schema
 from trulens_eval.schema import types as mod_types_schema
 from trulens_eval.utils import pyschema
@@ -104,6 +103,9 @@ class Select:
 
     @staticmethod
     def context(app: Optional[Any] = None) -> serial.Lens:
+        # Avoids circular imports.
+        from trulens_eval import app as mod_app
+
         return mod_app.App.select_context(app)
 
     @staticmethod
@@ -3,6 +3,9 @@
 from __future__ import annotations
 
 import datetime
+from enum import Enum
+import hashlib
+import json
 import logging
 from typing import ClassVar, Dict, Hashable, List, Optional, Tuple, TypeVar
 
@@ -23,6 +26,30 @@ T = TypeVar("T")
 logger = logging.getLogger(__name__)
 
 
+class RecordIDStrategy(str, Enum):
+    """How [Record.record_id][trulens_eval.schema.record.Record.record_id] is
+    generated for records constructed without one.
+
+    Specify this using the `record_id_strategy` to [App][trulens_eval.app.App]
+    constructors or to the [Record][trulens_eval.schema.record.Record]
+    constructor.
+    """
+
+    UUID7 = "uuid7"
+    """Time-ordered UUID. Costs the same regardless of the size of the record
+    and keeps inserts of new records close together in database indices."""
+
+    CONTENT_HASH = "content_hash"
+    """Merkle hash of the whole record as json. Records with the same content
+    get the same id. Costs a jsonification and hash of the whole record."""
+
+    INCREMENTAL_HASH = "incremental_hash"
+    """Hash of the record fields combined with hashes of each of its calls.
+    Records with the same content get the same id. Call hashes are kept with
+    the calls so each call is hashed once even if it is part of several records
+    or a record is rebuilt with more calls."""
+
+
 class RecordAppCallMethod(serial.SerialModel):
     """Method information for the stacks inside `RecordAppCall`."""
 
@@ -74,6 +101,19 @@ class RecordAppCall(serial.SerialModel):
     tid: int
     """Thread id."""
 
+    _digest: Optional[str] = pydantic.PrivateAttr(None)
+
+    def digest(self) -> str:
+        """Hash of the content of this call.
+
+        Computed once; calls are not expected to change once part of a record.
+        """
+
+        if self._digest is None:
+            self._digest = _json_digest(self.model_dump())
+
+        return self._digest
+
     def top(self) -> RecordAppCallMethod:
         """The top of the stack."""
 
@@ -155,15 +195,48 @@ class Record(serial.SerialModel, Hashable):
     """Only the futures part of the above for backwards compatibility."""
 
     def __init__(
-        self, record_id: Optional[mod_types_schema.RecordID] = None, **kwargs
+        self,
+        record_id: Optional[mod_types_schema.RecordID] = None,
+        record_id_strategy: RecordIDStrategy = RecordIDStrategy.UUID7,
+        **kwargs
     ):
-        super().__init__(record_id="temporary", **kwargs)
+        if record_id is None and record_id_strategy == RecordIDStrategy.UUID7:
+            record_id = mod_types_schema.new_record_id()
+
+        super().__init__(record_id=record_id or "temporary", **kwargs)
 
         if record_id is None:
-            record_id = obj_id_of_obj(jsonify(self), prefix="record")
+            if record_id_strategy == RecordIDStrategy.CONTENT_HASH:
+                record_id = obj_id_of_obj(jsonify(self), prefix="record")
+
+            elif record_id_strategy == RecordIDStrategy.INCREMENTAL_HASH:
+                record_id = f"record_hash_{self._incremental_hash()}"
+
+            else:
+                raise ValueError(
+                    f"Unknown record id strategy {record_id_strategy}."
+                )
 
         self.record_id = record_id
 
+    def _incremental_hash(self) -> str:
+        """Hash of the fields of this record other than its id and calls,
+        combined with the digests of its calls."""
+
+        content = jsonify(
+            {
+                name: getattr(self, name)
+                for name, field in type(self).model_fields.items()
+                if name not in ("record_id", "calls") and not field.exclude
+            }
+        )
+
+        hasher = hashlib.md5(_json_digest(content).encode())
+        for call in self.calls:
+            hasher.update(call.digest().encode())
+
+        return hasher.hexdigest()
+
     def __hash__(self):
         return hash(self.record_id)
 
@@ -233,3 +306,9 @@ class Record(serial.SerialModel, Hashable):
 RecordAppCallMethod.model_rebuild()
 Record.model_rebuild()
 RecordAppCall.model_rebuild()
+
+
+def _json_digest(content: serial.JSON) -> str:
+    return hashlib.md5(
+        json.dumps(content, sort_keys=True, default=str).encode()
+    ).hexdigest()
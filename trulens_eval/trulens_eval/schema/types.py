@@ -1,5 +1,8 @@
 """Type aliases."""
 
+import os
+import threading
+import time
 from typing import Dict
 import uuid
 
@@ -8,7 +11,7 @@ import typing_extensions
 RecordID: typing_extensions.TypeAlias = str
 """Unique identifier for a record.
 
-By default these hashes of record content as json.
+By default these are time-ordered UUIDs. See
 [Record.record_id][trulens_eval.schema.record.Record.record_id].
 """
 
@@ -24,6 +27,51 @@ def new_call_id() -> CallID:
     return str(uuid.uuid4())
 
 
+_uuid7_lock = threading.Lock()
+_uuid7_last = (0, 0)
+"""Millisecond timestamp and sequence number of the last UUIDv7 generated in
+this process."""
+
+
+def uuid7() -> uuid.UUID:
+    """Generate a version 7 UUID as per RFC 9562.
+
+    These start with a millisecond timestamp so they sort by creation time. The
+    12 bits following the timestamp are a sequence number so that UUIDs
+    generated in the same millisecond by this process also sort in the order
+    they were generated.
+    """
+
+    global _uuid7_last
+
+    ms = time.time_ns() // 1_000_000
+
+    with _uuid7_lock:
+        last_ms, last_seq = _uuid7_last
+
+        if ms <= last_ms:
+            # Same millisecond or clock went backwards. Keep increasing.
+            ms, seq = last_ms, last_seq + 1
+            if seq > 0xFFF:
+                ms, seq = last_ms + 1, 0
+        else:
+            seq = 0
+
+        _uuid7_last = (ms, seq)
+
+    rand = int.from_bytes(os.urandom(8), "big") & 0x3FFF_FFFF_FFFF_FFFF
+
+    return uuid.UUID(
+        int=(ms & 0xFFFF_FFFF_FFFF) << 80 | 0x7 << 76 | seq << 64 | 0b10 << 62 |
+        rand
+    )
+
+
+def new_record_id() -> RecordID:
+    """Generate a new time-ordered record id."""
+    return f"record_{uuid7()}"
+
+
 AppID: typing_extensions.TypeAlias = str
 """Unique identifier for an app.
 
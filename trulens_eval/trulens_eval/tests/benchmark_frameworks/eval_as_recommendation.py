@@ -1,19 +1,243 @@
+"""
+Benchmark feedback functions as recommenders: score each passage of a query
+with the feedback function and compare the resulting ranking against human
+relevance labels.
+
+Passages are scored concurrently. Rate limits are left to the endpoints of the
+providers behind the feedback functions, which pace their own requests. Each
+sampled score can be cached on disk so that an interrupted run resumes where
+it left off.
+"""
+
+from dataclasses import dataclass
+import hashlib
 import logging
-import random
+import sqlite3
+import threading
 import time
-from typing import List
+from typing import Callable, List, Optional, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
 from sklearn.metrics import ndcg_score
 
+from trulens_eval.feedback.provider.endpoint.base import Endpoint
+from trulens_eval.schema.base import Cost
+from trulens_eval.utils.threading import FanOut
+
 log = logging.getLogger(__name__)
-"""score passages with feedback function, retrying if feedback function fails.
-    Args: df: dataframe with columns 'query_id', 'query', 'passage', 'is_selected'
-            feedback_func: function that takes query and passage as input and returns a score
-            backoff_time: time to wait between retries
-            n: number of samples to estimate conditional probabilities of feedback_func's scores
-"""
+
+DEFAULT_MAX_WORKERS: int = 8
+"""Default number of passages scored concurrently per feedback function."""
+
+
+class ScoreCache:
+    """Sampled feedback scores persisted to a sqlite file, keyed by feedback
+    function name, temperature, query, passage and sample index.
+
+    Args:
+        path: Sqlite file to store scores in.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS scores "
+            "(key TEXT PRIMARY KEY, score REAL, cost REAL)"
+        )
+        self._db.commit()
+
+    @staticmethod
+    def key(
+        func_name: str, temperature: float, query: str, passage: str,
+        sample: int
+    ) -> str:
+        """Cache key of one sample of a feedback function's score."""
+
+        return hashlib.sha256(
+            "\0".join(
+                (func_name, repr(temperature), query, passage, str(sample))
+            ).encode("utf-8")
+        ).hexdigest()
+
+    def get(self, key: str) -> Optional[float]:
+        """Get the cached score for the given key, if any."""
+
+        with self._lock:
+            row = self._db.execute(
+                "SELECT score FROM scores WHERE key = ?", (key,)
+            ).fetchone()
+
+        return None if row is None else row[0]
+
+    def put(self, key: str, score: float, cost: float = 0.0) -> None:
+        """Cache the given score along with the cost in USD of producing it."""
+
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO scores VALUES (?, ?, ?)",
+                (key, score, cost)
+            )
+            self._db.commit()
+
+
+@dataclass
+class BenchmarkReport:
+    """Results of benchmarking one feedback function."""
+
+    name: str
+    """Name of the feedback function."""
+
+    n_queries: int
+    """Number of queries."""
+
+    n_passages: int
+    """Number of passages over all queries."""
+
+    n_calls: int
+    """Number of feedback function calls made, not counting cached scores."""
+
+    n_cached: int
+    """Number of scores taken from the cache."""
+
+    elapsed: float
+    """Seconds taken to score all passages."""
+
+    cost: Cost
+    """Cost of the feedback function calls made."""
+
+    k: int
+    """Number of top passages for precision and recall."""
+
+    ndcg: float
+    """Mean nDCG over queries."""
+
+    ece: float
+    """Expected calibration error over all passages."""
+
+    precision_at_k: float
+    """Mean precision@k over queries."""
+
+    recall_at_k: float
+    """Mean recall@k over queries."""
+
+    @property
+    def throughput(self) -> float:
+        """Feedback function calls per second."""
+
+        return self.n_calls / self.elapsed if self.elapsed > 0 else 0.0
+
+    def row(self) -> dict:
+        """Flat dictionary of the report for a results dataframe."""
+
+        return {
+            'Model': self.name,
+            'nDCG': self.ndcg,
+            'ECE': self.ece,
+            f'Precision@{self.k}': self.precision_at_k,
+            f'Recall@{self.k}': self.recall_at_k,
+            'Calls': self.n_calls,
+            'Cached': self.n_cached,
+            'Calls/s': self.throughput,
+            'Cost (USD)': self.cost.cost,
+            'Tokens': self.cost.n_tokens
+        }
+
+
+def _score_passages(
+    df: pd.DataFrame,
+    feedback_func_name: str,
+    feedback_func: Callable[[str, str, float], float],
+    backoff_time: float,
+    n: int,
+    temperature: float,
+    max_workers: int,
+    max_retries: int,
+    cache: Optional[ScoreCache],
+) -> Tuple[List[List[float]], List[List[int]], int, int, Cost]:
+    """Score all passages, returning scores and relevance grouped by query
+    along with the number of calls made, the number of cached scores used and
+    the cost of the calls."""
+
+    if feedback_func_name == 'TruEra':
+        # We don't need to sample for the TruEra BERT-based model.
+        n = 1
+
+    queries = df['query'].to_numpy()
+    passages = df['passage'].to_numpy()
+
+    samples = [(i, s) for i in range(len(df)) for s in range(n)]
+
+    stats_lock = threading.Lock()
+    stats = dict(n_calls=0, n_cached=0, cost=Cost())
+
+    def score_sample(sample: Tuple[int, int]) -> float:
+        i, s = sample
+        query, passage = queries[i], passages[i]
+
+        key = None
+        if cache is not None:
+            key = ScoreCache.key(
+                feedback_func_name, temperature, query, passage, s
+            )
+            score = cache.get(key)
+            if score is not None:
+                with stats_lock:
+                    stats['n_cached'] += 1
+                return score
+
+        for attempt in range(max_retries + 1):
+            try:
+                score, cost = Endpoint.track_all_costs_tally(
+                    feedback_func, query, passage, temperature
+                )
+                break
+            except Exception as e:
+                if attempt == max_retries:
+                    raise
+                log.warning(
+                    "Feedback function %s failed (%s), retrying.",
+                    feedback_func_name, e
+                )
+                time.sleep(backoff_time * 2**attempt)
+
+        with stats_lock:
+            stats['n_calls'] += 1
+            stats['cost'] = stats['cost'] + cost
+
+        if key is not None:
+            cache.put(key, score, cost.cost)
+
+        return score
+
+    sampled = FanOut().map(
+        score_sample,
+        samples,
+        key=("benchmark", feedback_func_name),
+        limit=max_workers
+    )
+
+    passage_scores = np.asarray(sampled, dtype=float).reshape(len(df), n)
+    df = df.assign(score=passage_scores.mean(axis=1))
+
+    scores = []
+    true_relevance = []
+    for name, group in df.groupby('query_id'):
+        scores.append(group['score'].tolist())
+        true_relevance.append(group['is_selected'].tolist())
+
+        log.info(
+            "Feedback function %s scored %s passages of query %s.",
+            feedback_func_name, len(group), name
+        )
+
+    return (
+        scores, true_relevance, stats['n_calls'], stats['n_cached'],
+        stats['cost']
+    )
 
 
 def score_passages(
@@ -22,83 +246,188 @@ def score_passages(
     feedback_func,
     backoff_time=0.5,
     n=5,
-    temperature=0.0
+    temperature=0.0,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    max_retries: int = 3,
+    cache_path: Optional[str] = None
 ):
-    grouped = df.groupby('query_id')
-    scores = []
-    true_relevance = []
+    """Score passages with feedback function, retrying if feedback function
+    fails.
 
-    for name, group in grouped:
-        query_scores = []
-        query_relevance = []
-        for _, row in group.iterrows():
-            sampled_score = None
-            if feedback_func_name == 'TruEra' or n == 1:
-                sampled_score = feedback_func(
-                    row['query'], row['passage'], temperature
-                )  # hard-coded for now, we don't need to sample for TruEra BERT-based model
-                time.sleep(backoff_time)
-            else:
-                sampled_scores = []
-                for _ in range(n):
-                    sampled_scores.append(
-                        feedback_func(
-                            row['query'], row['passage'], temperature
-                        )
-                    )
-                    time.sleep(backoff_time)
-                sampled_score = sum(sampled_scores) / len(sampled_scores)
-            query_scores.append(sampled_score)
-            query_relevance.append(row['is_selected'])
-            # print(f"Feedback avg score for query {name} is {sampled_score}, is_selected is {row['is_selected']}")
-
-        print(
-            f"Feedback function {name} scored {len(query_scores)} out of {len(group)} passages."
-        )
-        scores.append(query_scores)
-        true_relevance.append(query_relevance)
+    Args:
+        df: dataframe with columns 'query_id', 'query', 'passage', 'is_selected'
+
+        feedback_func: function that takes query, passage and temperature as
+            input and returns a score
+
+        backoff_time: time to wait before the first retry, doubling with each
+            further retry
+
+        n: number of samples to estimate conditional probabilities of
+            feedback_func's scores
+
+        max_workers: number of passages scored concurrently
+
+        max_retries: number of retries of a failing feedback function call
+
+        cache_path: sqlite file to cache scores in so interrupted runs can
+            resume; not cached if None
+
+    Returns:
+        Scores and human relevance labels of passages, grouped by query.
+    """
+
+    cache = ScoreCache(cache_path) if cache_path is not None else None
+
+    scores, true_relevance, _, _, _ = _score_passages(
+        df,
+        feedback_func_name,
+        feedback_func,
+        backoff_time=backoff_time,
+        n=n,
+        temperature=temperature,
+        max_workers=max_workers,
+        max_retries=max_retries,
+        cache=cache
+    )
 
     return scores, true_relevance
 
 
+def run_benchmark(
+    df,
+    feedback_func_name,
+    feedback_func,
+    k: int = 5,
+    backoff_time=0.5,
+    n=5,
+    temperature=0.0,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    max_retries: int = 3,
+    cache_path: Optional[str] = None
+) -> BenchmarkReport:
+    """Score passages as in `score_passages` and compute all metrics, along
+    with throughput and cost.
+
+    Args:
+        k: number of top passages for precision@k and recall@k
+
+    See `score_passages` for the other arguments.
+    """
+
+    cache = ScoreCache(cache_path) if cache_path is not None else None
+
+    start = time.perf_counter()
+    scores, true_relevance, n_calls, n_cached, cost = _score_passages(
+        df,
+        feedback_func_name,
+        feedback_func,
+        backoff_time=backoff_time,
+        n=n,
+        temperature=temperature,
+        max_workers=max_workers,
+        max_retries=max_retries,
+        cache=cache
+    )
+    elapsed = time.perf_counter() - start
+
+    return BenchmarkReport(
+        name=feedback_func_name,
+        n_queries=len(scores),
+        n_passages=sum(map(len, scores)),
+        n_calls=n_calls,
+        n_cached=n_cached,
+        elapsed=elapsed,
+        cost=cost,
+        k=k,
+        ndcg=compute_ndcg(scores, true_relevance),
+        ece=compute_ece(scores, true_relevance),
+        precision_at_k=mean_precision_at_k(scores, true_relevance, k),
+        recall_at_k=mean_recall_at_k(scores, true_relevance, k)
+    )
+
+
+def _pad(
+    scores: Sequence[Sequence[float]],
+    true_relevance: Sequence[Sequence[float]],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Pad per-query scores and relevance into matrices with a row per query.
+    Padded scores are -inf and padded relevance 0. Also returns the number of
+    passages of each query."""
+
+    lengths = np.array([len(s) for s in scores], dtype=int)
+    width = max(1, lengths.max(initial=0))
+
+    padded_scores = np.full((len(scores), width), -np.inf)
+    padded_relevance = np.zeros((len(scores), width))
+
+    for i, (s, t) in enumerate(zip(scores, true_relevance)):
+        padded_scores[i, :len(s)] = s
+        padded_relevance[i, :len(t)] = t
+
+    return padded_scores, padded_relevance, lengths
+
+
+def _top_k_hits(
+    scores: Sequence[Sequence[float]],
+    true_relevance: Sequence[Sequence[float]], k: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Number of relevant passages scored at least the k-th highest score,
+    number of such passages, and number of relevant passages, per query."""
+
+    padded_scores, padded_relevance, lengths = _pad(scores, true_relevance)
+
+    descending = -np.sort(-padded_scores, axis=1)
+    kth_index = np.clip(np.minimum(k, lengths) - 1, 0, None)
+    kth_score = descending[np.arange(len(lengths)), kth_index]
+
+    top_k = padded_scores >= kth_score[:, None]
+    top_k &= np.isfinite(padded_scores)
+
+    hits = (padded_relevance * top_k).sum(axis=1)
+
+    return hits, top_k.sum(axis=1), padded_relevance.sum(axis=1)
+
+
 def compute_ndcg(scores, true_relevance):
-    ndcg_values = [
-        ndcg_score([true], [pred])
-        for true, pred in zip(true_relevance, scores)
-    ]
-    return np.mean(ndcg_values)
+    padded_scores, padded_relevance, _ = _pad(scores, true_relevance)
+
+    # Padding ranks last and, with no relevance, does not change any query's
+    # nDCG. It must be finite though.
+    finite = np.isfinite(padded_scores)
+    floor = padded_scores[finite].min(initial=0.0) - 1.0
+    padded_scores[~finite] = floor
+
+    return ndcg_score(padded_relevance, padded_scores)
 
 
 def compute_ece(scores, true_relevance, n_bins=10):
-    ece = 0
-    for bin in np.linspace(0, 1, n_bins):
-        bin_scores = []
-        bin_truth = []
-        for score_list, truth_list in zip(scores, true_relevance):
-            for score, truth in zip(score_list, truth_list):
-                if bin <= score < bin + 1 / n_bins:
-                    bin_scores.append(score)
-                    bin_truth.append(truth)
+    all_scores = np.concatenate([np.asarray(s, dtype=float) for s in scores])
+    all_truth = np.concatenate(
+        [np.asarray(t, dtype=float) for t in true_relevance]
+    )
+
+    # Bins start at evenly spaced points in [0, 1] and are 1 / n_bins wide.
+    starts = np.linspace(0, 1, n_bins)[:, None]
+    in_bin = (starts <= all_scores) & (all_scores < starts + 1 / n_bins)
 
-        if bin_scores:
-            bin_avg_confidence = np.mean(bin_scores)
-            bin_accuracy = np.mean(bin_truth)
-            ece += np.abs(bin_avg_confidence - bin_accuracy
-                         ) * len(bin_scores) / sum(map(len, scores))
+    counts = in_bin.sum(axis=1)
+    nonempty = counts > 0
+    counts = counts[nonempty]
 
-    return ece
+    confidence = (in_bin * all_scores).sum(axis=1)[nonempty] / counts
+    accuracy = (in_bin * all_truth).sum(axis=1)[nonempty] / counts
+
+    return np.sum(np.abs(confidence - accuracy) * counts / len(all_scores))
 
 
 def precision_at_k(scores, true_relevance, k):
-    sorted_scores = sorted(scores, reverse=True)
-    kth_score = sorted_scores[min(k - 1, len(scores) - 1)]
+    """Precision at K of a single query. Items tied with the k-th highest
+    score are included."""
 
-    # Indices of items with scores >= kth highest score
-    top_k_indices = [i for i, score in enumerate(scores) if score >= kth_score]
+    hits, n_top, _ = _top_k_hits([scores], [true_relevance], k)
 
-    # Calculate precision
-    true_positives = sum(np.take(true_relevance, top_k_indices))
-    return true_positives / len(top_k_indices) if top_k_indices else 0
+    return hits[0] / n_top[0] if n_top[0] else 0
 
 
 def recall_at_k(scores, true_relevance, k):
@@ -113,15 +442,33 @@ def recall_at_k(scores, true_relevance, k):
     Returns:
     float: Recall at K.
     """
-    sorted_scores = sorted(scores, reverse=True)
-    kth_score = sorted_scores[min(k - 1, len(scores) - 1)]
 
-    # Indices of items with scores >= kth highest score
-    top_k_indices = [i for i, score in enumerate(scores) if score >= kth_score]
+    hits, _, total_relevant = _top_k_hits([scores], [true_relevance], k)
+
+    return hits[0] / total_relevant[0] if total_relevant[0] > 0 else 0
+
 
-    # Calculate recall
-    relevant_indices = np.where(true_relevance)[0]
-    hits = sum(idx in top_k_indices for idx in relevant_indices)
-    total_relevant = sum(true_relevance)
+def mean_precision_at_k(scores, true_relevance, k):
+    """Mean of `precision_at_k` over queries, computed for all queries at
+    once."""
 
-    return hits / total_relevant if total_relevant > 0 else 0
+    hits, n_top, _ = _top_k_hits(scores, true_relevance, k)
+
+    return np.mean(
+        np.divide(hits, n_top, out=np.zeros_like(hits), where=n_top > 0)
+    )
+
+
+def mean_recall_at_k(scores, true_relevance, k):
+    """Mean of `recall_at_k` over queries, computed for all queries at once."""
+
+    hits, _, total_relevant = _top_k_hits(scores, true_relevance, k)
+
+    return np.mean(
+        np.divide(
+            hits,
+            total_relevant,
+            out=np.zeros_like(hits),
+            where=total_relevant > 0
+        )
+    )
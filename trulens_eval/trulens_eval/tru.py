@@ -33,7 +33,6 @@ from trulens_eval.schema import app as mod_app_schema
 from trulens_eval.schema import feedback as mod_feedback_schema
 from trulens_eval.schema import record as mod_record_schema
 from trulens_eval.schema import types as mod_types_schema
-from trulens_eval.utils import notebook_utils
 from trulens_eval.utils import python
 from trulens_eval.utils import serial
 from trulens_eval.utils import threading as tru_threading
@@ -728,7 +727,9 @@ class Tru(python.SingletonPerName):
 
         df, feedback_cols = self.db.get_records_and_feedback(app_ids)
 
-        col_agg_list = feedback_cols + ['latency', 'total_cost']
+        col_agg_list = feedback_cols + [
+            'latency', 'time_to_first_chunk', 'total_cost'
+        ]
 
         leaderboard = df.groupby('app_id')[col_agg_list].mean().sort_values(
             by=feedback_cols, ascending=False
@@ -1083,6 +1084,9 @@ class Tru(python.SingletonPerName):
             **env_opts
         )
 
+        # Deferred as it imports IPython which is slow.
+        from trulens_eval.utils import notebook_utils
+
         started = threading.Event()
         tunnel_started = threading.Event()
         if notebook_utils.is_notebook():
@@ -114,11 +114,18 @@ class LangChainInstrument(Instrument):
         Key is method name and value is filter for objects that need those
         methods instrumented"""
 
+        SKIP_TYPES = {
+            "langchain_community.docstore.base.Docstore",
+            "langchain.docstore.base.Docstore",  # legacy
+        }
+        """Data containers, by full class name, not walked for components."""
+
     def __init__(self, *args, **kwargs):
         super().__init__(
             include_modules=LangChainInstrument.Default.MODULES,
             include_classes=LangChainInstrument.Default.CLASSES(),
             include_methods=LangChainInstrument.Default.METHODS,
+            skip_types=LangChainInstrument.Default.SKIP_TYPES,
             *args,
             **kwargs
         )
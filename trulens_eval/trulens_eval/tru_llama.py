@@ -210,11 +210,29 @@ class LlamaInstrument(Instrument):
         )
         """Methods to instrument."""
 
+        SKIP_TYPES = {
+            "llama_index.core.storage.docstore.types.BaseDocumentStore",
+            "llama_index.core.storage.kvstore.types.BaseKVStore",
+            "llama_index.core.vector_stores.simple.SimpleVectorStoreData",
+            "llama_index.core.data_structs.data_structs.IndexStruct",
+            # legacy
+            "llama_index.storage.docstore.types.BaseDocumentStore",
+            "llama_index.storage.kvstore.types.BaseKVStore",
+            "llama_index.vector_stores.simple.SimpleVectorStoreData",
+            "llama_index.data_structs.data_structs.IndexStruct",
+        }.union(LangChainInstrument.Default.SKIP_TYPES)
+        """Data containers, by full class name, not walked for components.
+
+        Documents, embeddings and node maps of indices grow with the data and
+        hold no components.
+        """
+
     def __init__(self, *args, **kwargs):
         super().__init__(
             include_modules=LlamaInstrument.Default.MODULES,
             include_classes=LlamaInstrument.Default.CLASSES(),
             include_methods=LlamaInstrument.Default.METHODS,
+            skip_types=LlamaInstrument.Default.SKIP_TYPES,
             *args,
             **kwargs
         )
@@ -0,0 +1,114 @@
+"""
+# Batching Utilities
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Callable, Generic, List, Optional, Sequence, TypeVar
+
+from trulens_eval.utils.python import Future
+
+logger = logging.getLogger(__name__)
+
+A = TypeVar("A")
+B = TypeVar("B")
+
+
+class _Batch(Generic[A, B]):
+    """Items collected for one batched call along with futures for their
+    results."""
+
+    def __init__(self):
+        self.items: List[A] = []
+        self.futures: List[Future[B]] = []
+        self.full = threading.Event()
+
+
+class MicroBatcher(Generic[A, B]):
+    """Combine concurrent single-item calls into batched calls.
+
+    The first caller to [submit][trulens_eval.utils.batching.MicroBatcher.submit]
+    an item to an empty batch waits up to `max_wait` seconds (or until the
+    batch reaches `max_size` items) for other callers to add theirs, then
+    makes one call to `func` with all of the collected items on their behalf.
+    Every caller receives the result for its own item. No background threads
+    are involved.
+
+    Args:
+        func: Function processing a batch of items, returning one result per
+            item in the same order. Exceptions it raises are raised to every
+            caller in the batch.
+
+        max_size: Maximum number of items in a batch.
+
+        max_wait: Maximum number of seconds to wait for a batch to fill.
+    """
+
+    def __init__(
+        self,
+        func: Callable[[List[A]], Sequence[B]],
+        max_size: int = 16,
+        max_wait: float = 0.005
+    ):
+        if max_size < 1:
+            raise ValueError("`max_size` must be at least 1.")
+
+        self.func = func
+        self.max_size = max_size
+        self.max_wait = max_wait
+
+        self._lock = threading.Lock()
+        self._current: Optional[_Batch[A, B]] = None
+
+    def submit(self, item: A) -> B:
+        """Process the given item as part of a batch, blocking until its result
+        is ready."""
+
+        future: Future[B] = Future()
+
+        with self._lock:
+            batch = self._current
+            leader = batch is None
+            if leader:
+                batch = _Batch()
+                self._current = batch
+
+            batch.items.append(item)
+            batch.futures.append(future)
+
+            if len(batch.items) >= self.max_size:
+                self._current = None
+                batch.full.set()
+
+        if leader:
+            batch.full.wait(timeout=self.max_wait)
+
+            with self._lock:
+                if self._current is batch:
+                    self._current = None
+
+            self._run(batch)
+
+        return future.result()
+
+    def _run(self, batch: _Batch[A, B]) -> None:
+        logger.debug("Running batch of %s item(s).", len(batch.items))
+
+        try:
+            results = self.func(batch.items)
+
+            if len(results) != len(batch.items):
+                raise RuntimeError(
+                    f"Batch of {len(batch.items)} item(s) "
+                    f"produced {len(results)} result(s)."
+                )
+
+        except Exception as e:
+            for future in batch.futures:
+                future.set_exception(e)
+            return
+
+        for future, result in zip(batch.futures, results):
+            future.set_result(result)
@@ -4,7 +4,7 @@ Utilities for dealing with LLM-generated text.
 
 import logging
 import re
-from typing import Optional
+from typing import List, Optional
 
 from trulens_eval.utils.text import retab
 
@@ -47,6 +47,12 @@ PATTERN_NUMBER: re.Pattern = re.compile(r"([+-]?[0-9]+\.[0-9]*|[1-9][0-9]*|0)")
 PATTERN_INTEGER: re.Pattern = re.compile(r"([+-]?[1-9][0-9]*|0)")
 """Regex that matches integers."""
 
+PATTERN_ENUMERATED: re.Pattern = re.compile(
+    r"^\W*(?:[a-z]+\s*)?([0-9]+)\s*[:.)\]-]+(.*)$", re.IGNORECASE | re.MULTILINE
+)
+"""Regex that matches a line starting with an item number (optionally preceded
+by a label like "Item" or "CONTEXT") followed by the rest of the line."""
+
 
 def re_0_10_rating(s: str) -> int:
     """Extract a 0-10 rating from a string.
@@ -86,3 +92,53 @@ def re_0_10_rating(s: str) -> int:
 
     # Min to handle cases like "The rating is 8 out of 10."
     return min(vals)
+
+
+def re_enumerated_0_10_ratings(s: str, n: int) -> List[int]:
+    """Extract 0-10 ratings of items numbered 1 to `n` from a string with one
+    line per item, like:
+
+    ```
+    1: 8
+    2: 3
+    ```
+
+    Args:
+        s: String to extract ratings from.
+
+        n: Number of items expected.
+
+    Returns:
+        List[int]: Extracted rating of each item in order.
+
+    Raises:
+        ParseError: If any item is missing, repeated with different ratings, or
+            does not have a 0-10 rating.
+    """
+
+    ratings = {}
+
+    for match in PATTERN_ENUMERATED.finditer(s):
+        index = int(match.group(1))
+        if not 1 <= index <= n:
+            continue
+
+        try:
+            rating = re_0_10_rating(match.group(2))
+        except ParseError:
+            continue
+
+        if ratings.get(index, rating) != rating:
+            raise ParseError(
+                f"one rating for item {index}", s, pattern=PATTERN_ENUMERATED
+            )
+
+        ratings[index] = rating
+
+    missing = [i for i in range(1, n + 1) if i not in ratings]
+    if missing:
+        raise ParseError(
+            f"ratings for items {missing}", s, pattern=PATTERN_ENUMERATED
+        )
+
+    return [ratings[i] for i in range(1, n + 1)]
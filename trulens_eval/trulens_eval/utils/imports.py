@@ -6,35 +6,52 @@ line. Hopefully this wraps automatically.
 
 import builtins
 from dataclasses import dataclass
+import hashlib
+import importlib
 from importlib import metadata
 from importlib import resources
 import inspect
 import logging
+import os
 from pathlib import Path
 from pprint import PrettyPrinter
+import re
 import sys
-from typing import Any, Dict, Iterable, Optional, Sequence, Type, Union
+from typing import (
+    Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Type, Union
+)
 
 from packaging import requirements
 from packaging import version
-from pip._internal.req import parse_requirements
 
 from trulens_eval import __name__ as trulens_name
+from trulens_eval import __version__ as trulens_version
 
 logger = logging.getLogger(__name__)
 pp = PrettyPrinter()
 
+_COMMENT = re.compile(r"(^|\s+)#.*$")
+"""Comments in requirements files, as pip recognizes them."""
+
 
 def requirements_of_file(path: Path) -> Dict[str, requirements.Requirement]:
     """Get a dictionary of package names to requirements from a requirements
-    file."""
+    file.
 
-    pip_reqs = parse_requirements(str(path), session=None)
+    Only requirement specifiers and comments are supported; lines with pip
+    options are skipped. The file is not parsed with pip as importing it is
+    slow.
+    """
 
     mapping = {}
 
-    for pip_req in pip_reqs:
-        req = requirements.Requirement(pip_req.requirement)
+    for line in Path(path).read_text().splitlines():
+        line = _COMMENT.sub("", line).strip()
+
+        if not line or line.startswith("-"):
+            continue
+
+        req = requirements.Requirement(line)
         mapping[req.name] = req
 
     return mapping
@@ -169,7 +186,48 @@ class VersionConflict(Exception):
     """Exception to raise when a version conflict is found in a required package."""
 
 
-def check_imports(ignore_version_mismatch: bool = False):
+def _check_imports_marker() -> Optional[Tuple[Path, str]]:
+    """File marking that the packages of this environment passed
+    [check_imports][trulens_eval.utils.imports.check_imports] and its expected
+    content, or None if there is no place to keep it.
+
+    There is one file per python interpreter. Its content is a digest of this
+    version of trulens_eval, the python version, and the modification times of
+    the folders on `sys.path`. Installing or removing a package changes the
+    modification time of the folder it is installed to and therefore the
+    digest.
+    """
+
+    try:
+        cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+
+    except RuntimeError:  # no home directory
+        return None
+
+    digest = hashlib.sha256()
+
+    for part in [trulens_version, sys.version]:
+        digest.update(part.encode() + b"\0")
+
+    for entry in sys.path:
+        try:
+            mtime = os.stat(entry or ".").st_mtime_ns
+        except OSError:
+            continue
+
+        digest.update(f"{entry}:{mtime}".encode() + b"\0")
+
+    interpreter = hashlib.sha256(sys.executable.encode()).hexdigest()
+
+    return (
+        Path(cache_home) / trulens_name / "check_imports" / interpreter,
+        digest.hexdigest()
+    )
+
+
+def check_imports(
+    ignore_version_mismatch: bool = False, use_cache: bool = True
+):
     """Check required and optional package versions.
 
     Args:
@@ -177,11 +235,29 @@ def check_imports(ignore_version_mismatch: bool = False):
             version mismatch is found in a required package. Regardless of
             this setting, mismatch in an optional package is a warning.
 
+        use_cache: If set, skip the check if the installed packages have not
+            changed since they last passed it. Passing checks are recorded in
+            the user's cache folder.
+
     Raises:
         VersionConflict: If a version mismatch is found in a required package
             and `ignore_version_mismatch` is not set.
     """
 
+    marker = _check_imports_marker() if use_cache else None
+
+    if marker is not None:
+        path, expected = marker
+
+        try:
+            if path.read_text() == expected:
+                return
+
+        except OSError:
+            pass
+
+    passed = True
+
     for n, req in all_packages.items():
         is_optional = n in optional_packages
 
@@ -191,6 +267,7 @@ def check_imports(ignore_version_mismatch: bool = False):
         except metadata.PackageNotFoundError as e:
             if is_optional:
                 logger.debug(MESSAGE_DEBUG_OPTIONAL_PACKAGE_NOT_FOUND, req.name)
+                continue
 
             else:
                 raise ModuleNotFoundError(
@@ -211,6 +288,7 @@ def check_imports(ignore_version_mismatch: bool = False):
                 message += MESSAGE_FRAGMENT_VERSION_MISMATCH_REQUIRED.format(
                     req=req
                 )
+                passed = False
 
             message += MESSAGE_FRAGMENT_VERSION_MISMATCH_PIP.format(req=req)
 
@@ -219,6 +297,15 @@ def check_imports(ignore_version_mismatch: bool = False):
 
             logger.debug(message)
 
+    if passed and marker is not None:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(expected)
+
+        except OSError:
+            # Read-only file systems just do not get the cache.
+            pass
+
 
 def pin_spec(r: requirements.Requirement) -> requirements.Requirement:
     """
@@ -369,6 +456,19 @@ REQUIREMENT_EVALUATE = format_import_errors(
     "evaluate", purpose="using certain metrics"
 )
 
+REQUIREMENT_TRANSFORMERS = format_import_errors(
+    ["transformers", "torch"], purpose="running Huggingface models locally"
+)
+
+REQUIREMENT_ONNX = format_import_errors(
+    ["optimum", "onnxruntime"],
+    purpose="running Huggingface models locally with ONNX Runtime"
+)
+
+REQUIREMENT_ORJSON = format_import_errors(
+    "orjson", purpose="faster dumping of json strings"
+)
+
 REQUIREMENT_NOTEBOOK = format_import_errors(
     ["ipython", "ipywidgets"], purpose="using TruLens-Eval in a notebook"
 )
@@ -672,3 +772,78 @@ class OptionalImports(object):
             raise ImportError(self.messages.import_error) from exc_value
 
         # Exception will be propagated unless we return True so we don't return it.
+
+
+LazyAttributes = Dict[str, Tuple[str, Optional[ImportErrorMessages]]]
+"""Attributes of a module that are imported on first access, by name, as the
+module defining them and, if it depends on optional packages, the messages to
+show when they are not installed."""
+
+
+def lazy_module_attributes(
+    module_name: str, attributes: LazyAttributes
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """Module `__getattr__` and `__dir__` (see PEP 562) importing `attributes`
+    of module `module_name` on first access instead of when the module is
+    imported.
+
+    Attributes whose defining module depends on optional packages become
+    [Dummy][trulens_eval.utils.imports.Dummy] if those are not installed, as
+    they would if imported eagerly in an
+    [OptionalImports][trulens_eval.utils.imports.OptionalImports] block. Other
+    attributes that are submodules of `module_name` are also imported on first
+    access.
+
+    Example:
+        ```python
+        __getattr__, __dir__ = lazy_module_attributes(
+            __name__, {
+                "Tru": ("trulens_eval.tru", None),
+                "OpenAI": (
+                    "trulens_eval.feedback.provider.openai",
+                    REQUIREMENT_OPENAI
+                ),
+            }
+        )
+        ```
+    """
+
+    def __getattr__(name: str) -> Any:
+        if name in attributes:
+            source, messages = attributes[name]
+
+            if messages is None:
+                value = getattr(importlib.import_module(source), name)
+
+            else:
+                with OptionalImports(messages=messages):
+                    value = getattr(__import__(source, fromlist=[name]), name)
+
+        elif not name.startswith("__"):
+            submodule_name = f"{module_name}.{name}"
+
+            try:
+                value = importlib.import_module(submodule_name)
+
+            except ModuleNotFoundError as e:
+                if e.name != submodule_name:
+                    raise
+
+                raise AttributeError(
+                    f"module {module_name!r} has no attribute {name!r}"
+                ) from None
+
+        else:
+            raise AttributeError(
+                f"module {module_name!r} has no attribute {name!r}"
+            )
+
+        # Later accesses do not come here.
+        setattr(sys.modules[module_name], name, value)
+
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[module_name])).union(attributes))
+
+    return __getattr__, __dir__
@@ -10,14 +10,18 @@ import logging
 from pathlib import Path
 from pprint import PrettyPrinter
 import typing
-from typing import Any, Dict, Optional, Sequence, Set, TypeVar
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, TypeVar
+import weakref
 
 from merkle_json import MerkleJson
 import pydantic
+import pydantic.v1.json
 
 from trulens_eval.keys import redact_value
+from trulens_eval.utils.imports import Dummy
 from trulens_eval.utils.imports import OptionalImports
 from trulens_eval.utils.imports import REQUIREMENT_OPENAI
+from trulens_eval.utils.imports import REQUIREMENT_ORJSON
 from trulens_eval.utils.pyschema import CIRCLE
 from trulens_eval.utils.pyschema import Class
 from trulens_eval.utils.pyschema import CLASS_INFO
@@ -59,6 +63,17 @@ with OptionalImports(messages=REQUIREMENT_OPENAI):
 
     pydantic.v1.json.ENCODERS_BY_TYPE[Timeout] = encode_openai_timeout
 
+with OptionalImports(messages=REQUIREMENT_ORJSON):
+    import orjson
+
+USE_ORJSON: bool = False
+"""Dump json strings in `json_str_of_obj` with orjson if it is installed.
+
+This is faster but the strings differ from those of the json module: they have
+no whitespace, non-ascii characters are not escaped and NaN or infinite floats
+become null. Values orjson cannot dump are dumped by the json module instead.
+"""
+
 
 def obj_id_of_obj(obj: dict, prefix="obj"):
     """
@@ -76,10 +91,19 @@ def json_str_of_obj(
     Encode the given json object as a string.
     """
 
-    return json.dumps(
-        jsonify(obj, *args, redact_keys=redact_keys, **kwargs),
-        default=json_default
-    )
+    content = jsonify(obj, *args, redact_keys=redact_keys, **kwargs)
+
+    if USE_ORJSON and not isinstance(orjson, Dummy):
+        try:
+            return orjson.dumps(
+                content, default=json_default, option=orjson.OPT_NON_STR_KEYS
+            ).decode()
+
+        except TypeError:
+            # E.g. integers larger than 64 bits.
+            pass
+
+    return json.dumps(content, default=json_default)
 
 
 def json_default(obj: Any) -> str:
@@ -100,6 +124,19 @@ def json_default(obj: Any) -> str:
 ALL_SPECIAL_KEYS = set([CIRCLE, ERROR, CLASS_INFO, NOSERIO])
 
 
+def _array_summary(obj: Any) -> Dict[str, JSON]:
+    """Shape and dtype of array-like objects such as numpy arrays or tensors,
+    which are not serialized, or nothing for other objects."""
+
+    try:
+        shape = obj.shape
+        dtype = obj.dtype
+        return dict(shape=[int(s) for s in shape], dtype=str(dtype))
+
+    except Exception:
+        return {}
+
+
 def jsonify_for_ui(*args, **kwargs):
     """Options for jsonify common to UI displays.
     
@@ -109,6 +146,472 @@ def jsonify_for_ui(*args, **kwargs):
     return jsonify(*args, **kwargs, redact_keys=True, skip_specials=True)
 
 
+# Kinds of objects by how jsonify handles them. Determined once per type, see
+# `_kind_of`.
+_KIND_BASE = 0
+_KIND_SERIAL_BYTES = 1
+_KIND_PATH = 2
+_KIND_ENUM = 3
+_KIND_DICT = 4
+_KIND_SEQUENCE = 5
+_KIND_SET = 6
+_KIND_LENS = 7
+_KIND_MODEL = 8
+_KIND_MODEL_V1 = 9
+_KIND_DATACLASS = 10
+_KIND_OBJECT = 11
+
+_kinds: Dict[type, int] = {}
+"""Kinds of the types seen so far."""
+
+_BASE_TYPES = frozenset([str, int, float, bool, type(None)])
+"""Types whose values jsonify returns as they are, except for strings that
+may be redacted."""
+
+_SENTINEL = object()
+
+_class_attrs: Dict[typing.Tuple[type, str], typing.Tuple[Any, bool]] = {}
+"""Attributes of classes found by static lookup through their mro, see
+`_class_attr`."""
+
+_class_infos: Dict[type, JSON] = {}
+"""Class information of the types seen so far, as added under CLASS_INFO."""
+
+_instrumented_types: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+"""Per instrument, the number of its classes and whether objects of the
+types seen so far are to be instrumented."""
+
+_default_instrument: Optional[typing.Tuple[int, 'Instrument']] = None
+"""Instrument used when none is given to jsonify and the number of default
+classes when it was made."""
+
+
+def _classify(obj: Any) -> int:
+    """Kind of the given object in the order of the checks jsonify has to
+    make."""
+
+    if isinstance(obj, JSON_BASES):
+        return _KIND_BASE
+    if isinstance(obj, SerialBytes):
+        return _KIND_SERIAL_BYTES
+    if isinstance(obj, Path):
+        return _KIND_PATH
+    if isinstance(obj, Enum):
+        return _KIND_ENUM
+    if isinstance(obj, Dict):
+        return _KIND_DICT
+    if isinstance(obj, Sequence):
+        return _KIND_SEQUENCE
+    if isinstance(obj, Set):
+        return _KIND_SET
+    if isinstance(obj, pydantic.BaseModel):
+        return _KIND_LENS if isinstance(obj, Lens) else _KIND_MODEL
+    if isinstance(obj, pydantic.v1.BaseModel):
+        return _KIND_MODEL_V1
+    if dataclasses.is_dataclass(type(obj)):
+        return _KIND_DATACLASS
+
+    return _KIND_OBJECT
+
+
+def _kind_of(obj: Any) -> int:
+    """Kind of the given object, cached by type.
+    
+    Objects that report a class other than their type, like proxies, are
+    classified every time.
+    """
+
+    cls = type(obj)
+    kind = _kinds.get(cls)
+
+    if kind is None or obj.__class__ is not cls:
+        kind = _classify(obj)
+        if obj.__class__ is cls:
+            _kinds[cls] = kind
+
+    return kind
+
+
+def _mro_lookup(cls: type, k: str) -> Any:
+    for base in cls.__mro__:
+        base_dict = base.__dict__
+        if k in base_dict:
+            return base_dict[k]
+
+    return _SENTINEL
+
+
+def _class_attr(cls: type, k: str) -> typing.Tuple[Any, bool]:
+    """Static lookup of attribute `k` through the mro of `cls` as
+    [inspect.getattr_static][] does for instances of `cls`, cached.
+    
+    Returns the attribute, or `_SENTINEL` if absent, and whether it is a data
+    descriptor which takes precedence over instance attributes.
+    """
+
+    key = (cls, k)
+    ret = _class_attrs.get(key)
+
+    if ret is None:
+        v = _mro_lookup(cls, k)
+        ret = (
+            v, v is not _SENTINEL and
+            _mro_lookup(type(v), "__get__") is not _SENTINEL and (
+                _mro_lookup(type(v), "__set__") is not _SENTINEL or
+                _mro_lookup(type(v), "__delete__") is not _SENTINEL
+            )
+        )
+        _class_attrs[key] = ret
+
+    return ret
+
+
+def _instance_attr(obj: Any, k: str) -> Any:
+    """Attribute `k` from the instance dictionary of `obj`, or `_SENTINEL`."""
+
+    if type(obj).__dictoffset__ == 0:
+        return _SENTINEL
+
+    try:
+        return dict.get(object.__getattribute__(obj, "__dict__"), k, _SENTINEL)
+    except AttributeError:
+        return _SENTINEL
+
+
+def _fast_getattr(obj: Any, k: str) -> Any:
+    """Same as [safe_getattr][trulens_eval.utils.pyschema.safe_getattr] but
+    without [inspect.getattr_static][] for plain values in the instance
+    dictionary."""
+
+    cls = type(obj)
+    if obj.__class__ is cls and not isinstance(obj, type):
+        _, is_data_descriptor = _class_attr(cls, k)
+
+        if not is_data_descriptor:
+            # Instance dictionary comes first.
+            v = _instance_attr(obj, k)
+
+            if v is not _SENTINEL:
+                try:
+                    if not isinstance(v, property):
+                        return v
+                except Exception:
+                    # Let safe_getattr report the error.
+                    pass
+
+    return safe_getattr(obj, k)
+
+
+def _has_jsonify_extra(obj: Any) -> bool:
+    """Same as `safe_hasattr(obj, "jsonify_extra")` but looking through the
+    class of `obj` once."""
+
+    cls = type(obj)
+    if obj.__class__ is not cls or isinstance(obj, type):
+        return safe_hasattr(obj, "jsonify_extra")
+
+    if _class_attr(cls, "jsonify_extra")[0] is _SENTINEL and \
+            _instance_attr(obj, "jsonify_extra") is _SENTINEL:
+        return False
+
+    return safe_hasattr(obj, "jsonify_extra")
+
+
+def _class_info_of(cls: type) -> JSON:
+    """Class information with bases of the given class, cached."""
+
+    info = _class_infos.get(cls)
+
+    if info is None:
+        info = Class.of_class(cls=cls, with_bases=True).model_dump()
+        _class_infos[cls] = info
+
+    return _copy_json(info)
+
+
+def _copy_json(value: JSON) -> JSON:
+    if isinstance(value, dict):
+        return {k: _copy_json(v) for k, v in value.items()}
+
+    if isinstance(value, list):
+        return [_copy_json(v) for v in value]
+
+    return value
+
+
+def _get_default_instrument() -> 'Instrument':
+    """Instrument with the default configuration.
+    
+    Made again only when classes have been added to the defaults since jsonify
+    only checks the classes of instruments.
+    """
+
+    from trulens_eval.instruments import Instrument
+
+    global _default_instrument
+
+    n_classes = len(Instrument.Default.CLASSES)
+
+    if _default_instrument is None or _default_instrument[0] != n_classes:
+        _default_instrument = (n_classes, Instrument())
+
+    return _default_instrument[1]
+
+
+def _instrumented_types_of(instrument: 'Instrument') -> Dict[type, bool]:
+    """Cache of `instrument.to_instrument_object` by type, reset if classes
+    were added to the instrument."""
+
+    n_classes = len(instrument.include_classes)
+    cached = _instrumented_types.get(instrument)
+
+    if cached is None or cached[0] != n_classes:
+        cached = (n_classes, {})
+        _instrumented_types[instrument] = cached
+
+    return cached[1]
+
+
+class _Jsonifier:
+    """Serialization engine behind [jsonify][trulens_eval.utils.json.jsonify].
+
+    Holds the options of one top-level call and the objects being serialized
+    (ancestors of the current one) to detect circular references.
+    """
+
+    __slots__ = (
+        "instrument", "instrumented", "skip_specials", "redact_keys",
+        "include_excluded", "max_depth", "ancestors"
+    )
+
+    def __init__(
+        self, instrument: 'Instrument', skip_specials: bool, redact_keys: bool,
+        include_excluded: bool, max_depth: int, ancestors: typing.Set[int]
+    ):
+        self.instrument = instrument
+        self.instrumented = _instrumented_types_of(instrument)
+        self.skip_specials = skip_specials
+        self.redact_keys = redact_keys
+        self.include_excluded = include_excluded
+        self.max_depth = max_depth
+        self.ancestors = ancestors
+
+    def recur_key(self, k: Any) -> bool:
+        if self.skip_specials:
+            return isinstance(k, JSON_BASES) and k not in ALL_SPECIAL_KEYS
+
+        return isinstance(k, JSON_BASES)
+
+    def to_instrument_object(self, obj: Any) -> bool:
+        cls = type(obj)
+        if obj.__class__ is not cls:
+            return self.instrument.to_instrument_object(obj)
+
+        ret = self.instrumented.get(cls)
+        if ret is None:
+            ret = self.instrument.to_instrument_object(obj)
+            self.instrumented[cls] = ret
+
+        return ret
+
+    def redact(self, content: Dict) -> None:
+        """Redact possible secrets based on key name and value."""
+
+        for k, v in content.items():
+            content[k] = redact_value(v=v, k=k)
+
+    def jsonify(self, obj: Any, depth: int) -> JSON:
+        if depth > self.max_depth:
+            logger.debug(
+                "Max depth reached for jsonify of object type '%s'.", type(obj)
+            )  # careful about str(obj) in case it is recursive infinitely.
+
+            return noserio(obj)
+
+        cls = type(obj)
+
+        if cls in _BASE_TYPES:
+            if self.redact_keys and cls is str:
+                return redact_value(obj)
+
+            return obj
+
+        kind = _kind_of(obj)
+
+        if kind == _KIND_BASE:
+            if self.redact_keys and isinstance(obj, str):
+                return redact_value(obj)
+
+            return obj
+
+        if id(obj) in self.ancestors:
+            if self.skip_specials:
+                return None
+
+            return {CIRCLE: id(obj)}
+
+        # TODO: remove eventually
+        if kind == _KIND_SERIAL_BYTES:
+            return obj.model_dump()
+
+        if kind == _KIND_PATH:
+            return str(obj)
+
+        encoder = pydantic.v1.json.ENCODERS_BY_TYPE.get(cls)
+        if encoder is not None:
+            if inspect.isgenerator(obj):
+                # Encoded as a list by pydantic, which would consume the
+                # stream out from under its user.
+                return noserio(obj)
+
+            return encoder(obj)
+
+        if kind == _KIND_LENS:  # special handling of paths
+            return obj.model_dump()
+
+        if kind >= _KIND_MODEL and self.instrument.to_skip_object(obj):
+            # Data containers such as document stores are summarized to keep
+            # app json bounded by the number of components.
+            return noserio(obj, **_array_summary(obj))
+
+        if kind == _KIND_ENUM:
+            content = obj.name
+
+        elif kind == _KIND_DICT:
+            content = self.jsonify_dict(obj, depth)
+
+        elif kind == _KIND_SEQUENCE or kind == _KIND_SET:
+            content = self.jsonify_sequence(obj, depth)
+
+        elif kind == _KIND_MODEL:
+            # Not even trying to use pydantic.dict here.
+
+            # Hack so that our models do not get exludes dumped which causes
+            # many problems.
+            skip_excluded = not self.include_excluded or isinstance(
+                obj, SerialModel
+            )
+
+            content = self.jsonify_fields(
+                obj, (
+                    k for k, v in obj.__class__.model_fields.items()
+                    if not skip_excluded or not v.exclude
+                ), depth
+            )
+
+        elif kind == _KIND_MODEL_V1:
+            # TODO: DEDUP with pydantic.BaseModel case
+
+            # Not even trying to use pydantic.dict here.
+
+            skip_excluded = not self.include_excluded
+
+            content = self.jsonify_fields(
+                obj, (
+                    k for k, v in obj.__fields__.items()
+                    if not skip_excluded or not v.field_info.exclude
+                ), depth
+            )
+
+        elif kind == _KIND_DATACLASS:
+            # NOTE: cannot use dataclasses.asdict as that may fail due to its
+            # use of copy.deepcopy.
+
+            content = self.jsonify_fields(
+                obj, (f.name for f in dataclasses.fields(obj)), depth
+            )
+
+        elif self.to_instrument_object(obj):
+            content = {}
+            self.ancestors.add(id(obj))
+
+            kvs = clean_attributes(obj, include_props=True)
+
+            # TODO(piotrm): object walks redo
+            for k, v in kvs.items():
+                if self.recur_key(k) and (isinstance(v, JSON_BASES) or
+                                          isinstance(v, Dict) or
+                                          isinstance(v, Sequence) or
+                                          self.to_instrument_object(v)):
+                    content[k] = self.jsonify(v, depth + 1)
+
+            self.ancestors.discard(id(obj))
+
+        else:
+            logger.debug(
+                "Do not know how to jsonify an object of type '%s'.", type(obj)
+            )  # careful about str(obj) in case it is recursive infinitely.
+
+            content = noserio(obj, **_array_summary(obj))
+
+        # Add class information for objects that are to be instrumented, known
+        # as "components".
+        if not self.skip_specials and isinstance(content, dict) and \
+                kind != _KIND_DICT and (self.to_instrument_object(obj) or
+                                        isinstance(obj, WithClassInfo)):
+
+            content[CLASS_INFO] = _class_info_of(obj.__class__)
+
+        if _has_jsonify_extra(obj):
+            content = obj.jsonify_extra(content)
+
+        return content
+
+    def jsonify_dict(self, obj: Dict, depth: int) -> Dict[Any, JSON]:
+        content = {}
+        self.ancestors.add(id(obj))
+
+        fast = depth < self.max_depth and not self.redact_keys
+
+        for k, v in obj.items():
+            if not self.recur_key(k):
+                continue
+
+            if fast and type(v) in _BASE_TYPES:
+                content[k] = v
+            else:
+                content[k] = self.jsonify(v, depth + 1)
+
+        self.ancestors.discard(id(obj))
+
+        if self.redact_keys:
+            self.redact(content)
+
+        return content
+
+    def jsonify_sequence(self, obj: Sequence, depth: int) -> List[JSON]:
+        content = []
+        self.ancestors.add(id(obj))
+
+        fast = depth < self.max_depth and not self.redact_keys
+
+        for v in obj:
+            if fast and type(v) in _BASE_TYPES:
+                content.append(v)
+            else:
+                content.append(self.jsonify(v, depth + 1))
+
+        self.ancestors.discard(id(obj))
+
+        return content
+
+    def jsonify_fields(self, obj: Any, fields: Iterable[str],
+                       depth: int) -> Dict[str, JSON]:
+        content = {}
+        self.ancestors.add(id(obj))
+
+        for k in fields:
+            if self.recur_key(k):
+                content[k] = self.jsonify(_fast_getattr(obj, k), depth + 1)
+
+        self.ancestors.discard(id(obj))
+
+        if self.redact_keys:
+            self.redact(content)
+
+        return content
+
+
 def jsonify(
     obj: Any,
     dicted: Optional[Dict[int, JSON]] = None,
@@ -177,216 +680,14 @@ def jsonify(
         raise ValueError("Cannot jsonify a generator function.")
     """
 
-    if depth > max_depth:
-        logger.debug(
-            "Max depth reached for jsonify of object type '%s'.", type(obj)
-        )  # careful about str(obj) in case it is recursive infinitely.
-
-        return noserio(obj)
-
-    skip_excluded = not include_excluded
-    # Hack so that our models do not get exludes dumped which causes many
-    # problems. Another variable set here so we can recurse with the original
-    # include_excluded .
-    if isinstance(obj, SerialModel):
-        skip_excluded = True
-
-    from trulens_eval.instruments import Instrument
-
     if instrument is None:
-        instrument = Instrument()
-
-    dicted = dicted or {}
-
-    if skip_specials:
-
-        def recur_key(k):
-            return isinstance(k, JSON_BASES) and k not in ALL_SPECIAL_KEYS
-    else:
-
-        def recur_key(k):
-            return isinstance(k, JSON_BASES)
-
-    if id(obj) in dicted:
-        if skip_specials:
-            return None
-
-        return {CIRCLE: id(obj)}
-
-    if isinstance(obj, JSON_BASES):
-        if redact_keys and isinstance(obj, str):
-            return redact_value(obj)
-
-        return obj
-
-    # TODO: remove eventually
-    if isinstance(obj, SerialBytes):
-        return obj.model_dump()
-
-    if isinstance(obj, Path):
-        return str(obj)
-
-    if type(obj) in pydantic.v1.json.ENCODERS_BY_TYPE:
-        return pydantic.v1.json.ENCODERS_BY_TYPE[type(obj)](obj)
-
-    # TODO: should we include duplicates? If so, dicted needs to be adjusted.
-    new_dicted = dict(dicted)
-
-    def recur(o):
-        return jsonify(
-            obj=o,
-            dicted=new_dicted,
-            instrument=instrument,
-            skip_specials=skip_specials,
-            redact_keys=redact_keys,
-            include_excluded=include_excluded,
-            depth=depth + 1,
-            max_depth=max_depth
-        )
-
-    content = None
-
-    if isinstance(obj, Enum):
-        content = obj.name
-
-    elif isinstance(obj, Dict):
-        forward_value = {}
-        new_dicted[id(obj)] = forward_value
-        forward_value.update(
-            {k: recur(v) for k, v in obj.items() if recur_key(k)}
-        )
-
-        # Redact possible secrets based on key name and value.
-        if redact_keys:
-            for k, v in forward_value.items():
-                forward_value[k] = redact_value(v=v, k=k)
-
-        content = forward_value
-
-    elif isinstance(obj, Sequence):
-        forward_value = []
-        new_dicted[id(obj)] = forward_value
-        for x in (recur(v) for v in obj):
-            forward_value.append(x)
-
-        content = forward_value
-
-    elif isinstance(obj, Set):
-        forward_value = []
-        new_dicted[id(obj)] = forward_value
-        for x in (recur(v) for v in obj):
-            forward_value.append(x)
-
-        content = forward_value
-
-    elif isinstance(obj, pydantic.BaseModel):
-        # Not even trying to use pydantic.dict here.
-
-        if isinstance(obj, Lens):  # special handling of paths
-            return obj.model_dump()
-
-        forward_value = {}
-        new_dicted[id(obj)] = forward_value
-        forward_value.update(
-            {
-                k: recur(safe_getattr(obj, k))
-                for k, v in obj.model_fields.items()
-                if (not skip_excluded or not v.exclude) and recur_key(k)
-            }
-        )
-
-        # Redact possible secrets based on key name and value.
-        if redact_keys:
-            for k, v in forward_value.items():
-                forward_value[k] = redact_value(v=v, k=k)
-
-        content = forward_value
-
-    elif isinstance(obj, pydantic.v1.BaseModel):
-        # TODO: DEDUP with pydantic.BaseModel case
-
-        # Not even trying to use pydantic.dict here.
-
-        forward_value = {}
-        new_dicted[id(obj)] = forward_value
-        forward_value.update(
-            {
-                k: recur(safe_getattr(obj, k))
-                for k, v in obj.__fields__.items()
-                if (not skip_excluded or not v.field_info.exclude) and
-                recur_key(k)
-            }
-        )
-
-        # Redact possible secrets based on key name and value.
-        if redact_keys:
-            for k, v in forward_value.items():
-                forward_value[k] = redact_value(v=v, k=k)
-
-        content = forward_value
-
-    elif dataclasses.is_dataclass(type(obj)):
-        # NOTE: cannot use dataclasses.asdict as that may fail due to its use of
-        # copy.deepcopy.
-
-        forward_value = {}
-        new_dicted[id(obj)] = forward_value
-
-        forward_value.update(
-            {
-                f.name: recur(safe_getattr(obj, f.name))
-                for f in dataclasses.fields(obj)
-                if recur_key(f.name)
-            }
-        )
-
-        # Redact possible secrets based on key name and value.
-        if redact_keys:
-            for k, v in forward_value.items():
-                forward_value[k] = redact_value(v=v, k=k)
-
-        content = forward_value
-
-    elif instrument.to_instrument_object(obj):
-
-        forward_value = {}
-        new_dicted[id(obj)] = forward_value
-
-        kvs = clean_attributes(obj, include_props=True)
-
-        # TODO(piotrm): object walks redo
-        forward_value.update(
-            {
-                k: recur(v) for k, v in kvs.items() if recur_key(k) and (
-                    isinstance(v, JSON_BASES) or isinstance(v, Dict) or
-                    isinstance(v, Sequence) or
-                    instrument.to_instrument_object(v)
-                )
-            }
-        )
-
-        content = forward_value
-
-    else:
-        logger.debug(
-            "Do not know how to jsonify an object of type '%s'.", type(obj)
-        )  # careful about str(obj) in case it is recursive infinitely.
-
-        content = noserio(obj)
-
-    # Add class information for objects that are to be instrumented, known as
-    # "components".
-    if not skip_specials and isinstance(content, dict) and not isinstance(
-            obj, dict) and (instrument.to_instrument_object(obj) or
-                            isinstance(obj, WithClassInfo)):
-
-        content[CLASS_INFO] = Class.of_class(
-            cls=obj.__class__, with_bases=True
-        ).model_dump()
-
-    if not isinstance(obj, Lens) and safe_hasattr(obj, "jsonify_extra"):
-        # Problem with Lens and similar objects: they always say they have every attribute.
-
-        content = obj.jsonify_extra(content)
-
-    return content
+        instrument = _get_default_instrument()
+
+    return _Jsonifier(
+        instrument=instrument,
+        skip_specials=skip_specials,
+        redact_keys=redact_keys,
+        include_excluded=include_excluded,
+        max_depth=max_depth,
+        ancestors=set(dicted or ())
+    ).jsonify(obj, depth)
@@ -6,7 +6,6 @@ various langchain classes and example classes:
   documents via a threshold on a specified feedback function.
 """
 
-from concurrent.futures import wait
 from typing import List, Type
 
 from trulens_eval import app
@@ -18,7 +17,7 @@ from trulens_eval.utils.imports import REQUIREMENT_LANGCHAIN
 from trulens_eval.utils.pyschema import Class
 from trulens_eval.utils.serial import JSON
 from trulens_eval.utils.serial import model_dump
-from trulens_eval.utils.threading import ThreadPoolExecutor
+from trulens_eval.utils.threading import FanOut
 
 with OptionalImports(messages=REQUIREMENT_LANGCHAIN):
     import langchain
@@ -114,26 +113,12 @@ class WithFeedbackFilterDocuments(VectorStoreRetriever):
         docs = super()._get_relevant_documents(query, run_manager=run_manager)
 
         # Evaluate the filter on each, in parallel.
-        ex = ThreadPoolExecutor(max_workers=max(1, len(docs)))
-
-        futures = list(
-            (
-                doc,
-                ex.submit(
-                    (
-                        lambda doc, query: self.
-                        feedback(query, doc.page_content) > self.threshold
-                    ),
-                    query=query,
-                    doc=doc
-                )
-            ) for doc in docs
+        passes = FanOut().map(
+            lambda doc: self.feedback(query, doc.page_content) > self.threshold,
+            docs
         )
 
-        wait([future for (_, future) in futures])
-
-        results = list((doc, future.result()) for (doc, future) in futures)
-        filtered = map(first, filter(second, results))
+        filtered = map(first, filter(second, zip(docs, passes)))
 
         # Return only the filtered ones.
         return list(filtered)
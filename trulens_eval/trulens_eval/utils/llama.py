@@ -15,7 +15,7 @@ from trulens_eval.utils.containers import second
 from trulens_eval.utils.imports import OptionalImports
 from trulens_eval.utils.imports import REQUIREMENT_LLAMA
 from trulens_eval.utils.pyschema import Class
-from trulens_eval.utils.threading import ThreadPoolExecutor
+from trulens_eval.utils.threading import FanOut
 
 with OptionalImports(messages=REQUIREMENT_LLAMA):
     import llama_index
@@ -143,26 +143,14 @@ class WithFeedbackFilterNodes(VectorIndexRetriever):
         # Get relevant docs using super class:
         nodes = super()._retrieve(query_bundle)
 
-        ex = ThreadPoolExecutor(max_workers=max(1, len(nodes)))
-
         # Evaluate the filter on each, in parallel.
-        futures = (
-            (
-                node,
-                ex.submit(
-                    lambda query, node: self.feedback(
-                        query.query_str, node.node.get_text()
-                    ) > self.threshold,
-                    query=query_bundle,
-                    node=node
-                )
-            ) for node in nodes
+        passes = FanOut().map(
+            lambda node: self.feedback(
+                query_bundle.query_str, node.node.get_text()
+            ) > self.threshold, nodes
         )
 
-        wait([future for (_, future) in futures])
-
-        results = ((node, future.result()) for (node, future) in futures)
-        filtered = map(first, filter(second, results))
+        filtered = map(first, filter(second, zip(nodes, passes)))
 
         # Return only the filtered ones.
         return list(filtered)
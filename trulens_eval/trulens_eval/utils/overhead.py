@@ -0,0 +1,267 @@
+"""
+# Instrumentation Overhead
+
+Measurement of the time instrumented methods spend in TruLens itself as
+opposed to in the methods they wrap. Give a profiler to an app recorder to
+measure its calls:
+
+```python
+from trulens_eval import TruCustomApp
+from trulens_eval.utils.overhead import OverheadProfiler
+
+tru_app = TruCustomApp(app, overhead_profiler=OverheadProfiler())
+
+with tru_app:
+    app.respond_to_query("...")
+
+print(tru_app.instrumentation_overhead_report())
+```
+
+Each recorded call of an instrumented method is timed by phase (see
+[OverheadPhase][trulens_eval.utils.overhead.OverheadPhase]). Times are
+aggregated per method path into counts, totals and log2 histograms by the
+thread that made the call without locking. Reports merge the accumulators of
+all threads.
+
+Methods that add the most overhead relative to their own time are candidates
+for removal from the app's instrumentation.
+"""
+
+from __future__ import annotations
+
+from enum import Enum
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from trulens_eval.utils.serial import Lens
+
+
+class OverheadPhase(str, Enum):
+    """Phases of a call of an instrumented method."""
+
+    FUNCTION = "function"
+    """The wrapped method itself, including its subcalls. Not overhead."""
+
+    CONTEXT = "context"
+    """Finding the recording contexts and call stacks of the call and deciding
+    whether to record it."""
+
+    BIND = "bind"
+    """Binding the arguments of the call to the signature of the method."""
+
+    COST = "cost"
+    """Tracking the costs of the endpoints the call uses, excluding the time of
+    the wrapped method."""
+
+    JSONIFY = "jsonify"
+    """Serializing, or capturing for later serialization, the arguments and
+    returns of the call."""
+
+    RECORD_CALL = "record_call"
+    """Building the recorded call and adding it to its recording contexts."""
+
+    ON_ADD_RECORD = "on_add_record"
+    """Building records of root calls and handing them to their apps."""
+
+
+OVERHEAD_PHASES: Tuple[OverheadPhase, ...] = tuple(
+    phase for phase in OverheadPhase if phase != OverheadPhase.FUNCTION
+)
+"""Phases that are instrumentation overhead."""
+
+N_BUCKETS = 64
+"""Number of histogram buckets. Bucket `i` counts times of `i` bits, that is
+from `2**(i-1)` up to `2**i - 1` nanoseconds."""
+
+
+class _Stats:
+    """Count, total, maximum and histogram of the nanoseconds of one phase of
+    the calls of one method."""
+
+    __slots__ = ("count", "total", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.max = 0
+        self.buckets = [0] * N_BUCKETS
+
+    def add(self, ns: int) -> None:
+        self.count += 1
+        self.total += ns
+        if ns > self.max:
+            self.max = ns
+        self.buckets[min(ns.bit_length(), N_BUCKETS - 1)] += 1
+
+    def merge(self, other: _Stats) -> None:
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        for i, n in enumerate(other.buckets):
+            self.buckets[i] += n
+
+    def percentile(self, p: float) -> int:
+        """Upper bound in nanoseconds of the bucket containing the `p`
+        quantile."""
+
+        rank = p * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if n > 0 and seen >= rank:
+                return min((1 << i) - 1, self.max)
+
+        return self.max
+
+
+MethodKey = Tuple[Lens, str]
+"""Path of the object owning a method and the name of the method."""
+
+Measurement = Dict[OverheadPhase, int]
+"""Nanoseconds spent in each phase of one call."""
+
+
+class OverheadProfiler:
+    """Accumulates the time spent in each phase of the calls of instrumented
+    methods of an app.
+
+    Args:
+        hooks: Callables called with the method and measurement of each
+            profiled call, for example to export them as metrics. They are
+            called by the thread that made the call, after it finished.
+    """
+
+    def __init__(
+        self,
+        hooks: Optional[Iterable[Callable[[MethodKey, Measurement],
+                                          None]]] = None
+    ):
+        self.hooks: List[Callable[[MethodKey, Measurement],
+                                  None]] = list(hooks or [])
+
+        self._local = threading.local()
+
+        # Accumulators of all threads. Only appended to, once per thread.
+        # Keyed by method and phase, or None for the overhead of all phases.
+        self._accumulators: List[Dict[Tuple[MethodKey, Optional[OverheadPhase]],
+                                      _Stats]] = []
+        self._accumulators_lock = threading.Lock()
+
+    def _accumulator(
+        self
+    ) -> Dict[Tuple[MethodKey, Optional[OverheadPhase]], _Stats]:
+        acc = getattr(self._local, "acc", None)
+
+        if acc is None:
+            acc = self._local.acc = {}
+            with self._accumulators_lock:
+                self._accumulators.append(acc)
+
+        return acc
+
+    def add(self, method: MethodKey, measurement: Measurement) -> None:
+        """Add the measurement of one call of `method`."""
+
+        acc = self._accumulator()
+
+        overhead = 0
+
+        for phase, ns in measurement.items():
+            stats = acc.get((method, phase))
+            if stats is None:
+                stats = acc[(method, phase)] = _Stats()
+
+            stats.add(ns)
+
+            if phase != OverheadPhase.FUNCTION:
+                overhead += ns
+
+        # Overhead of all phases under None.
+        stats = acc.get((method, None))
+        if stats is None:
+            stats = acc[(method, None)] = _Stats()
+        stats.add(overhead)
+
+        for hook in self.hooks:
+            hook(method, measurement)
+
+    def reset(self) -> None:
+        """Forget all measurements."""
+
+        with self._accumulators_lock:
+            for acc in self._accumulators:
+                acc.clear()
+
+    def stats(self) -> Dict[MethodKey, Dict[Optional[OverheadPhase], _Stats]]:
+        """Accumulated stats of all threads by method and phase, or None for
+        the overhead of all phases."""
+
+        with self._accumulators_lock:
+            accumulators = list(self._accumulators)
+
+        ret: Dict[MethodKey, Dict[Optional[OverheadPhase], _Stats]] = {}
+
+        for acc in accumulators:
+            # Copy as the owning thread may add to it meanwhile.
+            for (method, phase), stats in list(acc.items()):
+                merged = ret.setdefault(method, {}).setdefault(phase, _Stats())
+                merged.merge(stats)
+
+        return ret
+
+    def report(self) -> pd.DataFrame:
+        """Overhead per method, most overhead first.
+
+        Columns are the number of calls; the mean milliseconds of the method
+        itself, of the overhead in total and of each overhead phase; the
+        overhead as a percentage of the method's own time; and the
+        approximate 99th percentile of the overhead of a call.
+        """
+
+        rows = []
+
+        for (path, name), phases in self.stats().items():
+            function = phases.get(OverheadPhase.FUNCTION, _Stats())
+            count = function.count
+
+            if count == 0:
+                continue
+
+            overhead = phases.get(None, _Stats())
+
+            row = {
+                "method":
+                    f"{path}.{name}",
+                "calls":
+                    count,
+                "function_ms":
+                    function.total / count / 1e6,
+                "overhead_ms":
+                    overhead.total / count / 1e6,
+                "overhead_pct":
+                    100.0 * overhead.total /
+                    function.total if function.total > 0 else float("nan"),
+                "overhead_p99_ms":
+                    overhead.percentile(0.99) / 1e6
+            }
+
+            for phase in OVERHEAD_PHASES:
+                stats = phases.get(phase)
+                row[f"{phase.value}_ms"] = \
+                    stats.total / count / 1e6 if stats is not None else 0.0
+
+            rows.append(row)
+
+        df = pd.DataFrame(
+            rows,
+            columns=[
+                "method", "calls", "function_ms", "overhead_ms", "overhead_pct",
+                "overhead_p99_ms"
+            ] + [f"{phase.value}_ms" for phase in OVERHEAD_PHASES]
+        )
+
+        return df.sort_values(
+            by="overhead_ms", ascending=False
+        ).set_index("method")
@@ -1,11 +1,16 @@
 from _thread import LockType
+import asyncio
 from collections import deque
+import contextlib
 from datetime import datetime
 from datetime import timedelta
 import logging
+from threading import Condition
 from threading import Lock
 import time
-from typing import ClassVar, Deque, Optional
+from typing import (
+    AsyncIterator, ClassVar, Deque, Dict, Iterator, Optional, Union
+)
 
 from pydantic import BaseModel
 from pydantic import Field
@@ -20,6 +25,11 @@ class Pace(BaseModel):
     constraint: the number of returns in the given period of time cannot exceed
     `marks_per_second * seconds_per_period`. This means the average number of
     returns in that period is bounded above exactly by `marks_per_second`.
+
+    Note:
+        Endpoints use [TokenBucketPace][trulens_eval.utils.pace.TokenBucketPace]
+        instead which does not hold a lock while waiting and can also limit
+        tokens per minute.
     """
 
     marks_per_second: float = 1.0
@@ -132,3 +142,440 @@ per second in that period.
             )
 
             return (now - prior_last_mark).total_seconds()
+
+
+class TokenBucket(BaseModel):
+    """A token bucket that can go into debt.
+
+    Reservations are taken out of the bucket immediately even if there is not
+    enough in it. The reserver is then told how long to wait for the bucket to
+    refill to the point that the debt is paid off. This schedules waiters in the
+    order of their reservations without anyone having to hold a lock while
+    waiting.
+
+    Not thread safe on its own; see
+    [TokenBucketPace][trulens_eval.utils.pace.TokenBucketPace].
+    """
+
+    capacity: float
+    """Maximum level of the bucket. This bounds the size of bursts."""
+
+    refill_per_second: float
+    """Rate at which the bucket refills."""
+
+    level: float
+    """Current level. Negative if there are outstanding reservations."""
+
+    last_refill: float = Field(default_factory=time.monotonic)
+    """Monotonic time of the last refill."""
+
+    def __init__(self, capacity: float, refill_per_second: float, **kwargs):
+        if refill_per_second <= 0.0:
+            raise ValueError("Refill rate must be positive.")
+
+        kwargs['level'] = kwargs.get('level', capacity)
+
+        super().__init__(
+            capacity=capacity, refill_per_second=refill_per_second, **kwargs
+        )
+
+    def refill(self, now: float) -> None:
+        """Add to the level the amount refilled since the last refill."""
+
+        elapsed = now - self.last_refill
+        if elapsed > 0.0:
+            self.level = min(
+                self.capacity, self.level + elapsed * self.refill_per_second
+            )
+            self.last_refill = now
+
+    def reserve(self, amount: float, now: float) -> float:
+        """Take `amount` out of the bucket and return the number of seconds the
+        reserver needs to wait before proceeding."""
+
+        self.refill(now)
+        self.level -= amount
+
+        if self.level >= 0.0:
+            return 0.0
+
+        return -self.level / self.refill_per_second
+
+    def adjust(self, amount: float, now: float) -> None:
+        """Take out (or give back if negative) `amount` without waiting.
+        
+        Used to correct a prior reservation whose amount was an estimate.
+        """
+
+        self.refill(now)
+        self.level = min(self.capacity, self.level - amount)
+
+    def set_rate(self, refill_per_second: float, now: float) -> None:
+        """Change the refill rate, keeping what was refilled at the old rate."""
+
+        self.refill(now)
+        self.refill_per_second = refill_per_second
+
+    def drain_for(self, seconds: float, now: float) -> None:
+        """Make sure no reservation succeeds for at least the given number of
+        seconds."""
+
+        self.refill(now)
+        self.level = min(self.level, -seconds * self.refill_per_second)
+
+
+class TokenBucketPace(BaseModel):
+    """Keep a given pace of requests per minute and tokens per minute.
+
+    Each call to `mark` reserves one request and the given number of
+    (estimated) tokens and then waits until both budgets permit the call to
+    proceed. The lock is held only while updating the buckets, never while
+    waiting, so concurrent callers do not serialize on each other. Once a
+    response is available, the token estimate can be corrected with
+    `reconcile`.
+
+    The buckets only hold `burst_seconds` worth of budget so after an idle
+    period at most that many seconds of requests are let through at once
+    instead of the whole minute's worth which tends to trigger 429 responses.
+
+    !!! example
+
+        ```python
+        pace = TokenBucketPace(rpm=500, tpm=90_000)
+
+        pace.mark(tokens=estimate)  # or `await pace.amark(...)`
+        response = ...
+        pace.reconcile(estimated=estimate, actual=response_tokens)
+        ```
+    """
+
+    rpm: float
+    """Requests per minute."""
+
+    tpm: Optional[float] = None
+    """Tokens per minute. If None, tokens are not limited."""
+
+    burst_seconds: float = 1.0
+    """How many seconds of budget can be used at once."""
+
+    requests: TokenBucket
+    """Bucket of requests."""
+
+    tokens: Optional[TokenBucket] = None
+    """Bucket of tokens if `tpm` is given."""
+
+    rate_factor: float = 1.0
+    """Fraction of `rpm` and `tpm` currently in effect.
+    
+    Lowered by [AdaptiveLimits][trulens_eval.utils.pace.AdaptiveLimits] when
+    the provider is throttling requests.
+    """
+
+    last_mark: float = Field(default_factory=time.monotonic)
+    """Monotonic time of the last mark return."""
+
+    lock: LockType = Field(default_factory=Lock)
+    """Lock for updating the buckets. Not held while waiting."""
+
+    model_config: ClassVar[dict] = dict(arbitrary_types_allowed=True)
+
+    def __init__(
+        self,
+        rpm: float,
+        tpm: Optional[float] = None,
+        burst_seconds: float = 1.0,
+        **kwargs
+    ):
+        if rpm <= 0.0:
+            raise ValueError("`rpm` must be positive.")
+
+        if tpm is not None and tpm <= 0.0:
+            raise ValueError("`tpm` must be positive if given.")
+
+        # Always allow at least one whole request through at a time.
+        requests = TokenBucket(
+            capacity=max(1.0, rpm / 60.0 * burst_seconds),
+            refill_per_second=rpm / 60.0
+        )
+
+        tokens = None
+        if tpm is not None:
+            tokens = TokenBucket(
+                capacity=tpm / 60.0 * burst_seconds,
+                refill_per_second=tpm / 60.0
+            )
+
+        super().__init__(
+            rpm=rpm,
+            tpm=tpm,
+            burst_seconds=burst_seconds,
+            requests=requests,
+            tokens=tokens,
+            **kwargs
+        )
+
+    def _reserve(self, tokens: int) -> float:
+        """Reserve a request and the given number of tokens, returning how long
+        to wait before proceeding."""
+
+        with self.lock:
+            now = time.monotonic()
+
+            delay = self.requests.reserve(1.0, now=now)
+
+            if self.tokens is not None and tokens > 0:
+                delay = max(delay, self.tokens.reserve(tokens, now=now))
+
+        if delay >= 60.0 * 0.5:
+            logger.warning(
+                "Pace has a long delay of %s seconds. "
+                "Consider lowering concurrency or raising `rpm` (currently %s) "
+                "or `tpm` (currently %s) if the provider permits it.", delay,
+                self.rpm, self.tpm
+            )
+
+        return delay
+
+    def _marked(self) -> float:
+        with self.lock:
+            now = time.monotonic()
+            prior_last_mark = self.last_mark
+            self.last_mark = now
+
+        return now - prior_last_mark
+
+    def mark(self, tokens: int = 0) -> float:
+        """Block until a request costing the given number of tokens can be made
+        at the configured pace. Returns time in seconds since last mark
+        returned."""
+
+        delay = self._reserve(tokens)
+        if delay > 0.0:
+            time.sleep(delay)
+
+        return self._marked()
+
+    async def amark(self, tokens: int = 0) -> float:
+        """Async version of [mark][trulens_eval.utils.pace.TokenBucketPace.mark]."""
+
+        delay = self._reserve(tokens)
+        if delay > 0.0:
+            await asyncio.sleep(delay)
+
+        return self._marked()
+
+    def reconcile(self, estimated: int, actual: int) -> None:
+        """Correct a prior token reservation of `estimated` tokens now that the
+        `actual` number of tokens used is known."""
+
+        if self.tokens is None:
+            return
+
+        with self.lock:
+            self.tokens.adjust(actual - estimated, now=time.monotonic())
+
+    def scale(self, rate_factor: float) -> None:
+        """Run at the given fraction of the configured `rpm` and `tpm`."""
+
+        with self.lock:
+            now = time.monotonic()
+            self.rate_factor = rate_factor
+            self.requests.set_rate(self.rpm / 60.0 * rate_factor, now=now)
+            if self.tokens is not None:
+                self.tokens.set_rate(self.tpm / 60.0 * rate_factor, now=now)
+
+    def pause(self, seconds: float) -> None:
+        """Hold off all marks for at least the given number of seconds.
+        
+        Marks already waiting are not affected.
+        """
+
+        with self.lock:
+            self.requests.drain_for(seconds, now=time.monotonic())
+
+    @property
+    def effective_rpm(self) -> float:
+        """Requests per minute currently in effect."""
+
+        return self.rpm * self.rate_factor
+
+    @property
+    def effective_tpm(self) -> Optional[float]:
+        """Tokens per minute currently in effect."""
+
+        if self.tpm is None:
+            return None
+
+        return self.tpm * self.rate_factor
+
+
+class AdaptiveLimits(BaseModel):
+    """Additive-increase/multiplicative-decrease (AIMD) control of the
+    concurrency and rate of requests to a provider.
+
+    Every successful request slowly raises the concurrency limit and the rate
+    factor of the controlled
+    [TokenBucketPace][trulens_eval.utils.pace.TokenBucketPace] back toward
+    their configured maximums. Every throttling signal (429s, "overloaded"
+    responses, etc.) cuts both by `decrease` and pauses the pace for the
+    retry period the provider asked for, if any. Decreases are applied at most
+    once per `decrease_interval` seconds so that a burst of throttled
+    responses to requests sent at the same time counts as one signal.
+    """
+
+    pace: TokenBucketPace = Field(exclude=True)
+    """Pace whose rate is controlled."""
+
+    max_concurrency: int = 32
+    """Largest number of requests allowed in flight at once."""
+
+    concurrency: float = 32.0
+    """Current limit on requests in flight. Fractional for gradual increase."""
+
+    min_rate_factor: float = 0.05
+    """Smallest fraction of the configured rate to back off to."""
+
+    rate_increase: float = 0.02
+    """Fraction of the configured rate added back after each success."""
+
+    decrease: float = 0.5
+    """Factor applied to concurrency and rate after a throttling signal."""
+
+    decrease_interval: float = 1.0
+    """Minimum seconds between two decreases."""
+
+    in_flight: int = 0
+    """Number of requests presently in flight."""
+
+    n_successes: int = 0
+    """Number of successful requests seen."""
+
+    n_throttles: int = 0
+    """Number of throttling signals seen."""
+
+    last_decrease: float = 0.0
+    """Monotonic time of the last decrease."""
+
+    condition: Condition = Field(default_factory=Condition, exclude=True)
+    """Condition for waiting on a free slot. Not held while requests run."""
+
+    model_config: ClassVar[dict] = dict(arbitrary_types_allowed=True)
+
+    def __init__(
+        self, pace: TokenBucketPace, max_concurrency: int = 32, **kwargs
+    ):
+        if max_concurrency < 1:
+            raise ValueError("`max_concurrency` must be at least 1.")
+
+        super().__init__(
+            pace=pace,
+            max_concurrency=max_concurrency,
+            concurrency=float(max_concurrency),
+            **kwargs
+        )
+
+    def _try_enter(self) -> bool:
+        if self.in_flight < max(1, int(self.concurrency)):
+            self.in_flight += 1
+            return True
+
+        return False
+
+    def _exit(self) -> None:
+        with self.condition:
+            self.in_flight -= 1
+            self.condition.notify()
+
+    @contextlib.contextmanager
+    def slot(self) -> Iterator[None]:
+        """Context manager that blocks until a request can be put in flight."""
+
+        with self.condition:
+            while not self._try_enter():
+                self.condition.wait()
+
+        try:
+            yield
+        finally:
+            self._exit()
+
+    @contextlib.asynccontextmanager
+    async def aslot(self) -> AsyncIterator[None]:
+        """Async version of [slot][trulens_eval.utils.pace.AdaptiveLimits.slot].
+        
+        Polls for a free slot to avoid blocking the event loop.
+        """
+
+        delay = 0.001
+        while True:
+            with self.condition:
+                if self._try_enter():
+                    break
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.1)
+
+        try:
+            yield
+        finally:
+            self._exit()
+
+    def on_success(self) -> None:
+        """Record a successful request, additively increasing the limits."""
+
+        with self.condition:
+            self.n_successes += 1
+
+            if self.concurrency < self.max_concurrency:
+                # About one more slot per full window of successes.
+                self.concurrency = min(
+                    float(self.max_concurrency),
+                    self.concurrency + 1.0 / self.concurrency
+                )
+                self.condition.notify()
+
+            rate_factor = self.pace.rate_factor
+
+        if rate_factor < 1.0:
+            self.pace.scale(min(1.0, rate_factor + self.rate_increase))
+
+    def on_throttle(self, retry_after: Optional[float] = None) -> None:
+        """Record a throttling signal, multiplicatively decreasing the limits
+        and pausing for `retry_after` seconds if given."""
+
+        now = time.monotonic()
+
+        with self.condition:
+            self.n_throttles += 1
+
+            decrease = now - self.last_decrease >= self.decrease_interval
+            if decrease:
+                self.last_decrease = now
+                self.concurrency = max(1.0, self.concurrency * self.decrease)
+
+            rate_factor = self.pace.rate_factor
+
+        if decrease:
+            rate_factor = max(self.min_rate_factor, rate_factor * self.decrease)
+            self.pace.scale(rate_factor)
+
+            logger.info(
+                "Throttled; reducing concurrency to %s and rate to %s rpm.",
+                int(self.concurrency), self.pace.effective_rpm
+            )
+
+        if retry_after is not None and retry_after > 0.0:
+            self.pace.pause(retry_after)
+
+    def metrics(self) -> Dict[str, Union[int, float, None]]:
+        """Current limits and counters."""
+
+        return dict(
+            concurrency=int(self.concurrency),
+            max_concurrency=self.max_concurrency,
+            in_flight=self.in_flight,
+            rate_factor=self.pace.rate_factor,
+            effective_rpm=self.pace.effective_rpm,
+            effective_tpm=self.pace.effective_tpm,
+            n_successes=self.n_successes,
+            n_throttles=self.n_throttles
+        )
@@ -0,0 +1,305 @@
+"""
+# Payload Policies
+
+Limits on the size of the arguments and returns of instrumented calls kept in
+records. Apps may pass whole documents, embedding vectors or encoded images
+between their components; recording all of it makes records large and slow to
+serialize, store and display. Give a policy to an app recorder to bound them:
+
+```python
+from trulens_eval import TruCustomApp
+from trulens_eval.utils.payload import PayloadPolicy
+
+tru_app = TruCustomApp(
+    app,
+    payload=PayloadPolicy(
+        max_string_length=2000,
+        max_vector_length=16,
+        max_field_bytes=20_000,
+        max_record_bytes=1_000_000
+    )
+)
+```
+
+Methods can override the policy of the app for their own calls:
+
+```python
+from trulens_eval.tru_custom_app import instrument
+
+class App:
+    @instrument(payload=PayloadPolicy(max_field_bytes=1000))
+    def embed(self, text: str) -> List[float]:
+        ...
+```
+
+Calls that feedback functions of the app select from are never limited so
+that their selectors resolve to the same values as they would without a
+policy. Main inputs and outputs of records are not limited either.
+
+Limited values are replaced in one of two ways:
+
+- Long strings are cut and end with a note of their full length and content
+  hash so that the same content can be recognized across records.
+
+- Other values are replaced by a dictionary with the single key `ELIDED`
+  describing what was there: its type, size, content hash, and for numeric
+  vectors and matrices their shape and dtype.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from numbers import Number
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from pydantic import BaseModel
+from pydantic import Field
+
+from trulens_eval.utils.serial import JSON
+from trulens_eval.utils.serial import Lens
+from trulens_eval.utils.serial import StepItemOrAttribute
+
+ELIDED = "__tru_elided"
+"""Key of dictionaries replacing elided values."""
+
+
+def content_hash(content: str) -> str:
+    """Short hash of the given content for recognizing it across records."""
+
+    return hashlib.blake2b(content.encode(), digest_size=8).hexdigest()
+
+
+def json_size(value: JSON) -> int:
+    """Size in bytes of the given json value when dumped."""
+
+    # Dumped as ascii so characters are bytes.
+    return len(json.dumps(value))
+
+
+def numeric_shape(value: JSON) -> Optional[Tuple[Tuple[int, ...], str]]:
+    """Shape and dtype of the given json value if it is a non-empty list of
+    numbers or a rectangular nesting of such lists, otherwise None."""
+
+    if not isinstance(value, list) or len(value) == 0:
+        return None
+
+    if all(isinstance(v, Number) and not isinstance(v, bool) for v in value):
+        dtype = "float" if any(isinstance(v, float) for v in value) else "int"
+        return (len(value),), dtype
+
+    inner = [numeric_shape(v) for v in value]
+    if inner[0] is None or any(i != inner[0] for i in inner):
+        return None
+
+    shape, dtype = inner[0]
+
+    return (len(value),) + shape, dtype
+
+
+def may_select(selector: Lens, lens: Lens) -> bool:
+    """Whether `selector` may select values at or under `lens`, or values
+    containing those under `lens`.
+
+    Steps of `selector` other than attribute or item lookups, like slices, may
+    match any step of `lens`.
+    """
+
+    for s1, s2 in zip(selector.path, lens.path):
+        if isinstance(s1, StepItemOrAttribute) and \
+                isinstance(s2, StepItemOrAttribute) and \
+                s1.get_item_or_attribute() != s2.get_item_or_attribute():
+            return False
+
+    return True
+
+
+class PayloadPolicy(BaseModel):
+    """Limits on the size of recorded arguments and returns of calls.
+
+    No limits apply by default.
+    """
+
+    max_string_length: Optional[int] = Field(None, gt=0)
+    """Longest string kept in full. Longer strings are cut to this many
+    characters followed by a note of their length and content hash."""
+
+    max_vector_length: Optional[int] = Field(None, ge=0)
+    """Longest list of numbers, like an embedding, kept in full. Longer ones
+    and matrices with more elements are elided with their shape and dtype."""
+
+    max_field_bytes: Optional[int] = Field(None, gt=0)
+    """Largest argument or return value of a call kept, in bytes of json.
+    Larger ones are elided after the above limits are applied."""
+
+    max_call_bytes: Optional[int] = Field(None, gt=0)
+    """Largest total size of the arguments and return value of a call. The
+    largest of them are elided until the call fits."""
+
+    max_record_bytes: Optional[int] = Field(None, gt=0)
+    """Largest total size of the arguments and return values of all calls in a
+    record. The largest of them are elided until the record fits. Only applies
+    to the policy of an app."""
+
+    preview_length: int = Field(64, ge=0)
+    """Characters of the json of elided values to keep as a preview."""
+
+    def elide(self, value: JSON) -> JSON:
+        """Replace the given value with a description of it."""
+
+        dumped = json.dumps(value)
+
+        summary = {
+            "type": type(value).__name__,
+            "bytes": len(dumped),
+            "hash": content_hash(dumped)
+        }
+
+        shape = numeric_shape(value)
+        if shape is not None:
+            summary['shape'], summary['dtype'] = list(shape[0]), shape[1]
+        elif self.preview_length > 0:
+            summary['preview'] = dumped[:self.preview_length]
+
+        return {ELIDED: summary}
+
+    def truncate(self, value: str) -> str:
+        """Cut the given string if it is longer than `max_string_length`."""
+
+        if self.max_string_length is None or \
+                len(value) <= self.max_string_length:
+            return value
+
+        return value[:self.max_string_length] + \
+            f"... [truncated {len(value)} chars, hash {content_hash(value)}]"
+
+    def limit(self, value: JSON) -> JSON:
+        """Apply the string, vector and field limits to the given value."""
+
+        value = self._limit_contents(value)
+
+        if self.max_field_bytes is not None and \
+                json_size(value) > self.max_field_bytes:
+            return self.elide(value)
+
+        return value
+
+    def _limit_contents(self, value: JSON) -> JSON:
+        if isinstance(value, str):
+            return self.truncate(value)
+
+        if isinstance(value, dict):
+            if ELIDED in value:
+                return value
+
+            return {k: self._limit_contents(v) for k, v in value.items()}
+
+        if isinstance(value, list):
+            if self.max_vector_length is not None and \
+                    len(value) > 0 and not isinstance(value[0], (str, dict)):
+                shape = numeric_shape(value)
+                if shape is not None and \
+                        _product(shape[0]) > self.max_vector_length:
+                    return self.elide(value)
+
+            return [self._limit_contents(v) for v in value]
+
+        return value
+
+    def limit_call(self, args: Dict[str, JSON],
+                   rets: JSON) -> Tuple[Dict[str, JSON], JSON]:
+        """Apply the limits to the arguments and return value of a call."""
+
+        args = {k: self.limit(v) for k, v in args.items()}
+        rets = self.limit(rets)
+
+        if self.max_call_bytes is None:
+            return args, rets
+
+        fields = dict(args)
+        fields[None] = rets  # None does not collide with argument names
+
+        fields = _fit(fields, self.max_call_bytes, self.elide)
+
+        rets = fields.pop(None)
+
+        return fields, rets
+
+    def limit_calls(
+        self, calls: Sequence[Any], limited: Callable[[Any], bool]
+    ) -> None:
+        """Elide the largest arguments and returns of the given
+        [RecordAppCall][trulens_eval.schema.record.RecordAppCall]s, in place,
+        until they fit in `max_record_bytes`.
+
+        Only calls for which `limited` is true are changed but all count
+        towards the limit.
+        """
+
+        if self.max_record_bytes is None:
+            return
+
+        fields = {}
+        fixed = 0
+
+        for i, call in enumerate(calls):
+            if not limited(call):
+                fixed += json_size(call.args) + json_size(call.rets)
+                continue
+
+            for k, v in call.args.items():
+                fields[(i, k)] = v
+            fields[(i, None)] = call.rets
+
+        fitted = _fit(fields, self.max_record_bytes - fixed, self.elide)
+
+        for (i, k), v in fitted.items():
+            if v is fields[(i, k)]:
+                continue
+
+            if k is None:
+                calls[i].rets = v
+            else:
+                # Arguments may be shared with calls of other records.
+                args = dict(calls[i].args)
+                args[k] = v
+                calls[i].args = args
+
+
+def _product(shape: Sequence[int]) -> int:
+    ret = 1
+    for s in shape:
+        ret *= s
+
+    return ret
+
+
+def _fit(fields: Dict[Any, JSON], budget: int,
+         elide: Callable[[JSON], JSON]) -> Dict[Any, JSON]:
+    """Elide the largest of the given fields until their total size is within
+    `budget`, or all are elided."""
+
+    sizes = {k: json_size(v) for k, v in fields.items()}
+    total = sum(sizes.values())
+
+    if total <= budget:
+        return fields
+
+    fields = dict(fields)
+
+    order: List[Any] = sorted(sizes, key=lambda k: sizes[k], reverse=True)
+
+    for k in order:
+        if total <= budget:
+            break
+
+        elided = elide(fields[k])
+        elided_size = json_size(elided)
+
+        if elided_size >= sizes[k]:
+            continue
+
+        fields[k] = elided
+        total += elided_size - sizes[k]
+
+    return fields
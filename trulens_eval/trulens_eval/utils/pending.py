@@ -0,0 +1,225 @@
+"""
+# Pending Feedback
+
+Tracking of the records of an app whose feedback functions are still being
+evaluated in the app's process (see
+[FeedbackMode.WITH_APP_THREAD][trulens_eval.schema.feedback.FeedbackMode.WITH_APP_THREAD]).
+Only the ids of those records are kept, never the records themselves, and at
+most `max_pending` of them. Records are forgotten as soon as the last of their
+feedback functions finishes.
+
+When feedback functions are slower than the app, the limit is reached and
+new records overflow. Give an app recorder a tracker to choose what happens
+then:
+
+```python
+from trulens_eval import TruCustomApp
+from trulens_eval.utils.pending import Overflow
+from trulens_eval.utils.pending import PendingFeedback
+
+# Leave the feedback of records beyond 256 pending ones to the deferred
+# evaluator.
+tru_app = TruCustomApp(
+    app,
+    feedbacks=[...],
+    pending_feedback=PendingFeedback(max_pending=256, overflow=Overflow.DEFER)
+)
+
+tru.start_evaluator()
+
+...
+
+print(tru_app.pending_feedback.stats())
+```
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import Future
+from enum import Enum
+import itertools
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from trulens_eval.schema import types as mod_types_schema
+
+
+class Overflow(str, Enum):
+    """What to do with the feedback of a new record when the most records
+    are already pending."""
+
+    BLOCK = "block"
+    """Wait until another record's feedback finishes. Blocks the thread
+    that produced the record, usually the app's."""
+
+    DEFER = "defer"
+    """Add the record's feedback to the database to be run by the deferred
+    evaluator as in
+    [FeedbackMode.DEFERRED][trulens_eval.schema.feedback.FeedbackMode.DEFERRED].
+    It is only run if an evaluator is started with
+    [Tru.start_evaluator][trulens_eval.tru.Tru.start_evaluator]."""
+
+    SHED = "shed"
+    """Do not run the record's feedback functions. The record is still added
+    to the database."""
+
+
+class PendingFeedback:
+    """Bounded tracker of the records of an app with feedback functions being
+    evaluated.
+
+    Args:
+        max_pending: Most records with pending feedback.
+
+        overflow: What to do with the feedback of records beyond
+            `max_pending`.
+    """
+
+    def __init__(
+        self, max_pending: int = 1024, overflow: Overflow = Overflow.BLOCK
+    ):
+        if max_pending < 1:
+            raise ValueError("At least one pending record must be allowed.")
+
+        self.max_pending = max_pending
+        self.overflow = Overflow(overflow)
+
+        self._cond = threading.Condition()
+
+        self._pending: Dict[int, Tuple[mod_types_schema.RecordID, int]] = {}
+        """Id and number of unfinished feedback functions of each pending
+        record, by order of tracking. Records may share ids."""
+
+        self._keys = itertools.count()
+
+        self._reserved = 0
+        """Slots reserved for records whose feedback is being submitted."""
+
+        self._max_depth = 0
+        self._tracked = 0
+        self._completed = 0
+        self._overflowed = 0
+        self._blocked = 0
+        self._blocked_seconds = 0.0
+
+    @property
+    def depth(self) -> int:
+        """Number of records with pending feedback."""
+
+        with self._cond:
+            return self._depth()
+
+    def reserve(self) -> bool:
+        """Reserve a slot for a record whose feedback functions are about to be
+        submitted.
+
+        Blocks if there are no slots and the overflow policy is
+        [BLOCK][trulens_eval.utils.pending.Overflow.BLOCK].
+
+        Returns:
+            Whether a slot was reserved. If not, the record overflowed and its
+            feedback is to be handled as per the overflow policy. Otherwise
+            either [track][trulens_eval.utils.pending.PendingFeedback.track]
+            or [release][trulens_eval.utils.pending.PendingFeedback.release]
+            must follow.
+        """
+
+        with self._cond:
+            if self._depth() >= self.max_pending:
+                if self.overflow != Overflow.BLOCK:
+                    self._overflowed += 1
+                    return False
+
+                self._blocked += 1
+                start = time.monotonic()
+                self._cond.wait_for(lambda: self._depth() < self.max_pending)
+                self._blocked_seconds += time.monotonic() - start
+
+            self._reserved += 1
+            self._max_depth = max(self._max_depth, self._depth())
+
+            return True
+
+    def release(self) -> None:
+        """Give back a reserved slot that was not used."""
+
+        with self._cond:
+            self._reserved -= 1
+            self._cond.notify_all()
+
+    def track(
+        self, record_id: mod_types_schema.RecordID, futures: Iterable[Future]
+    ) -> None:
+        """Track the futures of the feedback results of the given record in a
+        reserved slot until they are all done."""
+
+        futures = list(futures)
+
+        with self._cond:
+            self._reserved -= 1
+            self._tracked += 1
+
+            if len(futures) == 0:
+                self._completed += 1
+                self._cond.notify_all()
+                return
+
+            key = next(self._keys)
+            self._pending[key] = (record_id, len(futures))
+
+        # Outside the lock as callbacks of futures that are already done run
+        # right away.
+        for future in futures:
+            future.add_done_callback(lambda _: self._done(key))
+
+    def _done(self, key: int) -> None:
+        with self._cond:
+            record_id, remaining = self._pending[key]
+            remaining -= 1
+
+            if remaining > 0:
+                self._pending[key] = (record_id, remaining)
+                return
+
+            del self._pending[key]
+            self._completed += 1
+            self._cond.notify_all()
+
+    def _depth(self) -> int:
+        return len(self._pending) + self._reserved
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait until no record has pending feedback, including records added
+        while waiting.
+
+        Returns:
+            False if `timeout` seconds passed first.
+        """
+
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: self._depth() == 0, timeout=timeout
+            )
+
+    def pending_record_ids(self) -> List[mod_types_schema.RecordID]:
+        """Ids of the records with pending feedback, oldest first."""
+
+        with self._cond:
+            return [record_id for record_id, _ in self._pending.values()]
+
+    def stats(self) -> Dict[str, float]:
+        """Current and maximum number of records with pending feedback, and
+        counts of records tracked, completed, overflowed and blocked, and the
+        total seconds spent blocked."""
+
+        with self._cond:
+            return dict(
+                depth=self._depth(),
+                max_depth=self._max_depth,
+                tracked=self._tracked,
+                completed=self._completed,
+                overflowed=self._overflowed,
+                blocked=self._blocked,
+                blocked_seconds=self._blocked_seconds
+            )
@@ -4,8 +4,9 @@ Utilities related to core python functionalities.
 
 from __future__ import annotations
 
-import asyncio
 from concurrent import futures
+import contextlib
+import contextvars
 import dataclasses
 import inspect
 import logging
@@ -15,8 +16,8 @@ import sys
 from types import ModuleType
 import typing
 from typing import (
-    Any, Awaitable, Callable, Dict, Generator, Generic, Hashable, Iterator,
-    List, Optional, Sequence, Type, TypeVar, Union
+    Any, AsyncGenerator, Awaitable, Callable, Dict, Generator, Generic,
+    Hashable, List, Mapping, Optional, Type, TypeVar, Union
 )
 
 T = TypeVar("T")
@@ -325,9 +326,6 @@ def run_before(callback: Callable):
 
 # Python call stack utilities
 
-# Attribute name for storing a callstack in asyncio tasks.
-STACK = "__tru_stack"
-
 
 def caller_frame(offset=0) -> 'frame':
     """
@@ -361,228 +359,30 @@ def caller_frameinfo(
     return None
 
 
-def task_factory_with_stack(loop, coro, *args, **kwargs) -> Sequence['frame']:
-    """
-    A task factory that annotates created tasks with stacks of their parents.
-    
-    All of such annotated stacks can be retrieved with
-    [stack_with_tasks][trulens_eval.utils.python.stack_with_tasks] as one merged
-    stack.
-    """
-
-    parent_task = asyncio.current_task(loop=loop)
-    task = asyncio.tasks.Task(coro=coro, loop=loop, *args, **kwargs)
-
-    stack = [fi.frame for fi in inspect.stack()[2:]]
-
-    if parent_task is not None:
-        stack = merge_stacks(stack, parent_task.get_stack()[::-1])
-        # skipping create_task and task_factory
-
-    setattr(task, STACK, stack)
-
-    return task
-
-
-# Instrument new_event_loop to set the above task_factory upon creation:
-original_new_event_loop = asyncio.new_event_loop
-
-
-def tru_new_event_loop():
+def _future_target_wrapper(context: contextvars.Context, func, *args, **kwargs):
     """
-    Replacement for [new_event_loop][asyncio.new_event_loop] that sets
-    the task factory to make tasks that copy the stack from their creators.
+    Wrapper for a function that is started by threads. Python threads do not
+    inherit the context variables of their creators; our instrumentation relies
+    on them for tracking recordings and call stacks so we run the function in
+    the context copied prior to thread start.
     """
 
-    loop = original_new_event_loop()
-    loop.set_task_factory(task_factory_with_stack)
-    return loop
-
-
-asyncio.new_event_loop = tru_new_event_loop
-
-
-def get_task_stack(task: asyncio.Task) -> Sequence['frame']:
-    """
-    Get the annotated stack (if available) on the given task.
-    """
-    if safe_hasattr(task, STACK):
-        return getattr(task, STACK)
-    else:
-        # get_stack order is reverse of inspect.stack:
-        return task.get_stack()[::-1]
-
-
-def merge_stacks(s1: Sequence['frame'],
-                 s2: Sequence['frame']) -> Sequence['frame']:
-    """
-    Assuming `s1` is a subset of `s2`, combine the two stacks in presumed call
-    order.
-    """
-
-    ret = []
-
-    while len(s1) > 1:
-        f = s1[0]
-        s1 = s1[1:]
-
-        ret.append(f)
-        try:
-            s2i = s2.index(f)
-            for _ in range(s2i):
-                ret.append(s2[0])
-                s2 = s2[1:]
+    return context.run(func, *args, **kwargs)
 
-        except:
-            pass
 
-    return ret
+@contextlib.contextmanager
+def context_vars_set(values: Mapping[contextvars.ContextVar, Any]):
+    """Set the given context variables for the duration of the context manager,
+    resetting them to their prior values afterwards."""
 
-
-def stack_with_tasks() -> Sequence['frame']:
-    """
-    Get the current stack (not including this function) with frames reaching
-    across Tasks.
-    """
-
-    ret = [fi.frame for fi in inspect.stack()[1:]]  # skip stack_with_task_stack
+    tokens = [(var, var.set(value)) for var, value in values.items()]
 
     try:
-        task_stack = get_task_stack(asyncio.current_task())
-
-        return merge_stacks(ret, task_stack)
-
-    except:
-        return ret
-
-
-def _future_target_wrapper(stack, context, func, *args, **kwargs):
-    """
-    Wrapper for a function that is started by threads. This is needed to
-    record the call stack prior to thread creation as in python threads do
-    not inherit the stack. Our instrumentation, however, relies on walking
-    the stack and need to do this to the frames prior to thread starts.
-    """
-
-    # TODO: See if threading.stack_size([size]) can be used instead.
+        yield
 
-    # Keep this for looking up via get_first_local_in_call_stack .
-    pre_start_stack = stack
-
-    for var, value in context.items():
-        var.set(value)
-
-    return func(*args, **kwargs)
-
-
-def get_all_local_in_call_stack(
-    key: str,
-    func: Callable[[Callable], bool],
-    offset: Optional[int] = 1,
-    skip: Optional[Any] = None  # really frame
-) -> Iterator[Any]:
-    """Find locals in call stack by name.
-    
-    Args:
-        key: The name of the local variable to look for.
-        
-        func: Recognizer of the function to find in the call stack.
-        
-        offset: The number of top frames to skip.
-        
-        skip: A frame to skip as well.
-
-    Note:
-        `offset` is unreliable for skipping the intended frame when operating
-        with async tasks. In those cases, the `skip` argument is more reliable.
-
-    Returns:
-        An iterator over the values of the local variable named `key` in the
-            stack at all of the frames executing a function which `func` recognizes
-            (returns True on) starting from the top of the stack except `offset` top
-            frames.
-
-            Returns None if `func` does not recognize any function in the stack.
-
-    Raises:
-        RuntimeError: Raised if a function is recognized but does not have `key`
-            in its locals.
-
-    This method works across threads as long as they are started using
-    [TP][trulens_eval.utils.threading.TP].
-    """
-
-    frames = stack_with_tasks()[1:]  # + 1 to skip this method itself
-    # NOTE: skipping offset frames is done below since the full stack may need
-    # to be reconstructed there.
-
-    # Using queue for frames as additional frames may be added due to handling threads.
-    q = queue.Queue()
-    for f in frames:
-        q.put(f)
-
-    while not q.empty():
-        f = q.get()
-
-        if id(f.f_code) == id(_future_target_wrapper.__code__):
-            locs = f.f_locals
-            assert "pre_start_stack" in locs, "Pre thread start stack expected but not found."
-            for fi in locs['pre_start_stack']:
-                q.put(fi.frame)
-
-            continue
-
-        if offset is not None and offset > 0:
-            offset -= 1
-            continue
-
-        if func(f.f_code):
-            logger.debug(f"Looking via {func.__name__}; found {f}")
-            if skip is not None and f == skip:
-                logger.debug(f"Skipping.")
-                continue
-
-            locs = f.f_locals
-            if key in locs:
-                yield locs[key]
-            else:
-                raise KeyError(f"No local named '{key}' found in frame {f}.")
-
-    return
-
-
-def get_first_local_in_call_stack(
-    key: str,
-    func: Callable[[Callable], bool],
-    offset: Optional[int] = 1,
-    skip: Optional[Any] = None  # actually frame
-) -> Optional[Any]:
-    """
-    Get the value of the local variable named `key` in the stack at the nearest
-    frame executing a function which `func` recognizes (returns True on)
-    starting from the top of the stack except `offset` top frames. If `skip`
-    frame is provided, it is skipped as well. Returns None if `func` does not
-    recognize the correct function. Raises RuntimeError if a function is
-    recognized but does not have `key` in its locals.
-
-    This method works across threads as long as they are started using the TP
-    class above.
-
-    NOTE: `offset` is unreliable for skipping the intended frame when operating
-    with async tasks. In those cases, the `skip` argument is more reliable.
-    """
-
-    try:
-        return next(
-            iter(
-                get_all_local_in_call_stack(
-                    key, func, offset=offset + 1, skip=skip
-                )
-            )
-        )
-    except StopIteration:
-        logger.debug("no frames found")
-        return None
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
 
 
 # Wrapping utilities
@@ -624,7 +424,8 @@ class OpaqueWrapper(Generic[T]):
 def wrap_awaitable(
     awaitable: Awaitable[T],
     on_await: Optional[Callable[[], Any]] = None,
-    on_done: Optional[Callable[[T], Any]] = None
+    on_done: Optional[Callable[[T], Any]] = None,
+    context_vars: Optional[Mapping[contextvars.ContextVar, Any]] = None
 ) -> Awaitable[T]:
     """Wrap an awaitable in another awaitable that will call callbacks before
     and after the given awaitable finishes.
@@ -640,13 +441,19 @@ def wrap_awaitable(
         
         on_done: The callback to call with the result of the wrapped awaitable
             once it is ready.
+
+        context_vars: Context variables to set while the wrapped awaitable
+            runs. Coroutines run in the context of whoever awaits them, not
+            whoever created them, so this is how the creator's state reaches
+            them.
     """
 
     async def wrapper(awaitable):
         if on_await is not None:
             on_await()
 
-        val = await awaitable
+        with context_vars_set(context_vars or {}):
+            val = await awaitable
 
         if on_done is not None:
             on_done(val)
@@ -660,7 +467,9 @@ def wrap_generator(
     gen: Generator[T, None, None],
     on_iter: Optional[Callable[[], Any]] = None,
     on_next: Optional[Callable[[T], Any]] = None,
-    on_done: Optional[Callable[[], Any]] = None
+    on_done: Optional[Callable[[], Any]] = None,
+    on_error: Optional[Callable[[BaseException], Any]] = None,
+    context_vars: Optional[Mapping[contextvars.ContextVar, Any]] = None
 ) -> Generator[T, None, None]:
     """Wrap a generator in another generator that will call callbacks at various
     points in the generation process.
@@ -674,17 +483,95 @@ def wrap_generator(
         on_next: The callback to call with the result of each iteration of the
             wrapped generator.
 
-        on_done: The callback to call when the wrapped generator is exhausted.
+        on_done: The callback to call when the wrapped generator is exhausted
+            or the wrapper generator is closed before then.
+
+        on_error: The callback to call with the exception raised by the wrapped
+            generator, instead of `on_done`. The exception is raised again
+            afterwards.
+
+        context_vars: Context variables to set while the wrapped generator
+            produces each of its values. Generators run in the context of
+            whoever iterates them, not whoever created them.
     """
 
     def wrapper(gen):
         if on_iter is not None:
             on_iter()
 
-        for val in gen:
-            if on_next is not None:
-                on_next(val)
-            yield val
+        it = iter(gen)
+
+        try:
+            while True:
+                with context_vars_set(context_vars or {}):
+                    try:
+                        val = next(it)
+                    except StopIteration:
+                        break
+
+                if on_next is not None:
+                    on_next(val)
+
+                yield val
+
+        except GeneratorExit:
+            # Closed before exhausted. Close the wrapped one too.
+            if hasattr(it, "close"):
+                it.close()
+
+        except BaseException as e:
+            if on_error is not None:
+                on_error(e)
+            raise
+
+        if on_done is not None:
+            on_done()
+
+    return wrapper(gen)
+
+
+def wrap_async_generator(
+    gen: AsyncGenerator[T, None],
+    on_iter: Optional[Callable[[], Any]] = None,
+    on_next: Optional[Callable[[T], Any]] = None,
+    on_done: Optional[Callable[[], Any]] = None,
+    on_error: Optional[Callable[[BaseException], Any]] = None,
+    context_vars: Optional[Mapping[contextvars.ContextVar, Any]] = None
+) -> AsyncGenerator[T, None]:
+    """Wrap an async generator in another async generator that will call
+    callbacks at various points in the generation process.
+
+    See [wrap_generator][trulens_eval.utils.python.wrap_generator] for the
+    arguments.
+    """
+
+    async def wrapper(gen):
+        if on_iter is not None:
+            on_iter()
+
+        it = gen.__aiter__()
+
+        try:
+            while True:
+                with context_vars_set(context_vars or {}):
+                    try:
+                        val = await it.__anext__()
+                    except StopAsyncIteration:
+                        break
+
+                if on_next is not None:
+                    on_next(val)
+
+                yield val
+
+        except GeneratorExit:
+            if hasattr(it, "aclose"):
+                await it.aclose()
+
+        except BaseException as e:
+            if on_error is not None:
+                on_error(e)
+            raise
 
         if on_done is not None:
             on_done()
@@ -802,6 +689,17 @@ class SingletonPerName(Generic[T]):
 
         return obj
 
+    @classmethod
+    def existing_instances(cls) -> List[SingletonPerName[T]]:
+        """Get the instances of this class that have already been created, by
+        any name, without creating one."""
+
+        return [
+            info.val
+            for (cls_name, _), info in SingletonPerName._instances.items()
+            if cls_name == cls.__name__
+        ]
+
     @staticmethod
     def delete_singleton_by_name(name: str, cls: Type[SingletonPerName] = None):
         """
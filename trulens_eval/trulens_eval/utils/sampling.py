@@ -0,0 +1,139 @@
+"""
+# Recording Sampling
+
+Policies deciding which invocations of an app get recorded. Give one to an app
+recorder to record only some of its invocations:
+
+```python
+from trulens_eval import TruCustomApp
+from trulens_eval.utils.sampling import Sampling
+
+# Record 5% of invocations but no more than 60 a minute, plus any that fail or
+# take longer than 10 seconds.
+tru_app = TruCustomApp(
+    app,
+    sampling=Sampling(
+        rate=0.05, max_per_minute=60, record_slower_than=10.0
+    )
+)
+```
+
+The decision is made when a root instrumented method (the first one in a call
+stack) is called. Invocations that are not sampled run without recording: none
+of their calls are tracked or serialized and nothing is written to the
+database. If an unsampled invocation fails or is slow and the policy says to
+keep those, a record with only its root call is made once it finishes.
+"""
+
+from __future__ import annotations
+
+from _thread import LockType
+import hashlib
+import random
+from threading import Lock
+import time
+from typing import Optional
+
+from pydantic import BaseModel
+from pydantic import Field
+from pydantic import PrivateAttr
+
+
+def input_fraction(main_input: str) -> float:
+    """Map the given input to a number in [0, 1) deterministically, uniformly
+    over different inputs."""
+
+    digest = hashlib.blake2b(main_input.encode(), digest_size=8).digest()
+
+    return int.from_bytes(digest, "big") / 2**64
+
+
+class Sampling(BaseModel):
+    """Policy deciding which invocations of an app are recorded.
+
+    The default policy records everything.
+    """
+
+    rate: float = Field(1.0, ge=0.0, le=1.0)
+    """Fraction of invocations to record."""
+
+    by_input: bool = False
+    """Decide by a hash of the main input of each invocation instead of at
+    random so that the same input is either always or never recorded."""
+
+    max_per_minute: Optional[float] = Field(None, gt=0.0)
+    """Most sampled invocations to record per minute, per app. Allows bursts of
+    up to a second's worth, or at least one. Unlimited if None."""
+
+    record_errors: bool = True
+    """Record invocations that raise errors even if they were not sampled."""
+
+    record_slower_than: Optional[float] = None
+    """Record invocations that take at least this many seconds even if they
+    were not sampled."""
+
+    _lock: LockType = PrivateAttr(default_factory=Lock)
+
+    _tokens: Optional[float] = PrivateAttr(None)
+    """Invocations that can be recorded now under `max_per_minute`."""
+
+    _last_refill: float = PrivateAttr(default_factory=time.monotonic)
+
+    def needs_input(self) -> bool:
+        """Whether `sample` needs the main input of invocations."""
+
+        return self.by_input and self.rate < 1.0
+
+    def sample(self, main_input: Optional[str] = None) -> bool:
+        """Decide whether to record an invocation with the given main input.
+
+        Should be called once per invocation as it counts towards
+        `max_per_minute`.
+        """
+
+        if self.rate < 1.0:
+            if self.by_input and main_input is not None:
+                fraction = input_fraction(main_input)
+            else:
+                fraction = random.random()
+
+            if fraction >= self.rate:
+                return False
+
+        if self.max_per_minute is None:
+            return True
+
+        per_second = self.max_per_minute / 60.0
+        capacity = max(1.0, per_second)
+
+        with self._lock:
+            now = time.monotonic()
+
+            if self._tokens is None:
+                self._tokens = capacity
+            else:
+                self._tokens = min(
+                    capacity,
+                    self._tokens + (now - self._last_refill) * per_second
+                )
+
+            self._last_refill = now
+
+            if self._tokens < 1.0:
+                return False
+
+            self._tokens -= 1.0
+
+            return True
+
+    def keep_unsampled(
+        self, error: Optional[BaseException], duration: float
+    ) -> bool:
+        """Decide whether to record an unsampled invocation after all given how
+        it went."""
+
+        if error is not None and self.record_errors:
+            return True
+
+        return self.record_slower_than is not None and \
+            duration >= self.record_slower_than
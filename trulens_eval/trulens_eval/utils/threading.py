@@ -7,11 +7,12 @@ from __future__ import annotations
 from concurrent.futures import ThreadPoolExecutor as fThreadPoolExecutor
 from concurrent.futures import TimeoutError
 import contextvars
-from inspect import stack
 import logging
 import threading
 from threading import Thread as fThread
-from typing import Callable, Optional, TypeVar
+from typing import (
+    Callable, Dict, Generic, Hashable, Iterable, List, Optional, Tuple, TypeVar
+)
 
 from trulens_eval.utils.python import _future_target_wrapper
 from trulens_eval.utils.python import code_line
@@ -28,7 +29,8 @@ A = TypeVar("A")
 
 
 class Thread(fThread):
-    """Thread that wraps target with stack/context tracking.
+    """Thread that runs its target in a copy of its creator's context
+    variables.
     
     App components that do not use this thread class might not be properly
     tracked."""
@@ -42,7 +44,6 @@ class Thread(fThread):
         kwargs={},
         daemon=None
     ):
-        present_stack = stack()
         present_context = contextvars.copy_context()
 
         fThread.__init__(
@@ -50,7 +51,7 @@ class Thread(fThread):
             name=name,
             group=group,
             target=_future_target_wrapper,
-            args=(present_stack, present_context, target, *args),
+            args=(present_context, target, *args),
             kwargs=kwargs,
             daemon=daemon
         )
@@ -63,8 +64,8 @@ threading.Thread = Thread
 
 
 class ThreadPoolExecutor(fThreadPoolExecutor):
-    """A ThreadPoolExecutor that keeps track of the stack prior to each thread's
-    invocation.
+    """A ThreadPoolExecutor that runs each submitted function in a copy of the
+    submitter's context variables.
     
     Apps that do not use this thread pool might not be properly tracked.
     """
@@ -73,11 +74,9 @@ class ThreadPoolExecutor(fThreadPoolExecutor):
         super().__init__(*args, **kwargs)
 
     def submit(self, fn, /, *args, **kwargs):
-        present_stack = stack()
         present_context = contextvars.copy_context()
         return super().submit(
-            _future_target_wrapper, present_stack, present_context, fn, *args,
-            **kwargs
+            _future_target_wrapper, present_context, fn, *args, **kwargs
         )
 
 
@@ -101,8 +100,8 @@ try:
     from langchain_core.runnables.config import ContextThreadPoolExecutor
     ContextThreadPoolExecutor.__bases__ = (ThreadPoolExecutor,)
 
-    # TODO: ContextThreadPoolExecutor already maintains context so we no longer
-    # need to do it for them but we still need to maintain call stack.
+    # NOTE: ContextThreadPoolExecutor already maintains context so copying it
+    # again in our submit is redundant but harmless.
 
 except Exception:
     pass
@@ -209,3 +208,159 @@ class TP(SingletonPerName):  # "thread processing"
         return self.thread_pool_debug_tasks.submit(
             self._run_with_timeout, func, *args, timeout=timeout, **kwargs
         )
+
+
+class _FanOutTask(Generic[A, T]):
+    """A single item of a
+    [FanOut.map][trulens_eval.utils.threading.FanOut.map] call."""
+
+    def __init__(self, func: Callable[[A], T], item: A):
+        self.func = func
+        self.item = item
+
+        self.done = threading.Event()
+
+        self.result: Optional[T] = None
+        self.error: Optional[BaseException] = None
+
+    def run(self) -> None:
+        try:
+            self.result = self.func(self.item)
+        except BaseException as e:
+            self.error = e
+        finally:
+            self.done.set()
+
+
+class FanOut(SingletonPerName):
+    """Shared, bounded thread pool for concurrency within a single task, such
+    as scoring each sentence of a response inside one feedback function.
+
+    Singleton. Worker threads are shared by all callers and capped globally at
+    `MAX_THREADS`. Each call can additionally name a `key` (e.g. an endpoint)
+    with a `limit` on how many of that key's items run concurrently across all
+    callers.
+
+    The calling thread runs items that no worker has picked up yet instead of
+    waiting for them. This keeps nested fan-outs (and fan-outs from within
+    [TP][trulens_eval.utils.threading.TP] tasks) from deadlocking on a full pool
+    and means a key's items may run on up to `limit` workers plus the callers
+    themselves.
+    """
+
+    MAX_THREADS: int = 32
+    """Maximum number of worker threads."""
+
+    def __init__(self):
+        if safe_hasattr(self, "thread_pool"):
+            # Already initialized as per SingletonPerName mechanism.
+            return
+
+        self.thread_pool = ThreadPoolExecutor(
+            max_workers=FanOut.MAX_THREADS, thread_name_prefix="FanOut.map"
+        )
+
+        self._limits_lock = threading.Lock()
+        self._limits: Dict[Hashable, Tuple[int, threading.Semaphore]] = {}
+
+    def _semaphore(self, key: Hashable,
+                   limit: int) -> Optional[threading.Semaphore]:
+        """Get the semaphore for the given key, replacing it if its limit
+        changed."""
+
+        with self._limits_lock:
+            current = self._limits.get(key)
+            if current is None or current[0] != limit:
+                current = (limit, threading.Semaphore(max(1, limit)))
+                self._limits[key] = current
+
+            return current[1]
+
+    def map(
+        self,
+        func: Callable[[A], T],
+        items: Iterable[A],
+        key: Optional[Hashable] = None,
+        limit: Optional[int] = None
+    ) -> List[T]:
+        """Apply `func` to each of the items concurrently, returning the
+        results in order.
+
+        Args:
+            func: Function to apply.
+
+            items: Items to apply it to.
+
+            key: Name of the resource (e.g. an endpoint) the items use.
+
+            limit: Maximum number of items of `key` to run concurrently in
+                worker threads.
+
+        Raises:
+            Exception: The first error raised by `func`, in item order, after
+                all items have finished.
+        """
+
+        tasks = [_FanOutTask(func, item) for item in items]
+
+        if len(tasks) <= 1:
+            # Nothing to gain from another thread.
+            for task in tasks:
+                task.run()
+
+        else:
+            semaphore = None
+            if key is not None and limit is not None:
+                semaphore = self._semaphore(key, limit)
+
+            # Workers claim items from the front and the caller from the back
+            # so they do not race for the same items.
+            claim_lock = threading.Lock()
+            bounds = [0, len(tasks)]
+
+            def claim(front: bool) -> Optional[_FanOutTask]:
+                with claim_lock:
+                    if bounds[0] >= bounds[1]:
+                        return None
+                    if front:
+                        bounds[0] += 1
+                        return tasks[bounds[0] - 1]
+                    bounds[1] -= 1
+                    return tasks[bounds[1]]
+
+            def work() -> None:
+                while True:
+                    if semaphore is not None:
+                        semaphore.acquire()
+                    try:
+                        task = claim(front=True)
+                        if task is None:
+                            return
+                        task.run()
+                    finally:
+                        if semaphore is not None:
+                            semaphore.release()
+
+            # One job per worker rather than per item as submitting is not
+            # free (see ThreadPoolExecutor.submit).
+            num_workers = min(
+                len(tasks) - 1, FanOut.MAX_THREADS,
+                limit if semaphore is not None else len(tasks)
+            )
+            for _ in range(max(1, num_workers)):
+                self.thread_pool.submit(work)
+
+            # Run whatever the workers have not gotten to.
+            task = claim(front=False)
+            while task is not None:
+                task.run()
+                task = claim(front=False)
+
+            for task in tasks:
+                task.done.wait()
+
+        for task in tasks:
+            if task.error is not None:
+                raise task.error
+
+        return [task.result for task in tasks]